@@ -6,6 +6,71 @@ class Settings(BaseSettings):
     environment_name: str
     mist_api_key: str
     redis_url: str
+    redis_max_connections: int = 50
+    context_cache_ttl: float = 300.0
+
+    # Mist API connection pool (shared across all MistEngine instances)
+    mist_max_connections: int = 100
+    mist_max_keepalive_connections: int = 20
+    mist_keepalive_expiry: float = 30.0
+    mist_http2: bool = False
+
+    # Mist API rate limiting and retries
+    mist_rate_limit_per_hour: int = 5000
+    mist_rate_limit_burst: int = 50
+    mist_max_retries: int = 5
+    mist_backoff_base: float = 1.0
+    mist_backoff_max: float = 60.0
+
+    # Mist GET response cache
+    mist_cache_ttl: float = 30.0
+    mist_cache_stale_ttl: int = 3600
+    mist_cache_max_entries: int = 1024
+
+    # IPAM prefix index (overlap checks on network / hub profile creation)
+    ipam_index_ttl: float = 300.0
+
+    # Inventory serial/MAC index (seconds before a lookup miss triggers a full refresh)
+    inventory_index_ttl: int = 3600
+
+    # Pipeline checkpoints (seconds a run can be resumed)
+    pipeline_checkpoint_ttl: int = 7 * 24 * 3600
+
+    # Bulk PSK runs (seconds an unfinished run, and the passphrases it needs to resume, is kept)
+    psk_run_ttl: int = 24 * 3600
+
+    # Background jobs (Redis Streams queue consumed by `python -m src.worker`)
+    job_worker_concurrency: int = 4
+    job_claim_idle: float = 300.0
+    job_ttl: int = 7 * 24 * 3600
+    job_stream_maxlen: int = 100_000
+
+    # Day 1 template rendering (compiled-template LRU size; pool processes, 0 = in-process)
+    template_cache_size: int = 256
+    template_render_processes: int = 0
+
+    # Day 2 fleet snapshots (e.g. health of every site), shared by all workers;
+    # the lock timeout must outlast a build, or waiting workers start their own
+    snapshot_ttl: float = 60.0
+    snapshot_lock_timeout: float = 120.0
+
+    # Day 2 metric history (seconds between health samples recorded by the worker, 0 = off;
+    # a sample is skipped while fewer Mist API tokens than the reserve are left for jobs)
+    metrics_sample_interval: float = 0.0
+    metrics_sample_reserve: int = 25
+
+    # Day 2 alert webhooks (shared secret configured on the Mist webhook; unset rejects deliveries)
+    mist_webhook_secret: str | None = None
+    alert_retention: int = 7 * 24 * 3600
+
+    # Day 2 alert correlation (seconds an incident stays open and duplicates are detected)
+    correlation_window: int = 300
+
+    # Day 2 event streaming (events buffered per subscriber; seconds between keepalives;
+    # seconds between fleet health refreshes while a worker has subscribers, 0 = off)
+    stream_queue_size: int = 1000
+    stream_heartbeat: float = 15.0
+    stream_health_interval: float = 60.0
 
     model_config = SettingsConfigDict(
         env_file=".env",
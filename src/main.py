@@ -1,7 +1,26 @@
+import asyncio
+import importlib
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI, APIRouter, Depends
 from fastapi.responses import RedirectResponse
 from src.config import Settings, get_settings
-from src.routers.day0_design_and_topology import org, nms, sites, apps, inventory
+from src.routers.day0_design_and_topology import org, nms, ipam, sites, apps, inventory, networks, hub_profiles, reconcile, turnup
+from src.routers.day1_intent_and_policy import templates
+from src.routers.day2_observability_assurance_and_aiops import assurance
+from src.routers import jobs
+from src.services.event_bus import get_event_bus
+from src.services.http_pool import close_http_pool, get_http_pool
+from src.services.inventory_index import get_inventory_index
+from src.services.redis import close_redis_pool, get_context_cache, get_redis_pool, run_invalidation_listener
+from src.services.response_cache import get_response_cache
+from src.services.templates import close_render_pool
+
+# Day 1 service-domain packages are numbered (0_routing_wan, ...) and cannot be imported by name.
+wan = importlib.import_module("src.routers.day1_intent_and_policy.0_routing_wan.wan")
+wired = importlib.import_module("src.routers.day1_intent_and_policy.1_wired_switching.wired")
+wireless = importlib.import_module("src.routers.day1_intent_and_policy.2_wireless_mobility.wireless")
+psks = importlib.import_module("src.routers.day1_intent_and_policy.2_wireless_mobility.psks")
 
 # OpenAPI tag definitions for Swagger UI grouping.
 tags_metadata = [
@@ -13,6 +32,10 @@ tags_metadata = [
         "name": "day 0 - nms",
         "description": "Network management system configuration. Stores device MACs, VLANs, and switch management details.",
     },
+    {
+        "name": "day 0 - ipam",
+        "description": "Algorithmic IP planning. Derives non-overlapping site subnets from Zone and Site IDs.",
+    },
     {
         "name": "Sites - Day 0",
         "description": "Orchestrates the lifecycle (CRUD) of physical site objects and site variables within the Mist org.",
@@ -25,17 +48,79 @@ tags_metadata = [
         "name": "Inventory - Day 0",
         "description": "Device claim and assignment operations for Zero Touch Provisioning.",
     },
+    {
+        "name": "Networks - Day 0",
+        "description": "Network definitions (VLANs, subnets) referenced by Day 1 WAN policies.",
+    },
+    {
+        "name": "Hub Profiles - Day 0",
+        "description": "WAN Edge hub configurations that spoke sites build overlay tunnels to.",
+    },
+    {
+        "name": "day 0 - reconcile",
+        "description": "Idempotent desired-state apply. Diffs an org intent document and issues only the required writes.",
+    },
+    {
+        "name": "day 0 - turn-up",
+        "description": "End-to-end site turn-up as a resumable, parallel pipeline of provisioning steps.",
+    },
+    {
+        "name": "WAN - Day 1",
+        "description": "WAN Edge gateway templates and their late binding to sites.",
+    },
+    {
+        "name": "Wired - Day 1",
+        "description": "Switch templates and port profiles pushed to access switches in bulk.",
+    },
+    {
+        "name": "Wireless - Day 1",
+        "description": "RF and WLAN templates, WLANs, labels, wxrules and Org PSKs, individually or as one bundle.",
+    },
+    {
+        "name": "day 1 - templates",
+        "description": "Compiled {{variable}} templates rendered per site from NMS, IPAM and site variables.",
+    },
+    {
+        "name": "Assurance - Day 2",
+        "description": "Fleet-wide site health, webhook alerts and correlated incidents, SLE trends, live event streams and Marvis insights.",
+    },
+    {
+        "name": "jobs",
+        "description": "Progress, per-item results and cancellation of background provisioning jobs.",
+    },
     {
         "name": "system",
         "description": "Service health and configuration endpoints.",
     },
 ]
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared connection pools on startup and release them on shutdown."""
+    get_http_pool()
+    get_redis_pool()
+    get_context_cache()
+    get_response_cache()
+    get_inventory_index()
+    listener = asyncio.create_task(run_invalidation_listener())
+    events = asyncio.create_task(get_event_bus().run_listener())
+    yield
+    for task in (listener, events):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await close_http_pool()
+    await close_redis_pool()
+    close_render_pool()
+
+
 app = FastAPI(
     title="Juniper Mist - Multi-Site Provisioning Service",
     description="Automates network infrastructure provisioning using the Juniper Mist Cloud API.",
     version="1.0.0",
     openapi_tags=tags_metadata,
+    lifespan=lifespan,
 )
 
 status_router = APIRouter(tags=["system"])
@@ -55,9 +140,21 @@ async def get_test_variable(settings: Settings = Depends(get_settings)):
 app.include_router(status_router)
 app.include_router(org.router)
 app.include_router(nms.router)
+app.include_router(ipam.router)
 app.include_router(sites.router)
 app.include_router(apps.router)
 app.include_router(inventory.router)
+app.include_router(networks.router)
+app.include_router(hub_profiles.router)
+app.include_router(reconcile.router)
+app.include_router(turnup.router)
+app.include_router(wan.router)
+app.include_router(wired.router)
+app.include_router(wireless.router)
+app.include_router(psks.router)
+app.include_router(templates.router)
+app.include_router(assurance.router)
+app.include_router(jobs.router)
 
 @app.get("/", include_in_schema=False)
 def redirect_to_docs():
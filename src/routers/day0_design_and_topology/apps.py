@@ -13,11 +13,12 @@ Mist API Reference:
 """
 from enum import Enum
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Query
 from pydantic import BaseModel, Field
 
 from src.services.mist_engine import MistEngine
-from src.services.redis import get_api_host, get_org_id
+from src.services.redis import get_context
+from src.services.streaming import NDJSON_RESPONSES, ndjson_response, wants_ndjson
 
 
 router = APIRouter(prefix="/apps", tags=["Applications - Day 0"])
@@ -91,18 +92,44 @@ class AppListResponse(BaseModel):
     count: int
 
 
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def _to_app(a: dict) -> App:
+    """Map a Mist API record onto the response model."""
+    return App(
+        id=a.get("id", ""),
+        name=a.get("name", ""),
+        type=a.get("type"),
+        hostnames=a.get("hostnames", []),
+        ips=a.get("ips", []),
+        protocol=a.get("protocol"),
+        port=a.get("port"),
+        dscp=a.get("dscp"),
+        traffic_class=a.get("traffic_class"),
+        description=a.get("description"),
+        org_id=a.get("org_id"),
+    )
+
+
 # =============================================================================
 # Endpoints
 # =============================================================================
 
-@router.get("/", response_model=AppListResponse, summary="List all applications")
-async def list_apps():
+@router.get("/", response_model=AppListResponse, responses=NDJSON_RESPONSES, summary="List all applications")
+async def list_apps(
+    all_pages: bool = Query(False, alias="all", description="Return every page of the collection"),
+    accept: str | None = Header(None, description="Send application/x-ndjson to stream records"),
+):
     """
     List all application signatures in the organization.
 
     These define "Interesting Traffic" for traffic classification and AppQoE.
+    Use `all=true` to follow Mist pagination across the whole collection.
+    Send `Accept: application/x-ndjson` to stream every record as NDJSON.
     """
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -110,24 +137,16 @@ async def list_apps():
         )
 
     engine = MistEngine(host=api_host)
-    data = await engine.get(f"/api/v1/orgs/{org_id}/services")
-
-    apps = [
-        App(
-            id=a.get("id", ""),
-            name=a.get("name", ""),
-            type=a.get("type"),
-            hostnames=a.get("hostnames", []),
-            ips=a.get("ips", []),
-            protocol=a.get("protocol"),
-            port=a.get("port"),
-            dscp=a.get("dscp"),
-            traffic_class=a.get("traffic_class"),
-            description=a.get("description"),
-            org_id=a.get("org_id"),
-        )
-        for a in data
-    ]
+    endpoint = f"/api/v1/orgs/{org_id}/services"
+    if wants_ndjson(accept):
+        return await ndjson_response(_to_app(a) async for a in engine.paginate(endpoint))
+
+    if all_pages:
+        data = [a async for a in engine.paginate(endpoint)]
+    else:
+        data = await engine.get(endpoint)
+
+    apps = [_to_app(a) for a in data]
 
     return AppListResponse(apps=apps, count=len(apps))
 
@@ -144,7 +163,7 @@ async def create_app(request: AppCreate):
     - Zoom: hostnames=["*.zoom.us"], traffic_class="high"
     - Salesforce: hostnames=["*.salesforce.com", "*.force.com"]
     """
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -173,7 +192,7 @@ async def create_app(request: AppCreate):
 @router.get("/{app_id}", response_model=App, summary="Get application details")
 async def get_app(app_id: str):
     """Get detailed information about a specific application signature."""
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -181,7 +200,7 @@ async def get_app(app_id: str):
         )
 
     engine = MistEngine(host=api_host)
-    result = await engine.get(f"/api/v1/orgs/{org_id}/services/{app_id}")
+    result = await engine.get(f"/api/v1/orgs/{org_id}/services/{app_id}", cache=True)
 
     return App(
         id=result.get("id", app_id),
@@ -201,7 +220,7 @@ async def get_app(app_id: str):
 @router.put("/{app_id}", response_model=App, summary="Update application")
 async def update_app(app_id: str, request: AppUpdate):
     """Update an existing application signature."""
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -234,7 +253,7 @@ async def delete_app(app_id: str):
 
     WARNING: This may affect WAN policies that reference this application.
     """
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -11,14 +11,18 @@ Mist API Reference:
 - GET /api/v1/orgs/{org_id}/hubprofiles/{hubprofile_id} - Get hub profile
 - PUT /api/v1/orgs/{org_id}/hubprofiles/{hubprofile_id} - Update hub profile
 - DELETE /api/v1/orgs/{org_id}/hubprofiles/{hubprofile_id} - Delete hub profile
+
+LAN subnets are checked against existing allocations (see services/ipam_index).
 """
 from enum import Enum
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from src.services.ipam_index import PrefixRecord, check_prefix_conflicts, invalidate_org_index, parse_prefix
 from src.services.mist_engine import MistEngine
-from src.services.redis import get_api_host, get_org_id
+from src.services.redis import get_context
+from src.services.streaming import NDJSON_RESPONSES, ndjson_response, wants_ndjson
 
 
 router = APIRouter(prefix="/hub-profiles", tags=["Hub Profiles - Day 0"])
@@ -104,19 +108,44 @@ class HubProfileListResponse(BaseModel):
     count: int
 
 
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def _to_hub_profile(h: dict) -> HubProfile:
+    """Map a Mist API record onto the response model."""
+    return HubProfile(
+        id=h.get("id", ""),
+        name=h.get("name", ""),
+        wan=h.get("wan", []),
+        lan=h.get("lan", []),
+        path_preference=h.get("path_preference"),
+        bgp_enabled=h.get("bgp_enabled", False),
+        ospf_enabled=h.get("ospf_enabled", False),
+        org_id=h.get("org_id"),
+        created_time=h.get("created_time"),
+        modified_time=h.get("modified_time"),
+    )
+
+
 # =============================================================================
 # Endpoints
 # =============================================================================
 
-@router.get("/", response_model=HubProfileListResponse, summary="List all hub profiles")
-async def list_hub_profiles():
+@router.get("/", response_model=HubProfileListResponse, responses=NDJSON_RESPONSES, summary="List all hub profiles")
+async def list_hub_profiles(
+    all_pages: bool = Query(False, alias="all", description="Return every page of the collection"),
+    accept: str | None = Header(None, description="Send application/x-ndjson to stream records"),
+):
     """
     List all hub profiles in the organization.
 
     Hub profiles define WAN Edge configurations for datacenter sites.
     They create overlay endpoints that spoke sites connect to via IPsec tunnels.
+    Use `all=true` to follow Mist pagination across the whole collection.
+    Send `Accept: application/x-ndjson` to stream every record as NDJSON.
     """
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -124,29 +153,25 @@ async def list_hub_profiles():
         )
 
     engine = MistEngine(host=api_host)
-    data = await engine.get(f"/api/v1/orgs/{org_id}/hubprofiles")
-
-    hub_profiles = [
-        HubProfile(
-            id=h.get("id", ""),
-            name=h.get("name", ""),
-            wan=h.get("wan", []),
-            lan=h.get("lan", []),
-            path_preference=h.get("path_preference"),
-            bgp_enabled=h.get("bgp_enabled", False),
-            ospf_enabled=h.get("ospf_enabled", False),
-            org_id=h.get("org_id"),
-            created_time=h.get("created_time"),
-            modified_time=h.get("modified_time"),
-        )
-        for h in data
-    ]
+    endpoint = f"/api/v1/orgs/{org_id}/hubprofiles"
+    if wants_ndjson(accept):
+        return await ndjson_response(_to_hub_profile(h) async for h in engine.paginate(endpoint))
+
+    if all_pages:
+        data = [h async for h in engine.paginate(endpoint)]
+    else:
+        data = await engine.get(endpoint)
+
+    hub_profiles = [_to_hub_profile(h) for h in data]
 
     return HubProfileListResponse(hub_profiles=hub_profiles, count=len(hub_profiles))
 
 
 @router.post("/", response_model=HubProfile, summary="Create hub profile")
-async def create_hub_profile(request: HubProfileCreate):
+async def create_hub_profile(
+    request: HubProfileCreate,
+    allow_overlap: bool = Query(False, description="Create even if a LAN subnet overlaps an existing allocation"),
+):
     """
     Create a new hub profile for a datacenter WAN Edge device.
 
@@ -155,8 +180,11 @@ async def create_hub_profile(request: HubProfileCreate):
 
     Hub devices require static IPs for overlay endpoints. The Mist cloud
     automatically generates and installs SSL certificates for the hub.
+
+    Returns 409 with the conflicting allocations if a LAN subnet overlaps an
+    existing network or hub-profile LAN, unless `allow_overlap=true`.
     """
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -164,8 +192,16 @@ async def create_hub_profile(request: HubProfileCreate):
         )
 
     engine = MistEngine(host=api_host)
+    lans = [lan for lan in request.lan if lan.subnet]
+    index = await check_prefix_conflicts(engine, org_id, [lan.subnet for lan in lans], allow_overlap)
+
     payload = request.model_dump(exclude_none=True)
     result = await engine.post(f"/api/v1/orgs/{org_id}/hubprofiles", json=payload)
+    for lan in lans:
+        record = PrefixRecord(lan.subnet, "hub_profile", result.get("id", ""), f"{request.name}/{lan.name}")
+        index.add(parse_prefix(lan.subnet), record)
+    if lans:
+        await invalidate_org_index(api_host, org_id, keep_local=True)
 
     return HubProfile(
         id=result.get("id", ""),
@@ -184,7 +220,7 @@ async def create_hub_profile(request: HubProfileCreate):
 @router.get("/{hubprofile_id}", response_model=HubProfile, summary="Get hub profile details")
 async def get_hub_profile(hubprofile_id: str):
     """Get detailed information about a specific hub profile."""
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -192,7 +228,7 @@ async def get_hub_profile(hubprofile_id: str):
         )
 
     engine = MistEngine(host=api_host)
-    result = await engine.get(f"/api/v1/orgs/{org_id}/hubprofiles/{hubprofile_id}")
+    result = await engine.get(f"/api/v1/orgs/{org_id}/hubprofiles/{hubprofile_id}", cache=True)
 
     return HubProfile(
         id=result.get("id", hubprofile_id),
@@ -215,7 +251,7 @@ async def update_hub_profile(hubprofile_id: str, request: HubProfileUpdate):
 
     Changes to WAN interfaces may affect spoke connectivity.
     """
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -225,6 +261,8 @@ async def update_hub_profile(hubprofile_id: str, request: HubProfileUpdate):
     engine = MistEngine(host=api_host)
     payload = request.model_dump(exclude_none=True)
     result = await engine.put(f"/api/v1/orgs/{org_id}/hubprofiles/{hubprofile_id}", json=payload)
+    if request.lan is not None:
+        await invalidate_org_index(api_host, org_id)
 
     return HubProfile(
         id=result.get("id", hubprofile_id),
@@ -248,7 +286,7 @@ async def delete_hub_profile(hubprofile_id: str):
     WARNING: This will break connectivity for any spokes referencing this hub.
     Ensure all spoke templates are updated before deleting a hub profile.
     """
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -257,5 +295,6 @@ async def delete_hub_profile(hubprofile_id: str):
 
     engine = MistEngine(host=api_host)
     await engine.delete(f"/api/v1/orgs/{org_id}/hubprofiles/{hubprofile_id}")
+    await invalidate_org_index(api_host, org_id)
 
     return {"id": hubprofile_id, "status": "deleted"}
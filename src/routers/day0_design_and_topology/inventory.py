@@ -6,18 +6,32 @@ Mist API Reference:
 - GET /api/v1/orgs/{org_id}/inventory - List inventory
 - POST /api/v1/orgs/{org_id}/inventory - Claim devices
 - PUT /api/v1/orgs/{org_id}/inventory - Update inventory (assign/unassign)
+
+Large claims and assignments are split into Mist-sized batches dispatched with
+bounded concurrency; only the serials that failed are retried.
+
+Serial and MAC lookups are served from the local inventory index
+(services/inventory_index) instead of one Mist query per device.
 """
+from collections import defaultdict
 from enum import Enum
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from src.services.bulk import BulkItemResult, BulkItemStatus, BulkResponse, error_detail, run_bounded
+from src.services.inventory_index import get_inventory_index
+from src.services.jobs import JOB_RESPONSES, JobContext, enqueue_response, register_job_handler
 from src.services.mist_engine import MistEngine
-from src.services.redis import get_api_host, get_org_id
+from src.services.redis import get_context
+from src.services.streaming import NDJSON_RESPONSES, ndjson_response, wants_ndjson
 
 
 router = APIRouter(prefix="/inventory", tags=["Inventory - Day 0"])
 
+# Items per Mist inventory call when claiming or assigning in bulk
+INVENTORY_BATCH_SIZE = 100
+
 
 # =============================================================================
 # Enums
@@ -41,6 +55,22 @@ class DeviceAssignment(BaseModel):
     managed: bool = Field(default=True, description="Enable Mist management")
 
 
+class BulkDeviceAssignment(BaseModel):
+    """Assign many serials to many sites in one call."""
+    assignments: dict[str, list[str]] = Field(
+        ...,
+        min_length=1,
+        description="Site ID -> serial numbers to assign to it",
+        examples=[{"site-1": ["A1234", "A1235"], "site-2": ["B2001"]}],
+    )
+    managed: bool = Field(default=True, description="Enable Mist management")
+    batch_size: int = Field(
+        default=INVENTORY_BATCH_SIZE, ge=1, le=1000, description="Serials per Mist inventory call"
+    )
+    concurrency: int = Field(default=5, ge=1, le=20, description="Maximum simultaneous Mist calls")
+    retries: int = Field(default=2, ge=0, le=5, description="Extra attempts for serials that failed")
+
+
 class ClaimDevice(BaseModel):
     """Claim device request."""
     claim_codes: list[str] = Field(..., description="Device claim codes")
@@ -63,24 +93,176 @@ class InventoryDevice(BaseModel):
     connected: bool = False
 
 
+class IndexRefreshResponse(BaseModel):
+    """Inventory index refresh result."""
+    org_id: str
+    devices_indexed: int
+
+
 class InventoryResponse(BaseModel):
     """Inventory list response."""
     devices: list[InventoryDevice]
     count: int
     limit: int
-    page: int
+    page: int | None = None
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def _to_device(d: dict) -> InventoryDevice:
+    """Map a Mist API record onto the response model."""
+    return InventoryDevice(
+        serial=d.get("serial", ""),
+        mac=d.get("mac"),
+        model=d.get("model"),
+        type=d.get("type"),
+        site_id=d.get("site_id"),
+        site_name=d.get("site_name"),
+        name=d.get("name"),
+        connected=d.get("connected", False),
+    )
+
+
+def _chunks(items: list, size: int) -> list[list]:
+    """Split `items` into consecutive lists of at most `size`."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _rejected_serials(result: dict | list, serials: list[str]) -> dict[str, str]:
+    """
+    Serials Mist rejected in an inventory PUT, with the reason.
+
+    Mist answers `{"op": ..., "success": [...], "error": [...], "reason": [...]}`
+    where `reason[i]` explains `error[i]`.
+    """
+    if not isinstance(result, dict):
+        return {}
+    errors = result.get("error") or []
+    reasons = result.get("reason") or []
+    requested = set(serials)
+    return {
+        serial: reasons[i] if i < len(reasons) else "Rejected by Mist"
+        for i, serial in enumerate(errors)
+        if serial in requested
+    }
+
+
+async def assign_in_batches(engine: MistEngine, org_id: str, request: BulkDeviceAssignment) -> list[BulkItemResult]:
+    """
+    Assign serials to sites in batches, retrying only the serials that failed.
+
+    Shared by POST /inventory/assign/bulk and the site turn-up pipeline.
+
+    Each round groups the pending serials by site, splits them into
+    `batch_size` PUTs and dispatches them with bounded concurrency. Serials
+    Mist rejected, or whose batch failed with a 5xx/transport error, go into
+    the next round. Batches rejected with a 4xx are not retried.
+
+    Returns:
+        One result per serial, indexed in request order
+    """
+    endpoint = f"/api/v1/orgs/{org_id}/inventory"
+    results: list[BulkItemResult] = []
+    index_of: dict[str, int] = {}
+    site_of: dict[str, str] = {}
+    pending: list[str] = []
+    position = 0
+    for site_id, serials in request.assignments.items():
+        for serial in serials:
+            if serial in site_of:
+                results.append(BulkItemResult(
+                    index=position, key=serial, status=BulkItemStatus.SKIPPED,
+                    detail=f"Already requested for site {site_of[serial]}",
+                ))
+            else:
+                index_of[serial], site_of[serial] = position, site_id
+                pending.append(serial)
+            position += 1
+
+    async def assign(batch: tuple[str, list[str]]) -> dict | list:
+        site_id, serials = batch
+        payload = [{
+            "op": "assign",
+            "site_id": site_id,
+            "macs": [],
+            "serials": serials,
+            "managed": request.managed,
+        }]
+        return await engine.put(endpoint, json=payload)
+
+    failures: dict[str, str] = {}
+    for _ in range(request.retries + 1):
+        by_site: dict[str, list[str]] = defaultdict(list)
+        for serial in pending:
+            by_site[site_of[serial]].append(serial)
+        batches = [
+            (site_id, chunk)
+            for site_id, serials in by_site.items()
+            for chunk in _chunks(serials, request.batch_size)
+        ]
+
+        retry: list[str] = []
+        outcomes = await run_bounded(batches, assign, request.concurrency)
+        for (_, serials), outcome in zip(batches, outcomes):
+            if isinstance(outcome, Exception):
+                detail = error_detail(outcome)
+                for serial in serials:
+                    failures[serial] = detail
+                if not (isinstance(outcome, HTTPException) and outcome.status_code < 500):
+                    retry += serials
+                continue
+            rejected = _rejected_serials(outcome, serials)
+            for serial in serials:
+                if serial in rejected:
+                    failures[serial] = rejected[serial]
+                    retry.append(serial)
+                else:
+                    failures.pop(serial, None)
+        pending = retry
+        if not pending:
+            break
+
+    for serial, index in index_of.items():
+        if serial in failures:
+            results.append(BulkItemResult(
+                index=index, key=serial, status=BulkItemStatus.FAILED, detail=failures[serial]
+            ))
+        else:
+            results.append(BulkItemResult(
+                index=index, key=serial, status=BulkItemStatus.SUCCEEDED, id=site_of[serial]
+            ))
+
+    index = get_inventory_index()
+    for site_id in request.assignments:
+        assigned = [r.key for r in results if r.status == BulkItemStatus.SUCCEEDED and r.id == site_id]
+        await index.update_site(org_id, assigned, site_id)
+    return results
+
+
+async def _bulk_assign_job(job: JobContext) -> dict:
+    """Background job handler for POST /inventory/assign/bulk."""
+    request = BulkDeviceAssignment.model_validate(job.payload)
+    results = await assign_in_batches(MistEngine(host=job.api_host), job.org_id, request)
+    return BulkResponse.from_results(results).model_dump(mode="json")
+
+
+register_job_handler("inventory.bulk_assign", _bulk_assign_job)
 
 
 # =============================================================================
 # Endpoints
 # =============================================================================
 
-@router.get("/", summary="List all inventory devices")
+@router.get("/", responses=NDJSON_RESPONSES, summary="List all inventory devices")
 async def list_inventory(
     type: DeviceType | None = Query(None, description="Filter by device type"),
     unassigned: bool = Query(False, description="Only show unassigned devices"),
     limit: int = Query(100, ge=1, le=1000, description="Results per page"),
     page: int = Query(1, ge=1, description="Page number"),
+    all_pages: bool = Query(False, alias="all", description="Return every page of the collection"),
+    accept: str | None = Header(None, description="Send application/x-ndjson to stream records"),
 ) -> InventoryResponse:
     """
     List all devices in the organization inventory.
@@ -89,8 +271,12 @@ async def list_inventory(
     - **unassigned**: Filter to devices not yet assigned to a site
     - **limit**: Results per page (max 1000)
     - **page**: Page number for pagination
+    - **all**: Follow Mist pagination and return the whole inventory (`page` is ignored)
+
+    Send `Accept: application/x-ndjson` to stream the whole inventory as NDJSON
+    (`limit` is used as the upstream page size).
     """
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -98,40 +284,80 @@ async def list_inventory(
         )
 
     engine = MistEngine(host=api_host)
-    params = {"limit": limit, "page": page}
+    endpoint = f"/api/v1/orgs/{org_id}/inventory"
+    params = {}
     if type:
         params["type"] = type.value
     if unassigned:
         params["unassigned"] = "true"
 
-    data = await engine.get(f"/api/v1/orgs/{org_id}/inventory", params=params)
-
-    devices = [
-        InventoryDevice(
-            serial=d.get("serial", ""),
-            mac=d.get("mac"),
-            model=d.get("model"),
-            type=d.get("type"),
-            site_id=d.get("site_id"),
-            site_name=d.get("site_name"),
-            name=d.get("name"),
-            connected=d.get("connected", False),
+    if wants_ndjson(accept):
+        return await ndjson_response(
+            _to_device(d) async for d in engine.paginate(endpoint, params=params, limit=limit)
         )
-        for d in data
-    ]
+
+    if all_pages:
+        data = [d async for d in engine.paginate(endpoint, params=params, limit=limit)]
+    else:
+        data = await engine.get(endpoint, params={**params, "limit": limit, "page": page})
+
+    devices = [_to_device(d) for d in data]
 
     return InventoryResponse(
         devices=devices,
         count=len(devices),
         limit=limit,
-        page=page
+        page=None if all_pages else page
     )
 
 
+@router.get("/by-mac/{mac}", summary="Get device details by MAC address")
+async def get_device_by_mac(mac: str) -> InventoryDevice:
+    """
+    Get a device by MAC address (any separator style, e.g. the MACs stored in
+    the NMS deployment profile). Served from the local inventory index.
+    """
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    engine = MistEngine(host=api_host)
+    device = await get_inventory_index().by_mac(engine, org_id, mac)
+    if device is None:
+        raise HTTPException(status_code=404, detail=f"No device with MAC {mac} in inventory")
+
+    return _to_device(device)
+
+
+@router.post("/index/refresh", response_model=IndexRefreshResponse, summary="Rebuild the inventory index")
+async def refresh_inventory_index():
+    """
+    Pull the whole inventory from Mist and rebuild the local serial/MAC index.
+
+    The index also refreshes itself when a lookup misses and the last refresh
+    is older than `INVENTORY_INDEX_TTL`.
+    """
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    count = await get_inventory_index().refresh(MistEngine(host=api_host), org_id)
+    return IndexRefreshResponse(org_id=org_id, devices_indexed=count)
+
+
 @router.get("/{serial}", summary="Get device details")
 async def get_device(serial: str) -> InventoryDevice:
-    """Get detailed information about a specific device by serial number."""
-    api_host, org_id = get_api_host(), get_org_id()
+    """
+    Get detailed information about a specific device by serial number.
+    Served from the local inventory index.
+    """
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -139,22 +365,12 @@ async def get_device(serial: str) -> InventoryDevice:
         )
 
     engine = MistEngine(host=api_host)
-    data = await engine.get(f"/api/v1/orgs/{org_id}/inventory", params={"serial": serial})
+    device = await get_inventory_index().by_serial(engine, org_id, serial)
 
-    if not data:
+    if device is None:
         return InventoryDevice(serial=serial, connected=False)
 
-    d = data[0] if isinstance(data, list) else data
-    return InventoryDevice(
-        serial=d.get("serial", serial),
-        mac=d.get("mac"),
-        model=d.get("model"),
-        type=d.get("type"),
-        site_id=d.get("site_id"),
-        site_name=d.get("site_name"),
-        name=d.get("name"),
-        connected=d.get("connected", False),
-    )
+    return _to_device(device)
 
 
 @router.post("/assign", summary="Step 2: Assign Devices to Sites")
@@ -166,7 +382,7 @@ async def assign_devices(request: DeviceAssignment):
     from Step 1. Devices will adopt site-specific configurations
     once assigned.
     """
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -185,6 +401,9 @@ async def assign_devices(request: DeviceAssignment):
     ]
 
     result = await engine.put(f"/api/v1/orgs/{org_id}/inventory", json=payload)
+    rejected = _rejected_serials(result, request.serial_numbers)
+    assigned = [serial for serial in request.serial_numbers if serial not in rejected]
+    await get_inventory_index().update_site(org_id, assigned, request.site_id)
 
     return {
         "site_id": request.site_id,
@@ -195,13 +414,52 @@ async def assign_devices(request: DeviceAssignment):
     }
 
 
+@router.post("/assign/bulk", response_model=BulkResponse, responses=JOB_RESPONSES,
+             summary="Bulk assign devices to many sites")
+async def bulk_assign_devices(
+    request: BulkDeviceAssignment,
+    background: bool = Query(False, description="Run as a background job and return its ID (202)"),
+):
+    """
+    **Bulk Assign Devices to Sites (Day 0)**
+
+    Assigns thousands of serials across many sites in one call. Serials are
+    sent in `batch_size` chunks with at most `concurrency` calls in flight
+    (inside the Mist rate limit). A failed batch never fails the rest:
+    only the serials that failed are retried, up to `retries` times.
+
+    Returns one result per serial; `id` is the site it was assigned to.
+    Serials listed under more than one site are skipped after the first.
+
+    With `background=true` the request is queued and a job ID returned;
+    poll `GET /jobs/{job_id}` for progress and results.
+    """
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    if background:
+        return await enqueue_response("inventory.bulk_assign", request.model_dump(mode="json"), api_host, org_id)
+
+    engine = MistEngine(host=api_host)
+    results = await assign_in_batches(engine, org_id, request)
+    return BulkResponse.from_results(results)
+
+
 @router.post("/claim", summary="Claim devices to organization")
 async def claim_devices(request: ClaimDevice):
     """
     Claim devices to the organization using claim codes.
     Devices must be claimed before they can be assigned to sites.
+
+    Codes are claimed in batches of INVENTORY_BATCH_SIZE; the per-batch Mist
+    results are merged. Codes from a batch that failed outright are listed
+    under `error` with the reason under `reason`.
     """
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -209,11 +467,27 @@ async def claim_devices(request: ClaimDevice):
         )
 
     engine = MistEngine(host=api_host)
-    result = await engine.post(f"/api/v1/orgs/{org_id}/inventory", json=request.claim_codes)
+    endpoint = f"/api/v1/orgs/{org_id}/inventory"
+    batches = _chunks(request.claim_codes, INVENTORY_BATCH_SIZE)
+
+    async def claim(codes: list[str]) -> dict | list:
+        return await engine.post(endpoint, json=codes)
+
+    result: dict[str, list] = defaultdict(list)
+    failed = 0
+    for codes, outcome in zip(batches, await run_bounded(batches, claim, concurrency=5)):
+        if isinstance(outcome, Exception):
+            failed += len(codes)
+            result["error"] += codes
+            result["reason"] += [error_detail(outcome)] * len(codes)
+        elif isinstance(outcome, dict):
+            for key, value in outcome.items():
+                if isinstance(value, list):
+                    result[key] += value
 
     return {
         "org_id": org_id,
-        "claimed_count": len(request.claim_codes),
+        "claimed_count": len(request.claim_codes) - failed,
         "status": "claimed",
         "result": result,
     }
@@ -225,7 +499,7 @@ async def unassign_devices(request: UnassignDevice):
     Unassign devices from their current site.
     Devices remain in org inventory but are no longer site-assigned.
     """
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -242,6 +516,9 @@ async def unassign_devices(request: UnassignDevice):
     ]
 
     result = await engine.put(f"/api/v1/orgs/{org_id}/inventory", json=payload)
+    rejected = _rejected_serials(result, request.serial_numbers)
+    unassigned = [serial for serial in request.serial_numbers if serial not in rejected]
+    await get_inventory_index().update_site(org_id, unassigned, None)
 
     return {
         "serial_numbers": request.serial_numbers,
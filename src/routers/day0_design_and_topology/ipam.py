@@ -1,81 +1,140 @@
 """
-Day 0: NMS Configuration.
+Day 0: IP Address Management (IPAM).
 
-Manages the network management system profile stored in Redis for Zero Touch Provisioning (ZTP).
+Algorithmic IP planning - no spreadsheets. Subnets are derived from a site's
+Zone ID and Site ID by the NetworkCalculator, so every plan is deterministic and
+overlap-free. Bulk plans for whole zones are computed in one call and exported
+as columnar arrays, JSON rows or CSV.
+
+Prefixes already allocated in Mist (networks and hub-profile LANs) can be
+queried for overlaps before anything is created.
 """
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from enum import Enum
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, model_validator
+
+from src.services.ipam_index import PrefixConflict, get_org_index, parse_prefix
+from src.services.mist_engine import MistEngine
+from src.services.network_calculator import IPAllocation, get_network_calculator
+from src.services.redis import get_context
 
-from src.services.redis import get_redis_client
 
-router = APIRouter(prefix="/nms", tags=["day 0 - nms"])
-NMS_KEY = "nms_profile"
+router = APIRouter(prefix="/ipam", tags=["day 0 - ipam"])
+
+
+# =============================================================================
+# Enums
+# =============================================================================
+
+class PlanFormat(str, Enum):
+    """Export format for bulk IP plans."""
+    JSON = "json"        # One object per site (IPAllocation shape)
+    COLUMNS = "columns"  # One array per column, addresses as 32-bit ints
+    CSV = "csv"          # Streamed text/csv
 
 
 # =============================================================================
 # Models
 # =============================================================================
 
-class DeploymentProfile(BaseModel):
-    """
-    Physical and logical intent for a site deployment.
-    Grouped by: Physical (Routers → Switches → APs) then Logical (VLANs/IPs).
+class IPPlanRequest(BaseModel):
     """
-    # Routers (SSR)
-    ssr1_mac: str | None = Field(None, examples=["020001263c58"])
-    ssr2_mac: str | None = Field(None, examples=["020001bf1586"])
-    ssr3_mac: str | None = Field(None, examples=["020001eb4521"])
-    ssr4_mac: str | None = Field(None, examples=["020001263c58"])
+    Bulk IP plan request.
 
-    # Switches (EX)
-    ex1_mac: str | None = Field(None, examples=["d081c527cb80"])
+    Provide either explicit `pairs` or a list of `zones` to plan every
+    site slot in each zone.
+    """
+    pairs: list[tuple[int, int]] | None = Field(
+        None, description="(zone_id, site_id) pairs", examples=[[[1, 55], [2, 10]]]
+    )
+    zones: list[int] | None = Field(None, description="Zones to plan in full", examples=[[1, 2, 3]])
+    sites_per_zone: int = Field(default=255, ge=1, le=255, description="Site slots per zone")
+    format: PlanFormat = Field(default=PlanFormat.JSON, description="Export format")
 
-    # Access Points (AP)
-    ap1_mac: str | None = Field(None, examples=["ac2316ed5147"])
+    @model_validator(mode="after")
+    def check_source(self) -> "IPPlanRequest":
+        if (self.pairs is None) == (self.zones is None):
+            raise ValueError("Provide exactly one of 'pairs' or 'zones'")
+        return self
 
-    # VLANs
-    mgmt_vlan: int | None = Field(None, ge=1, le=4094, examples=[3623])
-    vlan_1: int | None = Field(None, ge=1, le=4094, examples=[3666])
-    vlan_2: int | None = Field(None, ge=1, le=4094, examples=[3667])
 
-    # Switch Management
-    ex_ip: str | None = Field(None, examples=["10.210.6.26"])
-    ex_gateway: str | None = Field(None, examples=["10.210.6.30"])
+class ConflictResponse(BaseModel):
+    """Existing allocations overlapping a prefix."""
+    subnet: str
+    conflicts: list[PrefixConflict]
+    count: int
 
 
 # =============================================================================
 # Endpoints
 # =============================================================================
 
-@router.post("/", summary="Save the NMS profile for site deployment.")
-async def set_profile(profile: DeploymentProfile):
-    """
-    Persists the NMS profile to Redis for Zero Touch Provisioning.
-
-    Accepts device MAC addresses and network configuration that will be used
-    during site provisioning workflows.
-    """
-    redis_client = get_redis_client()
-    redis_client.set(NMS_KEY, profile.model_dump_json())
-    return {"status": "saved", "profile": profile.model_dump()}
+@router.get("/zones/{zone_id}", summary="Get the IP ranges of a zone")
+async def get_zone_summary(zone_id: int):
+    """Returns the /16 summary ranges reserved for each VLAN role in a zone."""
+    return get_network_calculator().calculate_zone_summary(zone_id)
 
 
-@router.get("/", summary="Fetch the active NMS profile configuration.")
-async def get_profile():
-    """Retrieves the current NMS profile from Redis for use in provisioning workflows."""
-    redis_client = get_redis_client()
-    data = redis_client.get(NMS_KEY)
+@router.get("/zones/{zone_id}/sites/{site_id}", response_model=IPAllocation,
+            summary="Calculate the subnets of a site")
+async def get_site_subnets(zone_id: int, site_id: int):
+    """Returns the management, data, voice, guest and IoT subnets for one site."""
+    try:
+        return get_network_calculator().calculate_site_subnets(zone_id, site_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    if not data:
-        raise HTTPException(status_code=404, detail="NMS profile not found")
 
-    profile = DeploymentProfile.model_validate_json(data)
-    return {"profile": profile.model_dump(), "status": "found"}
+@router.post("/plan", summary="Plan subnets for many sites")
+async def plan_subnets(request: IPPlanRequest):
+    """
+    Calculates subnets for thousands of sites in one call.
 
+    - **json**: `{"sites": [...], "count": n}` with one IPAllocation-shaped row per site
+    - **columns**: columnar arrays; network addresses are 32-bit ints with a shared `prefix_length`
+    - **csv**: streamed `text/csv` with a header row
+    """
+    calculator = get_network_calculator()
+    try:
+        if request.pairs is not None:
+            zone_ids = [zone_id for zone_id, _ in request.pairs]
+            site_ids = [site_id for _, site_id in request.pairs]
+            plan = calculator.plan_sites(zone_ids, site_ids)
+        else:
+            plan = calculator.plan_zones(request.zones, request.sites_per_zone)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if request.format == PlanFormat.CSV:
+        return StreamingResponse(
+            plan.iter_csv(),
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=ip-plan.csv"},
+        )
+    if request.format == PlanFormat.COLUMNS:
+        return {"columns": plan.to_columns(), "count": len(plan)}
+    return {"sites": list(plan.iter_rows()), "count": len(plan)}
+
+
+@router.get("/conflicts", response_model=ConflictResponse, summary="Find allocations overlapping a subnet")
+async def find_conflicts(subnet: str = Query(..., description="Prefix in CIDR notation", examples=["10.1.0.0/16"])):
+    """
+    Lists existing network and hub-profile LAN subnets that overlap `subnet`.
 
-@router.delete("/", summary="Clear the NMS profile from storage.")
-async def delete_profile():
-    """Removes the NMS profile from Redis, allowing a fresh start for a new site."""
-    redis_client = get_redis_client()
-    redis_client.delete(NMS_KEY)
-    return {"status": "deleted"}
\ No newline at end of file
+    Each conflict is `equal`, `contains` (the existing prefix is a supernet)
+    or `within` (the existing prefix is inside the requested one).
+    """
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    network = parse_prefix(subnet)
+    index = await get_org_index(MistEngine(host=api_host), org_id)
+    conflicts = index.conflicts(network)
+
+    return ConflictResponse(subnet=str(network), conflicts=conflicts, count=len(conflicts))
@@ -11,12 +11,16 @@ Mist API Reference:
 - GET /api/v1/orgs/{org_id}/networks/{network_id} - Get network
 - PUT /api/v1/orgs/{org_id}/networks/{network_id} - Update network
 - DELETE /api/v1/orgs/{org_id}/networks/{network_id} - Delete network
+
+New subnets are checked against existing allocations (see services/ipam_index).
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from src.services.ipam_index import PrefixRecord, check_prefix_conflicts, invalidate_org_index, parse_prefix
 from src.services.mist_engine import MistEngine
-from src.services.redis import get_api_host, get_org_id
+from src.services.redis import get_context
+from src.services.streaming import NDJSON_RESPONSES, ndjson_response, wants_ndjson
 
 
 router = APIRouter(prefix="/networks", tags=["Networks - Day 0"])
@@ -70,19 +74,44 @@ class NetworkListResponse(BaseModel):
     count: int
 
 
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def _to_network(n: dict) -> Network:
+    """Map a Mist API record onto the response model."""
+    return Network(
+        id=n.get("id", ""),
+        name=n.get("name", ""),
+        subnet=n.get("subnet"),
+        vlan_id=n.get("vlan_id"),
+        disallow_mist_services=n.get("disallow_mist_services", False),
+        gateway=n.get("gateway"),
+        gateway6=n.get("gateway6"),
+        isolation=n.get("isolation", False),
+        internet_access=n.get("internet_access", True),
+        org_id=n.get("org_id"),
+    )
+
+
 # =============================================================================
 # Endpoints
 # =============================================================================
 
-@router.get("/", response_model=NetworkListResponse, summary="List all networks")
-async def list_networks():
+@router.get("/", response_model=NetworkListResponse, responses=NDJSON_RESPONSES, summary="List all networks")
+async def list_networks(
+    all_pages: bool = Query(False, alias="all", description="Return every page of the collection"),
+    accept: str | None = Header(None, description="Send application/x-ndjson to stream records"),
+):
     """
     List all network definitions in the organization.
 
     Networks define traffic source groups (the "who") for application policies.
     They can represent VLANs, subnets, or logical groupings of users/devices.
+    Use `all=true` to follow Mist pagination across the whole collection.
+    Send `Accept: application/x-ndjson` to stream every record as NDJSON.
     """
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -90,29 +119,25 @@ async def list_networks():
         )
 
     engine = MistEngine(host=api_host)
-    data = await engine.get(f"/api/v1/orgs/{org_id}/networks")
-
-    networks = [
-        Network(
-            id=n.get("id", ""),
-            name=n.get("name", ""),
-            subnet=n.get("subnet"),
-            vlan_id=n.get("vlan_id"),
-            disallow_mist_services=n.get("disallow_mist_services", False),
-            gateway=n.get("gateway"),
-            gateway6=n.get("gateway6"),
-            isolation=n.get("isolation", False),
-            internet_access=n.get("internet_access", True),
-            org_id=n.get("org_id"),
-        )
-        for n in data
-    ]
+    endpoint = f"/api/v1/orgs/{org_id}/networks"
+    if wants_ndjson(accept):
+        return await ndjson_response(_to_network(n) async for n in engine.paginate(endpoint))
+
+    if all_pages:
+        data = [n async for n in engine.paginate(endpoint)]
+    else:
+        data = await engine.get(endpoint)
+
+    networks = [_to_network(n) for n in data]
 
     return NetworkListResponse(networks=networks, count=len(networks))
 
 
 @router.post("/", response_model=Network, summary="Create network definition")
-async def create_network(request: NetworkCreate):
+async def create_network(
+    request: NetworkCreate,
+    allow_overlap: bool = Query(False, description="Create even if the subnet overlaps an existing allocation"),
+):
     """
     Create a new network definition.
 
@@ -120,8 +145,11 @@ async def create_network(request: NetworkCreate):
     Examples:
     - Corporate-LAN: subnet="10.0.0.0/8", vlan_id=100
     - Guest-WiFi: subnet="192.168.100.0/24", isolation=true
+
+    Returns 409 with the conflicting allocations if `subnet` overlaps an
+    existing network or hub-profile LAN, unless `allow_overlap=true`.
     """
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -129,8 +157,15 @@ async def create_network(request: NetworkCreate):
         )
 
     engine = MistEngine(host=api_host)
+    subnets = [request.subnet] if request.subnet else []
+    index = await check_prefix_conflicts(engine, org_id, subnets, allow_overlap)
+
     payload = request.model_dump(exclude_none=True)
     result = await engine.post(f"/api/v1/orgs/{org_id}/networks", json=payload)
+    for subnet in subnets:
+        index.add(parse_prefix(subnet), PrefixRecord(subnet, "network", result.get("id", ""), request.name))
+    if subnets:
+        await invalidate_org_index(api_host, org_id, keep_local=True)
 
     return Network(
         id=result.get("id", ""),
@@ -149,7 +184,7 @@ async def create_network(request: NetworkCreate):
 @router.get("/{network_id}", response_model=Network, summary="Get network details")
 async def get_network(network_id: str):
     """Get detailed information about a specific network definition."""
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -157,7 +192,7 @@ async def get_network(network_id: str):
         )
 
     engine = MistEngine(host=api_host)
-    result = await engine.get(f"/api/v1/orgs/{org_id}/networks/{network_id}")
+    result = await engine.get(f"/api/v1/orgs/{org_id}/networks/{network_id}", cache=True)
 
     return Network(
         id=result.get("id", network_id),
@@ -176,7 +211,7 @@ async def get_network(network_id: str):
 @router.put("/{network_id}", response_model=Network, summary="Update network")
 async def update_network(network_id: str, request: NetworkUpdate):
     """Update an existing network definition."""
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -186,6 +221,8 @@ async def update_network(network_id: str, request: NetworkUpdate):
     engine = MistEngine(host=api_host)
     payload = request.model_dump(exclude_none=True)
     result = await engine.put(f"/api/v1/orgs/{org_id}/networks/{network_id}", json=payload)
+    if request.subnet is not None:
+        await invalidate_org_index(api_host, org_id)
 
     return Network(
         id=result.get("id", network_id),
@@ -208,7 +245,7 @@ async def delete_network(network_id: str):
 
     WARNING: This may affect application policies that reference this network.
     """
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -217,5 +254,6 @@ async def delete_network(network_id: str):
 
     engine = MistEngine(host=api_host)
     await engine.delete(f"/api/v1/orgs/{org_id}/networks/{network_id}")
+    await invalidate_org_index(api_host, org_id)
 
     return {"id": network_id, "status": "deleted"}
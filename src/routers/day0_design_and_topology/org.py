@@ -12,7 +12,7 @@ from fastapi import APIRouter
 from pydantic import BaseModel, Field
 
 from src.services.mist_engine import MistEngine
-from src.services.redis import get_redis_client
+from src.services.redis import set_context
 
 
 router = APIRouter(prefix="/org", tags=["day 0 - organization"])
@@ -64,10 +64,7 @@ async def get_self(
         if org_priv:
             org_id = org_priv.get("org_id")
     
-    # Save to Redis
-    redis_client = get_redis_client()
-    redis_client.set("api_host", request.api_host)
-    if org_id:
-        redis_client.set("org_id", org_id)
+    # Save to Redis and invalidate every worker's cached context
+    await set_context(request.api_host, org_id)
     
     return result
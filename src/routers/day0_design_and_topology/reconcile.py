@@ -0,0 +1,144 @@
+"""
+Day 0: Desired-State Reconciliation.
+
+Applies a whole-org intent document (networks, applications, hub profiles,
+sites) idempotently. The current state is fetched in bulk and diffed by name;
+only missing objects are created and only changed fields are written, so
+re-applying an unchanged document issues no writes at all.
+
+Fields omitted from an object are left as they are in Mist. Objects missing
+from the document are deleted only with `prune=true`.
+"""
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+
+from src.routers.day0_design_and_topology.apps import AppCreate
+from src.routers.day0_design_and_topology.hub_profiles import HubProfileCreate
+from src.routers.day0_design_and_topology.networks import NetworkCreate
+from src.routers.day0_design_and_topology.sites import SiteCreate
+from src.services import reconciler
+from src.services.bulk import BulkResponse
+from src.services.ipam_index import invalidate_org_index
+from src.services.jobs import JOB_RESPONSES, JobContext, enqueue_response, register_job_handler
+from src.services.mist_engine import MistEngine
+from src.services.reconciler import ReconcilePlan
+from src.services.redis import get_context
+
+
+router = APIRouter(prefix="/reconcile", tags=["day 0 - reconcile"])
+
+
+# =============================================================================
+# Models
+# =============================================================================
+
+class DesiredState(BaseModel):
+    """
+    Desired-state document. Kinds left out (null) are not reconciled;
+    an empty list with `prune=true` deletes every object of that kind.
+    """
+    networks: list[NetworkCreate] | None = Field(None, description="Network definitions")
+    apps: list[AppCreate] | None = Field(None, description="Application signatures")
+    hub_profiles: list[HubProfileCreate] | None = Field(None, description="Hub profiles")
+    sites: list[SiteCreate] | None = Field(None, description="Sites")
+
+    def to_documents(self) -> dict[str, list[dict]]:
+        """Kind -> objects holding only the fields set in the document."""
+        return {
+            kind: [obj.model_dump(mode="json", exclude_unset=True) for obj in objects]
+            for kind, objects in self
+            if objects is not None
+        }
+
+
+class ReconcileRequest(BaseModel):
+    """Reconcile request payload."""
+    state: DesiredState
+    prune: bool = Field(default=False, description="Delete objects of the listed kinds missing from the document")
+    concurrency: int = Field(default=10, ge=1, le=50, description="Maximum simultaneous Mist calls")
+
+
+class ReconcileResponse(BaseModel):
+    """Plan that was executed and its per-action results."""
+    plan: ReconcilePlan
+    results: BulkResponse
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+async def _plan(engine: MistEngine, org_id: str, request: ReconcileRequest) -> ReconcilePlan:
+    try:
+        return await reconciler.plan(engine, org_id, request.state.to_documents(), prune=request.prune)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _apply(api_host: str, org_id: str, request: ReconcileRequest) -> ReconcileResponse:
+    engine = MistEngine(host=api_host)
+    plan = await _plan(engine, org_id, request)
+    results = await reconciler.apply(engine, org_id, plan, request.concurrency)
+    if any(a.kind in ("networks", "hub_profiles") for a in plan.actions):
+        await invalidate_org_index(api_host, org_id)
+    return ReconcileResponse(plan=plan, results=BulkResponse.from_results(results))
+
+
+async def _apply_job(job: JobContext) -> dict:
+    """Background job handler for POST /reconcile/apply."""
+    response = await _apply(job.api_host, job.org_id, ReconcileRequest.model_validate(job.payload))
+    return response.model_dump(mode="json")
+
+
+register_job_handler("reconcile.apply", _apply_job)
+
+
+# =============================================================================
+# Endpoints
+# =============================================================================
+
+@router.post("/plan", response_model=ReconcilePlan, summary="Preview the writes needed to reach a desired state")
+async def plan_reconcile(request: ReconcileRequest):
+    """
+    Dry run: diffs the document against the org and returns the minimal
+    create/update/delete actions without calling any write endpoint.
+    """
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    return await _plan(MistEngine(host=api_host), org_id, request)
+
+
+@router.post("/apply", response_model=ReconcileResponse, responses=JOB_RESPONSES,
+             summary="Converge the org onto a desired state")
+async def apply_reconcile(
+    request: ReconcileRequest,
+    background: bool = Query(False, description="Run as a background job and return its ID (202)"),
+):
+    """
+    Diffs the document against the org and executes only the required writes.
+
+    Creates and updates run in dependency order (networks, apps, hub profiles,
+    sites); deletes run in reverse. One failed action never stops the rest;
+    every action is reported.
+
+    With `background=true` the request is queued and a job ID returned;
+    poll `GET /jobs/{job_id}` for progress and results.
+    """
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    if background:
+        # Exclude unset fields so the worker reconciles exactly the managed fields.
+        payload = request.model_dump(mode="json", exclude_unset=True)
+        return await enqueue_response("reconcile.apply", payload, api_host, org_id)
+
+    return await _apply(api_host, org_id, request)
@@ -9,13 +9,25 @@ Mist API Reference:
 - GET /api/v1/sites/{site_id} - Get site
 - PUT /api/v1/sites/{site_id} - Update site
 - DELETE /api/v1/sites/{site_id} - Delete site
+
+Bulk creation fans out one POST per site with bounded concurrency.
 """
 import fnc
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel, Field
-
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from pydantic import BaseModel, Field, ValidationError
+
+from src.services.bulk import (
+    BulkItemResult,
+    BulkItemStatus,
+    BulkResponse,
+    error_detail,
+    iter_records,
+    run_bounded,
+)
+from src.services.jobs import JOB_RESPONSES, JobContext, enqueue_response, register_job_handler
 from src.services.mist_engine import MistEngine
-from src.services.redis import get_api_host, get_org_id
+from src.services.redis import get_api_host, get_context
+from src.services.streaming import NDJSON_RESPONSES, ndjson_response, wants_ndjson
 
 
 router = APIRouter(prefix="/sites", tags=["Sites - Day 0"])
@@ -63,20 +75,119 @@ class SiteListResponse(BaseModel):
     count: int
 
 
+class SiteBulkCreate(BaseModel):
+    """Request payload for creating many sites in one call."""
+    sites: list[SiteCreate] = Field(..., min_length=1, description="Sites to create")
+    concurrency: int = Field(default=10, ge=1, le=50, description="Maximum simultaneous Mist calls")
+    skip_existing: bool = Field(
+        default=True,
+        description="Skip sites whose name already exists in the org or earlier in the request"
+    )
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def _to_site(s: dict) -> Site:
+    """Map a Mist API record onto the response model."""
+    return Site(
+        id=s.get("id", ""),
+        name=s.get("name", ""),
+        address=s.get("address"),
+        timezone=s.get("timezone"),
+        country_code=s.get("country_code"),
+        latlng=s.get("latlng"),
+        notes=s.get("notes"),
+        org_id=s.get("org_id"),
+    )
+
+
+async def _bulk_create_sites(
+    engine: MistEngine,
+    org_id: str,
+    items: list[tuple[int, SiteCreate]],
+    concurrency: int,
+    skip_existing: bool,
+) -> list[BulkItemResult]:
+    """
+    Create sites concurrently, de-duplicating by name.
+
+    Args:
+        engine: Mist API engine
+        org_id: Target organization
+        items: (request index, site) pairs
+        concurrency: Maximum simultaneous Mist calls
+        skip_existing: Skip names already in the org or repeated in `items`
+
+    Returns:
+        One result per item
+    """
+    endpoint = f"/api/v1/orgs/{org_id}/sites"
+    existing: set[str] = set()
+    if skip_existing:
+        existing = {s.get("name") async for s in engine.paginate(endpoint)}
+
+    results: list[BulkItemResult] = []
+    pending: list[tuple[int, SiteCreate]] = []
+    requested: set[str] = set()
+    for index, site in items:
+        if skip_existing and (site.name in existing or site.name in requested):
+            results.append(BulkItemResult(
+                index=index, key=site.name, status=BulkItemStatus.SKIPPED,
+                detail="Site already exists" if site.name in existing else "Duplicate name in request",
+            ))
+            continue
+        requested.add(site.name)
+        pending.append((index, site))
+
+    async def create(item: tuple[int, SiteCreate]) -> dict:
+        return await engine.post(endpoint, json=item[1].model_dump(exclude_none=True))
+
+    outcomes = await run_bounded(pending, create, concurrency)
+    for (index, site), outcome in zip(pending, outcomes):
+        if isinstance(outcome, Exception):
+            results.append(BulkItemResult(
+                index=index, key=site.name, status=BulkItemStatus.FAILED, detail=error_detail(outcome)
+            ))
+        else:
+            results.append(BulkItemResult(
+                index=index, key=site.name, status=BulkItemStatus.SUCCEEDED, id=outcome.get("id")
+            ))
+    return results
+
+
+async def _bulk_create_job(job: JobContext) -> dict:
+    """Background job handler for POST /sites/bulk."""
+    request = SiteBulkCreate.model_validate(job.payload)
+    results = await _bulk_create_sites(
+        MistEngine(host=job.api_host), job.org_id, list(enumerate(request.sites)),
+        request.concurrency, request.skip_existing,
+    )
+    return BulkResponse.from_results(results).model_dump(mode="json")
+
+
+register_job_handler("sites.bulk_create", _bulk_create_job)
+
+
 # =============================================================================
 # Endpoints
 # =============================================================================
 
-@router.get("/", response_model=SiteListResponse, summary="List all sites")
+@router.get("/", response_model=SiteListResponse, responses=NDJSON_RESPONSES, summary="List all sites")
 async def list_sites(
     site_name: str | None = Query(None, description="Filter by site name"),
+    all_pages: bool = Query(False, alias="all", description="Return every page of the collection"),
+    accept: str | None = Header(None, description="Send application/x-ndjson to stream records"),
 ):
     """
     List all sites in the organization.
 
     If site_name is provided, filters to sites matching that name.
+    Use `all=true` to follow Mist pagination across the whole collection.
+    Send `Accept: application/x-ndjson` to stream every record as NDJSON.
     """
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -84,25 +195,23 @@ async def list_sites(
         )
 
     engine = MistEngine(host=api_host)
-    data = await engine.get(f"/api/v1/orgs/{org_id}/sites")
+    endpoint = f"/api/v1/orgs/{org_id}/sites"
+    if wants_ndjson(accept):
+        return await ndjson_response(
+            _to_site(s) async for s in engine.paginate(endpoint)
+            if not site_name or s.get("name") == site_name
+        )
+
+    if all_pages:
+        data = [s async for s in engine.paginate(endpoint)]
+    else:
+        data = await engine.get(endpoint)
 
     # Filter by site_name if provided
     if site_name:
         data = fnc.filter(lambda s: s.get("name") == site_name, data)
 
-    sites = [
-        Site(
-            id=s.get("id", ""),
-            name=s.get("name", ""),
-            address=s.get("address"),
-            timezone=s.get("timezone"),
-            country_code=s.get("country_code"),
-            latlng=s.get("latlng"),
-            notes=s.get("notes"),
-            org_id=s.get("org_id"),
-        )
-        for s in data
-    ]
+    sites = [_to_site(s) for s in data]
 
     return SiteListResponse(sites=sites, count=len(sites))
 
@@ -115,7 +224,7 @@ async def create_site(request: SiteCreate):
     Creates a new site container in the Mist organization.
     This is the Digital Twin of the physical location.
     """
-    api_host, org_id = get_api_host(), get_org_id()
+    api_host, org_id = await get_context()
     if not api_host or not org_id:
         raise HTTPException(
             status_code=400,
@@ -126,22 +235,87 @@ async def create_site(request: SiteCreate):
     payload = request.model_dump(exclude_none=True)
     result = await engine.post(f"/api/v1/orgs/{org_id}/sites", json=payload)
 
-    return Site(
-        id=result.get("id", ""),
-        name=result.get("name", request.name),
-        address=result.get("address"),
-        timezone=result.get("timezone"),
-        country_code=result.get("country_code"),
-        latlng=result.get("latlng"),
-        notes=result.get("notes"),
-        org_id=result.get("org_id"),
+    return _to_site({"name": request.name, **result})
+
+
+@router.post("/bulk", response_model=BulkResponse, responses=JOB_RESPONSES, summary="Bulk create sites")
+async def bulk_create_sites(
+    request: SiteBulkCreate,
+    background: bool = Query(False, description="Run as a background job and return its ID (202)"),
+):
+    """
+    **Bulk Create Sites (Day 0)**
+
+    Creates many sites in one call with bounded concurrency. Names that
+    already exist in the org are skipped, so a rollout can be re-submitted
+    safely after a partial failure. Returns a per-site outcome.
+
+    With `background=true` the request is queued and a job ID returned;
+    poll `GET /jobs/{job_id}` for progress and results.
+    """
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    if background:
+        return await enqueue_response("sites.bulk_create", request.model_dump(mode="json"), api_host, org_id)
+
+    engine = MistEngine(host=api_host)
+    results = await _bulk_create_sites(
+        engine, org_id, list(enumerate(request.sites)), request.concurrency, request.skip_existing
     )
+    return BulkResponse.from_results(results)
+
+
+@router.post("/bulk/import", response_model=BulkResponse, summary="Bulk create sites from CSV or JSON Lines")
+async def import_sites(
+    request: Request,
+    concurrency: int = Query(10, ge=1, le=50, description="Maximum simultaneous Mist calls"),
+    skip_existing: bool = Query(True, description="Skip sites whose name already exists"),
+):
+    """
+    Bulk create sites from an uploaded file streamed as the request body.
+
+    Send `Content-Type: text/csv` (header row with SiteCreate field names,
+    plus optional `lat`/`lng` columns) or `application/x-ndjson` (one
+    SiteCreate object per line). Invalid records are reported as failed
+    items; the rest are still created.
+    """
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    items: list[tuple[int, SiteCreate]] = []
+    results: list[BulkItemResult] = []
+    index = 0
+    async for record in iter_records(request):
+        try:
+            lat, lng = record.pop("lat", None), record.pop("lng", None)
+            if lat is not None and lng is not None:
+                record["latlng"] = {"lat": float(lat), "lng": float(lng)}
+            items.append((index, SiteCreate.model_validate(record)))
+        except (ValidationError, ValueError) as e:
+            results.append(BulkItemResult(
+                index=index, key=str(record.get("name") or f"#{index}"),
+                status=BulkItemStatus.FAILED, detail=error_detail(e),
+            ))
+        index += 1
+
+    engine = MistEngine(host=api_host)
+    results += await _bulk_create_sites(engine, org_id, items, concurrency, skip_existing)
+    return BulkResponse.from_results(results)
 
 
 @router.get("/{site_id}", response_model=Site, summary="Get site details")
 async def get_site(site_id: str):
     """Get detailed information about a specific site."""
-    api_host = get_api_host()
+    api_host = await get_api_host()
     if not api_host:
         raise HTTPException(
             status_code=400,
@@ -149,24 +323,15 @@ async def get_site(site_id: str):
         )
 
     engine = MistEngine(host=api_host)
-    result = await engine.get(f"/api/v1/sites/{site_id}")
+    result = await engine.get(f"/api/v1/sites/{site_id}", cache=True)
 
-    return Site(
-        id=result.get("id", site_id),
-        name=result.get("name", ""),
-        address=result.get("address"),
-        timezone=result.get("timezone"),
-        country_code=result.get("country_code"),
-        latlng=result.get("latlng"),
-        notes=result.get("notes"),
-        org_id=result.get("org_id"),
-    )
+    return _to_site({"id": site_id, **result})
 
 
 @router.put("/{site_id}", response_model=Site, summary="Update site")
 async def update_site(site_id: str, request: SiteUpdate):
     """Update an existing site's configuration."""
-    api_host = get_api_host()
+    api_host = await get_api_host()
     if not api_host:
         raise HTTPException(
             status_code=400,
@@ -177,16 +342,7 @@ async def update_site(site_id: str, request: SiteUpdate):
     payload = request.model_dump(exclude_none=True)
     result = await engine.put(f"/api/v1/sites/{site_id}", json=payload)
 
-    return Site(
-        id=result.get("id", site_id),
-        name=result.get("name", ""),
-        address=result.get("address"),
-        timezone=result.get("timezone"),
-        country_code=result.get("country_code"),
-        latlng=result.get("latlng"),
-        notes=result.get("notes"),
-        org_id=result.get("org_id"),
-    )
+    return _to_site({"id": site_id, **result})
 
 
 @router.delete("/{site_id}", summary="Delete site")
@@ -197,7 +353,7 @@ async def delete_site(site_id: str):
     WARNING: This will remove all site-specific configurations.
     Devices assigned to this site will become unassigned.
     """
-    api_host = get_api_host()
+    api_host = await get_api_host()
     if not api_host:
         raise HTTPException(
             status_code=400,
@@ -0,0 +1,341 @@
+"""
+Day 0: Site Turn-Up Pipeline.
+
+Runs the provisioning steps that operators otherwise call one endpoint at a
+time as a single dependency-aware pipeline (see services/pipeline):
+
+    org:   networks ─► hub_profiles      apps      site_index
+           wireless_* (the steps of a wireless bundle)
+    site:  site ─► assign_devices ─┬─► gateway_template ─┬─► wlans
+                                   └─► port_profiles ────┘
+
+Site steps wait on the org steps they build on: `site` on `site_index`,
+`gateway_template` on networks, apps and hub profiles, `port_profiles` on
+networks, and `wlans` on the wireless bundle.
+
+Org objects are converged through the reconciler and the Day 1 steps reuse
+the bulk helpers of the Day 1 routers (gateway template binding, port
+profile push, wireless bundle), so re-running a turn-up is idempotent. Site
+steps run concurrently across sites. Progress is checkpointed in Redis;
+resuming a run skips every step that already succeeded.
+"""
+import asyncio
+import importlib
+import uuid
+from collections import defaultdict
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field, model_validator
+
+from src.routers.day0_design_and_topology.apps import AppCreate
+from src.routers.day0_design_and_topology.hub_profiles import HubProfileCreate
+from src.routers.day0_design_and_topology.inventory import BulkDeviceAssignment, assign_in_batches
+from src.routers.day0_design_and_topology.networks import NetworkCreate
+from src.routers.day0_design_and_topology.sites import SiteCreate
+from src.services import reconciler
+from src.services.bulk import BulkItemResult, BulkItemStatus
+from src.services.ipam_index import invalidate_org_index
+from src.services.jobs import JOB_RESPONSES, JobContext, enqueue_response, register_job_handler
+from src.services.mist_engine import MistEngine
+from src.services.pipeline import (
+    CheckpointStore,
+    Pipeline,
+    PipelineReport,
+    Step,
+    StepContext,
+    StepScope,
+)
+from src.services.redis import get_context
+
+# Day 1 service-domain packages are numbered (0_routing_wan, ...) and cannot be imported by name.
+wan = importlib.import_module("src.routers.day1_intent_and_policy.0_routing_wan.wan")
+wired = importlib.import_module("src.routers.day1_intent_and_policy.1_wired_switching.wired")
+wired_models = importlib.import_module("src.routers.day1_intent_and_policy.1_wired_switching.models")
+wireless = importlib.import_module("src.routers.day1_intent_and_policy.2_wireless_mobility.wireless")
+wireless_models = importlib.import_module("src.routers.day1_intent_and_policy.2_wireless_mobility.models")
+
+
+router = APIRouter(prefix="/turnup", tags=["day 0 - turn-up"])
+
+
+# =============================================================================
+# Models
+# =============================================================================
+
+class OrgObjects(BaseModel):
+    """Org-level objects every site relies on."""
+    networks: list[NetworkCreate] = Field(default_factory=list, description="Network definitions")
+    apps: list[AppCreate] = Field(default_factory=list, description="Application signatures")
+    hub_profiles: list[HubProfileCreate] = Field(default_factory=list, description="Hub profiles")
+
+
+class SiteTurnup(BaseModel):
+    """One site and the devices to assign to it."""
+    site: SiteCreate
+    serial_numbers: list[str] = Field(default_factory=list, description="Devices to assign to the site")
+    managed: bool = Field(default=True, description="Enable Mist management")
+
+
+class SiteIntent(BaseModel):
+    """Day 1 configuration applied to every site of the turn-up."""
+    gateway_template_id: str | None = Field(None, description="Gateway template bound to each site")
+    port_profiles: wired_models.PortProfilePush | None = Field(
+        None, description="Port profiles pushed to each site's switches (`site_ids` is ignored)"
+    )
+    wireless: wireless_models.WirelessBundle | None = Field(
+        None, description="Wireless bundle created once; a site-scoped WLAN template is bound to each site"
+    )
+
+
+class TurnupRequest(BaseModel):
+    """Site turn-up request payload."""
+    org: OrgObjects = Field(default_factory=OrgObjects)
+    sites: list[SiteTurnup] = Field(..., min_length=1, description="Sites to turn up")
+    intent: SiteIntent = Field(default_factory=SiteIntent, description="Day 1 configuration of the sites")
+    concurrency: int = Field(default=10, ge=1, le=50, description="Maximum steps running at once")
+
+    @model_validator(mode="after")
+    def check_unique_names(self) -> "TurnupRequest":
+        if len({s.site.name for s in self.sites}) != len(self.sites):
+            raise ValueError("Site names must be unique within a turn-up")
+        return self
+
+
+# =============================================================================
+# Steps
+# =============================================================================
+
+def _reconcile(kind: str):
+    """Org step converging one kind of org object (no pruning)."""
+    async def run(ctx: StepContext) -> dict:
+        desired = ctx.params.get(kind) or []
+        if not desired:
+            return {}
+        plan = await reconciler.plan(ctx.engine, ctx.org_id, {kind: desired})
+        results = await reconciler.apply(ctx.engine, ctx.org_id, plan)
+        failed = [r for r in results if r.status == BulkItemStatus.FAILED]
+        if kind in ("networks", "hub_profiles") and plan.actions:
+            await invalidate_org_index(ctx.engine.host, ctx.org_id)
+        if failed:
+            raise RuntimeError("; ".join(f"{r.key}: {r.detail}" for r in failed))
+        return {"written": len(results), "unchanged": plan.unchanged.get(kind, 0)}
+    return run
+
+
+def _raise_failed(results: list[BulkItemResult]) -> None:
+    """Fail the step with the details of every failed item."""
+    failed = [r for r in results if r.status == BulkItemStatus.FAILED]
+    if failed:
+        raise RuntimeError("; ".join(f"{r.key}: {r.detail}" for r in failed))
+
+
+async def _site_index(ctx: StepContext) -> dict:
+    """Names and IDs of existing sites, so site creation is idempotent."""
+    endpoint = f"/api/v1/orgs/{ctx.org_id}/sites"
+    return {"sites": {s.get("name"): s.get("id") async for s in ctx.engine.paginate(endpoint)}}
+
+
+async def _site(ctx: StepContext) -> dict:
+    """Create the site unless one with the same name exists."""
+    site = ctx.params["site"]
+    existing = ctx.outputs["site_index"]["sites"].get(site["name"])
+    if existing:
+        return {"site_id": existing, "created": False}
+    result = await ctx.engine.post(f"/api/v1/orgs/{ctx.org_id}/sites", json=site)
+    return {"site_id": result.get("id"), "created": True}
+
+
+async def _assign_devices(ctx: StepContext) -> dict:
+    """Assign the site's serials in batches."""
+    serials = ctx.params.get("serial_numbers") or []
+    if not serials:
+        return {"assigned": 0}
+    site_id = ctx.outputs["site"]["site_id"]
+    request = BulkDeviceAssignment(assignments={site_id: serials}, managed=ctx.params.get("managed", True))
+    results = await assign_in_batches(ctx.engine, ctx.org_id, request)
+    _raise_failed(results)
+    return {"assigned": len(results)}
+
+
+async def _gateway_template(ctx: StepContext) -> dict:
+    """Bind the gateway template to the site."""
+    template_id = ctx.params.get("gateway_template_id")
+    if not template_id:
+        return {}
+    site_id = ctx.outputs["site"]["site_id"]
+    results = await wan.bind_gateway_template(ctx.engine, ctx.org_id, template_id, [site_id], concurrency=1)
+    _raise_failed(results)
+    return {"gateway_template_id": template_id, "bound": results[0].status == BulkItemStatus.SUCCEEDED}
+
+
+async def _port_profiles(ctx: StepContext) -> dict:
+    """Push the port profiles to the site's switches."""
+    if not ctx.params.get("port_profiles"):
+        return {}
+    request = wired_models.PortProfilePush.model_validate(
+        {**ctx.params["port_profiles"], "site_ids": [ctx.outputs["site"]["site_id"]]}
+    )
+    results = await wired.push_port_profiles(ctx.engine, ctx.org_id, request)
+    _raise_failed(results)
+    return {"pushed": sum(r.status == BulkItemStatus.SUCCEEDED for r in results)}
+
+
+# WLAN template ID -> lock serializing read-modify-writes of its `applies`
+_template_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+async def _wlans(ctx: StepContext) -> dict:
+    """Bind the wireless bundle's site-scoped WLAN template to the site."""
+    name = ctx.params.get("wlan_template")
+    if not name:
+        return {}
+    template_id = ctx.outputs["wireless_template"]["ids"][name]
+    site_id = ctx.outputs["site"]["site_id"]
+    endpoint = f"/api/v1/orgs/{ctx.org_id}/templates/{template_id}"
+    async with _template_locks[template_id]:
+        applies = (await ctx.engine.get(endpoint)).get("applies") or {}
+        site_ids = applies.get("site_ids") or []
+        if site_id in site_ids:
+            return {"wlan_template_id": template_id, "bound": False}
+        await ctx.engine.put(endpoint, json={"applies": {**applies, "site_ids": [*site_ids, site_id]}})
+    return {"wlan_template_id": template_id, "bound": True}
+
+
+def _wireless_step(step: Step) -> Step:
+    """A wireless bundle step run on the turn-up's bundle (a no-op without one)."""
+    async def run(ctx: StepContext) -> dict:
+        bundle = ctx.params.get("wireless")
+        if not bundle:
+            return {}
+        outputs = {name.removeprefix("wireless_"): output for name, output in ctx.outputs.items()}
+        return await step.run(ctx._replace(params=bundle, outputs=outputs))
+    return Step(f"wireless_{step.name}", run, tuple(f"wireless_{dep}" for dep in step.depends_on), StepScope.ORG)
+
+
+TURNUP_STEPS: list[Step] = [
+    Step("networks", _reconcile("networks"), scope=StepScope.ORG),
+    Step("apps", _reconcile("apps"), scope=StepScope.ORG),
+    Step("hub_profiles", _reconcile("hub_profiles"), depends_on=("networks",), scope=StepScope.ORG),
+    Step("site_index", _site_index, scope=StepScope.ORG),
+    *(_wireless_step(step) for step in wireless.BUNDLE_STEPS),
+    Step("site", _site, depends_on=("site_index",)),
+    Step("assign_devices", _assign_devices, depends_on=("site",)),
+    Step("gateway_template", _gateway_template,
+         depends_on=("site", "assign_devices", "networks", "apps", "hub_profiles")),
+    Step("port_profiles", _port_profiles, depends_on=("site", "assign_devices", "networks")),
+    Step("wlans", _wlans,
+         depends_on=("site", "gateway_template", "port_profiles", "wireless_template", "wireless_wlans")),
+]
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+async def _run(api_host: str, org_id: str, run_id: str, data: dict) -> PipelineReport:
+    """Execute (or resume) a turn-up run from its stored input."""
+    request = TurnupRequest.model_validate(data)
+    org_params = {kind: [o.model_dump(mode="json", exclude_unset=True) for o in objects]
+                  for kind, objects in request.org}
+    intent = request.intent
+    org_params["wireless"] = intent.wireless.model_dump(mode="json") if intent.wireless else None
+    wlan_template = intent.wireless.template if intent.wireless else None
+    sites = {
+        s.site.name: {
+            "site": s.site.model_dump(mode="json", exclude_none=True),
+            "serial_numbers": s.serial_numbers,
+            "managed": s.managed,
+            "gateway_template_id": intent.gateway_template_id,
+            "port_profiles": intent.port_profiles.model_dump(mode="json") if intent.port_profiles else None,
+            "wlan_template": wlan_template.name if wlan_template and wlan_template.applies_to == "site" else None,
+        }
+        for s in request.sites
+    }
+
+    results = await Pipeline(TURNUP_STEPS).execute(
+        MistEngine(host=api_host), org_id, org_params, sites, CheckpointStore(run_id), request.concurrency
+    )
+    return PipelineReport.from_results(run_id, results)
+
+
+async def _turnup_job(job: JobContext) -> dict:
+    """Background job handler for POST /turnup/ and its resume."""
+    run_id = job.payload["run_id"]
+    data = await CheckpointStore(run_id).load_input()
+    if data is None:
+        raise RuntimeError(f"Unknown or expired turn-up run: {run_id}")
+    report = await _run(job.api_host, job.org_id, run_id, data)
+    return report.model_dump(mode="json")
+
+
+register_job_handler("turnup.run", _turnup_job)
+
+
+# =============================================================================
+# Endpoints
+# =============================================================================
+
+@router.post("/", response_model=PipelineReport, responses=JOB_RESPONSES, summary="Turn up sites end to end")
+async def start_turnup(
+    request: TurnupRequest,
+    background: bool = Query(False, description="Run as a background job and return its ID (202)"),
+):
+    """
+    **Site Turn-Up (Day 0)**
+
+    Converges org objects (networks, apps, hub profiles, the wireless
+    bundle), then creates each site, assigns its devices, binds the gateway
+    template, pushes port profiles to its switches and binds its WLAN
+    template. Steps start as soon as their dependencies succeed; sites
+    proceed in parallel. A failed step blocks only the steps that depend on it.
+
+    Returns a `run_id`; if the run fails, fix the cause and call
+    `POST /turnup/{run_id}/resume`. With `background=true` the run is queued
+    as a job; poll `GET /jobs/{job_id}` for progress, and its result (the
+    report, including `run_id`) once finished.
+    """
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    run_id = uuid.uuid4().hex
+    data = request.model_dump(mode="json", exclude_unset=True)
+    await CheckpointStore(run_id).save_input(data)
+    if background:
+        return await enqueue_response("turnup.run", {"run_id": run_id}, api_host, org_id)
+    return await _run(api_host, org_id, run_id, data)
+
+
+@router.post("/{run_id}/resume", response_model=PipelineReport, responses=JOB_RESPONSES,
+             summary="Resume a failed turn-up")
+async def resume_turnup(
+    run_id: str,
+    background: bool = Query(False, description="Run as a background job and return its ID (202)"),
+):
+    """Re-runs a turn-up, skipping every step that already succeeded."""
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    data = await CheckpointStore(run_id).load_input()
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired turn-up run: {run_id}")
+    if background:
+        return await enqueue_response("turnup.run", {"run_id": run_id}, api_host, org_id)
+    return await _run(api_host, org_id, run_id, data)
+
+
+@router.get("/{run_id}", response_model=PipelineReport, summary="Get turn-up progress")
+async def get_turnup(run_id: str):
+    """Returns the checkpointed steps of a run (steps not yet finished are omitted)."""
+    store = CheckpointStore(run_id)
+    if await store.load_input() is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired turn-up run: {run_id}")
+    results = list((await store.load()).values())
+    return PipelineReport.from_results(run_id, results)
@@ -0,0 +1,56 @@
+"""
+WAN Models - SD-WAN & AppQoE
+Applications, hub profiles, and gateway templates.
+"""
+from pydantic import BaseModel, Field
+
+
+class ApplicationCreate(BaseModel):
+    """Application signature for traffic classification."""
+    name: str = Field(..., description="Application name")
+    app_type: str = Field(default="custom", description="Application type: custom or predefined")
+    traffic_class: str = Field(default="best_effort", description="AppQoE traffic class")
+
+
+class HubProfileCreate(BaseModel):
+    """Hub profile for the SD-WAN overlay."""
+    name: str = Field(..., description="Hub profile name")
+    hub_site_ids: list[str] = Field(default_factory=list, description="Sites acting as hubs")
+
+
+class GatewayTemplateCreate(BaseModel):
+    """
+    WAN Edge (gateway) template.
+
+    Values may use site variables (e.g. `{{wan0_ip}}`); Mist resolves them
+    per site once the template is bound.
+    """
+    name: str = Field(..., description="Template name")
+    type: str = Field(default="spoke", description="Template type: spoke, standalone or ha")
+    port_config: dict = Field(default_factory=dict, description="Interface name -> port configuration")
+    ip_configs: dict = Field(default_factory=dict, description="Network name -> gateway IP configuration")
+    path_preferences: dict = Field(default_factory=dict, description="Path preference name -> WAN paths")
+    service_policies: list[dict] = Field(default_factory=list, description="Application steering policies")
+    dns_servers: list[str] = Field(default_factory=list, description="DNS servers")
+    ntp_servers: list[str] = Field(default_factory=list, description="NTP servers")
+    tunnel_provider_options: dict | None = Field(None, description="Secure edge (Zscaler, ...) options")
+
+
+class GatewayTemplate(BaseModel):
+    """Gateway template response model."""
+    id: str
+    name: str
+    type: str | None = None
+    org_id: str | None = None
+
+
+class GatewayTemplateListResponse(BaseModel):
+    """List gateway templates response."""
+    templates: list[GatewayTemplate]
+    count: int
+
+
+class GatewayTemplateBinding(BaseModel):
+    """Sites to bind a gateway template to."""
+    site_ids: list[str] = Field(..., min_length=1, description="Site IDs")
+    concurrency: int = Field(default=10, ge=1, le=50, description="Maximum simultaneous Mist calls")
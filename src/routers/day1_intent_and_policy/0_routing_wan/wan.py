@@ -1,17 +1,117 @@
 """
 WAN Router - Day 1: SD-WAN & AppQoE
 Handles applications, hub profiles, and gateway templates.
+
+Mist API Reference:
+- GET /api/v1/orgs/{org_id}/gatewaytemplates - List gateway templates
+- POST /api/v1/orgs/{org_id}/gatewaytemplates - Create gateway template
+- GET /api/v1/orgs/{org_id}/gatewaytemplates/{gatewaytemplate_id} - Get gateway template
+- PUT /api/v1/sites/{site_id} - Bind a template (`gatewaytemplate_id`)
+
+Binding a template to many sites fans out one site update per site with
+bounded concurrency; sites already bound to the template are skipped.
 """
-from fastapi import APIRouter, Security
+from fastapi import APIRouter, HTTPException, Query, Security
 from fastapi.security import APIKeyHeader
 
-from .models import ApplicationCreate, HubProfileCreate, GatewayTemplateCreate
+from src.services.bulk import BulkItemResult, BulkItemStatus, BulkResponse, error_detail, run_bounded
+from src.services.jobs import JOB_RESPONSES, JobContext, enqueue_response, register_job_handler
+from src.services.mist_engine import MistEngine
+from src.services.redis import get_context
+
+from .models import (
+    ApplicationCreate,
+    GatewayTemplate,
+    GatewayTemplateBinding,
+    GatewayTemplateCreate,
+    GatewayTemplateListResponse,
+    HubProfileCreate,
+)
 
 router = APIRouter(prefix="/wan", tags=["WAN - Day 1"])
 
 mist_api_key = APIKeyHeader(name="X-Mist-API-Key", description="Your Juniper Mist API token")
 
 
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def _to_template(t: dict) -> GatewayTemplate:
+    """Map a Mist API record onto the response model."""
+    return GatewayTemplate(id=t.get("id", ""), name=t.get("name", ""), type=t.get("type"), org_id=t.get("org_id"))
+
+
+async def bind_gateway_template(
+    engine: MistEngine,
+    org_id: str,
+    template_id: str,
+    site_ids: list[str],
+    concurrency: int,
+) -> list[BulkItemResult]:
+    """
+    Bind a gateway template to many sites.
+
+    The org's sites are listed once up front: sites already bound are
+    skipped and unknown or repeated site IDs are reported without a call,
+    so a partially failed rollout can be re-submitted as is.
+
+    Returns:
+        One result per site ID, keyed by the site ID
+    """
+    # Fails with Mist's 404 before touching any site if the template does not exist.
+    await engine.get(f"/api/v1/orgs/{org_id}/gatewaytemplates/{template_id}")
+    bound = {s.get("id"): s.get("gatewaytemplate_id") async for s in engine.paginate(f"/api/v1/orgs/{org_id}/sites")}
+
+    results: list[BulkItemResult] = []
+    pending: list[tuple[int, str]] = []
+    seen: set[str] = set()
+    for index, site_id in enumerate(site_ids):
+        if site_id not in bound:
+            results.append(BulkItemResult(
+                index=index, key=site_id, status=BulkItemStatus.FAILED, detail="Site not found in org"
+            ))
+        elif site_id in seen or bound[site_id] == template_id:
+            results.append(BulkItemResult(
+                index=index, key=site_id, status=BulkItemStatus.SKIPPED,
+                detail="Duplicate site in request" if site_id in seen else "Template already bound",
+            ))
+        else:
+            pending.append((index, site_id))
+        seen.add(site_id)
+
+    async def bind(item: tuple[int, str]) -> dict:
+        return await engine.put(f"/api/v1/sites/{item[1]}", json={"gatewaytemplate_id": template_id})
+
+    outcomes = await run_bounded(pending, bind, concurrency)
+    for (index, site_id), outcome in zip(pending, outcomes):
+        if isinstance(outcome, Exception):
+            results.append(BulkItemResult(
+                index=index, key=site_id, status=BulkItemStatus.FAILED, detail=error_detail(outcome)
+            ))
+        else:
+            results.append(BulkItemResult(index=index, key=site_id, status=BulkItemStatus.SUCCEEDED, id=site_id))
+    return results
+
+
+async def _bind_job(job: JobContext) -> dict:
+    """Background job handler for POST /wan/gateway-templates/{template_id}/sites."""
+    request = GatewayTemplateBinding.model_validate(job.payload["binding"])
+    results = await bind_gateway_template(
+        MistEngine(host=job.api_host), job.org_id, job.payload["template_id"],
+        request.site_ids, request.concurrency,
+    )
+    return BulkResponse.from_results(results).model_dump(mode="json")
+
+
+register_job_handler("wan.bind_gateway_template", _bind_job)
+
+
+# =============================================================================
+# Endpoints
+# =============================================================================
+
+
 @router.post("/applications", summary="Step 3: Create Applications")
 async def create_applications(
     request: ApplicationCreate,
@@ -53,25 +153,61 @@ async def create_hub_profiles(
     }
 
 
-@router.post("/gateway-templates", summary="Step 6: Deploy WAN Edge Templates")
-async def create_gateway_template(
-    request: GatewayTemplateCreate,
-    api_key: str = Security(mist_api_key)
-):
+@router.post("/gateway-templates", response_model=GatewayTemplate, summary="Step 6: Deploy WAN Edge Templates")
+async def create_gateway_template(request: GatewayTemplateCreate):
     """
     **Step 6: Deploy WAN Edge Templates (Day 1 - WAN)**
     
     Creates gateway configuration templates for SSR/SRX devices.
     References Applications (Step 3) and Networks (Step 4).
-    Uses "Late Binding" to attach to sites after creation.
+    Uses "Late Binding" to attach to sites after creation
+    (`POST /wan/gateway-templates/{template_id}/sites`).
     """
-    # TODO: Call Mist API to create gateway template
-    return {
-        "id": f"gw-tmpl-{request.name.lower().replace(' ', '-')}",
-        "name": request.name,
-        "tunnel_provider": request.tunnel_provider,
-        "status": "created"
-    }
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    engine = MistEngine(host=api_host)
+    result = await engine.post(
+        f"/api/v1/orgs/{org_id}/gatewaytemplates", json=request.model_dump(exclude_none=True)
+    )
+    return _to_template(result)
+
+
+@router.post("/gateway-templates/{template_id}/sites", response_model=BulkResponse, responses=JOB_RESPONSES,
+             summary="Bind a gateway template to many sites")
+async def bind_gateway_template_to_sites(
+    template_id: str,
+    request: GatewayTemplateBinding,
+    background: bool = Query(False, description="Run as a background job and return its ID (202)"),
+):
+    """
+    **Late Binding (Day 1 - WAN)**
+
+    Attaches the gateway template to every listed site with bounded
+    concurrency. Sites already bound to it are skipped; each site gets its
+    own outcome.
+
+    With `background=true` the request is queued and a job ID returned;
+    poll `GET /jobs/{job_id}` for progress and results.
+    """
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    if background:
+        payload = {"template_id": template_id, "binding": request.model_dump(mode="json")}
+        return await enqueue_response("wan.bind_gateway_template", payload, api_host, org_id)
+
+    engine = MistEngine(host=api_host)
+    results = await bind_gateway_template(engine, org_id, template_id, request.site_ids, request.concurrency)
+    return BulkResponse.from_results(results)
 
 
 @router.get("/applications", summary="List applications")
@@ -82,12 +218,19 @@ async def list_applications(
     return {"applications": [], "count": 0}
 
 
-@router.get("/gateway-templates", summary="List gateway templates")
-async def list_gateway_templates(
-    api_key: str = Security(mist_api_key)
-):
+@router.get("/gateway-templates", response_model=GatewayTemplateListResponse, summary="List gateway templates")
+async def list_gateway_templates():
     """List all gateway templates."""
-    return {"templates": [], "count": 0}
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    engine = MistEngine(host=api_host)
+    templates = [_to_template(t) async for t in engine.paginate(f"/api/v1/orgs/{org_id}/gatewaytemplates")]
+    return GatewayTemplateListResponse(templates=templates, count=len(templates))
 
 
 @router.post("/traffic-steering", summary="Create traffic steering policy")
@@ -2,7 +2,7 @@
 Wired Models - Switching & L2
 Network/VLAN definitions and switch templates.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class NetworkCreate(BaseModel):
@@ -21,3 +21,50 @@ class SwitchTemplateCreate(BaseModel):
     port_usages: dict = Field(default_factory=dict, description="Port usage definitions")
     networks: list[str] = Field(default_factory=list, description="Network IDs to include")
     radius_config: dict | None = Field(None, description="RADIUS configuration for 802.1X")
+
+
+class SwitchTemplate(BaseModel):
+    """Switch template response model."""
+    id: str
+    name: str
+    port_usages: dict = Field(default_factory=dict)
+    org_id: str | None = None
+
+
+class SwitchTemplateListResponse(BaseModel):
+    """List switch templates response."""
+    templates: list[SwitchTemplate]
+    count: int
+
+
+class PortProfileCreate(BaseModel):
+    """Port profile (port usage) added to a switch template."""
+    template_id: str = Field(..., description="Switch template receiving the profile")
+    name: str = Field(..., description="Profile name, referenced by port configuration")
+    mode: str = Field(default="access", description="Mode: access, trunk")
+    port_network: str | None = Field(None, description="Access / native network name")
+    networks: list[str] = Field(default_factory=list, description="Trunk network names")
+    port_auth: str | None = Field(None, description="Port authentication: dot1x")
+    poe_disabled: bool = Field(default=False, description="Disable PoE")
+
+
+class PortAssignment(BaseModel):
+    """Ports of matching switches that take a port profile."""
+    ports: str = Field(..., description="Port or port range", examples=["ge-0/0/0-23"])
+    usage: str = Field(..., description="Port profile name from port_usages")
+    models: list[str] = Field(default_factory=list, description="Switch models it applies to (all if empty)")
+
+
+class PortProfilePush(BaseModel):
+    """Port profiles compiled onto many switches from org inventory."""
+    template: SwitchTemplateCreate = Field(..., description="Template whose port_usages are pushed")
+    assignments: list[PortAssignment] = Field(..., min_length=1, description="Port-to-profile rules")
+    site_ids: list[str] = Field(default_factory=list, description="Limit to switches of these sites (all if empty)")
+    concurrency: int = Field(default=10, ge=1, le=50, description="Maximum simultaneous Mist calls")
+
+    @model_validator(mode="after")
+    def check_usages(self) -> "PortProfilePush":
+        undefined = {a.usage for a in self.assignments} - self.template.port_usages.keys()
+        if undefined:
+            raise ValueError(f"Undefined port profiles: {', '.join(sorted(undefined))}")
+        return self
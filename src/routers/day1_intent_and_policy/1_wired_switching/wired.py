@@ -1,17 +1,180 @@
 """
 Wired Router - Day 1: L2 Switching Standards
 Handles VLANs, networks, and switch template configuration.
+
+Mist API Reference:
+- GET /api/v1/orgs/{org_id}/networktemplates - List switch templates
+- POST /api/v1/orgs/{org_id}/networktemplates - Create switch template
+- PUT /api/v1/orgs/{org_id}/networktemplates/{networktemplate_id} - Update switch template
+- GET /api/v1/orgs/{org_id}/inventory?type=switch - List switches
+- GET /api/v1/sites/{site_id}/devices/{device_id} - Get device configuration
+- PUT /api/v1/sites/{site_id}/devices/{device_id} - Update device configuration
+
+Port profiles are pushed to many switches by compiling the port configuration
+once per switch model and fanning out one read-merge-write per switch with
+bounded concurrency, so ports the push does not assign keep their settings.
 """
-from fastapi import APIRouter, Security
+from fastapi import APIRouter, HTTPException, Query, Security
 from fastapi.security import APIKeyHeader
 
-from .models import NetworkCreate, SwitchTemplateCreate
+from src.services.bulk import BulkItemResult, BulkItemStatus, BulkResponse, error_detail, run_bounded
+from src.services.jobs import JOB_RESPONSES, JobContext, enqueue_response, register_job_handler
+from src.services.mist_engine import MistEngine
+from src.services.redis import get_context
+
+from .models import (
+    NetworkCreate,
+    PortAssignment,
+    PortProfileCreate,
+    PortProfilePush,
+    SwitchTemplate,
+    SwitchTemplateCreate,
+    SwitchTemplateListResponse,
+)
 
 router = APIRouter(prefix="/wired", tags=["Wired - Day 1"])
 
 mist_api_key = APIKeyHeader(name="X-Mist-API-Key", description="Your Juniper Mist API token")
 
 
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def _to_template(t: dict) -> SwitchTemplate:
+    """Map a Mist API record onto the response model."""
+    return SwitchTemplate(
+        id=t.get("id", ""),
+        name=t.get("name", ""),
+        port_usages=t.get("port_usages") or {},
+        org_id=t.get("org_id"),
+    )
+
+
+async def _template_networks(engine: MistEngine, org_id: str, network_ids: list[str]) -> dict:
+    """
+    Resolve org network IDs into a template's `networks` (name -> VLAN).
+
+    Raises:
+        HTTPException: 400 for IDs not found in the org
+    """
+    wanted = set(network_ids)
+    found = {n["id"]: n async for n in engine.paginate(f"/api/v1/orgs/{org_id}/networks") if n.get("id") in wanted}
+    unknown = wanted - found.keys()
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown network IDs: {', '.join(sorted(unknown))}")
+    return {
+        n["name"]: {k: n[k] for k in ("vlan_id", "subnet") if n.get(k) is not None}
+        for n in found.values()
+    }
+
+
+def compile_port_config(port_usages: dict, assignments: list[PortAssignment], model: str | None) -> dict:
+    """
+    Device configuration applying the port profiles to one switch model.
+
+    Only the profiles the model's ports use are included. Later assignments
+    of the same port range override earlier ones.
+    """
+    port_config = {
+        a.ports: {"usage": a.usage}
+        for a in assignments
+        if not a.models or model in a.models
+    }
+    used = {config["usage"] for config in port_config.values()}
+    return {
+        "port_usages": {name: usage for name, usage in port_usages.items() if name in used},
+        "port_config": port_config,
+    }
+
+
+def merge_port_config(device: dict, compiled: dict) -> dict:
+    """
+    Device update adding compiled port profiles to a switch's own configuration.
+
+    Ports and profiles the push does not name are kept; those it names are replaced.
+    """
+    return {
+        field: {**(device.get(field) or {}), **compiled[field]}
+        for field in ("port_usages", "port_config")
+    }
+
+
+async def push_port_profiles(engine: MistEngine, org_id: str, request: PortProfilePush) -> list[BulkItemResult]:
+    """
+    Push port profiles to every matching switch in org inventory.
+
+    The configuration is compiled once per switch model and shared by all
+    switches of that model. Switches not assigned to a site are skipped.
+
+    Returns:
+        One result per switch, keyed by serial
+    """
+    port_usages = request.template.port_usages
+
+    sites = set(request.site_ids)
+    switches = [
+        d async for d in engine.paginate(f"/api/v1/orgs/{org_id}/inventory", params={"type": "switch"})
+        if not sites or d.get("site_id") in sites
+    ]
+
+    compiled: dict[str | None, dict] = {}
+    results: list[BulkItemResult] = []
+    pending: list[tuple[int, dict]] = []
+    for index, switch in enumerate(switches):
+        if not switch.get("site_id"):
+            results.append(BulkItemResult(
+                index=index, key=switch.get("serial", ""), status=BulkItemStatus.SKIPPED,
+                detail="Not assigned to a site",
+            ))
+            continue
+        model = switch.get("model")
+        if model not in compiled:
+            compiled[model] = compile_port_config(port_usages, request.assignments, model)
+        if not compiled[model]["port_config"]:
+            results.append(BulkItemResult(
+                index=index, key=switch.get("serial", ""), status=BulkItemStatus.SKIPPED,
+                detail=f"No assignment applies to model {model}",
+            ))
+            continue
+        pending.append((index, switch))
+
+    async def push(item: tuple[int, dict]) -> dict:
+        switch = item[1]
+        endpoint = f"/api/v1/sites/{switch['site_id']}/devices/{switch['id']}"
+        device = await engine.get(endpoint)
+        return await engine.put(endpoint, json=merge_port_config(device, compiled[switch.get("model")]))
+
+    outcomes = await run_bounded(pending, push, request.concurrency)
+    for (index, switch), outcome in zip(pending, outcomes):
+        if isinstance(outcome, Exception):
+            results.append(BulkItemResult(
+                index=index, key=switch.get("serial", ""), status=BulkItemStatus.FAILED,
+                detail=error_detail(outcome),
+            ))
+        else:
+            results.append(BulkItemResult(
+                index=index, key=switch.get("serial", ""), status=BulkItemStatus.SUCCEEDED, id=switch.get("id"),
+            ))
+    return results
+
+
+async def _push_job(job: JobContext) -> dict:
+    """Background job handler for POST /wired/port-profiles/push."""
+    results = await push_port_profiles(
+        MistEngine(host=job.api_host), job.org_id, PortProfilePush.model_validate(job.payload)
+    )
+    return BulkResponse.from_results(results).model_dump(mode="json")
+
+
+register_job_handler("wired.push_port_profiles", _push_job)
+
+
+# =============================================================================
+# Endpoints
+# =============================================================================
+
+
 @router.post("/networks", summary="Step 4: Create LAN Networks")
 async def create_lan_networks(
     request: NetworkCreate,
@@ -33,24 +196,27 @@ async def create_lan_networks(
     }
 
 
-@router.post("/templates", summary="Step 7: Deploy Switch Templates")
-async def create_switch_template(
-    request: SwitchTemplateCreate,
-    api_key: str = Security(mist_api_key)
-):
+@router.post("/templates", response_model=SwitchTemplate, summary="Step 7: Deploy Switch Templates")
+async def create_switch_template(request: SwitchTemplateCreate):
     """
     **Step 7: Deploy Switch Templates (Day 1 - Wired)**
     
     Creates switch configuration templates that define port profiles,
     VLAN assignments, and 802.1X policies. References networks from Step 4.
     """
-    # TODO: Call Mist API to create switch template
-    return {
-        "id": f"switch-tmpl-{request.name.lower().replace(' ', '-')}",
-        "name": request.name,
-        "port_usages": request.port_usages,
-        "status": "created"
-    }
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    engine = MistEngine(host=api_host)
+    payload = request.model_dump(exclude={"networks"}, exclude_none=True)
+    if request.networks:
+        payload["networks"] = await _template_networks(engine, org_id, request.networks)
+    result = await engine.post(f"/api/v1/orgs/{org_id}/networktemplates", json=payload)
+    return _to_template(result)
 
 
 @router.get("/networks", summary="List all networks")
@@ -61,29 +227,75 @@ async def list_networks(
     return {"networks": [], "count": 0}
 
 
-@router.get("/templates", summary="List switch templates")
-async def list_switch_templates(
-    api_key: str = Security(mist_api_key)
-):
+@router.get("/templates", response_model=SwitchTemplateListResponse, summary="List switch templates")
+async def list_switch_templates():
     """List all switch templates in the organization."""
-    return {"templates": [], "count": 0}
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
 
+    engine = MistEngine(host=api_host)
+    templates = [_to_template(t) async for t in engine.paginate(f"/api/v1/orgs/{org_id}/networktemplates")]
+    return SwitchTemplateListResponse(templates=templates, count=len(templates))
 
-@router.post("/port-profiles", summary="Create port profile")
-async def create_port_profile(
-    name: str,
-    mode: str = "access",
-    vlan_id: int | None = None,
-    api_key: str = Security(mist_api_key)
-):
+
+@router.post("/port-profiles", response_model=SwitchTemplate, summary="Create port profile")
+async def create_port_profile(request: PortProfileCreate):
     """
     Create a reusable port profile for switch templates.
-    Modes: access, trunk, dynamic
+    Modes: access, trunk
+
+    The profile is added to (or replaces the one of the same name in) the
+    template's `port_usages`; networks are referenced by name.
     """
-    return {
-        "id": f"port-profile-{name}",
-        "name": name,
-        "mode": mode,
-        "vlan_id": vlan_id,
-        "status": "created"
-    }
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    engine = MistEngine(host=api_host)
+    endpoint = f"/api/v1/orgs/{org_id}/networktemplates/{request.template_id}"
+    template = await engine.get(endpoint)
+    usage = request.model_dump(exclude={"template_id", "name"}, exclude_none=True)
+    if not usage["networks"]:
+        del usage["networks"]
+    port_usages = {**(template.get("port_usages") or {}), request.name: usage}
+    result = await engine.put(endpoint, json={"port_usages": port_usages})
+    return _to_template(result)
+
+
+@router.post("/port-profiles/push", response_model=BulkResponse, responses=JOB_RESPONSES,
+             summary="Push port profiles to switches in bulk")
+async def push_port_profiles_to_switches(
+    request: PortProfilePush,
+    background: bool = Query(False, description="Run as a background job and return its ID (202)"),
+):
+    """
+    **Bulk Port Profiles (Day 1 - Wired)**
+
+    Expands the template's `port_usages` onto every switch in org inventory
+    (optionally limited to `site_ids`) according to the port assignments, and
+    merges them into each switch's configuration with bounded concurrency;
+    ports the assignments do not name keep their settings. Assignments may be
+    limited to specific switch models. Returns a per-switch outcome.
+
+    With `background=true` the request is queued and a job ID returned;
+    poll `GET /jobs/{job_id}` for progress and results.
+    """
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    if background:
+        return await enqueue_response("wired.push_port_profiles", request.model_dump(mode="json"), api_host, org_id)
+
+    results = await push_port_profiles(MistEngine(host=api_host), org_id, request)
+    return BulkResponse.from_results(results)
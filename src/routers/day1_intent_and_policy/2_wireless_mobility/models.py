@@ -55,3 +55,18 @@ class OrgPSKCreate(BaseModel):
     vlan_id: int | None = Field(None, description="VLAN override for this PSK")
     usage: str = Field(default="multi", description="Usage: single, multi")
     expiry: int | None = Field(None, description="Expiry in seconds")
+
+
+class WirelessBundle(BaseModel):
+    """
+    A complete WLAN template rollout.
+
+    Label names may be used in wxrule `src_labels` / `dst_labels`; they are
+    resolved to the IDs of the labels created by the bundle.
+    """
+    template: WLANTemplateCreate = Field(..., description="WLAN template holding the WLANs and wxrules")
+    rf_template: RFTemplateCreate | None = Field(None, description="Optional RF template")
+    wlans: list[WLANCreate] = Field(default_factory=list, description="WLANs added to the template")
+    labels: list[LabelCreate] = Field(default_factory=list, description="Labels used by the wxrules")
+    wxrules: list[WxRuleCreate] = Field(default_factory=list, description="Rules added to the template")
+    concurrency: int = Field(default=10, ge=1, le=50, description="Maximum simultaneous Mist calls")
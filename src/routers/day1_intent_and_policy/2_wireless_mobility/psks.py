@@ -0,0 +1,332 @@
+"""
+Wireless Router - Day 1: Bulk Org PSKs
+Generates or imports per-user PSKs by the tens of thousands.
+
+Mist API Reference:
+- POST /api/v1/orgs/{org_id}/psks/import - Create or update many PSKs
+
+PSKs are validated in one pass before anything is uploaded, then sent in
+batches through `psks/import` (the MistEngine rate limiter applies to every
+batch). Each batch is checkpointed, so an interrupted run resumes with the
+batches that have not been uploaded yet.
+
+Generated passphrases are returned once, in the response of the generate
+call. The run keeps them only as long as it may need to resume (until every
+batch has succeeded, or `psk_run_ttl` expires); they cannot be fetched again.
+"""
+import secrets
+import uuid
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field, ValidationError
+
+from src.config import get_settings
+from src.services.bulk import error_detail, iter_records, run_bounded
+from src.services.jobs import (
+    JOB_RESPONSES,
+    JobAccepted,
+    JobContext,
+    enqueue,
+    enqueue_response,
+    register_job_handler,
+)
+from src.services.mist_engine import MistEngine
+from src.services.pipeline import CheckpointStore, PipelineReport, StepResult, StepStatus
+from src.services.redis import get_context
+
+from .models import OrgPSKCreate
+from .wireless import psk_payload
+
+router = APIRouter(prefix="/wireless/psks", tags=["Wireless - Day 1"])
+
+# Checkpoint target of upload batches
+PSK_TARGET = "psks"
+
+# Unambiguous characters for generated passphrases (no 0/O, 1/l/I)
+PASSPHRASE_ALPHABET = "ABCDEFGHJKMNPQRSTUVWXYZabcdefghjkmnpqrstuvwxyz23456789"
+
+# Validation errors returned in a 400 before the list is truncated
+MAX_REPORTED_ERRORS = 100
+
+
+# ============================================================================
+# Models
+# ============================================================================
+
+class PSKGenerate(BaseModel):
+    """Generate numbered PSKs with random passphrases."""
+    ssid: str = Field(..., description="Target SSID")
+    count: int = Field(..., ge=1, le=100_000, description="Number of PSKs")
+    name_prefix: str = Field(default="psk", description="Names are {prefix}-{number}")
+    start: int = Field(default=1, ge=0, description="First number")
+    length: int = Field(default=12, ge=8, le=63, description="Passphrase length")
+    vlan_id: int | None = Field(None, description="VLAN override for these PSKs")
+    usage: str = Field(default="single", description="Usage: single, multi")
+    expiry: int | None = Field(None, description="Expiry in seconds")
+    batch_size: int = Field(default=500, ge=1, le=1000, description="PSKs per import call")
+    concurrency: int = Field(default=2, ge=1, le=10, description="Import calls in flight")
+
+
+class PSKRun(BaseModel):
+    """Stored input of a PSK run."""
+    psks: list[dict]
+    batch_size: int
+    concurrency: int
+
+
+class PSKCredential(BaseModel):
+    """A generated passphrase, for distribution to its user."""
+    name: str
+    ssid: str
+    passphrase: str
+
+
+class PSKGenerateReport(PipelineReport):
+    """Upload report of a generate call."""
+    psks: list[PSKCredential] = Field(..., description="Generated passphrases (not returned again)")
+
+
+class PSKGenerateAccepted(JobAccepted):
+    """Response of a generate call with background=true."""
+    psks: list[PSKCredential] = Field(..., description="Generated passphrases (not returned again)")
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+def generate_psks(request: PSKGenerate) -> list[OrgPSKCreate]:
+    """Numbered PSKs with distinct random passphrases."""
+    passphrases: set[str] = set()
+    while len(passphrases) < request.count:
+        passphrases.add("".join(secrets.choice(PASSPHRASE_ALPHABET) for _ in range(request.length)))
+    width = len(str(request.start + request.count - 1))
+    return [
+        OrgPSKCreate(
+            name=f"{request.name_prefix}-{request.start + i:0{width}d}",
+            passphrase=passphrase,
+            ssid=request.ssid,
+            vlan_id=request.vlan_id,
+            usage=request.usage,
+            expiry=request.expiry,
+        )
+        for i, passphrase in enumerate(passphrases)
+    ]
+
+
+def validate_psks(records: list[dict]) -> tuple[list[OrgPSKCreate], list[str]]:
+    """
+    Validate uploaded records in one pass.
+
+    Besides the field rules, names must be unique and passphrases unique
+    per SSID (Mist identifies the user by the passphrase).
+
+    Returns:
+        (valid PSKs, one message per invalid record)
+    """
+    psks: list[OrgPSKCreate] = []
+    errors: list[str] = []
+    names: set[str] = set()
+    passphrases: set[tuple[str, str]] = set()
+    for index, record in enumerate(records):
+        try:
+            # Empty cells / nulls mean "use the default", e.g. a blank usage column.
+            psk = OrgPSKCreate.model_validate({k: v for k, v in record.items() if v is not None})
+        except ValidationError as e:
+            errors.append(f"#{index}: {error_detail(e)}")
+            continue
+        if psk.name in names:
+            errors.append(f"#{index}: Duplicate name {psk.name}")
+        elif (psk.ssid, psk.passphrase) in passphrases:
+            errors.append(f"#{index}: Duplicate passphrase for SSID {psk.ssid}")
+        else:
+            psks.append(psk)
+        names.add(psk.name)
+        passphrases.add((psk.ssid, psk.passphrase))
+    return psks, errors
+
+
+def _checkpoints(run_id: str) -> CheckpointStore:
+    return CheckpointStore(run_id, ttl=get_settings().psk_run_ttl)
+
+
+async def _save_run(psks: list[OrgPSKCreate], batch_size: int, concurrency: int) -> tuple[str, dict]:
+    """Store the input of a new run and return its ID and input."""
+    run_id = uuid.uuid4().hex
+    run = PSKRun(psks=[psk_payload(p) for p in psks], batch_size=batch_size, concurrency=concurrency)
+    data = run.model_dump(mode="json")
+    await _checkpoints(run_id).save_input(data)
+    return run_id, data
+
+
+async def _upload(api_host: str, org_id: str, run_id: str, data: dict) -> PipelineReport:
+    """
+    Upload every batch of a run not yet checkpointed as succeeded.
+
+    Returns:
+        One step per batch ("batch-00000", ...), resumed ones included
+    """
+    run = PSKRun.model_validate(data)
+    engine = MistEngine(host=api_host)
+    store = _checkpoints(run_id)
+    previous = await store.load()
+    endpoint = f"/api/v1/orgs/{org_id}/psks/import"
+
+    batches = [
+        (f"batch-{i:05d}", run.psks[start:start + run.batch_size])
+        for i, start in enumerate(range(0, len(run.psks), run.batch_size))
+    ]
+    results: dict[str, StepResult] = {}
+    pending = []
+    for name, batch in batches:
+        checkpoint = previous.get(f"{PSK_TARGET}/{name}")
+        if checkpoint is not None and checkpoint.status == StepStatus.SUCCEEDED:
+            results[name] = checkpoint.model_copy(update={"resumed": True})
+        else:
+            pending.append((name, batch))
+
+    async def upload(item: tuple[str, list[dict]]) -> StepResult:
+        name, batch = item
+        try:
+            await engine.post(endpoint, json=batch)
+            result = StepResult(target=PSK_TARGET, step=name, status=StepStatus.SUCCEEDED,
+                                output={"count": len(batch)})
+        except Exception as e:  # noqa: BLE001 - failures are checkpointed per batch
+            result = StepResult(target=PSK_TARGET, step=name, status=StepStatus.FAILED, detail=error_detail(e))
+        await store.save(result)
+        return result
+
+    for result in await run_bounded(pending, upload, run.concurrency):
+        if isinstance(result, Exception):
+            # Only job cancellation reaches here; the batch stays pending for resume.
+            continue
+        results[result.step] = result
+
+    # Once every batch is uploaded, resume needs no passphrases: stop storing them.
+    done = all(name in results and results[name].status == StepStatus.SUCCEEDED for name, _ in batches)
+    if done and any("passphrase" in psk for psk in run.psks):
+        psks = [{k: v for k, v in psk.items() if k != "passphrase"} for psk in run.psks]
+        await store.save_input({**data, "psks": psks})
+    return PipelineReport.from_results(run_id, [results[name] for name, _ in batches if name in results])
+
+
+async def _psks_job(job: JobContext) -> dict:
+    """Background job handler for PSK generation, import and resume."""
+    run_id = job.payload["run_id"]
+    data = await _checkpoints(run_id).load_input()
+    if data is None:
+        raise RuntimeError(f"Unknown or expired PSK run: {run_id}")
+    report = await _upload(job.api_host, job.org_id, run_id, data)
+    return report.model_dump(mode="json")
+
+
+register_job_handler("wireless.psks", _psks_job)
+
+
+# ============================================================================
+# Endpoints
+# ============================================================================
+
+@router.post("/generate", response_model=PSKGenerateReport,
+             responses={202: {"model": PSKGenerateAccepted, "description": "Queued as a background job"}},
+             summary="Generate and upload PSKs in bulk")
+async def generate_org_psks(
+    request: PSKGenerate,
+    background: bool = Query(False, description="Run as a background job and return its ID (202)"),
+):
+    """
+    **Bulk Org PSKs (Day 1 - Wireless)**
+
+    Generates `count` PSKs named `{name_prefix}-{number}` with distinct
+    random passphrases and uploads them in batches. The passphrases are
+    returned in `psks` of this response only (also with `background=true`);
+    save them before distributing them to users.
+    """
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    psks = generate_psks(request)
+    credentials = [PSKCredential(name=p.name, ssid=p.ssid, passphrase=p.passphrase) for p in psks]
+    run_id, data = await _save_run(psks, request.batch_size, request.concurrency)
+    if background:
+        job_id = await enqueue("wireless.psks", {"run_id": run_id}, api_host, org_id)
+        accepted = PSKGenerateAccepted(job_id=job_id, status_url=f"/jobs/{job_id}", psks=credentials)
+        return JSONResponse(status_code=202, content=accepted.model_dump(mode="json"))
+    report = await _upload(api_host, org_id, run_id, data)
+    return PSKGenerateReport(**report.model_dump(), psks=credentials)
+
+
+@router.post("/import", response_model=PipelineReport, responses=JOB_RESPONSES,
+             summary="Upload PSKs from CSV or JSON Lines")
+async def import_org_psks(
+    request: Request,
+    batch_size: int = Query(500, ge=1, le=1000, description="PSKs per import call"),
+    concurrency: int = Query(2, ge=1, le=10, description="Import calls in flight"),
+    background: bool = Query(False, description="Run as a background job and return its ID (202)"),
+):
+    """
+    Uploads PSKs from a file streamed as the request body.
+
+    Send `Content-Type: text/csv` (header row with OrgPSKCreate field names)
+    or `application/x-ndjson` (one OrgPSKCreate object per line). The whole
+    file is validated first; if any record is invalid nothing is uploaded
+    and the errors are returned.
+    """
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    records = [record async for record in iter_records(request)]
+    psks, errors = validate_psks(records)
+    if errors:
+        raise HTTPException(status_code=400, detail={
+            "message": f"{len(errors)} invalid PSK records; nothing was uploaded",
+            "errors": errors[:MAX_REPORTED_ERRORS],
+        })
+    if not psks:
+        raise HTTPException(status_code=400, detail="No PSK records in upload")
+    run_id, data = await _save_run(psks, batch_size, concurrency)
+    if background:
+        return await enqueue_response("wireless.psks", {"run_id": run_id}, api_host, org_id)
+    return await _upload(api_host, org_id, run_id, data)
+
+
+@router.post("/runs/{run_id}/resume", response_model=PipelineReport, responses=JOB_RESPONSES,
+             summary="Resume a PSK upload")
+async def resume_org_psks(
+    run_id: str,
+    background: bool = Query(False, description="Run as a background job and return its ID (202)"),
+):
+    """Uploads the batches of a run that have not succeeded yet."""
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    data = await _checkpoints(run_id).load_input()
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired PSK run: {run_id}")
+    if background:
+        return await enqueue_response("wireless.psks", {"run_id": run_id}, api_host, org_id)
+    return await _upload(api_host, org_id, run_id, data)
+
+
+@router.get("/runs/{run_id}", response_model=PipelineReport, summary="Get PSK upload progress")
+async def get_org_psk_run(run_id: str):
+    """Returns the checkpointed batches of a run (batches not yet uploaded are omitted)."""
+    store = _checkpoints(run_id)
+    if await store.load_input() is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired PSK run: {run_id}")
+    results = sorted((await store.load()).values(), key=lambda r: r.step)
+    return PipelineReport.from_results(run_id, results)
+
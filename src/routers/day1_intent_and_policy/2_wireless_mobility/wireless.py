@@ -2,24 +2,242 @@
 Wireless Router - Day 1: RF, WLANs, & Security
 Handles RF templates, WLAN templates, policies, and PSKs.
 
-These are 'Day 1' policy objects that define the wireless standard 
+These are 'Day 1' policy objects that define the wireless standard
 for the organization.
+
+Mist API Reference:
+- GET/POST /api/v1/orgs/{org_id}/rftemplates - RF templates
+- GET/POST /api/v1/orgs/{org_id}/templates - WLAN templates
+- GET/POST /api/v1/orgs/{org_id}/wlans - WLANs
+- GET/POST /api/v1/orgs/{org_id}/wxtags - Labels
+- GET/POST /api/v1/orgs/{org_id}/wxrules - WLAN policies
+- GET/POST /api/v1/orgs/{org_id}/psks - Org PSKs
+
+List endpoints are served from the response cache; creating an object
+through this service invalidates the cached list.
+
+A whole rollout (template, RF template, WLANs, labels, wxrules) can be
+submitted as one bundle. It runs as a pipeline (see services/pipeline):
+independent objects are created in parallel, dependants once the objects
+they reference exist, and a failed bundle can be resumed.
 """
-from fastapi import APIRouter, Security
-from fastapi.security import APIKeyHeader
+import time
+import uuid
+
+from fastapi import APIRouter, HTTPException, Query
+
+from src.services.bulk import error_detail, run_bounded
+from src.services.jobs import JOB_RESPONSES, JobContext, enqueue_response, register_job_handler
+from src.services.mist_engine import MistEngine
+from src.services.pipeline import CheckpointStore, Pipeline, PipelineReport, Step, StepContext, StepScope
+from src.services.redis import get_context
 
 from .models import (
+    LabelCreate,
+    OrgPSKCreate,
     RFTemplateCreate,
-    WLANTemplateCreate,
+    WirelessBundle,
     WLANCreate,
-    LabelCreate,
+    WLANTemplateCreate,
     WxRuleCreate,
-    OrgPSKCreate,
 )
 
 router = APIRouter(prefix="/wireless", tags=["Wireless - Day 1"])
 
-mist_api_key = APIKeyHeader(name="X-Mist-API-Key", description="Your Juniper Mist API token")
+# Page size of cached list reads (Mist's maximum); larger collections are paginated uncached.
+LIST_LIMIT = 1000
+
+# WLANCreate.band -> Mist `bands`
+BANDS = {"2.4": ["24"], "5": ["5"], "6": ["6"], "both": ["24", "5"]}
+
+# LabelCreate.label_type -> Mist wxtag `match`
+LABEL_MATCH = {"wlan": "wlan_id", "client": "client_mac", "ap": "ap_id"}
+
+
+# ============================================================================
+# Payloads
+# ============================================================================
+
+def _rf_template_payload(request: RFTemplateCreate) -> dict:
+    return request.model_dump()
+
+
+def _wlan_template_payload(request: WLANTemplateCreate, org_id: str) -> dict:
+    # Site-scoped templates are bound to sites later (Late Binding).
+    payload: dict = {"name": request.name}
+    if request.applies_to == "org":
+        payload["applies"] = {"org_id": org_id}
+    return payload
+
+
+def _wlan_payload(request: WLANCreate, template_id: str | None = None) -> dict:
+    # PSK WLANs authenticate against Org PSKs (Step 13) rather than one shared passphrase.
+    auth = {"type": request.auth_type}
+    if request.auth_type == "psk":
+        auth["multi_psk_only"] = True
+    payload = {
+        "ssid": request.ssid,
+        "enabled": request.enabled,
+        "auth": auth,
+        "hide_ssid": request.hide_ssid,
+        "bands": BANDS.get(request.band, BANDS["both"]),
+        "template_id": template_id or request.template_id,
+    }
+    if request.vlan_id is not None:
+        payload.update(vlan_enabled=True, vlan_id=request.vlan_id)
+    return payload
+
+
+def _label_payload(request: LabelCreate) -> dict:
+    return {
+        "name": request.name,
+        "type": "match",
+        "match": LABEL_MATCH.get(request.label_type, request.label_type),
+        "values": request.values,
+    }
+
+
+def _wxrule_payload(request: WxRuleCreate, template_id: str | None = None, label_ids: dict | None = None) -> dict:
+    label_ids = label_ids or {}
+    return {
+        "template_id": template_id,
+        "order": request.order,
+        "action": "block" if request.action == "deny" else request.action,
+        "src_wxtags": [label_ids.get(label, label) for label in request.src_labels],
+        "dst_wxtags": [label_ids.get(label, label) for label in request.dst_labels],
+        "enabled": True,
+    }
+
+
+def psk_payload(request: OrgPSKCreate) -> dict:
+    payload = request.model_dump(exclude={"expiry"}, exclude_none=True)
+    if request.expiry is not None:
+        payload["expire_time"] = int(time.time()) + request.expiry
+    return payload
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+async def _list(engine: MistEngine, endpoint: str) -> list[dict]:
+    """Every object of an org collection, from the response cache when it fits in one page."""
+    records = await engine.get(endpoint, params={"limit": LIST_LIMIT}, cache=True)
+    if len(records) < LIST_LIMIT:
+        return records
+    return [r async for r in engine.paginate(endpoint, limit=LIST_LIMIT)]
+
+
+async def _ensure(
+    ctx: StepContext,
+    collection: str,
+    key: str,
+    payloads: list[dict],
+    template_id: str | None = None,
+) -> dict:
+    """
+    Create the payloads not yet present (matched on `key`), in parallel.
+
+    Existing objects are reused, so re-running a bundle creates nothing twice.
+    Objects scoped to a WLAN template are only matched within that template.
+
+    Returns:
+        {"ids": key -> object ID} for every payload
+    """
+    if not payloads:
+        return {"ids": {}}
+    endpoint = f"/api/v1/orgs/{ctx.org_id}/{collection}"
+    ids = {
+        str(o.get(key)): o.get("id")
+        for o in await _list(ctx.engine, endpoint)
+        if template_id is None or o.get("template_id") == template_id
+    }
+    missing = [p for p in payloads if str(p[key]) not in ids]
+
+    async def create(payload: dict) -> dict:
+        return await ctx.engine.post(endpoint, json=payload)
+
+    outcomes = await run_bounded(missing, create, ctx.params["concurrency"])
+    failed = []
+    for payload, outcome in zip(missing, outcomes):
+        if isinstance(outcome, Exception):
+            failed.append(f"{payload[key]}: {error_detail(outcome)}")
+        else:
+            ids[str(payload[key])] = outcome.get("id")
+    if failed:
+        raise RuntimeError("; ".join(failed))
+    return {"ids": {str(p[key]): ids[str(p[key])] for p in payloads}}
+
+
+# ============================================================================
+# Bundle Steps
+# ============================================================================
+
+def _bundle(ctx: StepContext) -> WirelessBundle:
+    return WirelessBundle.model_validate(ctx.params)
+
+
+async def _template_step(ctx: StepContext) -> dict:
+    request = _bundle(ctx).template
+    return await _ensure(ctx, "templates", "name", [_wlan_template_payload(request, ctx.org_id)])
+
+
+async def _rf_template_step(ctx: StepContext) -> dict:
+    request = _bundle(ctx).rf_template
+    if request is None:
+        return {"ids": {}}
+    return await _ensure(ctx, "rftemplates", "name", [_rf_template_payload(request)])
+
+
+async def _labels_step(ctx: StepContext) -> dict:
+    return await _ensure(ctx, "wxtags", "name", [_label_payload(label) for label in _bundle(ctx).labels])
+
+
+async def _wlans_step(ctx: StepContext) -> dict:
+    bundle = _bundle(ctx)
+    template_id = ctx.outputs["template"]["ids"][bundle.template.name]
+    payloads = [_wlan_payload(wlan, template_id) for wlan in bundle.wlans]
+    return await _ensure(ctx, "wlans", "ssid", payloads, template_id)
+
+
+async def _wxrules_step(ctx: StepContext) -> dict:
+    bundle = _bundle(ctx)
+    template_id = ctx.outputs["template"]["ids"][bundle.template.name]
+    label_ids = ctx.outputs["labels"]["ids"]
+    payloads = [_wxrule_payload(rule, template_id, label_ids) for rule in bundle.wxrules]
+    return await _ensure(ctx, "wxrules", "order", payloads, template_id)
+
+
+BUNDLE_STEPS: list[Step] = [
+    Step("template", _template_step, scope=StepScope.ORG),
+    Step("rf_template", _rf_template_step, scope=StepScope.ORG),
+    Step("labels", _labels_step, scope=StepScope.ORG),
+    Step("wlans", _wlans_step, depends_on=("template",), scope=StepScope.ORG),
+    Step("wxrules", _wxrules_step, depends_on=("template", "labels"), scope=StepScope.ORG),
+]
+
+
+async def _run_bundle(api_host: str, org_id: str, run_id: str, data: dict) -> PipelineReport:
+    """Execute (or resume) a bundle from its stored input."""
+    bundle = WirelessBundle.model_validate(data)
+    results = await Pipeline(BUNDLE_STEPS).execute(
+        MistEngine(host=api_host), org_id, bundle.model_dump(mode="json"), {}, CheckpointStore(run_id),
+        bundle.concurrency,
+    )
+    return PipelineReport.from_results(run_id, results)
+
+
+async def _bundle_job(job: JobContext) -> dict:
+    """Background job handler for POST /wireless/bundles and its resume."""
+    run_id = job.payload["run_id"]
+    data = await CheckpointStore(run_id).load_input()
+    if data is None:
+        raise RuntimeError(f"Unknown or expired bundle run: {run_id}")
+    report = await _run_bundle(job.api_host, job.org_id, run_id, data)
+    return report.model_dump(mode="json")
+
+
+register_job_handler("wireless.bundle", _bundle_job)
 
 
 # ============================================================================
@@ -27,131 +245,173 @@ mist_api_key = APIKeyHeader(name="X-Mist-API-Key", description="Your Juniper Mis
 # ============================================================================
 
 @router.post("/rf-templates", summary="Step 9: Create RF Templates")
-async def create_rf_template(
-    request: RFTemplateCreate,
-    api_key: str = Security(mist_api_key)
-):
+async def create_rf_template(request: RFTemplateCreate):
     """
     **Step 9: Create RF Templates (Day 1 - Wireless)**
-    
+
     Defines radio frequency parameters including power levels, channel
     width, and band steering. Applied to sites via Late Binding.
     """
-    return {
-        "id": f"rf-tmpl-{request.name.lower().replace(' ', '-')}",
-        "name": request.name,
-        "country_code": request.country_code,
-        "bands_enabled": {
-            "2.4GHz": request.band_24.get("enabled", True),
-            "5GHz": request.band_5.get("enabled", True),
-            "6GHz": request.band_6.get("enabled", False)
-        },
-        "status": "created"
-    }
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    engine = MistEngine(host=api_host)
+    return await engine.post(f"/api/v1/orgs/{org_id}/rftemplates", json=_rf_template_payload(request))
 
 
 @router.post("/wlan-templates", summary="Step 8: Deploy WLAN Templates")
-async def create_wlan_template(
-    request: WLANTemplateCreate,
-    api_key: str = Security(mist_api_key)
-):
+async def create_wlan_template(request: WLANTemplateCreate):
     """
     **Step 8: Deploy WLAN Templates (Day 1 - Wireless)**
-    
+
     Creates the WLAN template container that holds SSID configurations.
     WLANs are added to this template in Step 10.
     """
-    return {
-        "id": f"wlan-tmpl-{request.name.lower().replace(' ', '-')}",
-        "name": request.name,
-        "applies_to": request.applies_to,
-        "status": "created"
-    }
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    engine = MistEngine(host=api_host)
+    return await engine.post(f"/api/v1/orgs/{org_id}/templates", json=_wlan_template_payload(request, org_id))
 
 
 @router.post("/wlans", summary="Step 10: Create WLANs")
-async def create_wlans(
-    request: WLANCreate,
-    api_key: str = Security(mist_api_key)
-):
+async def create_wlans(request: WLANCreate):
     """
     **Step 10: Create WLANs (Day 1 - Wireless)**
-    
+
     Creates individual SSID configurations within a WLAN template.
-    Linked to the template from Step 8.
+    Linked to the template from Step 8. PSK WLANs accept Org PSKs (Step 13).
     """
-    return {
-        "id": f"wlan-{request.ssid.lower().replace(' ', '-')}",
-        "ssid": request.ssid,
-        "auth_type": request.auth_type,
-        "vlan_id": request.vlan_id,
-        "template_id": request.template_id,
-        "status": "created"
-    }
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    engine = MistEngine(host=api_host)
+    return await engine.post(f"/api/v1/orgs/{org_id}/wlans", json=_wlan_payload(request))
 
 
 @router.post("/labels", summary="Step 11: Create Labels")
-async def create_labels(
-    request: LabelCreate,
-    api_key: str = Security(mist_api_key)
-):
+async def create_labels(request: LabelCreate):
     """
     **Step 11: Create Labels (Day 1 - Wireless/Policy)**
-    
+
     Creates labels used for policy matching in wxrules.
     Labels can match WLANs, client types, or AP groups.
     """
-    return {
-        "id": f"label-{request.name.lower().replace(' ', '-')}",
-        "name": request.name,
-        "label_type": request.label_type,
-        "values": request.values,
-        "status": "created"
-    }
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    engine = MistEngine(host=api_host)
+    return await engine.post(f"/api/v1/orgs/{org_id}/wxtags", json=_label_payload(request))
 
 
 @router.post("/wxrules", summary="Step 12: Deploy WLAN Policies (wxrules)")
-async def create_wx_rules(
-    request: WxRuleCreate,
-    api_key: str = Security(mist_api_key)
-):
+async def create_wx_rules(request: WxRuleCreate):
     """
     **Step 12: Deploy WLAN Policies (Day 1 - Wireless)**
-    
+
     Creates wireless security rules that control traffic between
-    labeled groups. Uses Labels from Step 11.
+    labeled groups. Uses Labels (IDs) from Step 11.
     """
-    return {
-        "id": f"wxrule-{request.name.lower().replace(' ', '-')}",
-        "name": request.name,
-        "order": request.order,
-        "action": request.action,
-        "src_labels": request.src_labels,
-        "dst_labels": request.dst_labels,
-        "status": "created"
-    }
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    engine = MistEngine(host=api_host)
+    return await engine.post(f"/api/v1/orgs/{org_id}/wxrules", json=_wxrule_payload(request))
 
 
 @router.post("/org-psks", summary="Step 13: Create Org PSKs")
-async def create_org_psks(
-    request: OrgPSKCreate,
-    api_key: str = Security(mist_api_key)
-):
+async def create_org_psks(request: OrgPSKCreate):
     """
     **Step 13: Create Org PSKs (Day 1 - Wireless)**
-    
+
     Creates organization-level PSKs for secure, scalable wireless access.
     Supports per-user/per-device VLANs and expiration policies.
     """
-    return {
-        "id": f"psk-{request.name.lower().replace(' ', '-')}",
-        "name": request.name,
-        "ssid": request.ssid,
-        "vlan_id": request.vlan_id,
-        "usage": request.usage,
-        "has_expiry": request.expiry is not None,
-        "status": "created"
-    }
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    engine = MistEngine(host=api_host)
+    return await engine.post(f"/api/v1/orgs/{org_id}/psks", json=psk_payload(request))
+
+
+@router.post("/bundles", response_model=PipelineReport, responses=JOB_RESPONSES,
+             summary="Steps 8-12: Deploy a complete WLAN template")
+async def create_bundle(
+    request: WirelessBundle,
+    background: bool = Query(False, description="Run as a background job and return its ID (202)"),
+):
+    """
+    **Wireless Bundle (Day 1 - Wireless)**
+
+    Creates a WLAN template with its WLANs, labels and wxrules (plus an
+    optional RF template) in one request. The template, RF template and
+    labels are created in parallel; WLANs follow the template and wxrules
+    follow the template and labels. Objects that already exist by name (or
+    SSID / rule order within the template) are reused.
+
+    Returns a `run_id`; if a step fails, fix the cause and call
+    `POST /wireless/bundles/{run_id}/resume`. With `background=true` the run
+    is queued as a job; poll `GET /jobs/{job_id}` for progress and results.
+    """
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    run_id = uuid.uuid4().hex
+    data = request.model_dump(mode="json")
+    await CheckpointStore(run_id).save_input(data)
+    if background:
+        return await enqueue_response("wireless.bundle", {"run_id": run_id}, api_host, org_id)
+    return await _run_bundle(api_host, org_id, run_id, data)
+
+
+@router.post("/bundles/{run_id}/resume", response_model=PipelineReport, responses=JOB_RESPONSES,
+             summary="Resume a failed wireless bundle")
+async def resume_bundle(
+    run_id: str,
+    background: bool = Query(False, description="Run as a background job and return its ID (202)"),
+):
+    """Re-runs a bundle, skipping every step that already succeeded."""
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    data = await CheckpointStore(run_id).load_input()
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired bundle run: {run_id}")
+    if background:
+        return await enqueue_response("wireless.bundle", {"run_id": run_id}, api_host, org_id)
+    return await _run_bundle(api_host, org_id, run_id, data)
 
 
 # ============================================================================
@@ -159,30 +419,75 @@ async def create_org_psks(
 # ============================================================================
 
 @router.get("/rf-templates", summary="List RF templates")
-async def list_rf_templates(api_key: str = Security(mist_api_key)):
+async def list_rf_templates():
     """List all RF templates."""
-    return {"templates": [], "count": 0}
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    engine = MistEngine(host=api_host)
+    templates = await _list(engine, f"/api/v1/orgs/{org_id}/rftemplates")
+    return {"templates": templates, "count": len(templates)}
 
 
 @router.get("/wlan-templates", summary="List WLAN templates")
-async def list_wlan_templates(api_key: str = Security(mist_api_key)):
+async def list_wlan_templates():
     """List all WLAN templates."""
-    return {"templates": [], "count": 0}
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    engine = MistEngine(host=api_host)
+    templates = await _list(engine, f"/api/v1/orgs/{org_id}/templates")
+    return {"templates": templates, "count": len(templates)}
 
 
 @router.get("/wlans", summary="List WLANs")
-async def list_wlans(api_key: str = Security(mist_api_key)):
+async def list_wlans():
     """List all WLANs."""
-    return {"wlans": [], "count": 0}
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    engine = MistEngine(host=api_host)
+    wlans = await _list(engine, f"/api/v1/orgs/{org_id}/wlans")
+    return {"wlans": wlans, "count": len(wlans)}
 
 
 @router.get("/labels", summary="List labels")
-async def list_labels(api_key: str = Security(mist_api_key)):
+async def list_labels():
     """List all labels."""
-    return {"labels": [], "count": 0}
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    engine = MistEngine(host=api_host)
+    labels = await _list(engine, f"/api/v1/orgs/{org_id}/wxtags")
+    return {"labels": labels, "count": len(labels)}
 
 
 @router.get("/org-psks", summary="List Org PSKs")
-async def list_org_psks(api_key: str = Security(mist_api_key)):
+async def list_org_psks():
     """List all organization PSKs."""
-    return {"psks": [], "count": 0}
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    engine = MistEngine(host=api_host)
+    psks = await _list(engine, f"/api/v1/orgs/{org_id}/psks")
+    return {"psks": psks, "count": len(psks)}
@@ -0,0 +1,139 @@
+"""
+Day 1: Template Rendering.
+
+Renders a Day 1 template (any Mist configuration document using `{{variable}}`
+placeholders) for many sites in one call. Each site's variables are merged
+from, in increasing precedence:
+
+    NMS profile (POST /nms)  ->  IPAM subnets of its zone/site ID  ->  its own `vars`
+
+The template is compiled once and cached (see services/templates), so
+rendering thousands of sites costs one pass over the variable sets.
+"""
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+
+from src.routers.day0_design_and_topology.nms import NMS_KEY, DeploymentProfile
+from src.services.network_calculator import get_network_calculator
+from src.services.redis import get_redis_client
+from src.services.templates import TemplateError, compile_template, content_hash, render_batch
+
+
+router = APIRouter(prefix="/templates", tags=["day 1 - templates"])
+
+
+# =============================================================================
+# Models
+# =============================================================================
+
+class TemplateSource(BaseModel):
+    """A Day 1 template document."""
+    template: dict = Field(..., description="Configuration document with {{variable}} placeholders",
+                           examples=[{"networks": {"corp": {"vlan_id": "{{vlan_1}}", "subnet": "{{data_subnet}}"}}}])
+
+
+class TemplateInfo(BaseModel):
+    """Variables a template requires."""
+    hash: str = Field(..., description="Content hash the compiled template is cached under")
+    variables: list[str]
+
+
+class SiteVariables(BaseModel):
+    """One site to render the template for."""
+    name: str = Field(..., description="Site name (available as {{site_name}})")
+    zone_id: int | None = Field(None, ge=1, le=255, description="Adds the site's IPAM subnets")
+    site_id: int | None = Field(None, ge=1, le=255, description="Adds the site's IPAM subnets")
+    vars: dict = Field(default_factory=dict, description="Site-specific variables (highest precedence)")
+
+
+class RenderRequest(TemplateSource):
+    """Batch render request payload."""
+    sites: list[SiteVariables] = Field(..., min_length=1, description="Sites to render")
+    use_nms_profile: bool = Field(default=True, description="Include the stored NMS profile's values")
+
+
+class RenderedSite(BaseModel):
+    """Rendered template of one site."""
+    name: str
+    config: dict | None = None
+    missing: list[str] = Field(default_factory=list, description="Variables the site does not define")
+
+
+class RenderResponse(BaseModel):
+    """Batch render results."""
+    variables: list[str]
+    rendered: int
+    failed: int
+    sites: list[RenderedSite]
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+async def _nms_variables() -> dict:
+    """Non-empty fields of the stored NMS profile (empty if none is saved)."""
+    data = await get_redis_client().get(NMS_KEY)
+    if not data:
+        return {}
+    return DeploymentProfile.model_validate_json(data).model_dump(exclude_none=True)
+
+
+def site_variable_sets(sites: list[SiteVariables], base: dict) -> list[dict]:
+    """
+    Merge the variables of every site.
+
+    IPAM subnets of all sites with a zone and site ID are planned in one
+    columnar pass rather than per site.
+
+    Raises:
+        HTTPException: 400 if the zone/site IDs cannot be planned
+    """
+    planned = [s for s in sites if s.zone_id is not None and s.site_id is not None]
+    try:
+        plan = get_network_calculator().plan_sites([s.zone_id for s in planned], [s.site_id for s in planned])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    subnets = {id(site): row for site, row in zip(planned, plan.iter_rows())}
+
+    return [{**base, **subnets.get(id(s), {}), "site_name": s.name, **s.vars} for s in sites]
+
+
+# =============================================================================
+# Endpoints
+# =============================================================================
+
+@router.post("/variables", response_model=TemplateInfo, summary="List the variables a template uses")
+async def template_variables(request: TemplateSource):
+    """Compiles the template (caching it) and returns the variables every site must define."""
+    template = compile_template(request.template)
+    return TemplateInfo(hash=content_hash(request.template), variables=sorted(template.variables))
+
+
+@router.post("/render", response_model=RenderResponse, summary="Render a template for many sites")
+async def render_template(request: RenderRequest):
+    """
+    **Render a Day 1 Template**
+
+    Renders the template once per site. A placeholder that is the whole
+    string keeps the variable's type (`"{{vlan_1}}"` becomes an integer).
+
+    Sites missing variables are reported with the missing names; the rest
+    are rendered.
+    """
+    base = await _nms_variables() if request.use_nms_profile else {}
+    variable_sets = site_variable_sets(request.sites, base)
+    results = await render_batch(request.template, variable_sets)
+
+    sites = [
+        RenderedSite(name=site.name, missing=result.missing) if isinstance(result, TemplateError)
+        else RenderedSite(name=site.name, config=result)
+        for site, result in zip(request.sites, results)
+    ]
+    failed = sum(1 for s in sites if s.missing)
+    return RenderResponse(
+        variables=sorted(compile_template(request.template).variables),
+        rendered=len(sites) - failed,
+        failed=failed,
+        sites=sites,
+    )
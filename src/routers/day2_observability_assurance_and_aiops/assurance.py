@@ -7,28 +7,392 @@ Day 2 operations focus on:
 - Service Level Expectations (SLEs)
 - AI-driven troubleshooting with Marvis
 - Client and device insights
-"""
-from fastapi import APIRouter, Query
-from datetime import datetime
 
+Mist API Reference:
+- GET /api/v1/orgs/{org_id}/stats/sites - Device and client counts of every site
+- GET /api/v1/sites/{site_id}/stats - Device and client counts of one site
+- GET /api/v1/orgs/{org_id}/alarms/count - Open alarms per site
+- Webhooks (topic "alarms") - Alarms pushed to POST /assurance/webhooks/mist
+
+Fleet health reads the org-level site stats listing (one call per 1,000
+sites), so a 3,000-site snapshot costs three Mist calls. The snapshot is
+shared by every worker for `snapshot_ttl` seconds (see
+services/snapshot_cache), so dashboards polling every minute trigger at most
+one build per TTL.
+
+SLE trends are answered from the local time-series store (see
+services/timeseries): when `metrics_sample_interval` is set, the worker
+samples fleet health at that interval and the store keeps 1m/15m/1h/1d
+rollups, so a 30-day trend reads ~30 buckets instead of recomputing from Mist.
+
+Alerts are pushed by Mist alarm webhooks into an indexed store (see
+services/alert_store) instead of being polled; listings filter on its
+site / severity / acknowledgement indexes. New alerts are then deduplicated
+and grouped by topology (NMS deployment profile) into incidents (see
+services/correlation).
+
+New and acknowledged alerts, and sites whose health scores changed between
+fleet snapshots, are pushed to live subscribers (SSE at /assurance/stream,
+WebSocket at /assurance/ws) through the Redis event bus (see
+services/event_bus), so NOC screens need not poll. While a worker has
+subscribers of an org, it refreshes that org's fleet snapshot every
+`stream_health_interval` seconds, so health events flow even when no
+dashboard polls.
+"""
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from typing import Literal
+
+import redis.asyncio as redis
+from fastapi import APIRouter, Header, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from src.config import get_settings
 from src.routers.day2_observability_assurance_and_aiops.models import (
     SiteHealthResponse,
+    FleetHealthResponse,
     DeviceHealthResponse,
     ClientInsight,
     AlertResponse,
     AlertAcknowledge,
+    Incident,
+    IncidentDetail,
+    IncidentListResponse,
+    SLEMetric,
     SLEReport,
     MarvisQuery,
     MarvisResponse,
     SeverityLevel,
     DeviceType
 )
+from src.routers.day0_design_and_topology.nms import NMS_KEY, DeploymentProfile
+from src.services.alert_store import get_alert_store
+from src.services.bulk import error_detail
+from src.services.correlation import Topology, get_correlation_engine
+from src.services.event_bus import EventFilter, Subscription, get_event_bus
+from src.services.mist_engine import MistEngine
+from src.services.rate_limiter import get_rate_limiter
+from src.services.redis import RedisKeys, get_context, get_redis_client
+from src.services.snapshot_cache import get_snapshot_cache
+from src.services.timeseries import TIME_RANGES, Sample, average, get_timeseries_store
 
 router = APIRouter(prefix="/assurance", tags=["Assurance - Day 2"])
 
+logger = logging.getLogger(__name__)
+
+# SiteHealthResponse field -> device type counted in Mist site stats (num_{type}, num_{type}_connected)
+HEALTH_DOMAINS = {"wan_health": "gateway", "wired_health": "switch", "wireless_health": "ap"}
+
+# Sites per page of the org site stats listing (Mist maximum)
+SITE_STATS_PAGE = 1000
+
+# Recorded metric -> SiteHealthResponse field
+HEALTH_METRICS = {
+    "overall": "overall_score",
+    "wan": "wan_health",
+    "wired": "wired_health",
+    "wireless": "wireless_health",
+}
+
+# Mist alarm severity -> SeverityLevel
+ALARM_SEVERITY = {
+    "critical": SeverityLevel.CRITICAL,
+    "major": SeverityLevel.CRITICAL,
+    "minor": SeverityLevel.WARNING,
+    "warn": SeverityLevel.WARNING,
+    "info": SeverityLevel.INFO,
+}
+
+# Event types a stream subscriber can select
+EventType = Literal["alert", "health", "incident"]
+
 # TODO: Implement authentication via dependency injection from central auth module
 
 
+# ============================================================================
+# Helpers
+# ============================================================================
+
+def _percent(part: int, total: int) -> int | None:
+    return round(100 * part / total) if total else None
+
+
+def site_health(site_id: str, stats: dict, active_alerts: int, timestamp: str) -> SiteHealthResponse:
+    """Score a site from its Mist stats (connected share of devices per domain)."""
+    scores: dict[str, int | None] = {}
+    connected = total = 0
+    for field, kind in HEALTH_DOMAINS.items():
+        kind_total = stats.get(f"num_{kind}") or 0
+        kind_connected = stats.get(f"num_{kind}_connected") or 0
+        scores[field] = _percent(kind_connected, kind_total)
+        connected += kind_connected
+        total += kind_total
+    return SiteHealthResponse(
+        site_id=site_id,
+        site_name=stats.get("name", ""),
+        overall_score=_percent(connected, total),
+        active_alerts=active_alerts,
+        connected_clients=stats.get("num_clients") or 0,
+        timestamp=timestamp,
+        **scores,
+    )
+
+
+async def _open_alarms(engine: MistEngine, endpoint: str, params: dict) -> dict[str | None, int]:
+    """Open alarm counts per site; empty if Mist cannot count them (health is still served)."""
+    try:
+        data = await engine.get(endpoint, params={"status": "open", **params})
+    except HTTPException as e:
+        logger.warning("Alarm count unavailable: %s", error_detail(e))
+        return {}
+    counts: dict[str | None, int] = {}
+    for row in data.get("results", []):
+        counts[row.get("site_id")] = counts.get(row.get("site_id"), 0) + (row.get("count") or 0)
+    return counts
+
+
+async def build_fleet_health(engine: MistEngine, org_id: str) -> FleetHealthResponse:
+    """Score every site of the org from the org-level site stats listing."""
+    timestamp = datetime.now(UTC).isoformat()
+    alarms = await _open_alarms(engine, f"/api/v1/orgs/{org_id}/alarms/count", {"distinct": "site_id"})
+    results = [
+        site_health(stats["id"], stats, alarms.get(stats["id"], 0), timestamp)
+        async for stats in engine.paginate(f"/api/v1/orgs/{org_id}/stats/sites", limit=SITE_STATS_PAGE)
+    ]
+    return FleetHealthResponse(sites=results, count=len(results), generated_at=timestamp)
+
+
+async def fleet_health(api_host: str, org_id: str, refresh: bool = False) -> FleetHealthResponse:
+    """The org's fleet health snapshot (shared by all workers for `snapshot_ttl`)."""
+    async def build() -> dict:
+        engine = MistEngine(host=api_host)
+        fleet = await build_fleet_health(engine, org_id)
+        await publish_health_changes(org_id, fleet)
+        return fleet.model_dump(mode="json")
+
+    return FleetHealthResponse.model_validate(
+        await get_snapshot_cache().get_or_build(f"fleet_health:{org_id}", build, refresh=refresh)
+    )
+
+
+async def publish_health_changes(org_id: str, fleet: FleetHealthResponse) -> int:
+    """
+    Publish a `health` event for every site whose scores changed since the
+    previous snapshot (the last published scores are kept in a Redis hash).
+
+    Client and alert counts move on every snapshot of a busy site, so they
+    ride along in the event but do not trigger one.
+
+    Returns:
+        Number of sites that changed
+    """
+    key = f"{RedisKeys.HEALTH_STATE_PREFIX}{org_id}"
+    client = get_redis_client().client
+    try:
+        previous = await client.hgetall(key)
+    except redis.RedisError as e:
+        logger.warning("Health change detection unavailable: %s", e)
+        return 0
+
+    changed: dict[str, str] = {}
+    events = []
+    for site in fleet.sites:
+        encoded = json.dumps({field: getattr(site, field) for field in HEALTH_METRICS.values()}, sort_keys=True)
+        if previous.get(site.site_id) != encoded:
+            changed[site.site_id] = encoded
+            events.append({"type": "health", **site.model_dump(mode="json")})
+    if changed:
+        try:
+            await client.hset(key, mapping=changed)
+        except redis.RedisError as e:
+            logger.warning("Health state store failed: %s", e)
+    await get_event_bus().publish(org_id, events)
+    return len(changed)
+
+
+async def _refresh_fleet_health(api_host: str, org_id: str, interval: float) -> None:
+    """Rebuild the org's fleet snapshot (publishing health changes) every `interval` seconds."""
+    while True:
+        try:
+            await fleet_health(api_host, org_id)
+        except Exception as e:  # noqa: BLE001 - retried on the next interval
+            logger.warning("Fleet health refresh failed for org %s: %s", org_id, error_detail(e))
+        await asyncio.sleep(interval)
+
+
+# org_id -> (stream subscribers on this worker, refresh task)
+_health_watchers: dict[str, tuple[int, asyncio.Task]] = {}
+
+
+@asynccontextmanager
+async def watch_fleet_health(api_host: str, org_id: str) -> AsyncIterator[None]:
+    """
+    Keep the org's health events flowing while a stream subscriber is connected.
+
+    One refresh task runs per org and worker, whatever its subscriber count.
+    Snapshots are shared through the snapshot cache, so workers refreshing
+    the same org still build it at most once per `snapshot_ttl`.
+    """
+    interval = get_settings().stream_health_interval
+    if interval <= 0:
+        yield
+        return
+    count, task = _health_watchers.get(org_id, (0, None))
+    if task is None:
+        task = asyncio.create_task(_refresh_fleet_health(api_host, org_id, interval))
+    _health_watchers[org_id] = (count + 1, task)
+    try:
+        yield
+    finally:
+        count, task = _health_watchers.pop(org_id)
+        if count > 1:
+            _health_watchers[org_id] = (count - 1, task)
+        else:
+            task.cancel()
+
+
+def _series(org_id: str, site_id: str) -> str:
+    return f"{org_id}:{site_id}"
+
+
+def health_samples(org_id: str, fleet: FleetHealthResponse) -> list[Sample]:
+    """One sample per scored domain of every site (unscored domains are skipped)."""
+    timestamp = datetime.fromisoformat(fleet.generated_at).timestamp()
+    return [
+        Sample(_series(org_id, site.site_id), metric, timestamp, float(score))
+        for site in fleet.sites
+        for metric, field in HEALTH_METRICS.items()
+        if (score := getattr(site, field)) is not None
+    ]
+
+
+async def sample_fleet_health() -> list[Sample]:
+    """
+    Health samples of the current org (run periodically by the worker).
+
+    A sample costs the org site stats listing and one alarm count, unless a
+    dashboard already built the snapshot within `snapshot_ttl`. It is skipped
+    while the worker's Mist API budget is below `metrics_sample_reserve`, so
+    sampling never takes the tokens provisioning jobs are waiting for.
+    """
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        return []
+    settings = get_settings()
+    if get_rate_limiter().bucket(settings.mist_api_key, api_host).remaining < settings.metrics_sample_reserve:
+        logger.info("Skipping health sample: Mist API budget is reserved for jobs")
+        return []
+    return health_samples(org_id, await fleet_health(api_host, org_id))
+
+
+def verify_signature(secret: str, body: bytes, signature: str | None) -> bool:
+    """Check Mist's X-Mist-Signature-v2 header (hex HMAC-SHA256 of the raw body)."""
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature or "")
+
+
+def alarm_alert(event: dict) -> tuple[float, AlertResponse]:
+    """
+    Convert one Mist alarm webhook event into an alert.
+
+    Returns:
+        (epoch timestamp, alert)
+
+    Raises:
+        KeyError / ValueError: if the event has no ID or timestamp
+    """
+    timestamp = float(event["timestamp"])
+    hostnames = event.get("hostnames") or []
+    devices = [
+        (mac, kind)
+        for kind, field in ((DeviceType.GATEWAY, "gateways"), (DeviceType.SWITCH, "switches"), (DeviceType.AP, "aps"))
+        for mac in event.get(field) or []
+    ]
+    alarm_type = event.get("type", "alarm")
+    return timestamp, AlertResponse(
+        alert_id=event["id"],
+        severity=ALARM_SEVERITY.get(event.get("severity", ""), SeverityLevel.WARNING),
+        alert_type=alarm_type,
+        message=f"{alarm_type} on {', '.join(hostnames)}" if hostnames else alarm_type,
+        site_id=event.get("site_id"),
+        device_id=devices[0][0] if devices else None,
+        device_type=devices[0][1] if devices else None,
+        created_at=datetime.fromtimestamp(timestamp, UTC).isoformat(),
+    )
+
+
+async def _nms_topology() -> Topology:
+    """Device chain of the stored NMS profile (empty if none is saved)."""
+    data = await get_redis_client().get(NMS_KEY)
+    if not data:
+        return Topology()
+    return Topology.from_profile(DeploymentProfile.model_validate_json(data).model_dump())
+
+
+def _incident(doc: dict) -> Incident:
+    """API view of a stored incident."""
+    window = get_correlation_engine().window
+    fields = {k: v for k, v in doc.items() if k in Incident.model_fields}
+    fields.update(
+        opened_at=datetime.fromtimestamp(doc["opened_at"], UTC).isoformat(),
+        updated_at=datetime.fromtimestamp(doc["updated_at"], UTC).isoformat(),
+        active=doc.get("merged_into") is None and doc["updated_at"] + window > datetime.now(UTC).timestamp(),
+    )
+    return Incident(**fields)
+
+
+def _event_filter(types: list[str], site_ids: list[str], severities: list[SeverityLevel]) -> EventFilter:
+    return EventFilter(
+        types=frozenset(types),
+        site_ids=frozenset(site_ids),
+        severities=frozenset(s.value for s in severities),
+    )
+
+
+async def next_event(subscription: Subscription, heartbeat: float) -> dict:
+    """The subscriber's next event, or a `keepalive` after `heartbeat` idle seconds."""
+    try:
+        return await asyncio.wait_for(subscription.get(), heartbeat)
+    except TimeoutError:
+        return {"type": "keepalive"}
+
+
+async def _wait_disconnect(websocket: WebSocket) -> None:
+    """Return when the client closes the socket (messages it sends are ignored)."""
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+def _check_time_range(time_range: str) -> None:
+    if time_range not in TIME_RANGES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid time_range {time_range!r}; use one of {', '.join(TIME_RANGES)}"
+        )
+
+
+async def _domain_sle(org_id: str, site_id: str, metric: str, time_range: str) -> dict:
+    """Trend and sample-weighted score of one recorded metric."""
+    points = await get_timeseries_store().query_range(_series(org_id, site_id), metric, time_range)
+    score = average(points)
+    return {
+        "site_id": site_id,
+        "time_range": time_range,
+        f"{metric}_sles": [
+            {"timestamp": datetime.fromtimestamp(p.timestamp, UTC).isoformat(),
+             "score": round(p.average, 1), "samples": p.count}
+            for p in points
+        ],
+        "score": round(score, 1) if score is not None else None,
+    }
+
+
 # ============================================================================
 # Health & Status Endpoints
 # ============================================================================
@@ -47,27 +411,46 @@ async def get_site_health(
     - Active alert count
     - Connected client count
     """
-    # TODO: Call Mist API for site health
-    return SiteHealthResponse(
-        site_id=site_id,
-        site_name="Sample Site",
-        overall_score=92,
-        wan_health=95,
-        wired_health=90,
-        wireless_health=91,
-        active_alerts=2,
-        connected_clients=145,
-        timestamp=datetime.utcnow().isoformat()
-    )
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
 
+    engine = MistEngine(host=api_host)
+    stats = await engine.get(f"/api/v1/sites/{site_id}/stats", cache=True)
+    alarms = await _open_alarms(engine, f"/api/v1/sites/{site_id}/alarms/count", {})
+    return site_health(site_id, stats, sum(alarms.values()), datetime.now(UTC).isoformat())
 
-@router.get("/health/sites", summary="List all sites health")
+
+@router.get("/health/sites", response_model=FleetHealthResponse, summary="List all sites health")
 async def list_sites_health(
-    min_score: int = Query(0, ge=0, le=100, description="Minimum health score filter")
+    min_score: int = Query(0, ge=0, le=100, description="Minimum health score filter"),
+    refresh: bool = Query(False, description="Rebuild the fleet snapshot instead of serving the cached one"),
 ):
-    """List health scores for all sites, optionally filtered by minimum score."""
-    # TODO: Call Mist API
-    return {"sites": [], "count": 0}
+    """
+    List health scores for all sites, optionally filtered by minimum score.
+
+    Sites are sorted worst first. The fleet snapshot is cached for a short
+    TTL (`generated_at` tells its age); sites without devices have no score
+    and are only listed when `min_score`
+    is 0.
+    """
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    fleet = await fleet_health(api_host, org_id, refresh=refresh)
+    sites = [
+        s for s in fleet.sites
+        if min_score == 0 or (s.overall_score is not None and s.overall_score >= min_score)
+    ]
+    sites.sort(key=lambda s: (s.overall_score is None, s.overall_score or 0))
+    return FleetHealthResponse(sites=sites, count=len(sites), generated_at=fleet.generated_at)
 
 
 @router.get("/health/devices/{device_id}", response_model=DeviceHealthResponse,
@@ -136,22 +519,99 @@ async def get_client_detail(
 # Alerts Endpoints
 # ============================================================================
 
+@router.post("/webhooks/mist", summary="Receive Mist alarm webhooks")
+async def receive_mist_webhook(
+    request: Request,
+    x_mist_signature_v2: str | None = Header(None),
+):
+    """
+    **Mist Webhook Receiver (Day 2 - Assurance)**
+
+    Configure an org webhook for the `alarms` topic with this URL and the
+    `mist_webhook_secret` as its secret. Deliveries are authenticated with
+    the `X-Mist-Signature-v2` HMAC, converted to alerts and stored in one
+    batch; redeliveries of the same alarm are ignored. Other topics are
+    acknowledged and dropped.
+    """
+    secret = get_settings().mist_webhook_secret
+    if not secret:
+        raise HTTPException(status_code=503, detail="Webhook secret is not configured")
+    body = await request.body()
+    if not verify_signature(secret, body, x_mist_signature_v2):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+    try:
+        payload = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid webhook body: {e}") from e
+    if not isinstance(payload, dict) or not isinstance(payload.get("events") or [], list):
+        raise HTTPException(status_code=400, detail="Invalid webhook body: expected an object with an events list")
+
+    topic = payload.get("topic")
+    events = payload.get("events") or []
+    if topic != "alarms":
+        return {"topic": topic, "received": len(events), "new": 0, "invalid": 0, "incidents": 0}
+
+    by_org: dict[str, list[tuple[float, dict]]] = {}
+    invalid = 0
+    for event in events:
+        try:
+            timestamp, alert = alarm_alert(event)
+            org_id = event["org_id"]
+        except (KeyError, TypeError, ValueError):
+            invalid += 1
+            continue
+        by_org.setdefault(org_id, []).append((timestamp, alert.model_dump(mode="json")))
+
+    store = get_alert_store()
+    engine = get_correlation_engine()
+    bus = get_event_bus()
+    topology = await _nms_topology() if by_org else Topology()
+    new = incidents = 0
+    for org_id, alerts in by_org.items():
+        created = await store.ingest(org_id, alerts)
+        created_ids = {alert["alert_id"] for alert in created}
+        touched = await engine.process(org_id, [(t, a) for t, a in alerts if a["alert_id"] in created_ids], topology)
+        await bus.publish(org_id, [
+            *({"type": "alert", **alert} for alert in created),
+            *({"type": "incident", **_incident(doc).model_dump(mode="json")} for doc in touched),
+        ])
+        new += len(created)
+        incidents += len(touched)
+    if invalid:
+        logger.warning("Dropped %d malformed alarm events", invalid)
+    return {"topic": topic, "received": len(events), "new": new, "invalid": invalid, "incidents": incidents}
+
+
 @router.get("/alerts", summary="List active alerts")
 async def list_alerts(
     site_id: str | None = None,
     severity: SeverityLevel | None = None,
-    acknowledged: bool | None = None
+    acknowledged: bool | None = None,
+    limit: int = Query(100, ge=1, le=1000, description="Newest alerts returned")
 ):
     """
     **List Active Alerts (Day 2 - Assurance)**
-    
-    Returns network alerts filtered by:
+
+    Returns the newest webhook-delivered alerts filtered by:
     - Site
     - Severity level
     - Acknowledgement status
     """
-    # TODO: Call Mist API
-    return {"alerts": [], "count": 0}
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    alerts = await get_alert_store().query(
+        org_id,
+        site_id=site_id,
+        severity=severity.value if severity else None,
+        acknowledged=acknowledged,
+        limit=limit,
+    )
+    return {"alerts": [AlertResponse.model_validate(a) for a in alerts], "count": len(alerts)}
 
 
 @router.get("/alerts/{alert_id}", response_model=AlertResponse,
@@ -160,32 +620,175 @@ async def get_alert(
     alert_id: str
 ):
     """Get detailed information about a specific alert."""
-    # TODO: Call Mist API
-    return AlertResponse(
-        alert_id=alert_id,
-        severity=SeverityLevel.WARNING,
-        alert_type="ap_disconnected",
-        message="AP-Floor2-003 has been disconnected for 15 minutes",
-        site_id="site-1-5",
-        device_id="ap-12345",
-        created_at=datetime.utcnow().isoformat(),
-        acknowledged=False
-    )
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    alert = await get_alert_store().get(org_id, alert_id)
+    if alert is None:
+        raise HTTPException(status_code=404, detail=f"Alert not found: {alert_id}")
+    return AlertResponse.model_validate(alert)
 
 
 @router.post("/alerts/acknowledge", summary="Acknowledge alerts")
 async def acknowledge_alerts(
     request: AlertAcknowledge
 ):
-    """Acknowledge one or more alerts."""
-    # TODO: Call Mist API
+    """Acknowledge one or more alerts (unknown or expired IDs are listed in `not_found`)."""
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    found = await get_alert_store().acknowledge(org_id, request.alert_ids)
+    await get_event_bus().publish(org_id, ({"type": "alert", **alert} for alert in found))
+    known = {alert["alert_id"] for alert in found}
     return {
-        "acknowledged_count": len(request.alert_ids),
-        "alert_ids": request.alert_ids,
+        "acknowledged_count": len(found),
+        "alert_ids": [alert["alert_id"] for alert in found],
+        "not_found": [a for a in request.alert_ids if a not in known],
         "status": "acknowledged"
     }
 
 
+@router.get("/incidents", response_model=IncidentListResponse, summary="List correlated incidents")
+async def list_incidents(
+    site_id: str | None = None,
+    active: bool | None = Query(None, description="Only incidents still collecting alerts (or only closed ones)"),
+    limit: int = Query(100, ge=1, le=1000, description="Most recently updated incidents returned")
+):
+    """
+    **List Incidents (Day 2 - Assurance)**
+
+    Alerts are grouped per site under the most upstream device alerting
+    (gateway, then switch, then AP), so an uplink drop shows as one incident
+    instead of one alert per AP. Repeats of the same alert within the
+    correlation window are counted in `duplicate_count`.
+    """
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    incidents = [_incident(doc) for doc in await get_correlation_engine().query(org_id, site_id, limit)]
+    if active is not None:
+        incidents = [i for i in incidents if i.active == active]
+    return IncidentListResponse(incidents=incidents, count=len(incidents))
+
+
+@router.get("/incidents/{incident_id}", response_model=IncidentDetail, summary="Get incident details")
+async def get_incident(
+    incident_id: str
+):
+    """Get an incident with its alerts (merged incidents point to the one that absorbed them)."""
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    found = await get_correlation_engine().get(org_id, incident_id)
+    if found is None:
+        raise HTTPException(status_code=404, detail=f"Incident not found: {incident_id}")
+    doc, alert_ids = found
+    alerts = await get_alert_store().get_many(org_id, alert_ids)
+    return IncidentDetail(
+        **_incident(doc).model_dump(),
+        alerts=sorted((AlertResponse.model_validate(a) for a in alerts), key=lambda a: a.created_at),
+    )
+
+
+# ============================================================================
+# Live Event Streams
+# ============================================================================
+
+@router.get("/stream", summary="Stream alert and health events (SSE)",
+            response_class=StreamingResponse, responses={200: {"content": {"text/event-stream": {}}}})
+async def stream_events(
+    types: list[EventType] = Query([], description="Event types (default: all)"),
+    site_id: list[str] = Query([], description="Only these sites (default: all)"),
+    severity: list[SeverityLevel] = Query([], description="Only alerts of these severities (default: all)"),
+):
+    """
+    **Live Events (Day 2 - Assurance)**
+
+    Server-Sent Events stream of the current org's events:
+    - `alert`: a new or acknowledged alert (full alert state)
+    - `health`: a site whose health changed between fleet snapshots (refreshed
+      every `stream_health_interval` seconds while anyone is subscribed)
+    - `incident`: an incident opened, grew, or was merged into another
+    - `lagged`: events were dropped because this client fell behind; resync
+      from `GET /assurance/alerts` and `GET /assurance/health/sites`
+
+    A comment line is sent every `stream_heartbeat` seconds while idle.
+    """
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    event_filter = _event_filter(types, site_id, severity)
+    heartbeat = get_settings().stream_heartbeat
+
+    async def events() -> AsyncIterator[str]:
+        async with get_event_bus().subscribe(org_id, event_filter) as subscription, \
+                watch_fleet_health(api_host, org_id):
+            while True:
+                event = await next_event(subscription, heartbeat)
+                if event["type"] == "keepalive":
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@router.websocket("/ws")
+async def stream_events_ws(
+    websocket: WebSocket,
+    types: list[EventType] = Query([]),
+    site_id: list[str] = Query([]),
+    severity: list[SeverityLevel] = Query([]),
+):
+    """
+    WebSocket stream of the same events as `GET /assurance/stream`, one JSON
+    object per message (`keepalive` messages are sent while idle).
+    """
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        await websocket.close(code=1008, reason="Missing api_host or org_id. Call POST /org/self first.")
+        return
+
+    await websocket.accept()
+    heartbeat = get_settings().stream_heartbeat
+    async with get_event_bus().subscribe(org_id, _event_filter(types, site_id, severity)) as subscription, \
+            watch_fleet_health(api_host, org_id):
+        disconnected = asyncio.create_task(_wait_disconnect(websocket))
+        try:
+            while not disconnected.done():
+                sender = asyncio.create_task(next_event(subscription, heartbeat))
+                await asyncio.wait({sender, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+                if not sender.done():
+                    sender.cancel()
+                    break
+                await websocket.send_json(sender.result())
+        except WebSocketDisconnect:
+            pass
+        finally:
+            disconnected.cancel()
+
+
 # ============================================================================
 # SLE (Service Level Expectations) Endpoints
 # ============================================================================
@@ -198,45 +801,89 @@ async def get_sle_report(
 ):
     """
     **Get Service Level Expectations Report (Day 2 - Assurance)**
-    
-    Returns SLE metrics including:
-    - Time to Connect
-    - Throughput
-    - Coverage
-    - Capacity
-    - Roaming
+
+    Returns the average score of each health domain (overall, WAN, wired,
+    wireless) over the time range, read from locally recorded samples.
+    Metrics without samples in the range are omitted; 404 if the site has
+    none at all.
     """
-    # TODO: Call Mist API
+    _check_time_range(time_range)
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    store = get_timeseries_store()
+    metrics = []
+    overall = None
+    for metric in HEALTH_METRICS:
+        score = average(await store.query_range(_series(org_id, site_id), metric, time_range))
+        if score is None:
+            continue
+        if metric == "overall":
+            overall = score
+        metrics.append(SLEMetric(name=metric, score=round(score, 1)))
+    if not metrics:
+        raise HTTPException(status_code=404, detail=f"No samples recorded for site {site_id} in the last {time_range}")
     return SLEReport(
         site_id=site_id,
         time_range=time_range,
-        metrics=[],
-        overall_sle_score=94.5
+        metrics=metrics,
+        overall_sle_score=round(overall if overall is not None else sum(m.score for m in metrics) / len(metrics), 1)
     )
 
 
 @router.get("/sle/wireless/{site_id}", summary="Get wireless SLEs")
 async def get_wireless_sle(
-    site_id: str
+    site_id: str,
+    time_range: str = Query("24h", description="Time range: 1h, 24h, 7d, 30d")
 ):
-    """Get wireless-specific SLE metrics."""
-    return {"site_id": site_id, "wireless_sles": [], "score": 0}
+    """Get the wireless health trend (one point per rollup bucket) and its average."""
+    _check_time_range(time_range)
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    return await _domain_sle(org_id, site_id, "wireless", time_range)
 
 
 @router.get("/sle/wired/{site_id}", summary="Get wired SLEs")
 async def get_wired_sle(
-    site_id: str
+    site_id: str,
+    time_range: str = Query("24h", description="Time range: 1h, 24h, 7d, 30d")
 ):
-    """Get wired-specific SLE metrics."""
-    return {"site_id": site_id, "wired_sles": [], "score": 0}
+    """Get the wired health trend (one point per rollup bucket) and its average."""
+    _check_time_range(time_range)
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    return await _domain_sle(org_id, site_id, "wired", time_range)
 
 
 @router.get("/sle/wan/{site_id}", summary="Get WAN SLEs")
 async def get_wan_sle(
-    site_id: str
+    site_id: str,
+    time_range: str = Query("24h", description="Time range: 1h, 24h, 7d, 30d")
 ):
-    """Get WAN-specific SLE metrics."""
-    return {"site_id": site_id, "wan_sles": [], "score": 0}
+    """Get the WAN health trend (one point per rollup bucket) and its average."""
+    _check_time_range(time_range)
+    api_host, org_id = await get_context()
+    if not api_host or not org_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing api_host or org_id. Call POST /org/self first."
+        )
+
+    return await _domain_sle(org_id, site_id, "wan", time_range)
 
 
 # ============================================================================
@@ -0,0 +1,152 @@
+"""
+Assurance Models - Monitoring & Insights
+Site and device health, client insights, alerts, SLEs, and Marvis.
+"""
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+
+class SeverityLevel(str, Enum):
+    """Alert severity."""
+    CRITICAL = "critical"
+    WARNING = "warning"
+    INFO = "info"
+
+
+class DeviceType(str, Enum):
+    """Managed device type."""
+    AP = "ap"
+    SWITCH = "switch"
+    GATEWAY = "gateway"
+
+
+class SiteHealthResponse(BaseModel):
+    """
+    Health of one site.
+
+    Domain scores are the percentage of the domain's devices connected
+    (gateways for WAN, switches for wired, APs for wireless); None when the
+    site has no device of that domain.
+    """
+    site_id: str
+    site_name: str
+    overall_score: int | None = Field(None, ge=0, le=100, description="Connected share of all devices")
+    wan_health: int | None = Field(None, ge=0, le=100)
+    wired_health: int | None = Field(None, ge=0, le=100)
+    wireless_health: int | None = Field(None, ge=0, le=100)
+    active_alerts: int = 0
+    connected_clients: int = 0
+    timestamp: str
+
+
+class FleetHealthResponse(BaseModel):
+    """Health of every site in the org (worst first)."""
+    sites: list[SiteHealthResponse]
+    count: int
+    generated_at: str = Field(..., description="When the snapshot was taken")
+
+
+class DeviceHealthResponse(BaseModel):
+    """Health of one device."""
+    device_id: str
+    device_type: DeviceType
+    name: str
+    mac: str
+    status: str
+    uptime_seconds: int
+    cpu_usage: float
+    memory_usage: float
+    last_seen: str
+
+
+class ClientInsight(BaseModel):
+    """Connection details of one client."""
+    client_mac: str
+    username: str | None = None
+    ssid: str | None = None
+    vlan: int | None = None
+    ip_address: str | None = None
+    signal_strength: int | None = Field(None, description="RSSI in dBm")
+    connection_quality: str
+    connected_since: str
+
+
+class AlertResponse(BaseModel):
+    """A network alert."""
+    alert_id: str
+    severity: SeverityLevel
+    alert_type: str
+    message: str
+    site_id: str | None = None
+    device_id: str | None = None
+    device_type: DeviceType | None = None
+    created_at: str
+    acknowledged: bool = False
+
+
+class AlertAcknowledge(BaseModel):
+    """Alerts to acknowledge."""
+    alert_ids: list[str] = Field(..., min_length=1, description="Alert IDs")
+
+
+class Incident(BaseModel):
+    """
+    Correlated alerts of one site, rooted at the most upstream device alerting.
+
+    Duplicates (same type and device within the correlation window) are
+    counted, not listed.
+    """
+    incident_id: str
+    site_id: str | None = None
+    severity: SeverityLevel = Field(..., description="Most severe alert in the incident")
+    root_alert_id: str
+    root_alert_type: str | None = None
+    root_device_id: str | None = None
+    root_device_type: DeviceType | None = None
+    alert_count: int
+    duplicate_count: int = 0
+    opened_at: str
+    updated_at: str
+    active: bool = Field(..., description="Still collecting alerts (last alert within the correlation window)")
+    merged_into: str | None = Field(None, description="Incident that absorbed this one")
+
+
+class IncidentListResponse(BaseModel):
+    """Incidents, most recently updated first."""
+    incidents: list[Incident]
+    count: int
+
+
+class IncidentDetail(Incident):
+    """An incident with its alerts."""
+    alerts: list[AlertResponse] = Field(default_factory=list)
+
+
+class SLEMetric(BaseModel):
+    """One Service Level Expectation."""
+    name: str
+    score: float = Field(..., ge=0, le=100)
+
+
+class SLEReport(BaseModel):
+    """SLE metrics of a site over a time range."""
+    site_id: str
+    time_range: str
+    metrics: list[SLEMetric] = Field(default_factory=list)
+    overall_sle_score: float
+
+
+class MarvisQuery(BaseModel):
+    """Natural-language question for Marvis."""
+    query: str = Field(..., description="Question in plain language")
+    site_id: str | None = Field(None, description="Limit the question to one site")
+
+
+class MarvisResponse(BaseModel):
+    """Marvis answer."""
+    query: str
+    answer: str
+    confidence: float = Field(..., ge=0, le=1)
+    suggested_actions: list[str] = Field(default_factory=list)
+    related_insights: list[str] = Field(default_factory=list)
@@ -0,0 +1,41 @@
+"""
+Background Jobs.
+
+Status, progress and cancellation of operations started with
+`background=true` (see services/jobs).
+"""
+from fastapi import APIRouter, HTTPException
+
+from src.services.jobs import JobInfo, cancel_job, get_job
+
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+# =============================================================================
+# Endpoints
+# =============================================================================
+
+@router.get("/{job_id}", response_model=JobInfo, summary="Get job status and results")
+async def get_job_status(job_id: str):
+    """
+    Returns the status and progress (`done` of `total` items) of a job.
+    Once finished, `result` holds the same body the endpoint returns inline
+    (e.g. per-item bulk results).
+    """
+    job = await get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job: {job_id}")
+    return job
+
+
+@router.post("/{job_id}/cancel", response_model=JobInfo, summary="Cancel a job")
+async def cancel(job_id: str):
+    """
+    Cancels a job. Queued jobs never start; running jobs stop starting new
+    items, and items already in flight complete. Finished jobs are unchanged.
+    """
+    job = await cancel_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job: {job_id}")
+    return job
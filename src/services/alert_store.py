@@ -0,0 +1,182 @@
+"""
+Alert Store - Webhook-fed alerts with secondary indexes in Redis.
+
+Alerts are pushed by Mist webhooks rather than polled, and are stored per
+org as JSON documents with sorted-set indexes scored by creation time:
+
+    alerts:{org_id}:{alert_id}         document (expires after `alert_retention`)
+    alerts:{org_id}:idx:all            every alert
+    alerts:{org_id}:idx:site:{id}      by site
+    alerts:{org_id}:idx:severity:{s}   by severity
+    alerts:{org_id}:idx:ack:{0|1}      by acknowledgement
+
+Listings read the newest IDs of the matching index (ZREVRANGE with the
+limit); several filters are first intersected into a short-lived key
+(ZINTERSTORE). Documents are then read in one MGET, so a burst of thousands
+of alarms never turns into a scan. Ingest is two pipelined round trips per batch regardless of its size;
+redelivered alerts (Mist retries webhooks) are detected with SET NX and keep
+their acknowledgement.
+"""
+import json
+import time
+import uuid
+
+from src.config import get_settings
+from src.services.redis import RedisKeys, get_redis_client
+
+
+# Seconds an intersection of filter indexes is kept (it is read right away)
+QUERY_TTL = 10
+
+
+class AlertStore:
+    """Indexed alert documents of every org."""
+
+    def __init__(self, retention: int = 7 * 24 * 3600):
+        """
+        Initialize the store.
+
+        Args:
+            retention: Seconds an alert is kept after it is received
+        """
+        self.retention = retention
+
+    @staticmethod
+    def _doc(org_id: str, alert_id: str) -> str:
+        return f"{RedisKeys.ALERT_PREFIX}{org_id}:{alert_id}"
+
+    @staticmethod
+    def _index(org_id: str, *parts: object) -> str:
+        return f"{RedisKeys.ALERT_PREFIX}{org_id}:idx:" + ":".join(str(p) for p in parts)
+
+    def _indexes(self, org_id: str, alert: dict) -> list[str]:
+        keys = [
+            self._index(org_id, "all"),
+            self._index(org_id, "severity", alert["severity"]),
+            self._index(org_id, "ack", int(bool(alert.get("acknowledged")))),
+        ]
+        if alert.get("site_id"):
+            keys.append(self._index(org_id, "site", alert["site_id"]))
+        return keys
+
+    async def ingest(self, org_id: str, alerts: list[tuple[float, dict]]) -> list[dict]:
+        """
+        Store new alerts and index them; alerts already stored are left as is.
+
+        Args:
+            org_id: Org the alerts belong to
+            alerts: (epoch timestamp, document) pairs; documents need
+                `alert_id`, `severity`, and optionally `site_id` / `acknowledged`
+
+        Returns:
+            The alerts that were new
+        """
+        if not alerts:
+            return []
+        client = get_redis_client().client
+        pipe = client.pipeline(transaction=False)
+        for _, alert in alerts:
+            pipe.set(self._doc(org_id, alert["alert_id"]), json.dumps(alert), nx=True, ex=self.retention)
+        created = await pipe.execute()
+
+        cutoff = time.time() - self.retention
+        touched: set[str] = set()
+        pipe = client.pipeline(transaction=False)
+        new = []
+        for (timestamp, alert), is_new in zip(alerts, created):
+            if not is_new:
+                continue
+            new.append(alert)
+            for key in self._indexes(org_id, alert):
+                pipe.zadd(key, {alert["alert_id"]: timestamp})
+                touched.add(key)
+        for key in touched:
+            pipe.zremrangebyscore(key, "-inf", f"({cutoff}")
+        if new:
+            await pipe.execute()
+        return new
+
+    async def get(self, org_id: str, alert_id: str) -> dict | None:
+        """One alert document, or None if unknown or expired."""
+        raw = await get_redis_client().client.get(self._doc(org_id, alert_id))
+        return json.loads(raw) if raw else None
+
+    async def query(
+        self,
+        org_id: str,
+        site_id: str | None = None,
+        severity: str | None = None,
+        acknowledged: bool | None = None,
+        limit: int = 100,
+    ) -> list[dict]:
+        """Newest alerts matching every given filter."""
+        keys = []
+        if site_id is not None:
+            keys.append(self._index(org_id, "site", site_id))
+        if severity is not None:
+            keys.append(self._index(org_id, "severity", severity))
+        if acknowledged is not None:
+            keys.append(self._index(org_id, "ack", int(acknowledged)))
+
+        client = get_redis_client().client
+        if len(keys) <= 1:
+            ids = await client.zrevrange(keys[0] if keys else self._index(org_id, "all"), 0, limit - 1)
+        else:
+            # Intersect server side and read only the page, not the whole result.
+            temp = self._index(org_id, "query", uuid.uuid4().hex)
+            pipe = client.pipeline(transaction=True)
+            pipe.zinterstore(temp, keys, aggregate="MAX")
+            pipe.expire(temp, QUERY_TTL)
+            pipe.zrevrange(temp, 0, limit - 1)
+            pipe.delete(temp)
+            ids = (await pipe.execute())[2]
+        return await self.get_many(org_id, ids)
+
+    async def get_many(self, org_id: str, alert_ids: list[str]) -> list[dict]:
+        """Alert documents in the given order (unknown or expired ones are skipped)."""
+        if not alert_ids:
+            return []
+        docs = await get_redis_client().client.mget([self._doc(org_id, alert_id) for alert_id in alert_ids])
+        return [json.loads(raw) for raw in docs if raw]
+
+    async def acknowledge(self, org_id: str, alert_ids: list[str]) -> list[dict]:
+        """
+        Mark alerts acknowledged and move them to the acknowledged index.
+
+        Returns:
+            The alerts that exist (acknowledged now or before)
+        """
+        client = get_redis_client().client
+        unacked, acked = self._index(org_id, "ack", 0), self._index(org_id, "ack", 1)
+        pipe = client.pipeline(transaction=False)
+        pipe.mget([self._doc(org_id, alert_id) for alert_id in alert_ids])
+        for alert_id in alert_ids:
+            pipe.zscore(unacked, alert_id)
+        docs, *scores = await pipe.execute()
+
+        found = []
+        pipe = client.pipeline(transaction=False)
+        for alert_id, raw, score in zip(alert_ids, docs, scores):
+            if not raw:
+                continue
+            alert = json.loads(raw)
+            found.append(alert)
+            if alert.get("acknowledged"):
+                continue
+            alert["acknowledged"] = True
+            pipe.set(self._doc(org_id, alert_id), json.dumps(alert), keepttl=True)
+            pipe.zadd(acked, {alert_id: score if score is not None else time.time()})
+            pipe.zrem(unacked, alert_id)
+        await pipe.execute()
+        return found
+
+
+# Singleton instance
+_store: AlertStore | None = None
+
+
+def get_alert_store() -> AlertStore:
+    global _store
+    if _store is None:
+        _store = AlertStore(retention=get_settings().alert_retention)
+    return _store
@@ -0,0 +1,191 @@
+"""
+Bulk Operations - Bounded fan-out and per-item result reporting.
+
+Bulk endpoints (sites, inventory, templates, PSKs) share the same shape: run one
+Mist call per item with a concurrency cap, never let one failure abort the
+batch, and report a per-item outcome. The MistEngine rate limiter still
+applies underneath, so the cap bounds in-flight work, not the API budget.
+"""
+import asyncio
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from enum import Enum
+from typing import TypeVar
+
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, Field, ValidationError
+
+from src.services.jobs import current_job
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+CSV_MEDIA_TYPE = "text/csv"
+JSONL_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl", "application/x-jsonlines")
+
+
+# =============================================================================
+# Models
+# =============================================================================
+
+class BulkItemStatus(str, Enum):
+    """Outcome of one item in a bulk operation."""
+    SUCCEEDED = "succeeded"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+
+class BulkItemResult(BaseModel):
+    """Result for a single item of a bulk request."""
+    index: int = Field(..., description="Position of the item in the request")
+    key: str = Field(..., description="Natural key of the item (site name, serial, ...)")
+    status: BulkItemStatus
+    id: str | None = Field(None, description="Mist object ID when created or updated")
+    detail: str | None = Field(None, description="Skip reason or error message")
+
+
+class BulkResponse(BaseModel):
+    """Summary and per-item results of a bulk request."""
+    total: int
+    succeeded: int
+    skipped: int
+    failed: int
+    results: list[BulkItemResult]
+
+    @classmethod
+    def from_results(cls, results: list[BulkItemResult]) -> "BulkResponse":
+        """Build the summary counters from per-item results."""
+        results = sorted(results, key=lambda r: r.index)
+        counts = {status: 0 for status in BulkItemStatus}
+        for result in results:
+            counts[result.status] += 1
+        return cls(
+            total=len(results),
+            succeeded=counts[BulkItemStatus.SUCCEEDED],
+            skipped=counts[BulkItemStatus.SKIPPED],
+            failed=counts[BulkItemStatus.FAILED],
+            results=results,
+        )
+
+
+# =============================================================================
+# Fan-out
+# =============================================================================
+
+def error_detail(error: Exception) -> str:
+    """Human-readable message for a failed item."""
+    if isinstance(error, HTTPException):
+        return f"{error.status_code}: {error.detail}"
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors()
+        )
+    return str(error)
+
+
+async def run_bounded(
+    items: Sequence[T],
+    worker: Callable[[T], Awaitable[R]],
+    concurrency: int,
+    on_result: Callable[[int, R | Exception], None] | None = None,
+) -> list[R | Exception]:
+    """
+    Run `worker` over `items` with at most `concurrency` calls in flight.
+
+    Exceptions are returned in place of results rather than raised, so one
+    failing item never cancels its siblings. When running inside a background
+    job, progress is reported to it and, once the job is cancelled, items not
+    yet started fail with JobCancelled.
+
+    Args:
+        items: Work items
+        worker: Async callable applied to each item
+        concurrency: Maximum simultaneous calls
+        on_result: Optional callback (index, result) fired as each item finishes
+
+    Returns:
+        Results (or exceptions) in the same order as `items`
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    job = current_job.get()
+    if job is not None:
+        await job.add_total(len(items))
+
+    async def run(index: int, item: T) -> R | Exception:
+        async with semaphore:
+            try:
+                if job is not None:
+                    await job.check_cancelled()
+                result = await worker(item)
+            except Exception as e:  # noqa: BLE001 - failures are reported per item
+                result = e
+        if job is not None:
+            await job.advance()
+        if on_result is not None:
+            on_result(index, result)
+        return result
+
+    return await asyncio.gather(*(run(i, item) for i, item in enumerate(items)))
+
+
+# =============================================================================
+# Upload Parsing
+# =============================================================================
+
+async def _iter_lines(request: Request) -> AsyncIterator[str]:
+    """Yield decoded lines from a streamed request body."""
+    # Incremental decoding keeps multi-byte characters split across chunks intact.
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in request.stream():
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def iter_records(request: Request) -> AsyncIterator[dict]:
+    """
+    Stream records from a CSV or JSON Lines request body.
+
+    CSV uploads need a header row; empty cells are left out of the record, so
+    optional fields take their defaults. JSON Lines records must be objects.
+    Each record must fit on one line. Records are yielded as the body arrives, so uploads of
+    any size are parsed without buffering the whole file.
+
+    Raises:
+        HTTPException: 415 for other content types, 400 for malformed lines
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type not in (CSV_MEDIA_TYPE, *JSONL_MEDIA_TYPES):
+        raise HTTPException(
+            status_code=415,
+            detail=f"Upload must be {CSV_MEDIA_TYPE} or application/x-ndjson",
+        )
+
+    header: list[str] | None = None
+    line_number = 0
+    async for line in _iter_lines(request):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            if content_type == CSV_MEDIA_TYPE:
+                row = next(csv.reader([line]))
+                if header is None:
+                    header = [h.strip() for h in row]
+                    continue
+                yield {k: v for k, v in zip(header, row) if v != ""}
+            else:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise HTTPException(status_code=400,
+                                        detail=f"Record on line {line_number} is not a JSON object")
+                yield record
+        except (csv.Error, json.JSONDecodeError) as e:
+            raise HTTPException(status_code=400, detail=f"Malformed record on line {line_number}: {e}")
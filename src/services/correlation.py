@@ -0,0 +1,301 @@
+"""
+Alert Correlation - Dedup and topology grouping of alerts into incidents.
+
+Runs on every batch of new alerts (one webhook delivery):
+
+- Dedup: alerts with the same site, type and device within a sliding
+  correlation window are duplicates. They are counted on their incident,
+  not added to it.
+- Grouping: an alert joins the site's open incident rooted at the most
+  upstream device above it (gateway -> switch -> AP). The chain comes from
+  the NMS deployment profile when both devices are in it, and from the device
+  type otherwise. An alert with nothing open above it opens a new incident.
+  That incident absorbs the open incidents below it, so a root that arrives
+  after its symptoms still ends up as the root.
+
+Incidents stay open while their own alerts keep arriving within the window;
+an incident idle for longer is closed even if its site is still busy. All state
+lives in Redis with TTLs (open incidents for the window, incidents for
+`alert_retention`), and nothing is kept in-process between batches, so memory
+is bounded however long a storm lasts. Each batch costs two pipelined round
+trips. Two workers correlating the same site at the same moment can split one
+incident in two; the next upstream alert merges them.
+"""
+import json
+import time
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from src.config import get_settings
+from src.services.redis import RedisKeys, get_redis_client
+
+
+# Device type -> position in the topology (lower is more upstream)
+DEVICE_RANK = {"gateway": 0, "switch": 1, "ap": 2}
+
+# Rank of alerts without a known device (site-level alarms)
+SITE_RANK = len(DEVICE_RANK)
+
+SEVERITY_ORDER = ["critical", "warning", "info"]
+
+
+@dataclass
+class Topology:
+    """Device MAC -> (device type, parent MAC) for the devices of a deployment."""
+    devices: dict[str, tuple[str, str | None]] = field(default_factory=dict)
+
+    @classmethod
+    def from_profile(cls, profile: dict) -> "Topology":
+        """
+        Build the chain of an NMS deployment profile.
+
+        Every AP hangs off the first switch and every switch off the first
+        gateway (the profile models one of each tier per site).
+        """
+        gateways = [profile[f"ssr{i}_mac"] for i in range(1, 5) if profile.get(f"ssr{i}_mac")]
+        switches = [profile["ex1_mac"]] if profile.get("ex1_mac") else []
+        aps = [profile["ap1_mac"]] if profile.get("ap1_mac") else []
+        devices: dict[str, tuple[str, str | None]] = {mac: ("gateway", None) for mac in gateways}
+        devices.update({mac: ("switch", gateways[0] if gateways else None) for mac in switches})
+        uplink = switches[0] if switches else (gateways[0] if gateways else None)
+        devices.update({mac: ("ap", uplink) for mac in aps})
+        return cls({_normalize(mac): (kind, parent and _normalize(parent)) for mac, (kind, parent) in devices.items()})
+
+    def ancestors(self, mac: str | None) -> list[str]:
+        """Upstream devices of `mac`, nearest first (empty if unknown)."""
+        chain = []
+        mac = _normalize(mac) if mac else None
+        while mac in self.devices and (mac := self.devices[mac][1]) is not None and mac not in chain:
+            chain.append(mac)
+        return chain
+
+    def device_type(self, mac: str | None) -> str | None:
+        entry = self.devices.get(_normalize(mac)) if mac else None
+        return entry[0] if entry else None
+
+
+def _normalize(mac: str) -> str:
+    return mac.replace(":", "").replace("-", "").lower()
+
+
+def _rank(device_type: str | None) -> int:
+    return DEVICE_RANK.get(device_type or "", SITE_RANK)
+
+
+def _more_severe(a: str, b: str) -> str:
+    order = {s: i for i, s in enumerate(SEVERITY_ORDER)}
+    return a if order.get(a, len(order)) <= order.get(b, len(order)) else b
+
+
+class CorrelationEngine:
+    """Groups alerts into incidents, per org, in Redis."""
+
+    def __init__(self, window: int = 300, retention: int = 7 * 24 * 3600):
+        """
+        Initialize the engine.
+
+        Args:
+            window: Seconds an incident stays open (and duplicates are
+                detected) after its last alert
+            retention: Seconds an incident is kept after its last update
+        """
+        self.window = window
+        self.retention = retention
+
+    @staticmethod
+    def _key(org_id: str, *parts: str) -> str:
+        return f"{RedisKeys.INCIDENT_PREFIX}{org_id}:" + ":".join(parts)
+
+    def _fingerprint(self, org_id: str, alert: dict) -> str:
+        return self._key(org_id, "fp", alert.get("site_id") or "-", alert.get("alert_type") or "-",
+                         alert.get("device_id") or "-")
+
+    def _is_open(self, incident: dict, timestamp: float) -> bool:
+        return incident["updated_at"] + self.window >= timestamp
+
+    def _is_upstream(self, topology: Topology, root: dict, alert: dict) -> bool:
+        """Whether the incident root `root` sits above the device of `alert`."""
+        root_device, device = root.get("root_device_id"), alert.get("device_id")
+        if topology.device_type(root_device) and topology.device_type(device):
+            return _normalize(root_device) in topology.ancestors(device)
+        return root["rank"] < _rank(alert.get("device_type"))
+
+    async def process(self, org_id: str, alerts: Iterable[tuple[float, dict]], topology: Topology) -> list[dict]:
+        """
+        Correlate new alerts.
+
+        Args:
+            org_id: Org of the alerts
+            alerts: (epoch timestamp, alert document) pairs
+            topology: Device chain used to group alerts
+
+        Returns:
+            The incidents created or updated, absorbed ones included
+        """
+        batch = []
+        for timestamp, alert in alerts:
+            if not alert.get("device_type"):
+                alert = {**alert, "device_type": topology.device_type(alert.get("device_id"))}
+            batch.append((timestamp, alert))
+        if not batch:
+            return []
+        # Upstream alerts first, so symptoms in the same batch find their root.
+        batch.sort(key=lambda item: (_rank(item[1]["device_type"]), item[0]))
+        site_ids = sorted({alert.get("site_id") or "-" for _, alert in batch})
+
+        client = get_redis_client().client
+        pipe = client.pipeline(transaction=False)
+        for site_id in site_ids:
+            pipe.hgetall(self._key(org_id, "open", site_id))
+        for _, alert in batch:
+            fingerprint = self._fingerprint(org_id, alert)
+            pipe.set(fingerprint, "", nx=True, ex=self.window)
+            pipe.get(fingerprint)
+        results = await pipe.execute()
+        open_by_site = {
+            site_id: {incident_id: json.loads(raw) for incident_id, raw in entries.items()}
+            for site_id, entries in zip(site_ids, results[:len(site_ids)])
+        }
+        fingerprints = results[len(site_ids):]
+
+        touched: dict[str, dict] = {}
+        members: dict[str, list[str]] = {}
+        merges: list[tuple[str, dict]] = []   # (surviving incident ID, absorbed incident)
+        claims: dict[str, str] = {}           # new fingerprint -> incident ID
+        sliding: list[str] = []               # duplicate fingerprints whose window restarts
+        for i, (timestamp, alert) in enumerate(batch):
+            fingerprint = self._fingerprint(org_id, alert)
+            is_new, owner = fingerprints[2 * i], claims.get(fingerprint) or fingerprints[2 * i + 1]
+            if fingerprint in claims:
+                is_new = False
+            site_id = alert.get("site_id") or "-"
+            incidents = open_by_site[site_id]
+            candidates = [inc for inc in incidents.values() if self._is_open(inc, timestamp)]
+
+            if not is_new and owner:
+                incident = next((inc for inc in candidates
+                                 if inc["incident_id"] == owner or owner in inc["absorbed"]), None)
+                if incident is not None:
+                    sliding.append(fingerprint)
+                    incident["duplicate_count"] += 1
+                    incident["updated_at"] = max(incident["updated_at"], timestamp)
+                    touched[incident["incident_id"]] = incident
+                    continue
+
+            parents = [inc for inc in candidates if self._is_upstream(topology, inc, alert)]
+            if parents:
+                incident = min(parents, key=lambda inc: (inc["rank"], inc["opened_at"]))
+                incident["alert_count"] += 1
+                incident["severity"] = _more_severe(incident["severity"], alert["severity"])
+                incident["updated_at"] = max(incident["updated_at"], timestamp)
+            else:
+                incident = {
+                    "incident_id": uuid.uuid4().hex,
+                    "site_id": alert.get("site_id"),
+                    "root_alert_id": alert["alert_id"],
+                    "root_alert_type": alert.get("alert_type"),
+                    "root_device_id": alert.get("device_id"),
+                    "root_device_type": alert["device_type"],
+                    "rank": _rank(alert["device_type"]),
+                    "severity": alert["severity"],
+                    "opened_at": timestamp,
+                    "updated_at": timestamp,
+                    "alert_count": 1,
+                    "duplicate_count": 0,
+                    "absorbed": [],
+                }
+                for other in [inc for inc in candidates if self._is_upstream(
+                        topology, incident, {"device_id": inc["root_device_id"],
+                                             "device_type": inc["root_device_type"]})]:
+                    del incidents[other["incident_id"]]
+                    touched.pop(other["incident_id"], None)
+                    incident["alert_count"] += other["alert_count"]
+                    incident["duplicate_count"] += other["duplicate_count"]
+                    incident["severity"] = _more_severe(incident["severity"], other["severity"])
+                    incident["opened_at"] = min(incident["opened_at"], other["opened_at"])
+                    incident["absorbed"] += [other["incident_id"], *other["absorbed"]]
+                    merges.append((incident["incident_id"], other))
+                incidents[incident["incident_id"]] = incident
+            touched[incident["incident_id"]] = incident
+            members.setdefault(incident["incident_id"], []).append(alert["alert_id"])
+            if is_new:
+                claims[fingerprint] = incident["incident_id"]
+
+        latest = max(timestamp for timestamp, _ in batch)
+        closed = [inc for incidents in open_by_site.values() for inc in incidents.values()
+                  if inc["incident_id"] not in touched and not self._is_open(inc, latest)]
+        await self._store(org_id, touched, members, merges, claims, sliding, closed)
+        absorbed = [{**other, "merged_into": survivor} for survivor, other in merges]
+        return [*touched.values(), *absorbed]
+
+    async def _store(self, org_id: str, touched: dict[str, dict], members: dict[str, list[str]],
+                     merges: list[tuple[str, dict]], claims: dict[str, str], sliding: list[str],
+                     closed: list[dict]) -> None:
+        """Write a batch's incident changes in one pipeline."""
+        client = get_redis_client().client
+        pipe = client.pipeline(transaction=False)
+        index = self._key(org_id, "idx")
+        for incident in closed:
+            pipe.hdel(self._key(org_id, "open", incident["site_id"] or "-"), incident["incident_id"])
+        for survivor, other in merges:
+            other_id = other["incident_id"]
+            survivor_alerts = self._key(org_id, "alerts", survivor)
+            pipe.sunionstore(survivor_alerts, [survivor_alerts, self._key(org_id, "alerts", other_id)])
+            pipe.set(self._key(org_id, "doc", other_id), json.dumps({**other, "merged_into": survivor}),
+                     ex=self.retention)
+            pipe.hdel(self._key(org_id, "open", other["site_id"] or "-"), other_id)
+            pipe.zrem(index, other_id)
+        for incident_id, incident in touched.items():
+            site_key = self._key(org_id, "open", incident["site_id"] or "-")
+            pipe.hset(site_key, incident_id, json.dumps(incident))
+            pipe.expire(site_key, self.window)
+            pipe.set(self._key(org_id, "doc", incident_id), json.dumps(incident), ex=self.retention)
+            pipe.zadd(index, {incident_id: incident["updated_at"]})
+        for incident_id, alert_ids in members.items():
+            alerts_key = self._key(org_id, "alerts", incident_id)
+            pipe.sadd(alerts_key, *alert_ids)
+            pipe.expire(alerts_key, self.retention)
+        for fingerprint, incident_id in claims.items():
+            pipe.set(fingerprint, incident_id, xx=True, keepttl=True)
+        for fingerprint in sliding:
+            pipe.expire(fingerprint, self.window)
+        pipe.zremrangebyscore(index, "-inf", f"({time.time() - self.retention}")
+        await pipe.execute()
+
+    async def query(self, org_id: str, site_id: str | None = None, limit: int = 100) -> list[dict]:
+        """Most recently updated incidents (optionally of one site), newest first."""
+        client = get_redis_client().client
+        # Site filtering reads ahead so `limit` incidents of the site are usually found.
+        scan = limit if site_id is None else limit * 10
+        ids = await client.zrevrange(self._key(org_id, "idx"), 0, scan - 1)
+        if not ids:
+            return []
+        docs = await client.mget([self._key(org_id, "doc", incident_id) for incident_id in ids])
+        incidents = [json.loads(raw) for raw in docs if raw]
+        if site_id is not None:
+            incidents = [i for i in incidents if i.get("site_id") == site_id]
+        return incidents[:limit]
+
+    async def get(self, org_id: str, incident_id: str) -> tuple[dict, list[str]] | None:
+        """An incident and its alert IDs, or None if unknown or expired."""
+        client = get_redis_client().client
+        pipe = client.pipeline(transaction=False)
+        pipe.get(self._key(org_id, "doc", incident_id))
+        pipe.smembers(self._key(org_id, "alerts", incident_id))
+        raw, alert_ids = await pipe.execute()
+        if not raw:
+            return None
+        return json.loads(raw), sorted(alert_ids)
+
+
+# Singleton instance
+_engine: CorrelationEngine | None = None
+
+
+def get_correlation_engine() -> CorrelationEngine:
+    global _engine
+    if _engine is None:
+        settings = get_settings()
+        _engine = CorrelationEngine(window=settings.correlation_window, retention=settings.alert_retention)
+    return _engine
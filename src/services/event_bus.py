@@ -0,0 +1,179 @@
+"""
+Event Bus - Cross-worker fan-out of Day 2 events to streaming subscribers.
+
+Alert and health events are published on one Redis channel per org
+(`events:{org_id}`). Each process holds a single pattern subscription and
+dispatches every message to its local subscribers, so a subscriber connected
+to any worker sees events produced by every worker.
+
+Each subscriber has a bounded queue. A slow subscriber never blocks the
+listener or other subscribers: when its queue is full the oldest event is
+dropped, and the next event it reads is a `lagged` notice with the number
+dropped, telling it to resync through the REST endpoints.
+"""
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field
+
+import redis.asyncio as redis
+
+from src.config import get_settings
+from src.services.redis import RedisKeys, get_redis_client
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class EventFilter:
+    """Events a subscriber wants (an empty set matches everything)."""
+    types: frozenset[str] = frozenset()
+    site_ids: frozenset[str] = frozenset()
+    severities: frozenset[str] = frozenset()
+
+    def matches(self, event: dict) -> bool:
+        if self.types and event.get("type") not in self.types:
+            return False
+        if self.site_ids and event.get("site_id") not in self.site_ids:
+            return False
+        # Severity only narrows events that have one (health deltas have none).
+        return not (self.severities and "severity" in event and event["severity"] not in self.severities)
+
+
+@dataclass(eq=False)
+class Subscription:
+    """One subscriber's bounded queue of matching events."""
+    org_id: str
+    filter: EventFilter
+    maxsize: int = 1000
+    dropped: int = 0
+    queue: asyncio.Queue = field(init=False)
+
+    def __post_init__(self):
+        self.queue = asyncio.Queue(maxsize=self.maxsize)
+
+    def deliver(self, event: dict) -> None:
+        """Queue an event if it matches, dropping the oldest when full."""
+        if not self.filter.matches(event):
+            return
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self) -> dict:
+        """Next event, preceded by a `lagged` notice if events were dropped."""
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            return {"type": "lagged", "dropped": dropped}
+        return await self.queue.get()
+
+
+class EventBus:
+    """Redis pub/sub publisher and per-process subscriber registry."""
+
+    def __init__(self, queue_size: int = 1000):
+        """
+        Initialize the bus.
+
+        Args:
+            queue_size: Events buffered per subscriber before the oldest are dropped
+        """
+        self.queue_size = queue_size
+        self._subscriptions: dict[str, set[Subscription]] = {}
+
+    @staticmethod
+    def channel(org_id: str) -> str:
+        return f"{RedisKeys.EVENT_CHANNEL_PREFIX}{org_id}"
+
+    async def publish(self, org_id: str, events: Iterable[dict]) -> int:
+        """
+        Publish events to every worker's subscribers of the org (one pipeline).
+
+        Publishing is best effort: a Redis error is logged, never raised, so
+        it cannot fail the request that produced the events.
+
+        Returns:
+            Number of events published
+        """
+        pipe = get_redis_client().client.pipeline(transaction=False)
+        count = 0
+        for event in events:
+            pipe.publish(self.channel(org_id), json.dumps(event))
+            count += 1
+        if not count:
+            return 0
+        try:
+            await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning("Event publish failed for org %s: %s", org_id, e)
+            return 0
+        return count
+
+    def dispatch(self, org_id: str, event: dict) -> None:
+        """Hand an event to this process's subscribers of the org."""
+        for subscription in self._subscriptions.get(org_id, ()):
+            subscription.deliver(event)
+
+    def _lag_all(self) -> None:
+        """Mark every subscriber lagged (messages may have been missed)."""
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.dropped = subscription.dropped or 1
+
+    @asynccontextmanager
+    async def subscribe(self, org_id: str, event_filter: EventFilter) -> AsyncIterator[Subscription]:
+        """Register a subscriber for the duration of the block."""
+        subscription = Subscription(org_id, event_filter, self.queue_size)
+        self._subscriptions.setdefault(org_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscriptions.get(org_id, set())
+            subscribers.discard(subscription)
+            if not subscribers:
+                self._subscriptions.pop(org_id, None)
+
+    async def run_listener(self, retry_delay: float = 5.0) -> None:
+        """
+        Dispatch published events to local subscribers for the app lifetime.
+
+        On any Redis error every subscriber is told it lagged, since events
+        published while disconnected are lost; the subscription is then
+        re-established. Messages that are not a JSON object are skipped.
+        """
+        prefix = RedisKeys.EVENT_CHANNEL_PREFIX
+        while True:
+            pubsub = get_redis_client().client.pubsub()
+            try:
+                await pubsub.psubscribe(f"{prefix}*")
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    event = None
+                    with suppress(ValueError):
+                        event = json.loads(message["data"])
+                    if isinstance(event, dict):
+                        self.dispatch(message["channel"][len(prefix):], event)
+                    else:
+                        logger.warning("Ignoring malformed event on %s", message["channel"])
+            except redis.RedisError as e:
+                logger.warning("Event listener disconnected: %s", e)
+                self._lag_all()
+            finally:
+                await pubsub.aclose()
+            await asyncio.sleep(retry_delay)
+
+
+# Singleton instance
+_bus: EventBus | None = None
+
+
+def get_event_bus() -> EventBus:
+    global _bus
+    if _bus is None:
+        _bus = EventBus(queue_size=get_settings().stream_queue_size)
+    return _bus
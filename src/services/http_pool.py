@@ -0,0 +1,93 @@
+"""
+HTTP Client Pool - Shared, keep-alive connections to the Mist Cloud.
+
+Every Mist regional host (api.mist.com, api.eu.mist.com, api.ac2.mist.com, ...)
+gets exactly one long-lived `httpx.AsyncClient`. Connections are reused across
+requests and routers, so a provisioning burst pays the TCP + TLS handshake once
+per pooled connection instead of once per API call.
+
+The pool is opened lazily and closed by the FastAPI lifespan on shutdown.
+"""
+import httpx
+
+from src.config import get_settings
+
+
+class HTTPClientPool:
+    """
+    Process-wide registry of pooled `httpx.AsyncClient` instances, one per host.
+
+    Limits (max connections, keep-alive expiry, HTTP/2) come from settings so
+    they can be tuned per deployment without code changes.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            max_connections: Upper bound of concurrent connections per host
+            max_keepalive_connections: Idle connections kept open per host
+            keepalive_expiry: Seconds an idle connection is kept alive
+            http2: Negotiate HTTP/2 (multiplexes requests over one connection)
+            transport: Optional transport override (used by tests)
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self.transport = transport
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def client(self, host: str) -> httpx.AsyncClient:
+        """Return the shared client for a host, creating it on first use."""
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=f"https://{host}",
+                limits=self.limits,
+                http2=self.http2,
+                transport=self.transport,
+            )
+            self._clients[host] = client
+        return client
+
+    async def close(self) -> None:
+        """Close every pooled client and release its connections."""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+# Singleton instance
+_pool: HTTPClientPool | None = None
+
+
+def get_http_pool() -> HTTPClientPool:
+    global _pool
+    if _pool is None:
+        settings = get_settings()
+        _pool = HTTPClientPool(
+            max_connections=settings.mist_max_connections,
+            max_keepalive_connections=settings.mist_max_keepalive_connections,
+            keepalive_expiry=settings.mist_keepalive_expiry,
+            http2=settings.mist_http2,
+        )
+    return _pool
+
+
+async def close_http_pool() -> None:
+    """Close the shared pool (called from the FastAPI lifespan on shutdown)."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
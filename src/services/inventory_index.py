@@ -0,0 +1,249 @@
+"""
+Inventory Index - Local serial/MAC lookup of the org inventory.
+
+Workflows that resolve devices one by one (ZTP checks, NMS profile MACs,
+template compilation) would otherwise cost one Mist inventory query per
+device. The index keeps a slim record per device in two Redis hashes per org,
+shared by every worker, with an in-process dict in front:
+
+- inventory:{org_id}:devices  serial -> JSON record
+- inventory:{org_id}:macs     normalized MAC -> serial
+
+It is refreshed page by page from paginated inventory pulls (each page is
+written as it arrives) and patched in place after assign/unassign calls.
+Lookups that miss a fresh index fall back to a single filtered Mist query.
+Redis errors degrade to that same fallback.
+"""
+import asyncio
+import json
+import logging
+import time
+
+import redis.asyncio as redis
+
+from src.config import get_settings
+from src.services.mist_engine import MistEngine
+from src.services.redis import RedisKeys, get_redis_client, register_invalidation_handler
+
+
+logger = logging.getLogger(__name__)
+
+# Inventory fields kept per device
+INDEX_FIELDS = ("serial", "mac", "model", "type", "site_id", "site_name", "name", "connected")
+
+
+def normalize_mac(mac: str) -> str:
+    """Lower-case a MAC and strip separators ("AC:23:16:ED:51:47" -> "ac2316ed5147")."""
+    return "".join(c for c in mac.lower() if c in "0123456789abcdef")
+
+
+def _slim(device: dict) -> dict:
+    return {field: device.get(field) for field in INDEX_FIELDS}
+
+
+class InventoryIndex:
+    """
+    Serial/MAC index of Mist org inventories (Redis hashes + in-process dicts).
+
+    Every worker reads through its own dicts; a refresh or patch in one worker
+    publishes on RedisKeys.INVENTORY_CHANNEL so the others drop their copy of
+    that org and re-read from Redis.
+    """
+
+    def __init__(self, ttl: int = 3600):
+        """
+        Initialize the index.
+
+        Args:
+            ttl: Seconds after a full refresh before a lookup miss triggers another
+        """
+        self.ttl = ttl
+        self._devices: dict[str, dict[str, dict]] = {}   # org_id -> serial -> record
+        self._macs: dict[str, dict[str, str]] = {}       # org_id -> mac -> serial
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def _keys(org_id: str) -> tuple[str, str, str]:
+        prefix = f"{RedisKeys.INVENTORY_PREFIX}{org_id}"
+        return f"{prefix}:devices", f"{prefix}:macs", f"{prefix}:refreshed"
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    async def by_serial(self, engine: MistEngine, org_id: str, serial: str) -> dict | None:
+        """Find a device by serial number."""
+        try:
+            device = await self._indexed(org_id, serial)
+            if device is not None:
+                return device
+            if await self._is_stale(org_id):
+                await self.refresh(engine, org_id)
+                return await self._indexed(org_id, serial)
+        except redis.RedisError as e:
+            logger.warning("Inventory index lookup failed: %s", e)
+        return await self._fetch(engine, org_id, {"serial": serial})
+
+    async def by_mac(self, engine: MistEngine, org_id: str, mac: str) -> dict | None:
+        """Find a device by MAC address (any separator style)."""
+        mac = normalize_mac(mac)
+        try:
+            serial = await self._indexed_serial(org_id, mac)
+            if serial is None and await self._is_stale(org_id):
+                await self.refresh(engine, org_id)
+                serial = await self._indexed_serial(org_id, mac)
+                if serial is None:
+                    return None
+            if serial is not None:
+                return await self.by_serial(engine, org_id, serial)
+        except redis.RedisError as e:
+            logger.warning("Inventory index lookup failed: %s", e)
+        return await self._fetch(engine, org_id, {"mac": mac})
+
+    async def _indexed(self, org_id: str, serial: str) -> dict | None:
+        """Device record from the local dict, else from Redis."""
+        device = self._devices.get(org_id, {}).get(serial)
+        if device is None:
+            devices_key, _, _ = self._keys(org_id)
+            raw = await get_redis_client().client.hget(devices_key, serial)
+            if raw is not None:
+                device = json.loads(raw)
+                self._remember(org_id, device)
+        return device
+
+    async def _indexed_serial(self, org_id: str, mac: str) -> str | None:
+        """Serial for a normalized MAC from the local dict, else from Redis."""
+        serial = self._macs.get(org_id, {}).get(mac)
+        if serial is None:
+            _, macs_key, _ = self._keys(org_id)
+            serial = await get_redis_client().client.hget(macs_key, mac)
+        return serial
+
+    async def _is_stale(self, org_id: str) -> bool:
+        _, _, refreshed_key = self._keys(org_id)
+        refreshed = await get_redis_client().get(refreshed_key)
+        return refreshed is None or time.time() - float(refreshed) > self.ttl
+
+    async def _fetch(self, engine: MistEngine, org_id: str, params: dict) -> dict | None:
+        """Single filtered Mist query; the result (if any) is indexed."""
+        data = await engine.get(f"/api/v1/orgs/{org_id}/inventory", params=params)
+        if not data:
+            return None
+        device = _slim(data[0] if isinstance(data, list) else data)
+        try:
+            await self._store(org_id, [device])
+        except redis.RedisError as e:
+            logger.warning("Inventory index update failed: %s", e)
+        return device
+
+    # -------------------------------------------------------------------------
+    # Maintenance
+    # -------------------------------------------------------------------------
+
+    async def refresh(self, engine: MistEngine, org_id: str) -> int:
+        """
+        Pull the whole inventory and rebuild the index for an org.
+
+        Pages are written to Redis as they arrive; serials and MACs no longer
+        in the inventory are removed at the end. Concurrent refreshes of one org in
+        this worker share a single pull.
+
+        Returns:
+            Number of devices indexed
+        """
+        lock = self._locks.setdefault(org_id, asyncio.Lock())
+        if lock.locked():
+            async with lock:
+                return len(self._devices.get(org_id, {}))
+
+        async with lock:
+            devices_key, macs_key, refreshed_key = self._keys(org_id)
+            self.drop_local(org_id)
+            client = get_redis_client().client
+            previous = set(await client.hkeys(devices_key))
+            previous_macs = set(await client.hkeys(macs_key))
+            seen: set[str] = set()
+            seen_macs: set[str] = set()
+
+            async def flush(page: list[dict]) -> None:
+                await self._store(org_id, page, publish=False)
+                seen.update(d["serial"] for d in page)
+                seen_macs.update(normalize_mac(d["mac"]) for d in page if d.get("mac"))
+
+            page: list[dict] = []
+            async for device in engine.paginate(f"/api/v1/orgs/{org_id}/inventory", limit=1000):
+                page.append(_slim(device))
+                if len(page) == 1000:
+                    await flush(page)
+                    page = []
+            await flush(page)
+
+            removed, removed_macs = previous - seen, previous_macs - seen_macs
+            pipe = client.pipeline(transaction=False)
+            if removed:
+                pipe.hdel(devices_key, *removed)
+            if removed_macs:
+                pipe.hdel(macs_key, *removed_macs)
+            pipe.set(refreshed_key, str(time.time()))
+            pipe.publish(RedisKeys.INVENTORY_CHANNEL, org_id)
+            await pipe.execute()
+            return len(seen)
+
+    async def update_site(self, org_id: str, serials: list[str], site_id: str | None) -> None:
+        """Patch the site of indexed devices after an assign/unassign."""
+        if not serials:
+            return
+        devices_key, _, _ = self._keys(org_id)
+        try:
+            raw = await get_redis_client().client.hmget(devices_key, serials)
+            devices = [json.loads(r) for r in raw if r is not None]
+            for device in devices:
+                device["site_id"] = site_id
+                device["site_name"] = None
+            await self._store(org_id, devices)
+        except redis.RedisError as e:
+            logger.warning("Inventory index update failed: %s", e)
+            self.drop_local(org_id)
+
+    async def _store(self, org_id: str, devices: list[dict], publish: bool = True) -> None:
+        """Write device records (and their MACs) to Redis and the local dicts."""
+        if not devices:
+            return
+        for device in devices:
+            self._remember(org_id, device)
+        devices_key, macs_key, _ = self._keys(org_id)
+        pipe = get_redis_client().client.pipeline(transaction=False)
+        pipe.hset(devices_key, mapping={d["serial"]: json.dumps(d) for d in devices})
+        macs = {normalize_mac(d["mac"]): d["serial"] for d in devices if d.get("mac")}
+        if macs:
+            pipe.hset(macs_key, mapping=macs)
+        if publish:
+            pipe.publish(RedisKeys.INVENTORY_CHANNEL, org_id)
+        await pipe.execute()
+
+    def _remember(self, org_id: str, device: dict) -> None:
+        self._devices.setdefault(org_id, {})[device["serial"]] = device
+        if device.get("mac"):
+            self._macs.setdefault(org_id, {})[normalize_mac(device["mac"])] = device["serial"]
+
+    def drop_local(self, org_id: str) -> None:
+        """Drop an org from the in-process dicts (empty string drops all)."""
+        if not org_id:
+            self._devices.clear()
+            self._macs.clear()
+            return
+        self._devices.pop(org_id, None)
+        self._macs.pop(org_id, None)
+
+
+# Singleton instance
+_index: InventoryIndex | None = None
+
+
+def get_inventory_index() -> InventoryIndex:
+    """Get the process-wide inventory index."""
+    global _index
+    if _index is None:
+        _index = InventoryIndex(ttl=get_settings().inventory_index_ttl)
+        register_invalidation_handler(RedisKeys.INVENTORY_CHANNEL, _index.drop_local)
+    return _index
@@ -0,0 +1,268 @@
+"""
+IPAM Prefix Index - Overlap and containment queries over allocated prefixes.
+
+Before a network or hub profile is created, its subnets are checked against
+every prefix already allocated in the org (network subnets and hub-profile
+LAN subnets). A linear scan over tens of thousands of prefixes is too slow to
+run inline, so allocations are held in an index:
+
+- Supernets of a query are found by masking it to each prefix length present
+  in the index and doing a hash lookup (a flattened radix trie): at most
+  33 (IPv4) or 129 (IPv6) O(1) probes, independent of index size.
+- Subnets of a query are found by binary search over prefixes sorted by
+  start address: O(log n + k) for k matches.
+
+Because two CIDR prefixes are always either nested or disjoint, the union of
+both answers is exactly the set of overlapping prefixes.
+
+Indexes are cached per worker. Writes that change allocations publish an
+invalidation on Redis pub/sub, so every other worker reloads before its next
+check; the writing worker updates or drops its own index directly.
+"""
+import logging
+import time
+import uuid
+from bisect import bisect_left, insort
+from ipaddress import IPv4Network, IPv6Network, ip_network
+from typing import NamedTuple
+
+import redis.asyncio as redis
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from src.config import get_settings
+from src.services.mist_engine import MistEngine
+from src.services.redis import RedisKeys, get_redis_client, register_invalidation_handler
+
+
+logger = logging.getLogger(__name__)
+
+IPNetwork = IPv4Network | IPv6Network
+
+
+class PrefixRecord(NamedTuple):
+    """An allocated prefix and the Mist object that owns it."""
+    prefix: str
+    source: str        # "network" or "hub_profile"
+    object_id: str
+    name: str
+
+
+class PrefixConflict(BaseModel):
+    """An existing allocation overlapping a requested prefix."""
+    requested: str
+    existing: str
+    relation: str      # "equal", "contains" (existing is a supernet) or "within"
+    source: str
+    object_id: str
+    name: str
+
+
+class PrefixIndex:
+    """Overlap/containment index over IPv4 and IPv6 prefixes."""
+
+    def __init__(self):
+        # (version, network int, prefix length) -> owners of that exact prefix
+        self._exact: dict[tuple[int, int, int], list[PrefixRecord]] = {}
+        # version -> prefix lengths present (probe set for supernet lookups)
+        self._lengths: dict[int, set[int]] = {4: set(), 6: set()}
+        # version -> sorted (start address, prefix length) for subnet lookups
+        self._starts: dict[int, list[tuple[int, int]]] = {4: [], 6: []}
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self._exact.values())
+
+    def add(self, network: IPNetwork, record: PrefixRecord) -> None:
+        """Index one allocated prefix."""
+        key = (network.version, int(network.network_address), network.prefixlen)
+        if key not in self._exact:
+            self._exact[key] = []
+            self._lengths[network.version].add(network.prefixlen)
+            insort(self._starts[network.version], (key[1], key[2]))
+        self._exact[key].append(record)
+
+    def supernets(self, network: IPNetwork) -> list[tuple[IPNetwork, PrefixRecord]]:
+        """Allocations equal to or containing `network`."""
+        version, address = network.version, int(network.network_address)
+        bits = network.max_prefixlen
+        found = []
+        for length in self._lengths[version]:
+            if length > network.prefixlen:
+                continue
+            masked = address & (((1 << length) - 1) << (bits - length))
+            for record in self._exact.get((version, masked, length), []):
+                found.append((ip_network((masked, length)), record))
+        return found
+
+    def subnets(self, network: IPNetwork) -> list[tuple[IPNetwork, PrefixRecord]]:
+        """Allocations strictly inside `network`."""
+        version = network.version
+        start = int(network.network_address)
+        end = int(network.broadcast_address)
+        starts = self._starts[version]
+        found = []
+        for i in range(bisect_left(starts, (start, 0)), len(starts)):
+            address, length = starts[i]
+            if address > end:
+                break
+            if length > network.prefixlen:
+                for record in self._exact[(version, address, length)]:
+                    found.append((ip_network((address, length)), record))
+        return found
+
+    def conflicts(self, network: IPNetwork) -> list[PrefixConflict]:
+        """Every allocation overlapping `network`, with its relation."""
+        conflicts = []
+        for existing, record in self.supernets(network):
+            relation = "equal" if existing.prefixlen == network.prefixlen else "contains"
+            conflicts.append(self._conflict(network, existing, record, relation))
+        for existing, record in self.subnets(network):
+            conflicts.append(self._conflict(network, existing, record, "within"))
+        return conflicts
+
+    @staticmethod
+    def _conflict(requested: IPNetwork, existing: IPNetwork, record: PrefixRecord, relation: str) -> PrefixConflict:
+        return PrefixConflict(
+            requested=str(requested),
+            existing=str(existing),
+            relation=relation,
+            source=record.source,
+            object_id=record.object_id,
+            name=record.name,
+        )
+
+
+def parse_prefix(value: str) -> IPNetwork:
+    """
+    Parse a CIDR string, tolerating host bits (e.g. "10.1.1.1/24").
+
+    Raises:
+        HTTPException: 400 if the value is not an IP prefix
+    """
+    try:
+        return ip_network(value, strict=False)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid subnet: {value}")
+
+
+# =============================================================================
+# Org Index Loading
+# =============================================================================
+
+async def build_org_index(engine: MistEngine, org_id: str) -> PrefixIndex:
+    """Load every network subnet and hub-profile LAN subnet of an org."""
+    index = PrefixIndex()
+
+    async for n in engine.paginate(f"/api/v1/orgs/{org_id}/networks"):
+        for field in ("subnet", "subnet6"):
+            if n.get(field):
+                _add_quietly(index, n[field], PrefixRecord(n[field], "network", n.get("id", ""), n.get("name", "")))
+
+    async for h in engine.paginate(f"/api/v1/orgs/{org_id}/hubprofiles"):
+        for lan in h.get("lan") or []:
+            if lan.get("subnet"):
+                record = PrefixRecord(lan["subnet"], "hub_profile", h.get("id", ""), f"{h.get('name', '')}/{lan.get('name', '')}")
+                _add_quietly(index, lan["subnet"], record)
+
+    return index
+
+
+def _add_quietly(index: PrefixIndex, value: str, record: PrefixRecord) -> None:
+    # Existing Mist objects may hold malformed subnets; they cannot conflict.
+    try:
+        index.add(ip_network(value, strict=False), record)
+    except ValueError:
+        pass
+
+
+# (api_host, org_id) -> (expires at, index)
+_indexes: dict[tuple[str, str], tuple[float, PrefixIndex]] = {}
+
+# Tags this worker's invalidation notices; its own listener skips them, as the
+# sender already updated (or dropped) its index.
+_WORKER_ID = uuid.uuid4().hex
+
+
+async def get_org_index(engine: MistEngine, org_id: str) -> PrefixIndex:
+    """Return the cached prefix index for an org, rebuilding it after `ipam_index_ttl`."""
+    key = (engine.host, org_id)
+    cached = _indexes.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    index = await build_org_index(engine, org_id)
+    _indexes[key] = (time.monotonic() + get_settings().ipam_index_ttl, index)
+    return index
+
+
+async def invalidate_org_index(api_host: str, org_id: str, keep_local: bool = False) -> None:
+    """
+    Drop the cached index of an org in every worker (after a write changed allocations).
+
+    Args:
+        api_host: Mist API host of the org
+        org_id: Organization whose allocations changed
+        keep_local: Keep this worker's index (the caller already added the change to it)
+    """
+    if not keep_local:
+        _drop_local(f"{api_host}/{org_id}")
+    try:
+        await get_redis_client().client.publish(RedisKeys.IPAM_CHANNEL, f"{_WORKER_ID} {api_host}/{org_id}")
+    except redis.RedisError as e:
+        logger.warning("IPAM index invalidation failed: %s", e)
+
+
+def _drop_local(index: str) -> None:
+    """Drop a "{api_host}/{org_id}" index from this worker (empty string drops all)."""
+    if not index:
+        _indexes.clear()
+        return
+    api_host, _, org_id = index.partition("/")
+    _indexes.pop((api_host, org_id), None)
+
+
+def _on_invalidation(message: str) -> None:
+    """Apply a "{worker_id} {api_host}/{org_id}" notice unless this worker sent it (empty drops all)."""
+    if not message:
+        _drop_local("")
+        return
+    sender, _, index = message.partition(" ")
+    if sender != _WORKER_ID:
+        _drop_local(index)
+
+
+register_invalidation_handler(RedisKeys.IPAM_CHANNEL, _on_invalidation)
+
+
+async def check_prefix_conflicts(
+    engine: MistEngine,
+    org_id: str,
+    subnets: list[str],
+    allow_overlap: bool = False,
+) -> PrefixIndex:
+    """
+    Reject requested subnets that overlap an existing allocation.
+
+    Args:
+        engine: Mist API engine
+        org_id: Organization to check against
+        subnets: Requested prefixes (CIDR strings)
+        allow_overlap: Skip the rejection (conflicts are still computed)
+
+    Returns:
+        The org index, so callers can register the new prefixes after creation
+
+    Raises:
+        HTTPException: 400 for malformed subnets, 409 listing conflicts
+    """
+    networks = [parse_prefix(subnet) for subnet in subnets]
+    index = await get_org_index(engine, org_id)
+    conflicts = [c for network in networks for c in index.conflicts(network)]
+    if conflicts and not allow_overlap:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "Requested subnet overlaps existing allocations. Pass allow_overlap=true to override.",
+                "conflicts": [c.model_dump() for c in conflicts],
+            },
+        )
+    return index
@@ -0,0 +1,379 @@
+"""
+Job Queue - Background execution of long-running provisioning operations.
+
+Bulk endpoints accept `background=true`: the request is stored as a job and
+its ID returned immediately (202). Worker processes (`python -m src.worker`)
+consume jobs from a Redis Stream through a consumer group, so any number of
+workers share the queue and each job is delivered to exactly one of them.
+
+- job:{id}       hash: kind, status, payload, org context, progress, result
+- jobs:stream    stream of job IDs, consumed by group "workers"
+
+Handlers are registered per job kind by the routers that own the operation.
+While a handler runs, `current_job` points at its JobContext: the bulk
+fan-out and pipeline helpers use it to report progress and to stop starting
+new items once cancellation is requested.
+
+Jobs left pending by a crashed or stopped worker are reclaimed by another
+worker after `job_claim_idle` seconds; handlers are idempotent (skip-existing, reconciler,
+checkpoints), so re-running a partially executed job is safe.
+"""
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from enum import Enum
+
+import redis.asyncio as redis
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+from src.config import get_settings
+from src.services.redis import RedisKeys, get_redis_client
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Models
+# =============================================================================
+
+class JobStatus(str, Enum):
+    """Lifecycle of a background job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+TERMINAL_STATUSES = {JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED}
+
+
+class JobAccepted(BaseModel):
+    """Response of an endpoint called with background=true."""
+    job_id: str
+    status: JobStatus = JobStatus.QUEUED
+    status_url: str
+
+
+class JobInfo(BaseModel):
+    """State, progress and result of a job."""
+    id: str
+    kind: str
+    status: JobStatus
+    done: int = Field(0, description="Items finished so far")
+    total: int = Field(0, description="Items scheduled so far")
+    created_at: float | None = None
+    started_at: float | None = None
+    finished_at: float | None = None
+    cancel_requested: bool = False
+    result: dict | None = Field(None, description="Handler result (per-item results for bulk jobs)")
+    error: str | None = None
+
+
+# OpenAPI `responses` entry for endpoints accepting background=true
+JOB_RESPONSES = {202: {"model": JobAccepted, "description": "Queued as a background job (background=true)"}}
+
+
+class JobCancelled(Exception):
+    """Raised instead of starting an item once a job's cancellation is requested."""
+
+    def __str__(self) -> str:
+        return "Job cancelled"
+
+
+# =============================================================================
+# Job Context
+# =============================================================================
+
+class JobContext:
+    """
+    Handle given to a running job handler.
+
+    Progress counters are kept locally and written to Redis at most once per
+    `flush_interval`; the cancel flag is re-read at most once per interval.
+    """
+
+    def __init__(self, job_id: str, payload: dict, api_host: str, org_id: str, flush_interval: float = 1.0):
+        self.job_id = job_id
+        self.payload = payload
+        self.api_host = api_host
+        self.org_id = org_id
+        self.flush_interval = flush_interval
+        self.done = 0
+        self.total = 0
+        self._flushed_at = 0.0
+        self._checked_at = 0.0
+        self._cancelled = False
+
+    @property
+    def key(self) -> str:
+        return f"{RedisKeys.JOB_PREFIX}{self.job_id}"
+
+    async def add_total(self, count: int) -> None:
+        """Announce `count` more items."""
+        self.total += count
+        await self._maybe_flush()
+
+    async def advance(self, count: int = 1) -> None:
+        """Mark `count` items finished."""
+        self.done += count
+        await self._maybe_flush()
+
+    async def flush(self) -> None:
+        """Write the progress counters now."""
+        self._flushed_at = time.monotonic()
+        await get_redis_client().client.hset(self.key, mapping={"done": self.done, "total": self.total})
+
+    async def _maybe_flush(self) -> None:
+        if time.monotonic() - self._flushed_at >= self.flush_interval:
+            await self.flush()
+
+    async def is_cancelled(self, refresh: bool = False) -> bool:
+        """Whether cancellation was requested (cached for `flush_interval`)."""
+        if self._cancelled:
+            return True
+        if refresh or time.monotonic() - self._checked_at >= self.flush_interval:
+            self._checked_at = time.monotonic()
+            self._cancelled = bool(await get_redis_client().client.hget(self.key, "cancel"))
+        return self._cancelled
+
+    async def check_cancelled(self) -> None:
+        """
+        Raises:
+            JobCancelled: if cancellation was requested
+        """
+        if await self.is_cancelled():
+            raise JobCancelled()
+
+
+# The job being executed in this task (None when serving a request inline)
+current_job: ContextVar[JobContext | None] = ContextVar("current_job", default=None)
+
+
+# =============================================================================
+# Handlers
+# =============================================================================
+
+JobHandler = Callable[[JobContext], Awaitable[dict]]
+
+# Job kind -> handler. Routers register the operations they own.
+_handlers: dict[str, JobHandler] = {}
+
+
+def register_job_handler(kind: str, handler: JobHandler) -> None:
+    """Execute jobs of `kind` with `handler` (returns a JSON-serialisable dict)."""
+    _handlers[kind] = handler
+
+
+# =============================================================================
+# Queue Operations
+# =============================================================================
+
+def _job_key(job_id: str) -> str:
+    return f"{RedisKeys.JOB_PREFIX}{job_id}"
+
+
+async def enqueue(kind: str, payload: dict, api_host: str, org_id: str) -> str:
+    """
+    Store a job and publish it on the stream.
+
+    The org context is captured now, since workers serve no request.
+
+    Returns:
+        The job ID
+    """
+    if kind not in _handlers:
+        raise ValueError(f"No handler registered for job kind: {kind}")
+    settings = get_settings()
+    job_id = uuid.uuid4().hex
+    pipe = get_redis_client().client.pipeline(transaction=True)
+    pipe.hset(_job_key(job_id), mapping={
+        "kind": kind,
+        "status": JobStatus.QUEUED.value,
+        "payload": json.dumps(payload),
+        "api_host": api_host,
+        "org_id": org_id,
+        "created_at": time.time(),
+        "done": 0,
+        "total": 0,
+    })
+    # Jobs whose stream entry is trimmed before a worker reads them never finish.
+    pipe.expire(_job_key(job_id), settings.job_ttl)
+    pipe.xadd(RedisKeys.JOB_STREAM, {"job_id": job_id}, maxlen=settings.job_stream_maxlen, approximate=True)
+    await pipe.execute()
+    return job_id
+
+
+async def enqueue_response(kind: str, payload: dict, api_host: str, org_id: str) -> JSONResponse:
+    """Enqueue a job and build the 202 response returned by background endpoints."""
+    job_id = await enqueue(kind, payload, api_host, org_id)
+    accepted = JobAccepted(job_id=job_id, status_url=f"/jobs/{job_id}")
+    return JSONResponse(status_code=202, content=accepted.model_dump(mode="json"))
+
+
+async def get_job(job_id: str) -> JobInfo | None:
+    """Return a job's state, or None if unknown or expired."""
+    data = await get_redis_client().client.hgetall(_job_key(job_id))
+    if not data:
+        return None
+    return JobInfo(
+        id=job_id,
+        kind=data["kind"],
+        status=data["status"],
+        done=int(data.get("done", 0)),
+        total=int(data.get("total", 0)),
+        created_at=float(data["created_at"]) if data.get("created_at") else None,
+        started_at=float(data["started_at"]) if data.get("started_at") else None,
+        finished_at=float(data["finished_at"]) if data.get("finished_at") else None,
+        cancel_requested=bool(data.get("cancel")),
+        result=json.loads(data["result"]) if data.get("result") else None,
+        error=data.get("error"),
+    )
+
+
+async def cancel_job(job_id: str) -> JobInfo | None:
+    """
+    Request cancellation.
+
+    A queued job is cancelled immediately; a running job stops starting new
+    items and finishes as cancelled with the results gathered so far.
+    """
+    client = get_redis_client().client
+    key = _job_key(job_id)
+    status = await client.hget(key, "status")
+    if status is None:
+        return None
+    if status not in {s.value for s in TERMINAL_STATUSES}:
+        await client.hset(key, "cancel", "1")
+        if status == JobStatus.QUEUED.value:
+            await _finish(client, job_id, JobStatus.CANCELLED)
+    return await get_job(job_id)
+
+
+async def _finish(client: redis.Redis, job_id: str, status: JobStatus, result: dict | None = None,
+                  error: str | None = None) -> None:
+    fields = {"status": status.value, "finished_at": time.time()}
+    if result is not None:
+        fields["result"] = json.dumps(result)
+    if error is not None:
+        fields["error"] = error
+    pipe = client.pipeline(transaction=False)
+    pipe.hset(_job_key(job_id), mapping=fields)
+    pipe.expire(_job_key(job_id), get_settings().job_ttl)
+    await pipe.execute()
+
+
+# =============================================================================
+# Worker
+# =============================================================================
+
+async def ensure_consumer_group(client: redis.Redis) -> None:
+    """Create the stream and consumer group if they do not exist yet."""
+    try:
+        await client.xgroup_create(RedisKeys.JOB_STREAM, RedisKeys.JOB_GROUP, id="0", mkstream=True)
+    except redis.ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+async def process_job(client: redis.Redis, job_id: str) -> None:
+    """Run one job to completion and record its outcome."""
+    data = await client.hgetall(_job_key(job_id))
+    if not data or data["status"] in {s.value for s in TERMINAL_STATUSES}:
+        return
+    if data.get("cancel"):
+        await _finish(client, job_id, JobStatus.CANCELLED)
+        return
+    handler = _handlers.get(data["kind"])
+    if handler is None:
+        await _finish(client, job_id, JobStatus.FAILED, error=f"No handler for job kind: {data['kind']}")
+        return
+
+    await client.hset(_job_key(job_id), mapping={"status": JobStatus.RUNNING.value, "started_at": time.time()})
+    context = JobContext(job_id, json.loads(data["payload"]), data["api_host"], data["org_id"])
+    token = current_job.set(context)
+    try:
+        result = await handler(context)
+        status = JobStatus.CANCELLED if await context.is_cancelled(refresh=True) else JobStatus.SUCCEEDED
+        await _finish(client, job_id, status, result=result)
+    except Exception as e:
+        detail = f"{e.status_code}: {e.detail}" if isinstance(e, HTTPException) else str(e)
+        logger.exception("Job %s (%s) failed", job_id, data["kind"])
+        await _finish(client, job_id, JobStatus.FAILED, error=detail)
+    finally:
+        current_job.reset(token)
+        await context.flush()
+
+
+async def run_worker(consumer: str, concurrency: int | None = None, block_ms: int = 5000) -> None:
+    """
+    Consume jobs until cancelled.
+
+    Up to `concurrency` jobs run at once. Before reading new jobs, messages
+    another consumer has held for longer than `job_claim_idle` seconds are
+    claimed, so jobs of crashed workers are not lost. Running jobs keep their
+    message claimed with a heartbeat.
+
+    Args:
+        consumer: Unique consumer name of this worker
+        concurrency: Jobs executed at once (default: settings.job_worker_concurrency)
+        block_ms: How long one read waits for new jobs
+    """
+    settings = get_settings()
+    concurrency = concurrency or settings.job_worker_concurrency
+    client = get_redis_client().client
+    await ensure_consumer_group(client)
+    running: set[asyncio.Task] = set()
+
+    async def heartbeat(message_id: str) -> None:
+        # Re-claiming our own message resets its idle time, so long jobs are
+        # not mistaken for jobs of a crashed worker.
+        while True:
+            await asyncio.sleep(settings.job_claim_idle / 3)
+            await client.xclaim(
+                RedisKeys.JOB_STREAM, RedisKeys.JOB_GROUP, consumer,
+                min_idle_time=0, message_ids=[message_id], justid=True,
+            )
+
+    async def handle(message_id: str, job_id: str) -> None:
+        beat = asyncio.create_task(heartbeat(message_id))
+        try:
+            await process_job(client, job_id)
+        finally:
+            beat.cancel()
+        # Only jobs with a recorded outcome are acknowledged: one interrupted by
+        # shutdown (or a Redis error) stays pending and is reclaimed by xautoclaim.
+        await client.xack(RedisKeys.JOB_STREAM, RedisKeys.JOB_GROUP, message_id)
+
+    try:
+        while True:
+            free = concurrency - len(running)
+            if free == 0:
+                await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                continue
+
+            _, messages, _ = await client.xautoclaim(
+                RedisKeys.JOB_STREAM, RedisKeys.JOB_GROUP, consumer,
+                min_idle_time=int(settings.job_claim_idle * 1000), start_id="0-0", count=free,
+            )
+            if not messages:
+                response = await client.xreadgroup(
+                    RedisKeys.JOB_GROUP, consumer, {RedisKeys.JOB_STREAM: ">"}, count=free, block=block_ms
+                )
+                messages = response[0][1] if response else []
+
+            for message_id, fields in messages:
+                task = asyncio.create_task(handle(message_id, fields["job_id"]))
+                running.add(task)
+                task.add_done_callback(running.discard)
+    finally:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
@@ -1,10 +1,27 @@
 """
 Mist API Engine - Centralized API client with error handling.
 """
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
 import httpx
 from fastapi import HTTPException
 
 from src.config import get_settings
+from src.services.http_pool import get_http_pool
+from src.services.rate_limiter import backoff_delay, get_rate_limiter, parse_retry_after
+from src.services.response_cache import get_response_cache
+
+# 429 is always safe to retry (Mist rejected the call without processing it).
+# 5xx is only retried for idempotent methods so a POST is never applied twice.
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "PUT", "DELETE"}
+
+
+def _collection(endpoint: str) -> str:
+    """Collection endpoint of an object endpoint (e.g. /sites/{id}/wlans/{wlan_id} -> /sites/{id}/wlans)."""
+    return endpoint.rsplit("/", 1)[0]
 
 
 class MistEngine:
@@ -12,7 +29,8 @@ class MistEngine:
     Centralized Mist API client.
 
     Handles authentication, request execution, and error handling
-    for all Mist API calls.
+    for all Mist API calls. Every call is scheduled through the
+    per-token rate limiter and retried on 429/5xx with backoff.
     """
 
     def __init__(self, host: str, timeout: float = 30.0):
@@ -24,81 +42,215 @@ class MistEngine:
             timeout: Request timeout in seconds
         """
         settings = get_settings()
+        self.host = host
         self.base_url = f"https://{host}"
         self.api_key = settings.mist_api_key
         self.timeout = timeout
+        self.max_retries = settings.mist_max_retries
+        self.backoff_base = settings.mist_backoff_base
+        self.backoff_max = settings.mist_backoff_max
         self.headers = {
             "Authorization": f"Token {self.api_key}",
             "Content-Type": "application/json"
         }
 
-    async def _request(
+    async def _send(
         self,
         method: str,
         endpoint: str,
-        json: dict | None = None,
-        params: dict | None = None
-    ) -> dict:
+        json: dict | list | None = None,
+        params: dict | None = None,
+        headers: dict | None = None
+    ) -> httpx.Response:
         """
-        Execute an API request with error handling.
+        Execute an API request with rate limiting, retries and error handling.
+
+        A 429 pauses the whole token bucket for the Retry-After period so
+        queued callers back off together; 5xx responses on idempotent
+        methods are retried with jittered exponential backoff.
 
         Args:
             method: HTTP method (GET, POST, PUT, DELETE)
             endpoint: API endpoint (e.g., /api/v1/self)
             json: Request body for POST/PUT
             params: Query parameters
+            headers: Extra request headers (e.g., If-None-Match)
 
         Returns:
-            API response as dict
+            The successful (or 304 Not Modified) httpx response
 
         Raises:
-            HTTPException: On API or connection errors
+            HTTPException: On API or connection errors, or when retries are exhausted
         """
         url = f"{self.base_url}{endpoint}"
+        client = get_http_pool().client(self.host)
+        bucket = get_rate_limiter().bucket(self.api_key, self.host)
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire()
             try:
                 response = await client.request(
                     method=method,
                     url=url,
-                    headers=self.headers,
+                    headers={**self.headers, **(headers or {})},
                     json=json,
-                    params=params
+                    params=params,
+                    timeout=self.timeout
                 )
-                response.raise_for_status()
-                return response.json()
-
             except httpx.TimeoutException:
                 raise HTTPException(
                     status_code=504,
                     detail="Request to Mist API timed out"
                 )
-            except httpx.HTTPStatusError as e:
-                raise HTTPException(
-                    status_code=e.response.status_code,
-                    detail=f"Mist API error: {e.response.text}"
-                )
             except httpx.RequestError as e:
                 raise HTTPException(
                     status_code=502,
                     detail=f"Failed to connect to Mist API: {str(e)}"
                 )
 
-    async def get(self, endpoint: str, params: dict | None = None) -> dict:
-        """Execute a GET request."""
-        return await self._request("GET", endpoint, params=params)
+            if attempt < self.max_retries:
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_max)
+                if response.status_code == 429:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    bucket.pause(retry_after if retry_after is not None else delay)
+                    continue
+                if response.status_code in RETRY_STATUS_CODES and method in IDEMPOTENT_METHODS:
+                    await asyncio.sleep(delay)
+                    continue
 
-    async def post(self, endpoint: str, json: dict | None = None) -> dict:
-        """Execute a POST request."""
-        return await self._request("POST", endpoint, json=json)
+            if response.status_code == 304:
+                return response
+            try:
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                raise HTTPException(
+                    status_code=e.response.status_code,
+                    detail=f"Mist API error: {e.response.text}"
+                )
+            return response
 
-    async def put(self, endpoint: str, json: dict | None = None) -> dict:
-        """Execute a PUT request."""
-        return await self._request("PUT", endpoint, json=json)
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        json: dict | list | None = None,
+        params: dict | None = None
+    ) -> dict:
+        """
+        Execute an API request and decode the JSON body.
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE)
+            endpoint: API endpoint (e.g., /api/v1/self)
+            json: Request body for POST/PUT
+            params: Query parameters
+
+        Returns:
+            API response as dict (empty for bodiless responses)
+
+        Raises:
+            HTTPException: On API or connection errors
+        """
+        response = await self._send(method, endpoint, json=json, params=params)
+        return response.json() if response.content else {}
+
+    async def get(self, endpoint: str, params: dict | None = None, cache: bool = False) -> dict:
+        """
+        Execute a GET request.
+
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            cache: Serve from the response cache, revalidating with ETag once stale
+        """
+        if not cache:
+            return await self._request("GET", endpoint, params=params)
+
+        response_cache = get_response_cache()
+        entry = await response_cache.lookup(self.host, endpoint, params)
+        if entry is not None and entry["fresh_until"] > time.time():
+            return entry["body"]
+
+        headers = {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else None
+        response = await self._send("GET", endpoint, params=params, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            body, etag = entry["body"], entry["etag"]
+        else:
+            body = response.json() if response.content else {}
+            etag = response.headers.get("ETag")
+        await response_cache.store(self.host, endpoint, params, body, etag)
+        return body
+
+    async def post(self, endpoint: str, json: dict | list | None = None) -> dict:
+        """Execute a POST request and invalidate cached reads of the endpoint."""
+        result = await self._request("POST", endpoint, json=json)
+        await get_response_cache().invalidate(self.host, endpoint)
+        return result
+
+    async def put(self, endpoint: str, json: dict | list | None = None) -> dict:
+        """Execute a PUT request and invalidate cached reads of the object and its collection."""
+        result = await self._request("PUT", endpoint, json=json)
+        await get_response_cache().invalidate(self.host, endpoint, _collection(endpoint))
+        return result
 
     async def delete(self, endpoint: str) -> dict:
-        """Execute a DELETE request."""
-        return await self._request("DELETE", endpoint)
+        """Execute a DELETE request and invalidate cached reads of the object and its collection."""
+        result = await self._request("DELETE", endpoint)
+        await get_response_cache().invalidate(self.host, endpoint, _collection(endpoint))
+        return result
+
+    async def paginate(
+        self,
+        endpoint: str,
+        params: dict | None = None,
+        limit: int = 100
+    ) -> AsyncIterator[dict]:
+        """
+        Stream every record of a paginated Mist collection.
+
+        Follows the `X-Page-Total` / `X-Page-Limit` response headers (or a
+        short page when Mist omits them). The next page is requested while
+        the current one is being consumed, so callers never wait on the
+        network between pages and never hold more than two pages in memory.
+
+        Args:
+            endpoint: Collection endpoint (e.g., /api/v1/orgs/{org_id}/inventory)
+            params: Extra query parameters (filters)
+            limit: Page size requested from Mist
+
+        Yields:
+            Individual records as dicts
+        """
+        params = dict(params or {})
+
+        def fetch(page: int) -> asyncio.Task:
+            return asyncio.create_task(
+                self._send("GET", endpoint, params={**params, "limit": limit, "page": page})
+            )
+
+        page = 1
+        pending: asyncio.Task | None = fetch(page)
+        try:
+            while pending is not None:
+                response = await pending
+                pending = None
+                records = response.json() if response.content else []
+
+                page_limit = int(response.headers.get("X-Page-Limit", limit))
+                total = response.headers.get("X-Page-Total")
+                if total is not None:
+                    has_more = page * page_limit < int(total)
+                else:
+                    has_more = len(records) >= page_limit
+                if records and has_more:
+                    page += 1
+                    pending = fetch(page)
+
+                for record in records:
+                    yield record
+        finally:
+            if pending is not None:
+                pending.cancel()
 
     # =========================================================================
     # Convenience Methods
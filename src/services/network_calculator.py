@@ -5,10 +5,24 @@ Algorithmic IP Planning - No Spreadsheets Required
 This service mathematically generates non-overlapping subnets for every site 
 based on its Zone ID, eliminating manual IP management.
 """
+from array import array
+from collections.abc import Iterator, Sequence
 from ipaddress import IPv4Network
 from pydantic import BaseModel
 
 
+# Second-octet offset of each VLAN role: 10.{offset + zone_id}.{site_id}.0/24
+VLAN_OFFSETS = {
+    "management_subnet": 0,
+    "data_subnet": 100,
+    "voice_subnet": 150,
+    "guest_subnet": 200,
+    "iot_subnet": 220,
+}
+# Largest zone whose highest VLAN role (iot, +220) still fits in one octet.
+MAX_PLAN_ZONE_ID = 255 - max(VLAN_OFFSETS.values())
+
+
 class IPAllocation(BaseModel):
     """IP allocation result for a site."""
     zone_id: int
@@ -20,6 +34,61 @@ class IPAllocation(BaseModel):
     iot_subnet: str
 
 
+class IPPlan:
+    """
+    Columnar IP plan for many sites.
+
+    Each column is a compact `array` of unsigned ints (zone IDs, site IDs and
+    one network address per VLAN role), so a plan for thousands of sites is a
+    handful of arrays rather than thousands of model instances. Rows and
+    CIDR strings are only materialised on export.
+    """
+
+    PREFIX_LENGTH = 24
+
+    def __init__(self, zone_ids: array, site_ids: array, networks: dict[str, array]):
+        self.zone_ids = zone_ids
+        self.site_ids = site_ids
+        self.networks = networks
+
+    def __len__(self) -> int:
+        return len(self.site_ids)
+
+    @classmethod
+    def _cidr(cls, address: int) -> str:
+        return f"{address >> 24}.{(address >> 16) & 255}.{(address >> 8) & 255}.{address & 255}/{cls.PREFIX_LENGTH}"
+
+    @property
+    def columns(self) -> list[str]:
+        """Column names in export order."""
+        return ["zone_id", "site_id", *self.networks]
+
+    def to_columns(self) -> dict[str, list[int] | int]:
+        """Columnar export: network addresses as 32-bit ints plus the shared prefix length."""
+        return {
+            "prefix_length": self.PREFIX_LENGTH,
+            "zone_id": self.zone_ids.tolist(),
+            "site_id": self.site_ids.tolist(),
+            **{role: column.tolist() for role, column in self.networks.items()},
+        }
+
+    def iter_rows(self) -> Iterator[dict]:
+        """Yield one row per site with CIDR strings (same shape as IPAllocation)."""
+        cidr = self._cidr
+        columns = list(self.networks.items())
+        for i in range(len(self)):
+            row = {"zone_id": self.zone_ids[i], "site_id": self.site_ids[i]}
+            for role, column in columns:
+                row[role] = cidr(column[i])
+            yield row
+
+    def iter_csv(self) -> Iterator[str]:
+        """Yield the plan as CSV lines (header first)."""
+        yield ",".join(self.columns) + "\n"
+        for row in self.iter_rows():
+            yield ",".join(str(value) for value in row.values()) + "\n"
+
+
 class NetworkCalculator:
     """
     Algorithmic IP Planning Service.
@@ -64,6 +133,56 @@ class NetworkCalculator:
             iot_subnet=f"10.{220 + zone_id}.{site_id}.0/24"
         )
     
+    def plan_sites(self, zone_ids: Sequence[int], site_ids: Sequence[int]) -> IPPlan:
+        """
+        Calculate subnets for many (zone_id, site_id) pairs in one pass.
+
+        Uses the same formula as `calculate_site_subnets`, computed as
+        integer arithmetic on network addresses: each VLAN column is the
+        site's base address plus a fixed second-octet offset.
+
+        Args:
+            zone_ids: Zone identifier per site (1-35, so every VLAN octet fits)
+            site_ids: Site identifier per site (1-255), parallel to zone_ids
+
+        Returns:
+            Columnar IPPlan
+        """
+        if len(zone_ids) != len(site_ids):
+            raise ValueError("zone_ids and site_ids must have the same length")
+        if zone_ids and not (1 <= min(zone_ids) and max(zone_ids) <= MAX_PLAN_ZONE_ID):
+            raise ValueError(f"Zone IDs must be 1-{MAX_PLAN_ZONE_ID} for bulk planning")
+        if site_ids and not (1 <= min(site_ids) and max(site_ids) <= 255):
+            raise ValueError("Site IDs must be 1-255")
+        zones = array("I", zone_ids)
+        sites = array("I", site_ids)
+
+        supernet = int(self.supernet.network_address)
+        base = array("I", [supernet | (z << 16) | (s << 8) for z, s in zip(zones, sites)])
+        networks = {}
+        for role, offset in VLAN_OFFSETS.items():
+            shift = offset << 16
+            networks[role] = array("I", [address + shift for address in base])
+        return IPPlan(zones, sites, networks)
+
+    def plan_zones(self, zone_ids: Sequence[int], sites_per_zone: int = 255) -> IPPlan:
+        """
+        Plan every site slot (1..sites_per_zone) of each zone.
+
+        Args:
+            zone_ids: Zones to plan
+            sites_per_zone: Number of site slots per zone (1-255)
+
+        Returns:
+            Columnar IPPlan ordered by zone, then site
+        """
+        if not 1 <= sites_per_zone <= 255:
+            raise ValueError(f"sites_per_zone must be 1-255, got {sites_per_zone}")
+        site_range = range(1, sites_per_zone + 1)
+        zones = [z for z in zone_ids for _ in site_range]
+        sites = [s for _ in zone_ids for s in site_range]
+        return self.plan_sites(zones, sites)
+
     def calculate_zone_summary(self, zone_id: int) -> dict:
         """
         Get summary of IP ranges for an entire zone.
@@ -0,0 +1,268 @@
+"""
+Pipeline Engine - Dependency-aware parallel execution with resumable checkpoints.
+
+A pipeline is a DAG of named steps. Org-scoped steps run once per run;
+site-scoped steps run once per site and may depend on org steps. Every
+(target, step) pair starts as soon as its dependencies have succeeded, so
+independent branches and different sites progress concurrently, bounded by
+one semaphore for the whole run.
+
+Each finished step is checkpointed in a Redis hash. Running the same run ID
+again skips steps that already succeeded (reusing their outputs) and retries
+the rest, so a failed turn-up resumes where it stopped.
+"""
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+from enum import Enum
+from typing import NamedTuple
+
+from pydantic import BaseModel, Field
+
+from src.config import get_settings
+from src.services.bulk import error_detail
+from src.services.jobs import current_job
+from src.services.mist_engine import MistEngine
+from src.services.redis import RedisKeys, get_redis_client
+
+# Target name of org-scoped steps
+ORG_TARGET = "org"
+
+
+# =============================================================================
+# Enums
+# =============================================================================
+
+class StepScope(str, Enum):
+    """How often a step runs within one pipeline run."""
+    ORG = "org"      # once per run
+    SITE = "site"    # once per site
+
+
+class StepStatus(str, Enum):
+    """Outcome of one (target, step) pair."""
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    BLOCKED = "blocked"    # a dependency did not succeed
+
+
+# =============================================================================
+# Models
+# =============================================================================
+
+class StepContext(NamedTuple):
+    """Everything a step function receives."""
+    engine: MistEngine
+    org_id: str
+    target: str            # ORG_TARGET or the site key
+    params: dict           # input of this target (org input or one site's input)
+    outputs: dict          # step name -> output of each dependency
+
+
+class Step(NamedTuple):
+    """One node of a pipeline DAG."""
+    name: str
+    run: Callable[[StepContext], Awaitable[dict | None]]
+    depends_on: tuple[str, ...] = ()
+    scope: StepScope = StepScope.SITE
+
+
+class StepResult(BaseModel):
+    """Checkpointed outcome of one (target, step) pair."""
+    target: str
+    step: str
+    status: StepStatus
+    output: dict = Field(default_factory=dict)
+    detail: str | None = None
+    resumed: bool = Field(default=False, description="Taken from a previous attempt's checkpoint")
+
+
+class PipelineReport(BaseModel):
+    """Outcome of a pipeline run."""
+    run_id: str
+    status: StepStatus = Field(..., description="succeeded only if every step succeeded")
+    succeeded: int
+    failed: int
+    blocked: int
+    steps: list[StepResult]
+
+    @classmethod
+    def from_results(cls, run_id: str, results: list[StepResult]) -> "PipelineReport":
+        """Build the summary counters from per-step results."""
+        counts = {status: 0 for status in StepStatus}
+        for result in results:
+            counts[result.status] += 1
+        ok = counts[StepStatus.FAILED] == counts[StepStatus.BLOCKED] == 0
+        return cls(
+            run_id=run_id,
+            status=StepStatus.SUCCEEDED if ok else StepStatus.FAILED,
+            succeeded=counts[StepStatus.SUCCEEDED],
+            failed=counts[StepStatus.FAILED],
+            blocked=counts[StepStatus.BLOCKED],
+            steps=results,
+        )
+
+
+# =============================================================================
+# Checkpoints
+# =============================================================================
+
+class CheckpointStore:
+    """
+    Redis-backed checkpoints of one run.
+
+    - pipeline:{run_id}:input  JSON of the run input (for resume)
+    - pipeline:{run_id}:steps  "{target}/{step}" -> StepResult JSON
+    """
+
+    def __init__(self, run_id: str, ttl: int | None = None):
+        self.run_id = run_id
+        self.ttl = ttl or get_settings().pipeline_checkpoint_ttl
+        prefix = f"{RedisKeys.PIPELINE_PREFIX}{run_id}"
+        self.input_key = f"{prefix}:input"
+        self.steps_key = f"{prefix}:steps"
+
+    async def save_input(self, data: dict) -> None:
+        """Store the run input so the run can be resumed from its ID alone."""
+        await get_redis_client().set(self.input_key, json.dumps(data), expire=self.ttl)
+
+    async def load_input(self) -> dict | None:
+        """Return the stored run input, or None for an unknown run."""
+        raw = await get_redis_client().get(self.input_key)
+        return json.loads(raw) if raw else None
+
+    async def load(self) -> dict[str, StepResult]:
+        """All checkpointed results, keyed by "{target}/{step}"."""
+        raw = await get_redis_client().client.hgetall(self.steps_key)
+        return {key: StepResult.model_validate_json(value) for key, value in raw.items()}
+
+    async def save(self, result: StepResult) -> None:
+        """Checkpoint one step result."""
+        pipe = get_redis_client().client.pipeline(transaction=False)
+        pipe.hset(self.steps_key, f"{result.target}/{result.step}", result.model_dump_json())
+        pipe.expire(self.steps_key, self.ttl)
+        await pipe.execute()
+
+
+# =============================================================================
+# Pipeline
+# =============================================================================
+
+class Pipeline:
+    """A validated DAG of steps."""
+
+    def __init__(self, steps: list[Step]):
+        """
+        Validate and order the steps.
+
+        Raises:
+            ValueError: for duplicate names, unknown dependencies, org steps
+                depending on site steps, or cycles
+        """
+        self.steps: dict[str, Step] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"Duplicate step: {step.name}")
+            self.steps[step.name] = step
+
+        for step in steps:
+            for dep in step.depends_on:
+                if dep not in self.steps:
+                    raise ValueError(f"Step {step.name} depends on unknown step {dep}")
+                if step.scope == StepScope.ORG and self.steps[dep].scope == StepScope.SITE:
+                    raise ValueError(f"Org step {step.name} cannot depend on site step {dep}")
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> list[str]:
+        remaining = {name: set(step.depends_on) for name, step in self.steps.items()}
+        order: list[str] = []
+        while remaining:
+            ready = sorted(name for name, deps in remaining.items() if not deps)
+            if not ready:
+                raise ValueError(f"Dependency cycle between steps: {', '.join(sorted(remaining))}")
+            for name in ready:
+                del remaining[name]
+                order.append(name)
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    async def execute(
+        self,
+        engine: MistEngine,
+        org_id: str,
+        org_params: dict,
+        sites: dict[str, dict],
+        checkpoints: CheckpointStore,
+        concurrency: int = 10,
+    ) -> list[StepResult]:
+        """
+        Run every step for the org and each site.
+
+        Args:
+            engine: Mist API engine
+            org_id: Target organization
+            org_params: Input of org-scoped steps
+            sites: Site key -> input of site-scoped steps
+            checkpoints: Store of this run; succeeded steps are not re-run
+            concurrency: Maximum steps executing at once across all sites
+
+        Returns:
+            One result per (target, step), org steps first, then per site in step order
+        """
+        previous = await checkpoints.load()
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks: dict[tuple[str, str], asyncio.Task] = {}
+        job = current_job.get()
+
+        async def run(target: str, step: Step, params: dict) -> StepResult:
+            result = await run_step(target, step, params)
+            if job is not None:
+                await job.advance()
+            return result
+
+        async def run_step(target: str, step: Step, params: dict) -> StepResult:
+            deps: dict[str, StepResult] = {}
+            for dep in step.depends_on:
+                dep_target = ORG_TARGET if self.steps[dep].scope == StepScope.ORG else target
+                deps[dep] = await tasks[(dep_target, dep)]
+
+            not_ok = [name for name, result in deps.items() if result.status != StepStatus.SUCCEEDED]
+            if not_ok:
+                return StepResult(
+                    target=target, step=step.name, status=StepStatus.BLOCKED,
+                    detail=f"Dependency did not succeed: {', '.join(not_ok)}",
+                )
+
+            checkpoint = previous.get(f"{target}/{step.name}")
+            if checkpoint is not None and checkpoint.status == StepStatus.SUCCEEDED:
+                return checkpoint.model_copy(update={"resumed": True})
+
+            context = StepContext(
+                engine=engine, org_id=org_id, target=target, params=params,
+                outputs={name: result.output for name, result in deps.items()},
+            )
+            async with semaphore:
+                try:
+                    if job is not None:
+                        await job.check_cancelled()
+                    output = await step.run(context) or {}
+                    result = StepResult(target=target, step=step.name, status=StepStatus.SUCCEEDED, output=output)
+                except Exception as e:  # noqa: BLE001 - failures are checkpointed per step
+                    result = StepResult(
+                        target=target, step=step.name, status=StepStatus.FAILED, detail=error_detail(e)
+                    )
+            await checkpoints.save(result)
+            return result
+
+        targets = [(ORG_TARGET, org_params, StepScope.ORG)]
+        targets += [(site, params, StepScope.SITE) for site, params in sites.items()]
+        for target, params, scope in targets:
+            for name in self.order:
+                step = self.steps[name]
+                if step.scope == scope:
+                    tasks[(target, name)] = asyncio.create_task(run(target, step, params))
+
+        if job is not None:
+            await job.add_total(len(tasks))
+        return list(await asyncio.gather(*tasks.values()))
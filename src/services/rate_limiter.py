@@ -0,0 +1,140 @@
+"""
+Rate Limiter - Token-bucket scheduling for the Mist API quota.
+
+Mist enforces an hourly call budget per API token (5,000 calls/hour by default)
+and answers with 429 once it is spent. Instead of letting a large rollout burn
+the budget in minutes and collapse into errors, every MistEngine call first
+takes a token from the bucket for its (API key, host) pair. Callers that find
+the bucket empty are queued in arrival order until a token refills.
+
+The budget is tracked per process. When running several workers, size
+`mist_rate_limit_per_hour` as the token quota divided by the worker count.
+"""
+import asyncio
+import hashlib
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+from src.config import get_settings
+
+
+class TokenBucket:
+    """
+    Token bucket with FIFO waiters and a pause switch for server-side 429s.
+
+    Tokens refill continuously at `rate` per second up to `capacity`, so short
+    bursts are served immediately while the long-run rate stays in budget.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def remaining(self) -> int:
+        """Whole tokens currently available."""
+        self._refill()
+        return int(self.tokens)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available, then consume it."""
+        # The lock queues callers in arrival order; only the head waits on the clock.
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if self._paused_until > now:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for `seconds` (e.g. after a 429 Retry-After)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+
+class RateLimiter:
+    """Registry of token buckets keyed by API key and Mist host."""
+
+    def __init__(self, calls_per_hour: int = 5000, burst: int = 50):
+        """
+        Initialize the limiter.
+
+        Args:
+            calls_per_hour: Sustained budget per API key and host
+            burst: Calls that may be issued back-to-back from a full bucket
+        """
+        self.rate = calls_per_hour / 3600
+        self.burst = burst
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def bucket(self, api_key: str, host: str) -> TokenBucket:
+        """Return the bucket for an API key/host pair, creating it on first use."""
+        # Hash the token so raw credentials are never held as dictionary keys.
+        key = f"{hashlib.sha256(api_key.encode()).hexdigest()[:16]}@{host}"
+        if key not in self._buckets:
+            self._buckets[key] = TokenBucket(rate=self.rate, capacity=self.burst)
+        return self._buckets[key]
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter: uniform(0, min(cap, base * 2^attempt))."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if the header is absent or malformed
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# Singleton instance
+_limiter: RateLimiter | None = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        settings = get_settings()
+        _limiter = RateLimiter(
+            calls_per_hour=settings.mist_rate_limit_per_hour,
+            burst=settings.mist_rate_limit_burst,
+        )
+    return _limiter
@@ -0,0 +1,218 @@
+"""
+Reconciler - Converge Mist org objects onto a desired-state document.
+
+Instead of POSTing every object and PUTting full payloads, the reconciler
+fetches the current collections in bulk, matches objects by name, and issues
+only the calls needed:
+
+- create: the name does not exist in Mist
+- update: a PUT carrying only the fields whose value differs
+- delete: the object is not in the document (only when pruning)
+
+Fields omitted from a desired object are not managed: they are never diffed
+and take Mist defaults on create. Nested dicts are compared on the desired
+keys only, so server-populated fields (ids, timestamps) never cause a diff.
+
+Creates and updates run in dependency order (networks, applications, hub
+profiles, sites); deletes run in reverse, so nothing is removed while it
+may still be referenced.
+"""
+import asyncio
+from enum import Enum
+from typing import NamedTuple
+
+from pydantic import BaseModel, Field
+
+from src.services.bulk import BulkItemResult, BulkItemStatus, error_detail, run_bounded
+from src.services.mist_engine import MistEngine
+
+
+class ResourceSpec(NamedTuple):
+    """Mist endpoints of one reconcilable resource kind."""
+    collection: str    # formatted with org_id
+    item: str          # formatted with org_id and id
+
+
+RESOURCES: dict[str, ResourceSpec] = {
+    "networks": ResourceSpec("/api/v1/orgs/{org_id}/networks", "/api/v1/orgs/{org_id}/networks/{id}"),
+    "apps": ResourceSpec("/api/v1/orgs/{org_id}/services", "/api/v1/orgs/{org_id}/services/{id}"),
+    "hub_profiles": ResourceSpec("/api/v1/orgs/{org_id}/hubprofiles", "/api/v1/orgs/{org_id}/hubprofiles/{id}"),
+    "sites": ResourceSpec("/api/v1/orgs/{org_id}/sites", "/api/v1/sites/{id}"),
+}
+
+# Creates/updates run in this order; deletes in reverse.
+APPLY_ORDER = ("networks", "apps", "hub_profiles", "sites")
+
+
+# =============================================================================
+# Models
+# =============================================================================
+
+class ActionType(str, Enum):
+    """Kind of write the reconciler issues for one object."""
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class PlannedAction(BaseModel):
+    """One Mist write required to reach the desired state."""
+    kind: str = Field(..., description="Resource kind (networks, apps, hub_profiles, sites)")
+    action: ActionType
+    name: str
+    id: str | None = Field(None, description="Mist ID of the existing object (update/delete)")
+    changes: dict = Field(default_factory=dict, description="Fields written (create: full object)")
+
+
+class ReconcilePlan(BaseModel):
+    """Minimal set of writes, plus how many objects already match."""
+    actions: list[PlannedAction]
+    unchanged: dict[str, int] = Field(default_factory=dict, description="Matching objects per kind")
+
+
+# =============================================================================
+# Diff
+# =============================================================================
+
+def matches(desired, current) -> bool:
+    """
+    Whether `current` already satisfies `desired`.
+
+    Dicts match when every desired key matches (extra current keys are
+    ignored); lists match element-wise and must have the same length.
+    """
+    if isinstance(desired, dict):
+        return isinstance(current, dict) and all(matches(v, current.get(k)) for k, v in desired.items())
+    if isinstance(desired, list):
+        return (
+            isinstance(current, list)
+            and len(desired) == len(current)
+            and all(matches(d, c) for d, c in zip(desired, current))
+        )
+    return desired == current
+
+
+def diff(desired: dict, current: dict) -> dict:
+    """Top-level desired fields whose value does not match `current`."""
+    return {k: v for k, v in desired.items() if not matches(v, current.get(k))}
+
+
+def plan_kind(kind: str, desired: list[dict], current: list[dict], prune: bool) -> tuple[list[PlannedAction], int]:
+    """
+    Plan the writes for one resource kind.
+
+    Returns:
+        (actions, number of unchanged objects)
+
+    Raises:
+        ValueError: if a name appears twice in `desired`
+    """
+    existing = {}
+    for obj in current:
+        existing.setdefault(obj.get("name"), obj)
+
+    actions: list[PlannedAction] = []
+    unchanged = 0
+    seen: set[str] = set()
+    for obj in desired:
+        name = obj["name"]
+        if name in seen:
+            raise ValueError(f"Duplicate {kind} name in desired state: {name}")
+        seen.add(name)
+
+        live = existing.get(name)
+        if live is None:
+            actions.append(PlannedAction(kind=kind, action=ActionType.CREATE, name=name, changes=obj))
+            continue
+        changes = diff(obj, live)
+        if changes:
+            actions.append(PlannedAction(kind=kind, action=ActionType.UPDATE, name=name, id=live.get("id"), changes=changes))
+        else:
+            unchanged += 1
+
+    if prune:
+        for name, live in existing.items():
+            if name not in seen:
+                actions.append(PlannedAction(kind=kind, action=ActionType.DELETE, name=name or "", id=live.get("id")))
+    return actions, unchanged
+
+
+# =============================================================================
+# Reconciler
+# =============================================================================
+
+async def plan(engine: MistEngine, org_id: str, desired: dict[str, list[dict]], prune: bool = False) -> ReconcilePlan:
+    """
+    Compute the minimal writes to converge the org onto `desired`.
+
+    Only kinds present in `desired` are fetched and reconciled; current
+    collections are pulled concurrently.
+
+    Args:
+        engine: Mist API engine
+        org_id: Organization to reconcile
+        desired: Kind -> desired objects (each with a `name`)
+        prune: Also delete objects of those kinds missing from `desired`
+    """
+    kinds = [kind for kind in APPLY_ORDER if kind in desired]
+
+    async def fetch(kind: str) -> list[dict]:
+        endpoint = RESOURCES[kind].collection.format(org_id=org_id)
+        return [obj async for obj in engine.paginate(endpoint)]
+
+    current = await asyncio.gather(*(fetch(kind) for kind in kinds))
+
+    actions: list[PlannedAction] = []
+    unchanged: dict[str, int] = {}
+    for kind, live in zip(kinds, current):
+        kind_actions, unchanged[kind] = plan_kind(kind, desired[kind], live, prune)
+        actions += kind_actions
+    return ReconcilePlan(actions=actions, unchanged=unchanged)
+
+
+async def apply(engine: MistEngine, org_id: str, plan: ReconcilePlan, concurrency: int = 10) -> list[BulkItemResult]:
+    """
+    Execute a plan phase by phase with bounded concurrency.
+
+    Each kind's creates and updates finish before the next kind starts;
+    deletes then run kind by kind in reverse order. A failed action never
+    stops the others.
+
+    Returns:
+        One result per action, indexed by its position in `plan.actions`
+    """
+    async def run(item: tuple[int, PlannedAction]) -> dict:
+        _, action = item
+        spec = RESOURCES[action.kind]
+        if action.action == ActionType.CREATE:
+            return await engine.post(spec.collection.format(org_id=org_id), json=action.changes)
+        endpoint = spec.item.format(org_id=org_id, id=action.id)
+        if action.action == ActionType.UPDATE:
+            return await engine.put(endpoint, json=action.changes)
+        return await engine.delete(endpoint)
+
+    indexed = list(enumerate(plan.actions))
+    phases = [
+        [(i, a) for i, a in indexed if a.kind == kind and a.action != ActionType.DELETE]
+        for kind in APPLY_ORDER
+    ] + [
+        [(i, a) for i, a in indexed if a.kind == kind and a.action == ActionType.DELETE]
+        for kind in reversed(APPLY_ORDER)
+    ]
+
+    results: list[BulkItemResult] = []
+    for phase in phases:
+        outcomes = await run_bounded(phase, run, concurrency)
+        for (index, action), outcome in zip(phase, outcomes):
+            key = f"{action.kind}/{action.name}"
+            if isinstance(outcome, Exception):
+                results.append(BulkItemResult(
+                    index=index, key=key, status=BulkItemStatus.FAILED, detail=error_detail(outcome)
+                ))
+            else:
+                results.append(BulkItemResult(
+                    index=index, key=key, status=BulkItemStatus.SUCCEEDED,
+                    id=outcome.get("id", action.id) if isinstance(outcome, dict) else action.id,
+                    detail=action.action.value,
+                ))
+    return results
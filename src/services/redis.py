@@ -1,7 +1,15 @@
-import redis
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+
+import redis.asyncio as redis
 from src.config import get_settings
 
 
+logger = logging.getLogger(__name__)
+
+
 # =============================================================================
 # Redis Key Constants
 # =============================================================================
@@ -10,58 +18,248 @@ class RedisKeys:
     """Centralized Redis key definitions."""
     API_HOST = "api_host"
     ORG_ID = "org_id"
+    CONTEXT_CHANNEL = "org_context:invalidate"
+    RESPONSE_CACHE_PREFIX = "mist_cache:"
+    RESPONSE_CACHE_CHANNEL = "mist_cache:invalidate"
+    INVENTORY_PREFIX = "inventory:"
+    INVENTORY_CHANNEL = "inventory:invalidate"
+    IPAM_CHANNEL = "ipam_index:invalidate"
+    PIPELINE_PREFIX = "pipeline:"
+    JOB_PREFIX = "job:"
+    JOB_STREAM = "jobs:stream"
+    JOB_GROUP = "workers"
+    SNAPSHOT_PREFIX = "snapshot:"
+    TIMESERIES_PREFIX = "ts:"
+    TIMESERIES_INDEX = "ts:series"
+    ALERT_PREFIX = "alerts:"
+    HEALTH_STATE_PREFIX = "health_state:"
+    EVENT_CHANNEL_PREFIX = "events:"
+    INCIDENT_PREFIX = "incidents:"
 
 
-class RedisClient:
-    def __init__(self):
+# =============================================================================
+# Connection Pool
+# =============================================================================
+
+# One pool per process, shared by every RedisClient. Opened lazily and
+# closed by the FastAPI lifespan on shutdown.
+_pool: redis.ConnectionPool | None = None
+
+
+def get_redis_pool() -> redis.ConnectionPool:
+    """Get the shared async Redis connection pool."""
+    global _pool
+    if _pool is None:
         settings = get_settings()
-        url = settings.redis_url
-        self.client = redis.Redis.from_url(url, decode_responses=True)
+        _pool = redis.ConnectionPool.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            max_connections=settings.redis_max_connections,
+        )
+    return _pool
+
+
+async def close_redis_pool() -> None:
+    """Disconnect the shared pool (called from the FastAPI lifespan on shutdown)."""
+    global _pool
+    if _pool is not None:
+        await _pool.aclose()
+        _pool = None
+
+
+class RedisClient:
+    def __init__(self, pool: redis.ConnectionPool | None = None):
+        self.client = redis.Redis(connection_pool=pool or get_redis_pool())
 
-    def set(self, key: str, value: str, expire: int = None) -> bool:
+    async def set(self, key: str, value: str, expire: int | None = None) -> bool:
         """Set a key-value pair in Redis."""
-        return self.client.setex(key, expire, value) if expire else self.client.set(key, value)
+        return await self.client.set(key, value, ex=expire)
 
-    def get(self, key: str) -> str | None:
+    async def get(self, key: str) -> str | None:
         """Get a value by key from Redis."""
-        return self.client.get(key)
+        return await self.client.get(key)
+
+    async def mget(self, *keys: str) -> list[str | None]:
+        """Get several values in a single round trip."""
+        return await self.client.mget(keys)
 
-    def delete(self, key: str) -> int:
+    async def delete(self, key: str) -> int:
         """Delete a key from Redis."""
-        return self.client.delete(key)
+        return await self.client.delete(key)
 
-    def ping(self) -> bool:
+    async def publish(self, channel: str, message: str) -> int:
+        """Publish a message to a pub/sub channel."""
+        return await self.client.publish(channel, message)
+
+    async def ping(self) -> bool:
         """Test Redis connection."""
         try:
-            return self.client.ping()
-        except redis.ConnectionError:
+            return await self.client.ping()
+        except (redis.ConnectionError, redis.TimeoutError):
             return False
 
 
 def get_redis_client() -> RedisClient:
-    """Get a Redis client instance."""
+    """Get a Redis client backed by the shared connection pool."""
     return RedisClient()
 
 
+# =============================================================================
+# Invalidation Listener
+# =============================================================================
+
+# Channel -> handler called with the message payload. Services register here
+# so one pub/sub connection per process serves every in-memory cache.
+_invalidation_handlers: dict[str, Callable[[str], None]] = {}
+
+
+def register_invalidation_handler(channel: str, handler: Callable[[str], None]) -> None:
+    """Call `handler` whenever any worker publishes on `channel`."""
+    _invalidation_handlers[channel] = handler
+
+
+def _invalidate_all() -> None:
+    """Drop every in-memory cache (messages may have been missed)."""
+    for handler in _invalidation_handlers.values():
+        handler("")
+
+
+async def run_invalidation_listener(retry_delay: float = 5.0) -> None:
+    """
+    Subscribe to all registered invalidation channels for the app lifetime.
+
+    Caches must register their handlers before this task starts.
+
+    On any Redis error every cache is flushed, since invalidations published
+    while disconnected are lost; the subscription is then re-established.
+    A message its handler cannot process is logged and skipped.
+    """
+    while True:
+        pubsub = get_redis_client().client.pubsub()
+        try:
+            await pubsub.subscribe(*_invalidation_handlers)
+            _invalidate_all()
+            async for message in pubsub.listen():
+                handler = _invalidation_handlers.get(message["channel"])
+                if message["type"] != "message" or not handler:
+                    continue
+                try:
+                    handler(message["data"])
+                except Exception as e:  # noqa: BLE001 - one bad message must not stop the listener
+                    logger.warning("Ignoring invalidation on %s: %s", message["channel"], e)
+        except redis.RedisError as e:
+            logger.warning("Invalidation listener disconnected: %s", e)
+            _invalidate_all()
+        finally:
+            await pubsub.aclose()
+        await asyncio.sleep(retry_delay)
+
+
+# =============================================================================
+# Context Cache
+# =============================================================================
+
+class ContextCache:
+    """
+    In-process TTL cache of the org context (api_host, org_id).
+
+    The context only changes when POST /org/self runs, so hot-path handlers
+    read it from memory. Writers publish on RedisKeys.CONTEXT_CHANNEL and every
+    worker drops its copy; the TTL bounds staleness if a message is missed.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._value: tuple[str, str] | None = None
+        self._expires = 0.0
+
+    def get(self) -> tuple[str, str] | None:
+        """Return the cached context, or None if missing or expired."""
+        if self._value is not None and time.monotonic() < self._expires:
+            return self._value
+        return None
+
+    def put(self, value: tuple[str, str]) -> None:
+        """Cache a context for `ttl` seconds."""
+        self._value = value
+        self._expires = time.monotonic() + self.ttl
+
+    def invalidate(self, _message: str = "") -> None:
+        """Drop the cached context."""
+        self._value = None
+
+
+_context_cache: ContextCache | None = None
+
+
+def get_context_cache() -> ContextCache:
+    """Get the process-wide context cache."""
+    global _context_cache
+    if _context_cache is None:
+        _context_cache = ContextCache(ttl=get_settings().context_cache_ttl)
+        register_invalidation_handler(RedisKeys.CONTEXT_CHANNEL, _context_cache.invalidate)
+    return _context_cache
+
+
 # =============================================================================
 # Context Accessors
 # =============================================================================
 
-def get_api_host() -> str | None:
+async def get_context() -> tuple[str | None, str | None]:
+    """
+    Get the stored API host and organization ID.
+
+    Served from the in-process cache when warm; otherwise fetched in one
+    MGET round trip. Incomplete context is never cached.
+    """
+    cache = get_context_cache()
+    cached = cache.get()
+    if cached is not None:
+        return cached
+
+    api_host, org_id = await get_redis_client().mget(RedisKeys.API_HOST, RedisKeys.ORG_ID)
+    if api_host and org_id:
+        cache.put((api_host, org_id))
+    return api_host, org_id
+
+
+async def set_context(api_host: str, org_id: str | None = None) -> None:
+    """Store the API host (and org ID) and invalidate every worker's cache."""
+    client = get_redis_client()
+    await client.set(RedisKeys.API_HOST, api_host)
+    if org_id:
+        await client.set(RedisKeys.ORG_ID, org_id)
+    await _publish_context_change(client)
+
+
+async def _publish_context_change(client: RedisClient) -> None:
+    get_context_cache().invalidate()
+    await client.publish(RedisKeys.CONTEXT_CHANNEL, "changed")
+
+
+async def get_api_host() -> str | None:
     """Get the stored API host."""
-    return get_redis_client().get(RedisKeys.API_HOST)
+    api_host, _ = await get_context()
+    return api_host
 
 
-def get_org_id() -> str | None:
+async def get_org_id() -> str | None:
     """Get the stored organization ID."""
-    return get_redis_client().get(RedisKeys.ORG_ID)
+    _, org_id = await get_context()
+    return org_id
 
 
-def set_api_host(value: str) -> bool:
+async def set_api_host(value: str) -> bool:
     """Store the API host."""
-    return get_redis_client().set(RedisKeys.API_HOST, value)
+    client = get_redis_client()
+    result = await client.set(RedisKeys.API_HOST, value)
+    await _publish_context_change(client)
+    return result
 
 
-def set_org_id(value: str) -> bool:
+async def set_org_id(value: str) -> bool:
     """Store the organization ID."""
-    return get_redis_client().set(RedisKeys.ORG_ID, value)
+    client = get_redis_client()
+    result = await client.set(RedisKeys.ORG_ID, value)
+    await _publish_context_change(client)
+    return result
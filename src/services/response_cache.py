@@ -0,0 +1,152 @@
+"""
+Response Cache - Read-through cache for Mist GET endpoints.
+
+Objects such as sites, applications and hub profiles change rarely but are
+polled constantly by dashboards. Cached GETs are answered from a small
+in-process LRU, backed by Redis so every worker shares one copy. Once an entry
+is older than `ttl` it is revalidated with `If-None-Match` when Mist supplied
+an ETag, so an unchanged object costs a 304 instead of a full payload.
+
+Any PUT/POST/DELETE issued through MistEngine invalidates the cached entries
+for that endpoint (and, for a PUT/DELETE of one object, its collection),
+locally, in Redis, and in every other worker via pub/sub.
+
+Redis errors degrade to a cache miss; the cache never fails a request.
+"""
+import json
+import logging
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+import redis.asyncio as redis
+
+from src.config import get_settings
+from src.services.redis import RedisKeys, get_redis_client, register_invalidation_handler
+
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Two-tier (in-process LRU + Redis hash) cache of Mist GET response bodies.
+
+    Entries are grouped per resource (host + endpoint) in one Redis hash whose
+    fields are the encoded query parameters, so invalidating a resource is a
+    single DEL regardless of how many parameter variants were cached.
+    """
+
+    def __init__(self, ttl: float = 30.0, stale_ttl: int = 3600, max_entries: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry is served without contacting Mist
+            stale_ttl: Seconds an entry is kept for ETag revalidation
+            max_entries: Capacity of the in-process LRU
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._lru: OrderedDict[tuple[str, str], dict] = OrderedDict()
+
+    @staticmethod
+    def resource_key(host: str, endpoint: str) -> str:
+        """Redis key holding every cached variant of one resource."""
+        return f"{RedisKeys.RESPONSE_CACHE_PREFIX}{host}{endpoint}"
+
+    @staticmethod
+    def params_key(params: dict | None) -> str:
+        """Stable encoding of query parameters (order-independent)."""
+        return urlencode(sorted((params or {}).items())) or "-"
+
+    async def lookup(self, host: str, endpoint: str, params: dict | None = None) -> dict | None:
+        """
+        Find a cached entry.
+
+        Returns:
+            Entry dict with `body`, `etag` and `fresh_until` (epoch seconds),
+            or None on a miss
+        """
+        key = (self.resource_key(host, endpoint), self.params_key(params))
+        entry = self._lru.get(key)
+        if entry is not None:
+            self._lru.move_to_end(key)
+            return entry
+
+        try:
+            raw = await get_redis_client().client.hget(*key)
+        except redis.RedisError as e:
+            logger.warning("Response cache lookup failed: %s", e)
+            return None
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        self._remember(key, entry)
+        return entry
+
+    async def store(
+        self,
+        host: str,
+        endpoint: str,
+        params: dict | None,
+        body: dict | list,
+        etag: str | None
+    ) -> None:
+        """Cache a response body as fresh for `ttl` seconds."""
+        key = (self.resource_key(host, endpoint), self.params_key(params))
+        entry = {"body": body, "etag": etag, "fresh_until": time.time() + self.ttl}
+        self._remember(key, entry)
+        try:
+            pipe = get_redis_client().client.pipeline(transaction=False)
+            pipe.hset(key[0], key[1], json.dumps(entry))
+            pipe.expire(key[0], self.stale_ttl)
+            await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning("Response cache store failed: %s", e)
+
+    async def invalidate(self, host: str, *endpoints: str) -> None:
+        """Drop every cached variant of the resources in all workers."""
+        resources = [self.resource_key(host, endpoint) for endpoint in endpoints]
+        for resource in resources:
+            self.drop_local(resource)
+        try:
+            pipe = get_redis_client().client.pipeline(transaction=False)
+            pipe.delete(*resources)
+            for resource in resources:
+                pipe.publish(RedisKeys.RESPONSE_CACHE_CHANNEL, resource)
+            await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning("Response cache invalidation failed: %s", e)
+
+    def drop_local(self, resource: str) -> None:
+        """Drop a resource from the in-process LRU (empty string drops all)."""
+        if not resource:
+            self._lru.clear()
+            return
+        for key in [k for k in self._lru if k[0] == resource]:
+            del self._lru[key]
+
+    def _remember(self, key: tuple[str, str], entry: dict) -> None:
+        self._lru[key] = entry
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+
+# Singleton instance
+_cache: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache:
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        _cache = ResponseCache(
+            ttl=settings.mist_cache_ttl,
+            stale_ttl=settings.mist_cache_stale_ttl,
+            max_entries=settings.mist_cache_max_entries,
+        )
+        register_invalidation_handler(RedisKeys.RESPONSE_CACHE_CHANNEL, _cache.drop_local)
+    return _cache
@@ -0,0 +1,126 @@
+"""
+Snapshot Cache - Short-lived, single-flight cache of expensive aggregates.
+
+Fleet-wide views (e.g. the health of every site) cost one Mist call per site
+to build but are requested by many dashboards at once. A snapshot is built at
+most once per TTL across all workers:
+
+- Concurrent requests in one worker share a single build (asyncio lock).
+- Across workers, the builder holds a Redis lock (SET NX EX); the others
+  wait for the snapshot to appear instead of building their own.
+- Built snapshots are stored in Redis with the TTL and kept in-process.
+
+Redis errors degrade to building without the cache.
+"""
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+
+import redis.asyncio as redis
+
+from src.config import get_settings
+from src.services.redis import RedisKeys, get_redis_client
+
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotCache:
+    """Two-tier (in-process + Redis) single-flight cache of JSON snapshots."""
+
+    def __init__(self, ttl: float = 60.0, lock_timeout: float = 30.0, poll_interval: float = 0.25):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a snapshot is served before it is rebuilt
+            lock_timeout: Longest a build may hold the cross-worker lock
+            poll_interval: How often waiting workers check for the snapshot
+        """
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._local: dict[str, tuple[float, dict]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return f"{RedisKeys.SNAPSHOT_PREFIX}{name}"
+
+    def _fresh_local(self, name: str) -> dict | None:
+        entry = self._local.get(name)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    async def get_or_build(self, name: str, build: Callable[[], Awaitable[dict]], refresh: bool = False) -> dict:
+        """
+        Return the snapshot `name`, building it if missing or expired.
+
+        Args:
+            name: Snapshot key (include the org ID)
+            build: Coroutine function producing the snapshot (JSON-serializable)
+            refresh: Rebuild even if a fresh snapshot exists
+        """
+        if not refresh and (snapshot := self._fresh_local(name)) is not None:
+            return snapshot
+
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            # Another request in this worker may have built it while we waited.
+            if not refresh and (snapshot := self._fresh_local(name)) is not None:
+                return snapshot
+            snapshot = await self._shared(name, build, refresh)
+            self._local[name] = (time.monotonic() + self.ttl, snapshot)
+            return snapshot
+
+    async def _shared(self, name: str, build: Callable[[], Awaitable[dict]], refresh: bool) -> dict:
+        """Read the snapshot from Redis or build it under the cross-worker lock."""
+        client = get_redis_client().client
+        key, lock_key = self._key(name), f"{self._key(name)}:lock"
+        try:
+            if not refresh and (raw := await client.get(key)):
+                return json.loads(raw)
+
+            # Wait for another worker's build; take over if it outlives the lock timeout.
+            deadline = time.monotonic() + self.lock_timeout
+            while not (locked := await client.set(lock_key, "1", nx=True, ex=int(self.lock_timeout))):
+                if time.monotonic() > deadline:
+                    break
+                await asyncio.sleep(self.poll_interval)
+                if not refresh and (raw := await client.get(key)):
+                    return json.loads(raw)
+        except redis.RedisError as e:
+            logger.warning("Snapshot cache unavailable for %s: %s", name, e)
+            return await build()
+
+        try:
+            snapshot = await build()
+        finally:
+            if locked:
+                with suppress(redis.RedisError):
+                    await client.delete(lock_key)
+        try:
+            await client.set(key, json.dumps(snapshot), ex=int(self.ttl))
+        except redis.RedisError as e:
+            logger.warning("Snapshot cache store failed for %s: %s", name, e)
+        return snapshot
+
+    def invalidate(self, name: str) -> None:
+        """Drop the in-process copy (the Redis copy expires with its TTL)."""
+        self._local.pop(name, None)
+
+
+# Singleton instance
+_cache: SnapshotCache | None = None
+
+
+def get_snapshot_cache() -> SnapshotCache:
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        _cache = SnapshotCache(ttl=settings.snapshot_ttl, lock_timeout=settings.snapshot_lock_timeout)
+    return _cache
@@ -0,0 +1,53 @@
+"""
+Streaming Responses - NDJSON output for large collections.
+
+List endpoints normally build every record into one JSON document, so memory
+and time-to-first-byte grow with the collection. When a client sends
+`Accept: application/x-ndjson`, records are instead written one JSON object per
+line as they arrive from the Mist API, and the full collection is never held.
+"""
+from collections.abc import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# OpenAPI `responses=` entry documenting the alternate NDJSON representation.
+NDJSON_RESPONSES = {
+    200: {"content": {NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}}}},
+}
+
+
+def wants_ndjson(accept: str | None) -> bool:
+    """Return True if the Accept header asks for newline-delimited JSON."""
+    return bool(accept) and NDJSON_MEDIA_TYPE in accept
+
+
+async def ndjson_response(records: AsyncIterator[BaseModel]) -> StreamingResponse:
+    """
+    Stream Pydantic records as NDJSON.
+
+    The first record is pulled before the response starts, so upstream errors
+    (missing org context, Mist 4xx/5xx) still return a proper HTTP status
+    instead of a truncated 200 stream.
+
+    Args:
+        records: Async iterator of response models
+
+    Returns:
+        StreamingResponse emitting one JSON document per line
+    """
+    try:
+        first = await anext(records)
+    except StopAsyncIteration:
+        first = None
+
+    async def body() -> AsyncIterator[str]:
+        if first is None:
+            return
+        yield first.model_dump_json() + "\n"
+        async for record in records:
+            yield record.model_dump_json() + "\n"
+
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
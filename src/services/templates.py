@@ -0,0 +1,213 @@
+"""
+Template Engine - Compiled, cached rendering of Day 1 `{{variable}}` templates.
+
+Day 1 configuration is written once with Jinja-style variables (the README's
+"Golden Rule") and rendered for every site. A template is a JSON document
+(dict) whose strings may contain `{{name}}` placeholders. It is compiled once
+into a tree of render functions, and compiled templates are cached by content
+hash, so rendering it for thousands of sites only pays for the substitutions.
+
+A string that is exactly one placeholder takes the variable's value with its
+type (`"vlan_id": "{{user_vlan}}"` renders to an int); placeholders inside
+longer strings are interpolated as text.
+
+Large batches can be rendered across a process pool; each worker process
+compiles the template once and renders a chunk of sites.
+"""
+import asyncio
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+
+from src.config import get_settings
+
+
+PLACEHOLDER = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+
+# Batches smaller than this are rendered in-process even when a pool is configured;
+# pickling the variable sets costs more than it saves.
+MIN_POOL_BATCH = 500
+
+
+class TemplateError(ValueError):
+    """A template cannot be rendered with the given variables."""
+
+    def __init__(self, missing: Iterable[str]):
+        self.missing = sorted(set(missing))
+        super().__init__(f"Undefined template variables: {', '.join(self.missing)}")
+
+    def __reduce__(self):
+        # Results of pool workers are pickled; rebuild from the names, not the message.
+        return TemplateError, (self.missing,)
+
+
+# =============================================================================
+# Compilation
+# =============================================================================
+
+Renderer = Callable[[dict], object]
+
+
+def _compile_string(value: str, names: set[str]) -> Renderer | None:
+    """Render function of one string, or None if it has no placeholders."""
+    parts = PLACEHOLDER.split(value)
+    if len(parts) == 1:
+        return None
+    # split() alternates literal text and variable names: [text, name, text, ...]
+    names.update(parts[1::2])
+    if len(parts) == 3 and parts[0] == parts[2] == "":
+        name = parts[1]
+        return lambda variables: variables[name]
+
+    literals, keys = parts[0::2], parts[1::2]
+
+    def render(variables: dict) -> str:
+        out = [literals[0]]
+        for key, literal in zip(keys, literals[1:]):
+            out.append(str(variables[key]))
+            out.append(literal)
+        return "".join(out)
+    return render
+
+
+def _compile_node(node: object, names: set[str]) -> Renderer | None:
+    """
+    Render function of a JSON node, or None if the node is constant.
+
+    Constant subtrees are shared by every rendered document.
+    """
+    if isinstance(node, str):
+        return _compile_string(node, names)
+
+    if isinstance(node, dict):
+        items = [(_compile_string(k, names) if isinstance(k, str) else None, k,
+                  _compile_node(v, names), v) for k, v in node.items()]
+        if all(key_fn is None and value_fn is None for key_fn, _, value_fn, _ in items):
+            return None
+
+        def render_dict(variables: dict) -> dict:
+            return {
+                (key_fn(variables) if key_fn else key): (value_fn(variables) if value_fn else value)
+                for key_fn, key, value_fn, value in items
+            }
+        return render_dict
+
+    if isinstance(node, list):
+        elements = [(_compile_node(v, names), v) for v in node]
+        if all(fn is None for fn, _ in elements):
+            return None
+
+        def render_list(variables: dict) -> list:
+            return [fn(variables) if fn else value for fn, value in elements]
+        return render_list
+
+    return None
+
+
+class CompiledTemplate:
+    """A template compiled into render functions."""
+
+    def __init__(self, source: object):
+        names: set[str] = set()
+        self.source = source
+        self._render = _compile_node(source, names)
+        self.variables: frozenset[str] = frozenset(names)
+
+    def render(self, variables: dict) -> object:
+        """
+        Render the template for one variable set.
+
+        Raises:
+            TemplateError: if any variable used by the template is not defined
+        """
+        missing = self.variables.difference(variables)
+        if missing:
+            raise TemplateError(missing)
+        return self._render(variables) if self._render else self.source
+
+
+def content_hash(source: object) -> str:
+    """Stable hash of a template document (key order does not matter)."""
+    encoded = json.dumps(source, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+# Content hash -> compiled template (LRU, per process)
+_compiled: OrderedDict[str, CompiledTemplate] = OrderedDict()
+
+
+def compile_template(source: object) -> CompiledTemplate:
+    """Compile a template, reusing the cached compilation of identical content."""
+    key = content_hash(source)
+    template = _compiled.get(key)
+    if template is not None:
+        _compiled.move_to_end(key)
+        return template
+
+    template = CompiledTemplate(source)
+    _compiled[key] = template
+    while len(_compiled) > get_settings().template_cache_size:
+        _compiled.popitem(last=False)
+    return template
+
+
+# =============================================================================
+# Batch rendering
+# =============================================================================
+
+def render_many(source: object, variable_sets: Sequence[dict]) -> list[object | TemplateError]:
+    """
+    Render one template for many variable sets in-process.
+
+    Returns:
+        One rendered document per variable set, in order; a TemplateError in
+        place of each document that could not be rendered
+    """
+    template = compile_template(source)
+    results: list[object | TemplateError] = []
+    for variables in variable_sets:
+        try:
+            results.append(template.render(variables))
+        except TemplateError as e:
+            results.append(e)
+    return results
+
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def get_render_pool() -> ProcessPoolExecutor | None:
+    """Process pool for large batches, or None when `template_render_processes` is 0."""
+    global _pool
+    processes = get_settings().template_render_processes
+    if _pool is None and processes > 0:
+        _pool = ProcessPoolExecutor(max_workers=processes)
+    return _pool
+
+
+def close_render_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+async def render_batch(source: object, variable_sets: Sequence[dict]) -> list[object | TemplateError]:
+    """
+    Render one template for many variable sets without blocking the event loop.
+
+    Large batches are split into one chunk per pool process; otherwise the
+    batch is rendered in a worker thread.
+    """
+    pool = get_render_pool()
+    if pool is None or len(variable_sets) < MIN_POOL_BATCH:
+        return await asyncio.to_thread(render_many, source, variable_sets)
+
+    loop = asyncio.get_running_loop()
+    size = -(-len(variable_sets) // get_settings().template_render_processes)
+    chunks = [variable_sets[i:i + size] for i in range(0, len(variable_sets), size)]
+    rendered = await asyncio.gather(*(loop.run_in_executor(pool, render_many, source, chunk) for chunk in chunks))
+    return [result for chunk in rendered for result in chunk]
@@ -0,0 +1,203 @@
+"""
+Time-Series Store - Downsampled metric history in Redis.
+
+Health and SLE samples are aggregated on write into fixed-size buckets at
+four resolutions, so a range query reads at most a few hundred buckets no
+matter how long the range is:
+
+    resolution   bucket   retention   serves
+    1m           60 s     24 h        1h
+    15m          15 min   7 d         24h
+    1h           1 h      30 d        7d
+    1d           1 day    400 d       30d
+
+Each (series, metric, resolution) is a sorted set of bucket start times plus
+two hashes holding the running sum and sample count per bucket, updated with
+ZADD / HINCRBYFLOAT / HINCRBY in one pipeline per ingest.
+"""
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from typing import NamedTuple
+
+from src.services.redis import RedisKeys, get_redis_client
+
+
+logger = logging.getLogger(__name__)
+
+
+class Resolution(NamedTuple):
+    bucket: int       # seconds per bucket
+    retention: int    # seconds kept
+
+
+RESOLUTIONS: dict[str, Resolution] = {
+    "1m": Resolution(60, 24 * 3600),
+    "15m": Resolution(15 * 60, 7 * 24 * 3600),
+    "1h": Resolution(3600, 30 * 24 * 3600),
+    "1d": Resolution(24 * 3600, 400 * 24 * 3600),
+}
+
+# Query range -> (seconds, resolution answering it)
+TIME_RANGES: dict[str, tuple[int, str]] = {
+    "1h": (3600, "1m"),
+    "24h": (24 * 3600, "15m"),
+    "7d": (7 * 24 * 3600, "1h"),
+    "30d": (30 * 24 * 3600, "1d"),
+}
+
+
+class Sample(NamedTuple):
+    """One metric observation."""
+    series: str          # e.g. "{org_id}:{site_id}"
+    metric: str          # e.g. "wireless"
+    timestamp: float     # epoch seconds
+    value: float
+
+
+class Point(NamedTuple):
+    """One bucket of a range query."""
+    timestamp: int       # bucket start (epoch seconds)
+    sum: float
+    count: int
+
+    @property
+    def average(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+def average(points: Iterable[Point]) -> float | None:
+    """Sample-weighted average over buckets (None when there are no samples)."""
+    total = count = 0
+    for point in points:
+        total += point.sum
+        count += point.count
+    return total / count if count else None
+
+
+class TimeSeriesStore:
+    """Redis-backed multi-resolution metric store."""
+
+    @staticmethod
+    def _keys(series: str, metric: str, resolution: str) -> tuple[str, str, str]:
+        base = f"{RedisKeys.TIMESERIES_PREFIX}{series}:{metric}:{resolution}"
+        return f"{base}:idx", f"{base}:sum", f"{base}:count"
+
+    async def add(self, samples: Iterable[Sample]) -> int:
+        """
+        Record samples in every resolution (one pipeline).
+
+        Returns:
+            Number of samples recorded
+        """
+        pipe = get_redis_client().client.pipeline(transaction=False)
+        recorded = 0
+        for sample in samples:
+            pipe.sadd(RedisKeys.TIMESERIES_INDEX, f"{sample.series}|{sample.metric}")
+            for name, resolution in RESOLUTIONS.items():
+                bucket = int(sample.timestamp) // resolution.bucket * resolution.bucket
+                idx, sums, counts = self._keys(sample.series, sample.metric, name)
+                pipe.zadd(idx, {bucket: bucket})
+                pipe.hincrbyfloat(sums, bucket, sample.value)
+                pipe.hincrby(counts, bucket, 1)
+            recorded += 1
+        if recorded:
+            await pipe.execute()
+        return recorded
+
+    async def query(self, series: str, metric: str, start: float, end: float, resolution: str) -> list[Point]:
+        """Buckets of one metric whose start lies in [start, end], oldest first."""
+        idx, sums, counts = self._keys(series, metric, resolution)
+        client = get_redis_client().client
+        buckets = await client.zrangebyscore(idx, start, end)
+        if not buckets:
+            return []
+        pipe = client.pipeline(transaction=False)
+        pipe.hmget(sums, buckets)
+        pipe.hmget(counts, buckets)
+        sum_values, count_values = await pipe.execute()
+        return [
+            Point(int(bucket), float(total or 0), int(count or 0))
+            for bucket, total, count in zip(buckets, sum_values, count_values)
+        ]
+
+    async def query_range(self, series: str, metric: str, time_range: str, now: float | None = None) -> list[Point]:
+        """
+        Buckets covering the last `time_range` (a TIME_RANGES key).
+
+        Raises:
+            KeyError: for an unknown time range
+        """
+        seconds, resolution = TIME_RANGES[time_range]
+        end = now if now is not None else time.time()
+        return await self.query(series, metric, end - seconds, end, resolution)
+
+    async def trim(self, now: float | None = None) -> int:
+        """
+        Drop buckets older than each resolution's retention.
+
+        Returns:
+            Number of buckets removed
+        """
+        now = now if now is not None else time.time()
+        client = get_redis_client().client
+        names = await client.smembers(RedisKeys.TIMESERIES_INDEX)
+        targets = []
+        pipe = client.pipeline(transaction=False)
+        for name in names:
+            series, metric = name.rsplit("|", 1)
+            for resolution, spec in RESOLUTIONS.items():
+                keys = self._keys(series, metric, resolution)
+                cutoff = now - spec.retention
+                targets.append((keys, cutoff))
+                pipe.zrangebyscore(keys[0], "-inf", f"({cutoff}")
+        expired = await pipe.execute() if targets else []
+
+        removed = 0
+        pipe = client.pipeline(transaction=False)
+        for ((idx, sums, counts), cutoff), buckets in zip(targets, expired):
+            if buckets:
+                pipe.zremrangebyscore(idx, "-inf", f"({cutoff}")
+                pipe.hdel(sums, *buckets)
+                pipe.hdel(counts, *buckets)
+                removed += len(buckets)
+        if removed:
+            await pipe.execute()
+        return removed
+
+
+async def run_sampler(
+    sample: Callable[[], Awaitable[list[Sample]]],
+    interval: float,
+    name: str = "metrics",
+) -> None:
+    """
+    Record `sample()` every `interval` seconds until cancelled.
+
+    Safe to run in several processes: a Redis lock per interval lets only one
+    of them sample. Failures are logged and the next interval is attempted.
+    """
+    store = get_timeseries_store()
+    while True:
+        slot = int(time.time() // interval)
+        try:
+            client = get_redis_client().client
+            if await client.set(f"{RedisKeys.TIMESERIES_PREFIX}lock:{name}:{slot}", "1", nx=True, ex=int(interval)):
+                recorded = await store.add(await sample())
+                await store.trim()
+                logger.info("Recorded %d %s samples", recorded, name)
+        except Exception as e:  # noqa: BLE001 - keep sampling after failures
+            logger.warning("Sampling %s failed: %s", name, e)
+        await asyncio.sleep(max(0.0, (slot + 1) * interval - time.time()))
+
+
+# Singleton instance
+_store: TimeSeriesStore | None = None
+
+
+def get_timeseries_store() -> TimeSeriesStore:
+    global _store
+    if _store is None:
+        _store = TimeSeriesStore()
+    return _store
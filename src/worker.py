@@ -0,0 +1,60 @@
+"""
+Background job worker.
+
+Consumes provisioning jobs enqueued by endpoints called with
+`background=true` (see services/jobs). Run one or more alongside the API:
+
+    python -m src.worker [--concurrency N] [--name NAME]
+
+Workers scale horizontally: every worker joins the same consumer group, and
+each job is delivered to exactly one of them.
+
+When `metrics_sample_interval` is set, workers also record fleet health
+samples for SLE trends at that interval (one worker per interval; see
+services/timeseries).
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+
+# Importing the app registers every router's job handlers.
+import src.main  # noqa: F401
+from src.config import get_settings
+from src.routers.day2_observability_assurance_and_aiops.assurance import sample_fleet_health
+from src.services.http_pool import close_http_pool
+from src.services.jobs import run_worker
+from src.services.inventory_index import get_inventory_index
+from src.services.redis import close_redis_pool, get_context_cache, run_invalidation_listener
+from src.services.response_cache import get_response_cache
+from src.services.timeseries import run_sampler
+
+
+async def main(name: str, concurrency: int | None) -> None:
+    """Run the worker (and the health sampler) until interrupted, then release shared pools."""
+    # Jobs read the same local caches as the API, so they must see its invalidations.
+    get_context_cache()
+    get_response_cache()
+    get_inventory_index()
+    tasks = [asyncio.create_task(run_invalidation_listener())]
+    interval = get_settings().metrics_sample_interval
+    if interval > 0:
+        tasks.append(asyncio.create_task(run_sampler(sample_fleet_health, interval, "fleet_health")))
+    try:
+        await run_worker(name, concurrency)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await close_http_pool()
+        await close_redis_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mist provisioning job worker")
+    parser.add_argument("--name", default=f"{socket.gethostname()}-{os.getpid()}", help="Consumer name")
+    parser.add_argument("--concurrency", type=int, default=None, help="Jobs executed at once")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(main(args.name, args.concurrency))
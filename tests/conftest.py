@@ -0,0 +1,231 @@
+import asyncio
+from contextlib import ExitStack
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    """Run async tests on asyncio only (the runtime used by Hypercorn)."""
+    return "asyncio"
+
+
+def _bound(value) -> tuple[float, bool]:
+    """Parse a sorted-set score bound ("-inf", "(12", 12) into (score, exclusive)."""
+    text = str(value)
+    return float(text.lstrip("(")), text.startswith("(")
+
+
+class FakePipeline:
+    """Queues calls and runs them against FakeRedis on execute()."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((getattr(self.redis, name), args, kwargs))
+        return queue
+
+    async def execute(self):
+        return [await method(*args, **kwargs) for method, args, kwargs in self.calls]
+
+
+class FakePubSub:
+    """Pub/sub connection replaying `messages`, then failing with `error` (or idling)."""
+
+    def __init__(self, messages=(), error: Exception | None = None):
+        self.messages = list(messages)
+        self.error = error
+        self.channels: tuple[str, ...] = ()
+        self.closed = False
+
+    async def subscribe(self, *channels):
+        self.channels = channels
+
+    async def psubscribe(self, *patterns):
+        self.channels = patterns
+
+    async def listen(self):
+        for message in self.messages:
+            yield message
+        if self.error is not None:
+            raise self.error
+        await asyncio.Event().wait()
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeRedis:
+    """
+    Just enough of redis.asyncio.Redis (decode_responses=True) for the services.
+
+    Strings, hashes, sets, sorted sets, pub/sub publishing and the job stream
+    are kept in dicts; TTLs are ignored. `pubsub()` hands out the scripted
+    connections queued in `pubsubs`, then idle ones.
+    """
+
+    def __init__(self):
+        self.data: dict[str, str] = {}
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.sets: dict[str, set[str]] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.published: list[tuple[str, str]] = []
+        self.stream: list[dict] = []
+        self.acked: list[str] = []
+        self.pubsubs: list[FakePubSub] = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def pubsub(self):
+        return self.pubsubs.pop(0) if self.pubsubs else FakePubSub()
+
+    async def expire(self, key, seconds):
+        return True
+
+    async def delete(self, *keys):
+        found = 0
+        for key in keys:
+            for store in (self.data, self.hashes, self.sets, self.zsets):
+                found += store.pop(key, None) is not None
+        return found
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 0
+
+    # Strings
+
+    async def set(self, key, value, nx=False, xx=False, ex=None, keepttl=False):
+        if (nx and key in self.data) or (xx and key not in self.data):
+            return None
+        self.data[key] = str(value)
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def mget(self, keys):
+        return [self.data.get(k) for k in keys]
+
+    # Hashes
+
+    async def hset(self, key, field=None, value=None, mapping=None):
+        target = self.hashes.setdefault(key, {})
+        if field is not None:
+            target[str(field)] = str(value)
+        target.update({str(k): str(v) for k, v in (mapping or {}).items()})
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(str(field))
+
+    async def hmget(self, key, fields):
+        return [self.hashes.get(key, {}).get(str(f)) for f in fields]
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hkeys(self, key):
+        return list(self.hashes.get(key, {}))
+
+    async def hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(str(field), None)
+
+    async def hincrby(self, key, field, amount):
+        bucket = self.hashes.setdefault(key, {})
+        bucket[str(field)] = str(int(bucket.get(str(field), 0)) + amount)
+
+    async def hincrbyfloat(self, key, field, amount):
+        bucket = self.hashes.setdefault(key, {})
+        bucket[str(field)] = str(float(bucket.get(str(field), 0)) + amount)
+
+    # Sets
+
+    async def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    async def sunionstore(self, dest, keys):
+        self.sets[dest] = set().union(*(self.sets.get(k, set()) for k in keys))
+
+    # Sorted sets
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update({str(m): float(s) for m, s in mapping.items()})
+
+    async def zrem(self, key, member):
+        self.zsets.get(key, {}).pop(member, None)
+
+    async def zscore(self, key, member):
+        return self.zsets.get(key, {}).get(member)
+
+    async def zrangebyscore(self, key, low, high):
+        (low, low_open), (high, high_open) = _bound(low), _bound(high)
+        members = sorted(self.zsets.get(key, {}).items(), key=lambda kv: kv[1])
+        return [m for m, s in members
+                if (s > low if low_open else s >= low) and (s < high if high_open else s <= high)]
+
+    async def zremrangebyscore(self, key, low, high):
+        for member in await self.zrangebyscore(key, low, high):
+            del self.zsets[key][member]
+
+    async def zrevrange(self, key, start, end):
+        members = sorted(self.zsets.get(key, {}).items(), key=lambda kv: kv[1], reverse=True)
+        return [m for m, _ in members][start:None if end == -1 else end + 1]
+
+    async def zinterstore(self, dest, keys, aggregate=None):
+        common = set.intersection(*(set(self.zsets.get(k, {})) for k in keys))
+        combine = max if aggregate == "MAX" else sum
+        self.zsets[dest] = {m: combine(self.zsets[k][m] for k in keys) for m in common}
+        return len(common)
+
+    # Job stream (one consumer group; message IDs are stream positions)
+
+    async def xadd(self, name, fields, maxlen=None, approximate=True):
+        self.stream.append(fields)
+
+    async def xgroup_create(self, name, group, id="$", mkstream=False):
+        return True
+
+    async def xautoclaim(self, name, group, consumer, min_idle_time, start_id="0-0", count=None):
+        return "0-0", [], []
+
+    async def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        messages = [(str(n), fields) for n, fields in enumerate(self.stream)]
+        self.stream = []
+        if not messages:
+            await asyncio.sleep(block / 1000)
+            return []
+        return [(next(iter(streams)), messages)]
+
+    async def xclaim(self, name, group, consumer, min_idle_time, message_ids, justid=False):
+        return message_ids
+
+    async def xack(self, name, group, *message_ids):
+        self.acked.extend(message_ids)
+
+
+@pytest.fixture
+def use_fake_redis():
+    """
+    Route `get_redis_client()` of the given modules to one dict-backed Redis.
+
+    Yields a function taking module paths and returning the FakeRedis, e.g.
+    `use_fake_redis("src.services.timeseries")`. Every call shares the same
+    FakeRedis, as workers share one Redis.
+    """
+    redis = FakeRedis()
+    client = MagicMock(client=redis, get=redis.get)
+    with ExitStack() as stack:
+        def route(*modules: str) -> FakeRedis:
+            for module in modules:
+                stack.enter_context(patch(f"{module}.get_redis_client", return_value=client))
+            return redis
+        yield route
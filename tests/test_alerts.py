@@ -0,0 +1,170 @@
+"""
+Tests for webhook-fed alerts.
+
+These tests validate webhook authentication, alarm ingestion with
+redelivery detection, indexed alert listings, and acknowledgement.
+
+All tests use a dict-backed Redis and mock the org context and settings.
+"""
+import hashlib
+import hmac
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.config import get_settings
+from src.main import app
+from src.services.correlation import Topology
+
+
+ASSURANCE = "src.routers.day2_observability_assurance_and_aiops.assurance"
+SECRET = "s3cret"
+
+
+def _signed(payload: dict) -> tuple[bytes, dict]:
+    body = json.dumps(payload).encode()
+    signature = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return body, {"X-Mist-Signature-v2": signature, "Content-Type": "application/json"}
+
+
+def _alarm(alarm_id: str, timestamp: float, site_id: str = "s1", severity: str = "critical") -> dict:
+    return {"id": alarm_id, "org_id": "org-1", "site_id": site_id, "type": "device_down",
+            "severity": severity, "timestamp": timestamp, "hostnames": ["ap-1"], "aps": ["5c5b35000001"]}
+
+
+@pytest.fixture
+def client(use_fake_redis):
+    """TestClient with a webhook secret, org context and dict-backed Redis."""
+    redis = use_fake_redis("src.services.alert_store", "src.services.event_bus")
+    with patch(f"{ASSURANCE}.get_context", AsyncMock(return_value=("api.mist.com", "org-1"))), \
+            patch(f"{ASSURANCE}.get_settings",
+                  return_value=get_settings().model_copy(update={"mist_webhook_secret": SECRET})), \
+            patch(f"{ASSURANCE}.get_correlation_engine",
+                  return_value=MagicMock(window=300, process=AsyncMock(return_value=[]))), \
+            patch(f"{ASSURANCE}._nms_topology", AsyncMock(return_value=Topology())), \
+            patch("src.services.alert_store.time.time", return_value=2_000_000_000):
+        client = TestClient(app)
+        client.redis = redis
+        yield client
+
+
+class TestMistWebhook:
+    """
+    Test POST /assurance/webhooks/mist.
+
+    Why: Alarm bursts must be authenticated and stored without polling Mist.
+    """
+
+    def test_bad_signature_is_rejected(self, client):
+        """
+        Test: A delivery whose HMAC does not match gets 401 and stores nothing.
+
+        Why: Anyone could otherwise inject alerts.
+        """
+        # Arrange
+        body, headers = _signed({"topic": "alarms", "events": [_alarm("a1", 1_999_999_000)]})
+        headers["X-Mist-Signature-v2"] = "0" * 64
+
+        # Act
+        response = client.post("/assurance/webhooks/mist", content=body, headers=headers)
+
+        # Assert
+        assert response.status_code == 401
+        assert client.get("/assurance/alerts").json()["count"] == 0
+
+    @pytest.mark.parametrize("payload", [[], "x", {"topic": "alarms", "events": {"id": "a1"}}])
+    def test_signed_body_that_is_not_an_object_is_rejected(self, client, payload):
+        """
+        Test: A correctly signed body that is not an object with an events list gets 400.
+
+        Why: A 500 makes Mist redeliver the same body forever.
+        """
+        # Arrange
+        body, headers = _signed(payload)
+
+        # Act
+        response = client.post("/assurance/webhooks/mist", content=body, headers=headers)
+
+        # Assert
+        assert response.status_code == 400
+
+    def test_redelivery_is_not_stored_twice(self, client):
+        """
+        Test: Events already stored are counted as received but not new;
+        malformed events are counted as invalid.
+
+        Why: Mist retries webhooks, and one bad event must not drop the batch.
+        """
+        # Arrange
+        first, headers = _signed({"topic": "alarms", "events": [_alarm("a1", 1_999_999_000)]})
+        second, headers2 = _signed({"topic": "alarms", "events": [
+            _alarm("a1", 1_999_999_000), _alarm("a2", 1_999_999_100), {"id": "broken"},
+        ]})
+
+        # Act
+        client.post("/assurance/webhooks/mist", content=first, headers=headers)
+        response = client.post("/assurance/webhooks/mist", content=second, headers=headers2)
+
+        # Assert
+        assert response.json() == {"topic": "alarms", "received": 3, "new": 1, "invalid": 1, "incidents": 0}
+        assert [(channel, json.loads(message)["alert_id"]) for channel, message in client.redis.published] == [
+            ("events:org-1", "a1"), ("events:org-1", "a2"),
+        ]
+
+
+class TestAlertListing:
+    """
+    Test GET /assurance/alerts and acknowledgement.
+
+    Why: Filters are served from the indexes, newest first.
+    """
+
+    @pytest.fixture
+    def stored(self, client):
+        body, headers = _signed({"topic": "alarms", "events": [
+            _alarm("a1", 1_999_999_000, "s1", "critical"),
+            _alarm("a2", 1_999_999_100, "s1", "warn"),
+            _alarm("a3", 1_999_999_200, "s2", "critical"),
+        ]})
+        client.post("/assurance/webhooks/mist", content=body, headers=headers)
+        return client
+
+    def test_filters_intersect_indexes(self, stored):
+        """
+        Test: Site and severity filters combine; unfiltered lists are newest first.
+
+        Why: The NOC narrows thousands of alarms to one site's critical ones.
+        """
+        # Act
+        everything = stored.get("/assurance/alerts").json()
+        critical_s1 = stored.get("/assurance/alerts?site_id=s1&severity=critical").json()
+        newest_critical = stored.get("/assurance/alerts?severity=critical&limit=1").json()
+        newest_open_critical = stored.get("/assurance/alerts?severity=critical&acknowledged=false&limit=1").json()
+
+        # Assert
+        assert [a["alert_id"] for a in everything["alerts"]] == ["a3", "a2", "a1"]
+        assert [a["alert_id"] for a in critical_s1["alerts"]] == ["a1"]
+        assert critical_s1["alerts"][0]["message"] == "device_down on ap-1"
+        assert [a["alert_id"] for a in newest_critical["alerts"]] == ["a3"]
+        assert [a["alert_id"] for a in newest_open_critical["alerts"]] == ["a3"]
+        assert not any(":query:" in key for key in stored.redis.zsets)
+
+    def test_acknowledge_moves_alert_between_indexes(self, stored):
+        """
+        Test: Acknowledged alerts leave the unacknowledged listing; unknown IDs
+        are reported.
+
+        Why: Operators work the unacknowledged queue.
+        """
+        # Act
+        response = stored.post("/assurance/alerts/acknowledge", json={"alert_ids": ["a1", "nope"]})
+        open_alerts = stored.get("/assurance/alerts?acknowledged=false").json()
+
+        # Assert
+        assert response.json()["alert_ids"] == ["a1"]
+        assert response.json()["not_found"] == ["nope"]
+        assert [a["alert_id"] for a in open_alerts["alerts"]] == ["a3", "a2"]
+        assert stored.get("/assurance/alerts/a1").json()["acknowledged"] is True
+        assert stored.get("/assurance/alerts/nope").status_code == 404
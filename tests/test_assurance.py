@@ -0,0 +1,156 @@
+"""
+Tests for Day 2 fleet health.
+
+These tests validate site scoring, fleet health from the org site stats
+listing, and that fleet snapshots are built once per TTL.
+
+All tests mock the org context, MistEngine and Redis.
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.routers.day2_observability_assurance_and_aiops.assurance import site_health
+from src.services.snapshot_cache import SnapshotCache
+
+
+@pytest.fixture
+def snapshot_cache(use_fake_redis):
+    """A fresh SnapshotCache over a dict-backed Redis."""
+    use_fake_redis("src.services.snapshot_cache")
+    cache = SnapshotCache(ttl=60, lock_timeout=5, poll_interval=0.01)
+    with patch("src.routers.day2_observability_assurance_and_aiops.assurance.get_snapshot_cache",
+               return_value=cache):
+        yield cache
+
+
+class TestSiteHealth:
+    """
+    Test site_health.
+
+    Why: Scores must reflect the devices actually connected in each domain.
+    """
+
+    def test_domain_and_overall_scores(self):
+        """
+        Test: Each domain is its connected share; overall weighs all devices;
+        domains without devices have no score.
+
+        Why: A site without a gateway has no WAN health, not a perfect one.
+        """
+        # Arrange
+        stats = {"name": "HQ", "num_ap": 10, "num_ap_connected": 9, "num_switch": 2,
+                 "num_switch_connected": 1, "num_clients": 40}
+
+        # Act
+        health = site_health("s1", stats, 3, "now")
+
+        # Assert
+        assert (health.wireless_health, health.wired_health, health.wan_health) == (90, 50, None)
+        assert health.overall_score == 83
+        assert (health.connected_clients, health.active_alerts) == (40, 3)
+
+
+class TestFleetHealth:
+    """
+    Test GET /assurance/health/sites.
+
+    Why: The NOC wall polls health for thousands of sites every minute.
+    """
+
+    @pytest.fixture
+    def mist(self):
+        """Three sites in the org site stats listing; counts Mist calls."""
+        calls = []
+        stats = [
+            {"id": "s1", "name": "A", "num_ap": 4, "num_ap_connected": 4},
+            {"id": "s2", "name": "B", "num_ap": 4, "num_ap_connected": 1},
+            {"id": "s3", "name": "C"},
+        ]
+
+        async def paginate(self, endpoint, params=None, limit=100):
+            calls.append(endpoint)
+            for row in stats:
+                yield row
+
+        async def get(self, endpoint, params=None, cache=False):
+            return {"results": [{"site_id": "s2", "count": 5}]}
+
+        with patch("src.routers.day2_observability_assurance_and_aiops.assurance.get_context",
+                   AsyncMock(return_value=("api.mist.com", "org-1"))), \
+                patch("src.services.mist_engine.MistEngine.paginate", paginate), \
+                patch("src.services.mist_engine.MistEngine.get", get):
+            yield calls
+
+    def test_sites_are_sorted_and_filtered(self, snapshot_cache, mist):
+        """
+        Test: Sites come worst first; min_score drops lower and unscored sites.
+
+        Why: Filtering server-side keeps 3,000-site responses small.
+        """
+        # Arrange
+        client = TestClient(app)
+
+        # Act
+        everything = client.get("/assurance/health/sites").json()
+        healthy = client.get("/assurance/health/sites?min_score=50").json()
+
+        # Assert
+        assert [(s["site_id"], s["overall_score"]) for s in everything["sites"]] == [
+            ("s2", 25), ("s1", 100), ("s3", None)
+        ]
+        assert everything["sites"][0]["active_alerts"] == 5
+        assert [s["site_id"] for s in healthy["sites"]] == ["s1"]
+
+    def test_snapshot_is_reused_until_refresh(self, snapshot_cache, mist):
+        """
+        Test: A snapshot costs one org-level listing, not one call per site;
+        repeated requests reuse it and refresh=true rebuilds it.
+
+        Why: Per-site calls for 3,000 sites would exhaust the hourly Mist quota.
+        """
+        # Arrange
+        client = TestClient(app)
+
+        # Act
+        client.get("/assurance/health/sites")
+        client.get("/assurance/health/sites?min_score=10")
+        cached_calls = len(mist)
+        client.get("/assurance/health/sites?refresh=true")
+
+        # Assert
+        assert mist[:cached_calls] == ["/api/v1/orgs/org-1/stats/sites"]
+        assert len(mist) == 2
+
+
+class TestSnapshotCache:
+    """
+    Test SnapshotCache single-flight.
+
+    Why: Simultaneous dashboard loads must share one fleet build.
+    """
+
+    @pytest.mark.anyio
+    async def test_concurrent_requests_build_once(self, snapshot_cache):
+        """
+        Test: Ten concurrent requests for a missing snapshot run one build.
+
+        Why: Cache stampedes multiply Mist calls by the number of viewers.
+        """
+        # Arrange
+        builds = []
+
+        async def build():
+            builds.append(1)
+            await asyncio.sleep(0.01)
+            return {"value": len(builds)}
+
+        # Act
+        results = await asyncio.gather(*(snapshot_cache.get_or_build("fleet", build) for _ in range(10)))
+
+        # Assert
+        assert len(builds) == 1
+        assert all(r == {"value": 1} for r in results)
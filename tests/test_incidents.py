@@ -0,0 +1,185 @@
+"""
+Tests for alert correlation.
+
+These tests validate topology grouping, late roots absorbing their
+symptoms, sliding-window dedup, and the /assurance/incidents endpoints.
+
+All tests use a dict-backed Redis and mock the org context and settings.
+"""
+import hashlib
+import hmac
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.config import get_settings
+from src.main import app
+from src.services.correlation import CorrelationEngine, Topology
+
+
+ASSURANCE = "src.routers.day2_observability_assurance_and_aiops.assurance"
+SECRET = "s3cret"
+T0 = 2_000_000_000
+
+
+@pytest.fixture
+def fake_redis(use_fake_redis):
+    """Route the alert store, correlation engine and event bus to a dict-backed Redis."""
+    return use_fake_redis("src.services.correlation", "src.services.alert_store", "src.services.event_bus")
+
+
+def _alert(alert_id: str, device_type: str | None, device_id: str | None = None, site_id: str = "s1",
+           alert_type: str = "device_down", severity: str = "critical") -> dict:
+    return {"alert_id": alert_id, "site_id": site_id, "alert_type": alert_type, "severity": severity,
+            "device_id": device_id or f"mac-{alert_id}", "device_type": device_type}
+
+
+class TestCorrelationEngine:
+    """
+    Test CorrelationEngine.
+
+    Why: An uplink drop must surface as one incident, not one alert per AP.
+    """
+
+    @pytest.mark.anyio
+    async def test_symptoms_join_the_upstream_root(self, fake_redis):
+        """
+        Test: A switch alert and the AP alerts behind it in one batch form one
+        incident rooted at the switch; another site gets its own.
+
+        Why: Grouping follows gateway -> switch -> AP within a site only.
+        """
+        # Arrange
+        engine = CorrelationEngine()
+        batch = [(T0 + 1, _alert(f"ap{i}", "ap")) for i in range(3)]
+        batch += [(T0, _alert("sw", "switch")), (T0 + 2, _alert("other", "ap", site_id="s2"))]
+
+        # Act
+        incidents = await engine.process("org-1", batch, Topology())
+
+        # Assert
+        by_site = {i["site_id"]: i for i in incidents}
+        assert (by_site["s1"]["root_alert_id"], by_site["s1"]["alert_count"]) == ("sw", 4)
+        assert by_site["s2"]["alert_count"] == 1
+
+    @pytest.mark.anyio
+    async def test_late_root_absorbs_open_incidents(self, fake_redis):
+        """
+        Test: AP incidents opened before their switch alert are merged into the
+        switch's incident, which then holds every alert.
+
+        Why: Webhooks do not guarantee the root cause arrives first.
+        """
+        # Arrange
+        engine = CorrelationEngine()
+        await engine.process("org-1", [(T0, _alert("ap1", "ap")), (T0, _alert("ap2", "ap"))], Topology())
+
+        # Act
+        incidents = await engine.process("org-1", [(T0 + 5, _alert("sw", "switch"))], Topology())
+        listed = await engine.query("org-1")
+        root, alert_ids = await engine.get("org-1", listed[0]["incident_id"])
+
+        # Assert
+        assert len(listed) == 1
+        assert (root["root_alert_id"], root["alert_count"], len(root["absorbed"])) == ("sw", 3, 2)
+        assert alert_ids == ["ap1", "ap2", "sw"]
+        assert sum(1 for i in incidents if i.get("merged_into") == root["incident_id"]) == 2
+
+    @pytest.mark.anyio
+    async def test_repeats_within_window_are_duplicates(self, fake_redis):
+        """
+        Test: The same alert type on the same device, raised again with a new
+        ID, counts as a duplicate and is not added to the incident.
+
+        Why: Flapping devices would otherwise inflate incidents without bound.
+        """
+        # Arrange
+        engine = CorrelationEngine()
+        await engine.process("org-1", [(T0, _alert("a1", "ap", device_id="ap-mac"))], Topology())
+
+        # Act
+        incidents = await engine.process("org-1", [(T0 + 1, _alert("a2", "ap", device_id="ap-mac")),
+                                                   (T0 + 2, _alert("a3", "ap", device_id="ap-mac"))], Topology())
+
+        # Assert
+        assert [(i["alert_count"], i["duplicate_count"]) for i in incidents] == [(1, 2)]
+
+    @pytest.mark.anyio
+    async def test_idle_incident_closes_on_a_busy_site(self, fake_redis):
+        """
+        Test: An AP alert arriving after the switch incident has been idle
+        for longer than the window opens its own incident, and the idle one
+        leaves the site's open set.
+
+        Why: A site that keeps alerting must not keep every old incident open.
+        """
+        # Arrange
+        engine = CorrelationEngine(window=300)
+        await engine.process("org-1", [(T0, _alert("sw", "switch"))], Topology())
+
+        # Act
+        incidents = await engine.process("org-1", [(T0 + 301, _alert("ap1", "ap"))], Topology())
+
+        # Assert
+        assert [(i["root_alert_id"], i["alert_count"]) for i in incidents] == [("ap1", 1)]
+        open_ids = set(fake_redis.hashes["incidents:org-1:open:s1"])
+        assert open_ids == {incidents[0]["incident_id"]}
+
+    def test_topology_from_nms_profile(self):
+        """
+        Test: The profile's AP hangs off its switch, which hangs off the first gateway.
+
+        Why: Known devices are grouped by their actual chain, not just their type.
+        """
+        # Act
+        topology = Topology.from_profile({"ssr1_mac": "02:00:01:26:3c:58", "ex1_mac": "d081c527cb80",
+                                          "ap1_mac": "AC2316ED5147"})
+
+        # Assert
+        assert topology.ancestors("ac2316ed5147") == ["d081c527cb80", "020001263c58"]
+        assert topology.device_type("D0:81:C5:27:CB:80") == "switch"
+
+
+class TestIncidentEndpoints:
+    """
+    Test /assurance/incidents.
+
+    Why: Webhook storms must be browsable as incidents.
+    """
+
+    def test_webhook_alarms_become_one_incident(self, fake_redis):
+        """
+        Test: A switch and an AP alarm delivered together are listed as one
+        incident whose detail includes both alerts.
+
+        Why: Operators triage the root, not every symptom.
+        """
+        # Arrange
+        events = [
+            {"id": "sw", "org_id": "org-1", "site_id": "s1", "type": "switch_down", "severity": "critical",
+             "timestamp": T0, "switches": ["d081c527cb80"]},
+            {"id": "ap", "org_id": "org-1", "site_id": "s1", "type": "ap_disconnected", "severity": "warn",
+             "timestamp": T0 + 1, "aps": ["ac2316ed5147"]},
+        ]
+        body = json.dumps({"topic": "alarms", "events": events}).encode()
+        signature = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+        with patch(f"{ASSURANCE}.get_context", AsyncMock(return_value=("api.mist.com", "org-1"))), \
+                patch(f"{ASSURANCE}.get_settings",
+                      return_value=get_settings().model_copy(update={"mist_webhook_secret": SECRET})), \
+                patch(f"{ASSURANCE}._nms_topology", AsyncMock(return_value=Topology())):
+            client = TestClient(app)
+
+            # Act
+            delivered = client.post("/assurance/webhooks/mist", content=body,
+                                    headers={"X-Mist-Signature-v2": signature})
+            listed = client.get("/assurance/incidents").json()
+            detail = client.get(f"/assurance/incidents/{listed['incidents'][0]['incident_id']}").json()
+
+        # Assert
+        assert delivered.json()["incidents"] == 1
+        assert listed["count"] == 1
+        incident = listed["incidents"][0]
+        assert (incident["root_device_type"], incident["severity"], incident["alert_count"]) == ("switch", "critical", 2)
+        assert [a["alert_id"] for a in detail["alerts"]] == ["sw", "ap"]
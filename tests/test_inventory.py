@@ -0,0 +1,115 @@
+"""
+Tests for the Inventory API.
+
+These tests validate bulk device assignment: batching, per-serial outcomes,
+and retrying only the serials that failed.
+
+All tests mock the org context and MistEngine to avoid external dependencies.
+"""
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from src.main import app
+
+
+class TestBulkAssign:
+    """
+    Test POST /inventory/assign/bulk.
+
+    Why: Pallet-scale ZTP drops must not fail atomically; one bad serial or
+    one failed batch may only affect the serials involved.
+    """
+
+    @pytest.fixture
+    def client(self):
+        """Create FastAPI test client."""
+        return TestClient(app)
+
+    @pytest.fixture(autouse=True)
+    def mock_context(self):
+        """Stored org context (normally written by POST /org/self)."""
+        with patch(
+            "src.routers.day0_design_and_topology.inventory.get_context",
+            AsyncMock(return_value=("api.mist.com", "org-1")),
+        ):
+            yield
+
+    def _patch_put(self, put):
+        return patch("src.routers.day0_design_and_topology.inventory.MistEngine.put", put)
+
+    def test_splits_into_batches_per_site(self, client):
+        """
+        Test: Serials are sent in batch_size chunks, one site per call.
+
+        Why: Mist caps inventory payloads; each PUT targets one site.
+        """
+        # Arrange
+        calls = []
+
+        async def put(self, endpoint, json=None):
+            calls.append((json[0]["site_id"], json[0]["serials"]))
+            return {"op": "assign", "success": json[0]["serials"], "error": [], "reason": []}
+
+        body = {"assignments": {"site-1": ["A1", "A2", "A3"], "site-2": ["B1"]}, "batch_size": 2}
+
+        # Act
+        with self._patch_put(put):
+            response = client.post("/inventory/assign/bulk", json=body)
+
+        # Assert
+        assert response.status_code == 200
+        assert sorted(calls) == [("site-1", ["A1", "A2"]), ("site-1", ["A3"]), ("site-2", ["B1"])]
+        data = response.json()
+        assert data["succeeded"] == 4
+        assert [r["id"] for r in data["results"]] == ["site-1", "site-1", "site-1", "site-2"]
+
+    def test_retries_only_failed_serials(self, client):
+        """
+        Test: A serial Mist rejects once is retried alone and then succeeds.
+
+        Why: Resending whole batches wastes the API budget.
+        """
+        # Arrange
+        calls = []
+
+        async def put(self, endpoint, json=None):
+            serials = json[0]["serials"]
+            calls.append(serials)
+            if len(calls) == 1:
+                return {"success": ["A1"], "error": ["A2"], "reason": ["device busy"]}
+            return {"success": serials, "error": [], "reason": []}
+
+        # Act
+        with self._patch_put(put):
+            response = client.post("/inventory/assign/bulk", json={"assignments": {"site-1": ["A1", "A2"]}})
+
+        # Assert
+        assert calls == [["A1", "A2"], ["A2"]]
+        assert response.json()["succeeded"] == 2
+
+    def test_reports_permanent_failures_per_serial(self, client):
+        """
+        Test: A batch rejected with a 4xx fails its serials without retry.
+
+        Why: Client errors will not succeed on retry; other batches proceed.
+        """
+        # Arrange
+        put = AsyncMock(side_effect=[
+            HTTPException(status_code=400, detail="bad site"),
+            {"success": ["B1"], "error": [], "reason": []},
+        ])
+        body = {"assignments": {"site-x": ["A1"], "site-2": ["B1", "A1"]}, "concurrency": 1}
+
+        # Act
+        with self._patch_put(put):
+            response = client.post("/inventory/assign/bulk", json=body)
+
+        # Assert
+        data = response.json()
+        assert put.await_count == 2
+        assert (data["succeeded"], data["failed"], data["skipped"]) == (1, 1, 1)
+        assert data["results"][0]["detail"] == "400: bad site"
+        assert data["results"][2]["detail"] == "Already requested for site site-x"
@@ -0,0 +1,148 @@
+"""
+Tests for the local inventory index.
+
+These tests validate that serial and MAC lookups are answered from the
+index, and when the index falls back to Mist.
+
+Redis is replaced by a small dict-backed fake; MistEngine is mocked.
+"""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import redis.asyncio as redis
+
+from src.services.inventory_index import InventoryIndex
+
+
+class TestInventoryIndex:
+    """
+    Test InventoryIndex lookups.
+
+    Why: Device-heavy workflows must not cost one Mist round trip per device,
+    but a device claimed since the last refresh must still be found.
+    """
+
+    @pytest.fixture
+    def fake_redis(self, use_fake_redis):
+        """Dict-backed Redis shared by the index."""
+        return use_fake_redis("src.services.inventory_index")
+
+    @pytest.fixture
+    def engine(self):
+        """MistEngine whose inventory holds two devices."""
+        devices = [
+            {"serial": "A1", "mac": "AC:23:16:ED:51:47", "model": "AP45", "type": "ap", "site_id": None},
+            {"serial": "B2", "mac": "d081c527cb80", "model": "EX4100", "type": "switch", "site_id": "s1"},
+        ]
+
+        async def paginate(endpoint, params=None, limit=100):
+            for device in devices:
+                yield device
+
+        engine = MagicMock()
+        engine.paginate = MagicMock(side_effect=paginate)
+        engine.get = AsyncMock(return_value=[])
+        return engine
+
+    @pytest.mark.anyio
+    async def test_lookups_are_served_from_index(self, fake_redis, engine):
+        """
+        Test: After one pull, serial and MAC lookups never query Mist.
+
+        Why: This is the per-device round trip the index exists to remove.
+        """
+        # Arrange
+        index = InventoryIndex(ttl=3600)
+        await index.refresh(engine, "org-1")
+        index.drop_local("org-1")  # force reads through Redis as another worker would
+
+        # Act
+        by_serial = await index.by_serial(engine, "org-1", "B2")
+        by_mac = await index.by_mac(engine, "org-1", "ac-23-16-ed-51-47")
+
+        # Assert
+        assert by_serial["model"] == "EX4100"
+        assert by_mac["serial"] == "A1"
+        engine.get.assert_not_awaited()
+        assert engine.paginate.call_count == 1
+
+    @pytest.mark.anyio
+    async def test_stale_index_refreshes_once_then_falls_back(self, fake_redis, engine):
+        """
+        Test: A miss on an empty index pulls the inventory; a miss on a fresh
+        index queries Mist for that serial only.
+
+        Why: New claims must be visible without re-pulling the whole inventory.
+        """
+        # Arrange
+        index = InventoryIndex(ttl=3600)
+        engine.get.return_value = [{"serial": "C3", "mac": "aabbccddeeff", "type": "gateway"}]
+
+        # Act
+        first = await index.by_serial(engine, "org-1", "A1")
+        claimed = await index.by_serial(engine, "org-1", "C3")
+
+        # Assert
+        assert first["serial"] == "A1"
+        assert claimed["type"] == "gateway"
+        assert engine.paginate.call_count == 1
+        engine.get.assert_awaited_once_with("/api/v1/orgs/org-1/inventory", params={"serial": "C3"})
+        assert "C3" in fake_redis.hashes["inventory:org-1:devices"]
+
+    @pytest.mark.anyio
+    async def test_update_site_patches_records(self, fake_redis, engine):
+        """
+        Test: Assigning a device updates its indexed site_id.
+
+        Why: Lookups right after ZTP assignment must see the new site.
+        """
+        # Arrange
+        index = InventoryIndex(ttl=3600)
+        await index.refresh(engine, "org-1")
+
+        # Act
+        await index.update_site("org-1", ["A1"], "s9")
+        index.drop_local("")
+
+        # Assert
+        assert (await index.by_serial(engine, "org-1", "A1"))["site_id"] == "s9"
+
+    @pytest.mark.anyio
+    async def test_refresh_prunes_devices_and_macs_that_left(self, fake_redis, engine):
+        """
+        Test: A device indexed before but missing from the pull loses both its
+        record and its MAC entry.
+
+        Why: A stale MAC would resolve to a device that is no longer in the org.
+        """
+        # Arrange
+        fake_redis.hashes["inventory:org-1:devices"] = {"Z9": '{"serial": "Z9", "mac": "001122334455"}'}
+        fake_redis.hashes["inventory:org-1:macs"] = {"001122334455": "Z9"}
+        index = InventoryIndex(ttl=3600)
+
+        # Act
+        await index.refresh(engine, "org-1")
+
+        # Assert
+        assert set(fake_redis.hashes["inventory:org-1:devices"]) == {"A1", "B2"}
+        assert set(fake_redis.hashes["inventory:org-1:macs"]) == {"ac2316ed5147", "d081c527cb80"}
+
+    @pytest.mark.anyio
+    async def test_fallback_survives_redis_write_errors(self, fake_redis, engine):
+        """
+        Test: A device found by the Mist fallback is returned even when
+        indexing it in Redis fails.
+
+        Why: Redis errors must degrade the index, not the lookup.
+        """
+        # Arrange
+        index = InventoryIndex(ttl=3600)
+        fake_redis.data["inventory:org-1:refreshed"] = "9999999999"
+        engine.get.return_value = [{"serial": "C3", "type": "gateway"}]
+
+        # Act
+        with patch.object(index, "_store", AsyncMock(side_effect=redis.ConnectionError("down"))):
+            device = await index.by_serial(engine, "org-1", "C3")
+
+        # Assert
+        assert device["type"] == "gateway"
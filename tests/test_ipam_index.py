@@ -0,0 +1,197 @@
+"""
+Tests for the IPAM prefix index and overlap checks on create.
+
+These tests validate overlap/containment queries against a brute-force
+reference, and that POST /networks/ rejects conflicting subnets.
+
+All tests mock the org context and MistEngine to avoid external dependencies.
+"""
+import random
+from ipaddress import ip_network
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services import ipam_index
+from src.services.ipam_index import PrefixIndex, PrefixRecord
+
+
+def _record(prefix: str) -> PrefixRecord:
+    return PrefixRecord(prefix, "network", f"id-{prefix}", prefix)
+
+
+class TestPrefixIndex:
+    """
+    Test PrefixIndex overlap queries.
+
+    Why: A missed overlap hands two sites the same subnet; a false positive
+    blocks a valid allocation.
+    """
+
+    @pytest.fixture
+    def index(self):
+        """Index holding a /16, two /24s inside it, and an IPv6 /48."""
+        index = PrefixIndex()
+        for prefix in ("10.1.0.0/16", "10.1.5.0/24", "10.1.6.0/24", "2001:db8:1::/48"):
+            index.add(ip_network(prefix), _record(prefix))
+        return index
+
+    def test_supernet_reported_as_contains(self, index):
+        """
+        Test: A /24 inside an allocated /16 conflicts with it.
+
+        Why: Carving a subnet out of another network's range is an overlap.
+        """
+        # Act
+        conflicts = index.conflicts(ip_network("10.1.9.0/24"))
+
+        # Assert
+        assert [(c.existing, c.relation) for c in conflicts] == [("10.1.0.0/16", "contains")]
+
+    def test_subnets_reported_as_within(self, index):
+        """
+        Test: A /8 covering allocated prefixes lists them as within.
+
+        Why: A broad request must surface everything it would swallow.
+        """
+        # Act
+        conflicts = index.conflicts(ip_network("10.0.0.0/8"))
+
+        # Assert
+        assert {(c.existing, c.relation) for c in conflicts} == {
+            ("10.1.0.0/16", "within"), ("10.1.5.0/24", "within"), ("10.1.6.0/24", "within"),
+        }
+
+    def test_equal_and_disjoint(self, index):
+        """
+        Test: Exact duplicates are equal; disjoint prefixes do not conflict.
+
+        Why: Both are the most common real-world cases.
+        """
+        # Assert
+        assert sorted(c.relation for c in index.conflicts(ip_network("10.1.5.0/24"))) == ["contains", "equal"]
+        assert index.conflicts(ip_network("192.168.0.0/16")) == []
+
+    def test_ipv6_is_indexed_separately(self, index):
+        """
+        Test: IPv6 prefixes conflict only with IPv6 allocations.
+
+        Why: The v4 and v6 address spaces share integer ranges.
+        """
+        # Assert
+        assert [c.existing for c in index.conflicts(ip_network("2001:db8:1:2::/64"))] == ["2001:db8:1::/48"]
+        assert index.conflicts(ip_network("::/96")) == []
+
+    def test_matches_brute_force(self):
+        """
+        Test: Random queries return exactly what a linear scan finds.
+
+        Why: The index replaces the scan; it must agree with it.
+        """
+        # Arrange
+        rng = random.Random(7)
+        prefixes = {
+            ip_network((rng.getrandbits(32), rng.randint(8, 30)), strict=False) for _ in range(2000)
+        }
+        index = PrefixIndex()
+        for prefix in prefixes:
+            index.add(prefix, _record(str(prefix)))
+
+        for _ in range(300):
+            query = ip_network((rng.getrandbits(32), rng.randint(8, 30)), strict=False)
+
+            # Act
+            found = {c.existing for c in index.conflicts(query)}
+
+            # Assert
+            assert found == {str(p) for p in prefixes if p.overlaps(query)}
+
+
+class TestCreateNetworkConflicts:
+    """
+    Test overlap checks on POST /networks/.
+
+    Why: Conflicts must be caught before the network exists in Mist.
+    """
+
+    @pytest.fixture
+    def client(self):
+        """Create FastAPI test client."""
+        return TestClient(app)
+
+    @pytest.fixture
+    def redis(self, use_fake_redis):
+        """Redis client receiving invalidations."""
+        return use_fake_redis("src.services.ipam_index")
+
+    @pytest.fixture(autouse=True)
+    def mock_mist(self, redis):
+        """Org context, one existing network, and a recording POST."""
+        async def paginate(self, endpoint, params=None, limit=100):
+            if endpoint.endswith("/networks"):
+                yield {"id": "n1", "name": "Corp", "subnet": "10.1.0.0/16"}
+
+        post = AsyncMock(return_value={"id": "n2", "name": "New"})
+        ipam_index._indexes.clear()
+        with patch(
+            "src.routers.day0_design_and_topology.networks.get_context",
+            AsyncMock(return_value=("api.mist.com", "org-1")),
+        ), patch("src.services.ipam_index.MistEngine.paginate", paginate), \
+                patch("src.routers.day0_design_and_topology.networks.MistEngine.post", post):
+            yield post
+        ipam_index._indexes.clear()
+
+    def test_overlapping_subnet_is_rejected(self, client, mock_mist):
+        """
+        Test: A subnet inside an existing network returns 409.
+
+        Why: Nothing may be created in Mist when the plan conflicts.
+        """
+        # Act
+        response = client.post("/networks/", json={"name": "New", "subnet": "10.1.4.0/24"})
+
+        # Assert
+        assert response.status_code == 409
+        assert response.json()["detail"]["conflicts"][0]["object_id"] == "n1"
+        mock_mist.assert_not_awaited()
+
+    def test_allow_overlap_creates_and_indexes(self, client, mock_mist):
+        """
+        Test: allow_overlap=true creates anyway; the new subnet is indexed.
+
+        Why: Intentional overlaps (e.g. VRFs) are legitimate, and later
+        requests must see the new allocation without a reload.
+        """
+        # Act
+        created = client.post("/networks/?allow_overlap=true", json={"name": "New", "subnet": "10.1.4.0/24"})
+        response = client.post("/networks/", json={"name": "Other", "subnet": "10.1.4.128/25"})
+
+        # Assert
+        assert created.status_code == 200
+        conflicts = response.json()["detail"]["conflicts"]
+        assert {c["object_id"] for c in conflicts} == {"n1", "n2"}
+
+    def test_other_workers_drop_their_index_on_create(self, client, redis):
+        """
+        Test: Creating a network publishes an invalidation for the org; it
+        drops that org's cached index in other workers but not in the sender,
+        which already added the new subnet.
+
+        Why: Every worker caches its own index; one that missed the new
+        subnet would accept an overlapping allocation.
+        """
+        # Act
+        client.post("/networks/", json={"name": "New", "subnet": "10.2.0.0/24"})
+        cached = set(ipam_index._indexes)
+        [(channel, notice)] = redis.published
+        ipam_index._on_invalidation(notice)
+        kept_on_sender = set(ipam_index._indexes)
+        ipam_index._on_invalidation(notice.replace(ipam_index._WORKER_ID, "other-worker"))
+
+        # Assert
+        assert channel == "ipam_index:invalidate"
+        assert notice.endswith(" api.mist.com/org-1")
+        assert cached == kept_on_sender == {("api.mist.com", "org-1")}
+        assert ipam_index._indexes == {}
@@ -0,0 +1,169 @@
+"""
+Tests for the background job queue.
+
+These tests validate that background endpoints enqueue instead of running
+inline, and that workers record progress, results and cancellation.
+
+Redis is replaced by a small dict-backed fake; MistEngine is not called.
+"""
+import asyncio
+from contextlib import suppress
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services import jobs
+from src.services.bulk import run_bounded
+
+
+@pytest.fixture
+def fake_redis(use_fake_redis):
+    """Dict-backed Redis behind the job queue."""
+    return use_fake_redis("src.services.jobs")
+
+
+class TestBackgroundEndpoints:
+    """
+    Test background=true on bulk endpoints.
+
+    Why: Large operations must not hold the HTTP connection open.
+    """
+
+    def test_bulk_sites_returns_job_id(self, fake_redis):
+        """
+        Test: POST /sites/bulk?background=true answers 202 with a job ID
+        and queues the request instead of creating sites.
+
+        Why: API latency must not depend on provisioning throughput.
+        """
+        # Arrange
+        client = TestClient(app)
+        post = AsyncMock()
+
+        # Act
+        with patch(
+            "src.routers.day0_design_and_topology.sites.get_context",
+            AsyncMock(return_value=("api.mist.com", "org-1")),
+        ), patch("src.routers.day0_design_and_topology.sites.MistEngine.post", post):
+            response = client.post("/sites/bulk?background=true", json={"sites": [{"name": "HQ"}]})
+
+        # Assert
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert fake_redis.stream == [{"job_id": job_id}]
+        assert fake_redis.hashes[f"job:{job_id}"]["kind"] == "sites.bulk_create"
+        post.assert_not_awaited()
+
+
+class TestWorker:
+    """
+    Test process_job.
+
+    Why: Workers must record progress and results, and honour cancellation.
+    """
+
+    @pytest.fixture
+    def handler(self):
+        """A job kind whose handler fans out over the payload items."""
+        async def double(value):
+            return value * 2
+
+        async def run(job):
+            if job.payload.get("cancel"):
+                await jobs.cancel_job(job.job_id)
+            results = await run_bounded(job.payload["items"], double, concurrency=1)
+            return {"results": [r if not isinstance(r, Exception) else str(r) for r in results]}
+
+        jobs.register_job_handler("test.double", run)
+        yield
+        jobs._handlers.pop("test.double")
+
+    @pytest.mark.anyio
+    async def test_job_records_progress_and_result(self, fake_redis, handler):
+        """
+        Test: A processed job ends succeeded with its result and progress.
+
+        Why: GET /jobs/{id} is the only way to see background results.
+        """
+        # Arrange
+        job_id = await jobs.enqueue("test.double", {"items": [1, 2, 3]}, "api.mist.com", "org-1")
+
+        # Act
+        await jobs.process_job(fake_redis, job_id)
+        info = await jobs.get_job(job_id)
+
+        # Assert
+        assert info.status == jobs.JobStatus.SUCCEEDED
+        assert info.result == {"results": [2, 4, 6]}
+        assert (info.done, info.total) == (3, 3)
+
+    @pytest.mark.anyio
+    async def test_cancelled_job_starts_no_items(self, fake_redis, handler):
+        """
+        Test: Items of a job cancelled while running fail with "Job cancelled"
+        and the job ends cancelled.
+
+        Why: Cancellation must stop further Mist writes.
+        """
+        # Arrange
+        job_id = await jobs.enqueue("test.double", {"items": [1, 2], "cancel": True}, "api.mist.com", "org-1")
+
+        # Act
+        await jobs.process_job(fake_redis, job_id)
+        info = await jobs.get_job(job_id)
+
+        # Assert
+        assert info.status == jobs.JobStatus.CANCELLED
+        assert info.result == {"results": ["Job cancelled", "Job cancelled"]}
+
+    @pytest.mark.anyio
+    async def test_queued_job_cancels_immediately(self, fake_redis, handler):
+        """
+        Test: Cancelling a queued job finishes it without running.
+
+        Why: A worker picking it up later must skip it.
+        """
+        # Arrange
+        job_id = await jobs.enqueue("test.double", {"items": [1]}, "api.mist.com", "org-1")
+
+        # Act
+        info = await jobs.cancel_job(job_id)
+        await jobs.process_job(fake_redis, job_id)
+
+        # Assert
+        assert info.status == jobs.JobStatus.CANCELLED
+        assert (await jobs.get_job(job_id)).result is None
+
+    @pytest.mark.anyio
+    async def test_interrupted_job_stays_pending(self, fake_redis, handler):
+        """
+        Test: Stopping a worker acknowledges the job that finished but not the
+        one still running, which stays running for another worker to reclaim.
+
+        Why: Acknowledging an interrupted job would lose it for good.
+        """
+        # Arrange
+        started = asyncio.Event()
+
+        async def stuck(job):
+            started.set()
+            await asyncio.Event().wait()
+
+        jobs.register_job_handler("test.stuck", stuck)
+        await jobs.enqueue("test.double", {"items": [1]}, "api.mist.com", "org-1")
+        stuck_id = await jobs.enqueue("test.stuck", {}, "api.mist.com", "org-1")
+
+        # Act
+        worker = asyncio.create_task(jobs.run_worker("w1", concurrency=2, block_ms=10))
+        await asyncio.wait_for(started.wait(), timeout=1)
+        await asyncio.sleep(0.05)
+        worker.cancel()
+        with suppress(asyncio.CancelledError):
+            await worker
+        jobs._handlers.pop("test.stuck")
+
+        # Assert
+        assert fake_redis.acked == ["0"]
+        assert (await jobs.get_job(stuck_id)).status == jobs.JobStatus.RUNNING
@@ -0,0 +1,302 @@
+"""
+Tests for the Mist API Engine.
+
+These tests validate that MistEngine reuses pooled connections and maps
+Mist API failures onto HTTP errors.
+
+All tests use httpx.MockTransport so no request ever reaches the Mist Cloud.
+"""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from src.services.http_pool import HTTPClientPool
+from src.services.mist_engine import MistEngine
+from src.services.rate_limiter import RateLimiter, parse_retry_after
+from src.services.response_cache import ResponseCache
+
+
+class TestMistEngine:
+    """
+    Test MistEngine request execution.
+
+    Why: Every router talks to Mist through MistEngine. If connection reuse
+    or error mapping breaks, every provisioning workflow breaks with it.
+    """
+
+    @pytest.fixture
+    def calls(self):
+        """Record of requests seen by the mock transport."""
+        return []
+
+    @pytest.fixture
+    def pool(self, calls):
+        """
+        Pool whose clients answer from an in-memory handler.
+
+        Why: Tests should never hit the Mist Cloud. MockTransport keeps the
+        real httpx client stack while replacing the network.
+        """
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            if request.url.path == "/api/v1/missing":
+                return httpx.Response(404, text="not found")
+            if request.url.path == "/api/v1/throttled" and len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            if request.url.path == "/api/v1/flaky":
+                return httpx.Response(503, text="unavailable")
+            if request.url.path == "/api/v1/sites/s1":
+                if request.headers.get("If-None-Match") == '"v1"':
+                    return httpx.Response(304)
+                return httpx.Response(200, json={"id": "s1"}, headers={"ETag": '"v1"'})
+            if request.url.path == "/api/v1/orgs/o1/inventory":
+                page = int(request.url.params["page"])
+                limit = int(request.url.params["limit"])
+                start = (page - 1) * limit
+                records = [{"serial": f"SN{i}"} for i in range(start, min(start + limit, 250))]
+                return httpx.Response(
+                    200,
+                    json=records,
+                    headers={"X-Page-Total": "250", "X-Page-Limit": str(limit)}
+                )
+            return httpx.Response(200, json={"path": request.url.path})
+
+        pool = HTTPClientPool(transport=httpx.MockTransport(handler))
+        with (
+            patch("src.services.mist_engine.get_http_pool", return_value=pool),
+            patch("src.services.mist_engine.get_rate_limiter", return_value=RateLimiter()),
+            patch("src.services.mist_engine.backoff_delay", return_value=0),
+        ):
+            yield pool
+
+    @pytest.fixture(autouse=True)
+    def response_cache(self):
+        """
+        Fresh response cache with Redis mocked out (Redis misses).
+
+        Why: Cache behaviour must be deterministic per test and never
+        depend on a Redis server being reachable.
+        """
+        redis_mock = MagicMock()
+        redis_mock.client.hget = AsyncMock(return_value=None)
+        redis_mock.client.pipeline.return_value.execute = AsyncMock()
+        cache = ResponseCache(ttl=30)
+        with (
+            patch("src.services.response_cache.get_redis_client", return_value=redis_mock),
+            patch("src.services.mist_engine.get_response_cache", return_value=cache),
+        ):
+            yield cache
+
+    @pytest.mark.anyio
+    async def test_engines_share_pooled_client(self, pool, calls):
+        """
+        Test: Two engines for the same host reuse one client.
+
+        Why: Routers build a MistEngine per request. The handshake cost is
+        only avoided if they all borrow the same pooled client.
+        """
+        # Arrange
+        first = MistEngine(host="api.mist.com")
+        second = MistEngine(host="api.mist.com")
+
+        # Act
+        await first.get("/api/v1/self")
+        await second.get("/api/v1/self")
+
+        # Assert: One client, both requests authenticated
+        assert len(pool._clients) == 1
+        assert len(calls) == 2
+        assert calls[1].headers["Authorization"].startswith("Token ")
+        await pool.close()
+
+    @pytest.mark.anyio
+    async def test_pool_separates_hosts(self, pool):
+        """
+        Test: Each regional host gets its own client.
+
+        Why: Global and EU clouds are different endpoints; mixing their
+        connections would send requests to the wrong region.
+        """
+        # Act
+        await MistEngine(host="api.mist.com").get("/api/v1/self")
+        await MistEngine(host="api.eu.mist.com").get("/api/v1/self")
+
+        # Assert
+        assert set(pool._clients) == {"api.mist.com", "api.eu.mist.com"}
+        await pool.close()
+        assert pool._clients == {}
+
+    @pytest.mark.anyio
+    async def test_error_status_raises_http_exception(self, pool):
+        """
+        Test: Mist errors surface as HTTPException with the same status.
+
+        Why: Callers rely on the status code to tell a missing object
+        apart from an outage.
+        """
+        # Act / Assert
+        with pytest.raises(HTTPException) as exc:
+            await MistEngine(host="api.mist.com").get("/api/v1/missing")
+        assert exc.value.status_code == 404
+        await pool.close()
+
+    @pytest.mark.anyio
+    async def test_429_is_retried_after_retry_after(self, pool, calls):
+        """
+        Test: A throttled call waits out Retry-After and then succeeds.
+
+        Why: During large rollouts Mist throttles the token. Callers should
+        be queued and retried instead of failing the whole run.
+        """
+        # Act
+        result = await MistEngine(host="api.mist.com").get("/api/v1/throttled")
+
+        # Assert: First attempt throttled, second served
+        assert result == {"path": "/api/v1/throttled"}
+        assert len(calls) == 2
+        await pool.close()
+
+    @pytest.mark.anyio
+    async def test_post_is_not_retried_on_5xx(self, pool, calls):
+        """
+        Test: A POST that fails with 5xx is surfaced, not replayed.
+
+        Why: Mist may have created the object before failing. Replaying a
+        POST could create a duplicate site or application.
+        """
+        # Act / Assert
+        with pytest.raises(HTTPException) as exc:
+            await MistEngine(host="api.mist.com").post("/api/v1/flaky", json={})
+        assert exc.value.status_code == 503
+        assert len(calls) == 1
+        await pool.close()
+
+    @pytest.mark.anyio
+    async def test_get_is_retried_on_5xx(self, pool, calls):
+        """
+        Test: Idempotent GETs are retried until retries are exhausted.
+
+        Why: Transient 5xx errors from the cloud should not abort a read.
+        """
+        # Arrange
+        engine = MistEngine(host="api.mist.com")
+
+        # Act / Assert
+        with pytest.raises(HTTPException):
+            await engine.get("/api/v1/flaky")
+        assert len(calls) == engine.max_retries + 1
+        await pool.close()
+
+    @pytest.mark.anyio
+    async def test_paginate_follows_page_headers(self, pool, calls):
+        """
+        Test: paginate() yields every record across all pages.
+
+        Why: Large orgs hold tens of thousands of devices. Stopping at the
+        first page silently hides inventory from provisioning workflows.
+        """
+        # Act
+        engine = MistEngine(host="api.mist.com")
+        serials = [d["serial"] async for d in engine.paginate("/api/v1/orgs/o1/inventory")]
+
+        # Assert: 250 records over exactly 3 page requests
+        assert len(serials) == 250
+        assert serials[0] == "SN0" and serials[-1] == "SN249"
+        assert [c.url.params["page"] for c in calls] == ["1", "2", "3"]
+        await pool.close()
+
+    @pytest.mark.anyio
+    async def test_cached_get_is_served_locally(self, pool, calls):
+        """
+        Test: A fresh cached GET does not reach Mist.
+
+        Why: Dashboards poll single objects constantly; each poll that
+        reaches Mist spends API quota.
+        """
+        # Arrange
+        engine = MistEngine(host="api.mist.com")
+
+        # Act
+        first = await engine.get("/api/v1/sites/s1", cache=True)
+        second = await engine.get("/api/v1/sites/s1", cache=True)
+
+        # Assert
+        assert first == second == {"id": "s1"}
+        assert len(calls) == 1
+        await pool.close()
+
+    @pytest.mark.anyio
+    async def test_stale_entry_revalidates_with_etag(self, pool, calls, response_cache):
+        """
+        Test: A stale entry is revalidated with If-None-Match and reused on 304.
+
+        Why: Revalidation proves freshness without transferring the object.
+        """
+        # Arrange
+        engine = MistEngine(host="api.mist.com")
+        response_cache.ttl = 0
+
+        # Act
+        await engine.get("/api/v1/sites/s1", cache=True)
+        result = await engine.get("/api/v1/sites/s1", cache=True)
+
+        # Assert
+        assert result == {"id": "s1"}
+        assert calls[1].headers["If-None-Match"] == '"v1"'
+        await pool.close()
+
+    @pytest.mark.anyio
+    async def test_write_invalidates_cached_get(self, pool, calls):
+        """
+        Test: A PUT to the same endpoint evicts the cached object.
+
+        Why: After an update, the next read must return the new state.
+        """
+        # Arrange
+        engine = MistEngine(host="api.mist.com")
+        await engine.get("/api/v1/sites/s1", cache=True)
+
+        # Act
+        await engine.put("/api/v1/sites/s1", json={"name": "renamed"})
+        await engine.get("/api/v1/sites/s1", cache=True)
+
+        # Assert: GET, PUT, GET all reached Mist
+        assert [c.method for c in calls] == ["GET", "PUT", "GET"]
+        await pool.close()
+
+    @pytest.mark.anyio
+    async def test_object_write_invalidates_cached_collection(self, pool, calls):
+        """
+        Test: A PUT or DELETE of one object evicts the cached list it belongs to.
+
+        Why: List endpoints are cached; after an update they must not
+        serve the old object for the rest of the TTL.
+        """
+        # Arrange
+        engine = MistEngine(host="api.mist.com")
+        await engine.get("/api/v1/sites/s1/wlans", cache=True)
+
+        # Act
+        await engine.put("/api/v1/sites/s1/wlans/w1", json={"ssid": "renamed"})
+        await engine.get("/api/v1/sites/s1/wlans", cache=True)
+        await engine.delete("/api/v1/sites/s1/wlans/w1")
+        await engine.get("/api/v1/sites/s1/wlans", cache=True)
+
+        # Assert: every list read after a write reached Mist
+        assert [c.method for c in calls] == ["GET", "PUT", "GET", "DELETE", "GET"]
+        await pool.close()
+
+
+class TestRetryAfter:
+    """Test Retry-After header parsing."""
+
+    def test_seconds(self):
+        """Test: Delay-seconds form is returned as a float."""
+        assert parse_retry_after("12") == 12.0
+
+    def test_missing_or_invalid(self):
+        """Test: Absent or garbage headers fall back to backoff (None)."""
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
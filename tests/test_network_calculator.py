@@ -0,0 +1,103 @@
+"""
+Tests for the Network Calculator and IPAM planning API.
+
+These tests validate that bulk IP plans match the single-site formula and
+export correctly. No external services are involved.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services.network_calculator import NetworkCalculator
+
+
+class TestBulkPlan:
+    """
+    Test NetworkCalculator.plan_sites / plan_zones.
+
+    Why: The bulk planner must produce exactly the subnets the single-site
+    calculator does; any drift would hand two sites the same VLAN subnet.
+    """
+
+    @pytest.fixture
+    def calculator(self):
+        """Calculator over the default 10.0.0.0/8 supernet."""
+        return NetworkCalculator()
+
+    def test_bulk_rows_match_single_site_formula(self, calculator):
+        """
+        Test: Every bulk row equals calculate_site_subnets for the same pair.
+
+        Why: Both paths feed provisioning; they must agree exactly.
+        """
+        # Act
+        plan = calculator.plan_zones([1, 8], sites_per_zone=255)
+
+        # Assert
+        assert len(plan) == 510
+        for row in plan.iter_rows():
+            expected = calculator.calculate_site_subnets(row["zone_id"], row["site_id"])
+            assert row == expected.model_dump()
+
+    def test_columns_export_network_ints(self, calculator):
+        """
+        Test: Columnar export holds 32-bit network addresses.
+
+        Why: Downstream tooling loads the columns directly as integer arrays.
+        """
+        # Act
+        columns = calculator.plan_sites([1], [55]).to_columns()
+
+        # Assert: 10.1.55.0 and 10.101.55.0
+        assert columns["prefix_length"] == 24
+        assert columns["management_subnet"] == [(10 << 24) | (1 << 16) | (55 << 8)]
+        assert columns["data_subnet"] == [(10 << 24) | (101 << 16) | (55 << 8)]
+
+    def test_rejects_zone_that_overflows_octet(self, calculator):
+        """
+        Test: Zones whose IoT octet would exceed 255 are rejected.
+
+        Why: 10.{220 + zone} is only a valid address for zones up to 35.
+        """
+        with pytest.raises(ValueError):
+            calculator.plan_sites([36], [1])
+
+
+class TestPlanEndpoint:
+    """Test POST /ipam/plan."""
+
+    @pytest.fixture
+    def client(self):
+        """Create FastAPI test client."""
+        return TestClient(app)
+
+    def test_csv_export(self, client):
+        """
+        Test: format=csv streams a header plus one line per site.
+
+        Why: Planning teams review allocations in spreadsheets.
+        """
+        # Act
+        response = client.post("/ipam/plan", json={"zones": [1], "sites_per_zone": 2, "format": "csv"})
+
+        # Assert
+        lines = response.text.splitlines()
+        assert response.headers["content-type"].startswith("text/csv")
+        assert lines[0].startswith("zone_id,site_id,management_subnet")
+        assert lines[1].startswith("1,1,10.1.1.0/24,10.101.1.0/24")
+        assert len(lines) == 3
+
+    def test_requires_exactly_one_source(self, client):
+        """Test: Sending both pairs and zones is a validation error."""
+        response = client.post("/ipam/plan", json={"pairs": [[1, 1]], "zones": [1]})
+        assert response.status_code == 422
+
+    @pytest.mark.parametrize("pair", [[-1, 5], [1, 2**40]])
+    def test_out_of_range_ids_are_rejected(self, client, pair):
+        """
+        Test: Negative IDs and IDs beyond 32 bits are a 400, not a 500.
+
+        Why: Range checks must run before the IDs are packed into arrays.
+        """
+        response = client.post("/ipam/plan", json={"pairs": [pair]})
+        assert response.status_code == 400
@@ -0,0 +1,154 @@
+"""
+Tests for the pipeline engine.
+
+These tests validate DAG validation, concurrent execution of independent
+branches, and resuming a failed run from its checkpoints.
+
+Checkpoints are kept in memory; no external services are involved.
+"""
+import asyncio
+
+import pytest
+
+from src.services.pipeline import (
+    CheckpointStore,
+    Pipeline,
+    Step,
+    StepResult,
+    StepScope,
+    StepStatus,
+)
+
+
+class MemoryCheckpoints(CheckpointStore):
+    """CheckpointStore kept in a dict instead of Redis."""
+
+    def __init__(self):
+        super().__init__("test-run", ttl=60)
+        self.results: dict[str, StepResult] = {}
+
+    async def load(self) -> dict[str, StepResult]:
+        return dict(self.results)
+
+    async def save(self, result: StepResult) -> None:
+        self.results[f"{result.target}/{result.step}"] = result
+
+
+def _noop(name: str, calls: list):
+    async def run(ctx):
+        calls.append((ctx.target, name))
+        return {"from": name}
+    return run
+
+
+class TestPipelineValidation:
+    """
+    Test Pipeline construction.
+
+    Why: A malformed DAG would deadlock or run steps out of order.
+    """
+
+    def test_cycle_is_rejected(self):
+        """
+        Test: Steps depending on each other raise ValueError.
+
+        Why: A cycle can never start.
+        """
+        with pytest.raises(ValueError, match="cycle"):
+            Pipeline([Step("a", _noop("a", []), depends_on=("b",)), Step("b", _noop("b", []), depends_on=("a",))])
+
+    def test_org_step_cannot_depend_on_site_step(self):
+        """
+        Test: An org step depending on a per-site step raises ValueError.
+
+        Why: The org step runs once and has no single site to wait for.
+        """
+        with pytest.raises(ValueError, match="cannot depend"):
+            Pipeline([
+                Step("site", _noop("site", [])),
+                Step("org", _noop("org", []), depends_on=("site",), scope=StepScope.ORG),
+            ])
+
+
+class TestPipelineExecution:
+    """
+    Test Pipeline.execute.
+
+    Why: Turn-up must run independent work in parallel and resume after a
+    failure without repeating finished steps.
+    """
+
+    @pytest.mark.anyio
+    async def test_independent_sites_run_concurrently(self):
+        """
+        Test: Site steps of different sites overlap in time; a site step
+        sees the output of the org step it depends on.
+
+        Why: Serial turn-up is what this engine replaces.
+        """
+        # Arrange
+        running, peak = 0, 0
+
+        async def site_step(ctx):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"seen": ctx.outputs["index"]["from"]}
+
+        calls = []
+        pipeline = Pipeline([
+            Step("index", _noop("index", calls), scope=StepScope.ORG),
+            Step("site", site_step, depends_on=("index",)),
+        ])
+
+        # Act
+        results = await pipeline.execute(
+            None, "org-1", {}, {f"s{i}": {} for i in range(5)}, MemoryCheckpoints(), concurrency=3
+        )
+
+        # Assert
+        assert peak == 3
+        assert all(r.status == StepStatus.SUCCEEDED for r in results)
+        assert {r.output.get("seen") for r in results if r.step == "site"} == {"index"}
+
+    @pytest.mark.anyio
+    async def test_failure_blocks_dependents_and_resume_skips_done_steps(self):
+        """
+        Test: A failed step blocks only its dependents; re-running with the
+        same checkpoints re-executes just the failed branch.
+
+        Why: A failed run must resume where it stopped.
+        """
+        # Arrange
+        calls = []
+        attempts = {"n": 0}
+
+        async def flaky(ctx):
+            calls.append((ctx.target, "flaky"))
+            attempts["n"] += 1
+            if ctx.target == "s2" and attempts["n"] <= 2:
+                raise RuntimeError("device offline")
+            return {}
+
+        pipeline = Pipeline([
+            Step("create", _noop("create", calls)),
+            Step("flaky", flaky, depends_on=("create",)),
+            Step("after", _noop("after", calls), depends_on=("flaky",)),
+        ])
+        checkpoints = MemoryCheckpoints()
+        sites = {"s1": {}, "s2": {}}
+
+        # Act
+        first = await pipeline.execute(None, "org-1", {}, sites, checkpoints, concurrency=1)
+        calls.clear()
+        second = await pipeline.execute(None, "org-1", {}, sites, checkpoints, concurrency=1)
+
+        # Assert
+        statuses = {(r.target, r.step): r.status for r in first}
+        assert statuses[("s2", "flaky")] == StepStatus.FAILED
+        assert statuses[("s2", "after")] == StepStatus.BLOCKED
+        assert statuses[("s1", "after")] == StepStatus.SUCCEEDED
+        assert sorted(calls) == [("s2", "after"), ("s2", "flaky")]
+        assert all(r.status == StepStatus.SUCCEEDED for r in second)
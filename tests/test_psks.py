@@ -0,0 +1,183 @@
+"""
+Tests for bulk Org PSK generation and import.
+
+These tests validate passphrase generation, single-pass validation,
+batched, resumable uploads, and that passphrases are not kept once uploaded.
+
+All tests mock the org context, MistEngine and the checkpoint store.
+"""
+import importlib
+from typing import ClassVar
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services.pipeline import CheckpointStore, StepResult
+
+psks = importlib.import_module("src.routers.day1_intent_and_policy.2_wireless_mobility.psks")
+
+
+class MemoryCheckpoints(CheckpointStore):
+    """CheckpointStore kept in class-level dicts instead of Redis."""
+    inputs: ClassVar[dict[str, dict]] = {}
+    steps: ClassVar[dict[str, dict[str, StepResult]]] = {}
+
+    async def save_input(self, data: dict) -> None:
+        self.inputs[self.run_id] = data
+
+    async def load_input(self) -> dict | None:
+        return self.inputs.get(self.run_id)
+
+    async def load(self) -> dict[str, StepResult]:
+        return dict(self.steps.get(self.run_id, {}))
+
+    async def save(self, result: StepResult) -> None:
+        self.steps.setdefault(self.run_id, {})[f"{result.target}/{result.step}"] = result
+
+
+@pytest.fixture
+def client():
+    """Test client with org context and in-memory checkpoints."""
+    with patch.object(psks, "get_context", AsyncMock(return_value=("api.mist.com", "org-1"))), \
+            patch.object(psks, "CheckpointStore", MemoryCheckpoints):
+        yield TestClient(app)
+
+
+class TestGenerateAndValidate:
+    """
+    Test PSK generation and validation.
+
+    Why: Every user needs a distinct, valid passphrase.
+    """
+
+    def test_generated_psks_are_numbered_and_distinct(self):
+        """
+        Test: Names are zero-padded in sequence and passphrases are unique.
+
+        Why: Mist identifies the user by the passphrase.
+        """
+        # Act
+        generated = psks.generate_psks(psks.PSKGenerate(ssid="dorm", count=120, name_prefix="room", length=10))
+
+        # Assert
+        assert [p.name for p in generated[:2]] == ["room-001", "room-002"]
+        assert generated[-1].name == "room-120"
+        assert len({p.passphrase for p in generated}) == 120
+        assert all(len(p.passphrase) == 10 for p in generated)
+
+    def test_validation_reports_every_bad_record(self):
+        """
+        Test: Field errors and duplicate names/passphrases are all reported.
+
+        Why: A 20k-line file must be fixable in one round trip.
+        """
+        # Arrange
+        records = [
+            {"name": "a", "passphrase": "secret-one", "ssid": "dorm"},
+            {"name": "b", "passphrase": "short", "ssid": "dorm"},
+            {"name": "a", "passphrase": "secret-two", "ssid": "dorm"},
+            {"name": "c", "passphrase": "secret-one", "ssid": "dorm"},
+            {"name": "d", "passphrase": "secret-one", "ssid": "guest"},
+        ]
+
+        # Act
+        valid, errors = psks.validate_psks(records)
+
+        # Assert
+        assert [p.name for p in valid] == ["a", "d"]
+        assert [e.split(":")[0] for e in errors] == ["#1", "#2", "#3"]
+
+
+class TestUpload:
+    """
+    Test batched uploads.
+
+    Why: Tens of thousands of PSKs cannot be created one request at a time.
+    """
+
+    def test_failed_batch_is_retried_on_resume(self, client):
+        """
+        Test: After a batch fails, resume uploads only that batch.
+
+        Why: Re-uploading finished batches wastes the API budget.
+        """
+        # Arrange
+        calls = []
+
+        async def post(self, endpoint, json=None):
+            calls.append([p["name"] for p in json])
+            if len(calls) == 2:
+                raise HTTPException(status_code=503, detail="Unavailable")
+            return {}
+
+        with patch("src.services.mist_engine.MistEngine.post", post):
+            # Act
+            first = client.post("/wireless/psks/generate",
+                                json={"ssid": "dorm", "count": 5, "batch_size": 2, "concurrency": 1}).json()
+            resumed = client.post(f"/wireless/psks/runs/{first['run_id']}/resume").json()
+
+        # Assert
+        assert (first["succeeded"], first["failed"]) == (2, 1)
+        assert calls[3] == calls[1]
+        assert len(calls) == 4
+        assert resumed["status"] == "succeeded"
+        assert [s["resumed"] for s in resumed["steps"]] == [True, False, True]
+
+    def test_invalid_upload_uploads_nothing(self, client):
+        """
+        Test: One invalid record rejects the whole file with a 400.
+
+        Why: A half-imported term roster is harder to fix than a rejected file.
+        """
+        # Arrange
+        body = "name,passphrase,ssid\na,secret-one,dorm\nb,short,dorm\n"
+        post = AsyncMock()
+
+        # Act
+        with patch("src.services.mist_engine.MistEngine.post", post):
+            response = client.post("/wireless/psks/import", content=body, headers={"Content-Type": "text/csv"})
+
+        # Assert
+        assert response.status_code == 400
+        assert response.json()["detail"]["errors"][0].startswith("#1")
+        post.assert_not_awaited()
+
+    def test_blank_optional_cells_use_defaults(self, client):
+        """
+        Test: A CSV row with an empty usage cell is uploaded with the default usage.
+
+        Why: Spreadsheets leave optional columns blank.
+        """
+        # Arrange
+        body = "name,passphrase,ssid,usage\na,secret-one,dorm,\nb,secret-two,dorm,single\n"
+        post = AsyncMock(return_value={})
+
+        # Act
+        with patch("src.services.mist_engine.MistEngine.post", post):
+            response = client.post("/wireless/psks/import", content=body, headers={"Content-Type": "text/csv"})
+
+        # Assert
+        assert response.status_code == 200
+        assert [p["usage"] for p in post.await_args.kwargs["json"]] == ["multi", "single"]
+
+    def test_passphrases_are_returned_once(self, client):
+        """
+        Test: The generate response lists every passphrase, and the stored run
+        drops them once all batches are uploaded.
+
+        Why: Passphrases must not stay readable in Redis after they are handed out.
+        """
+        # Act
+        with patch("src.services.mist_engine.MistEngine.post", AsyncMock(return_value={})):
+            response = client.post("/wireless/psks/generate", json={"ssid": "dorm", "count": 3}).json()
+
+        # Assert
+        assert [p["name"] for p in response["psks"]] == ["psk-1", "psk-2", "psk-3"]
+        assert all(len(p["passphrase"]) == 12 for p in response["psks"])
+        stored = MemoryCheckpoints.inputs[response["run_id"]]["psks"]
+        assert [p["name"] for p in stored] == ["psk-1", "psk-2", "psk-3"]
+        assert not any("passphrase" in p for p in stored)
+        assert client.get(f"/wireless/psks/runs/{response['run_id']}/export").status_code == 404
@@ -0,0 +1,176 @@
+"""
+Tests for the desired-state reconciler.
+
+These tests validate the structural diff, that only the minimal writes are
+planned, and that they run in dependency order.
+
+All tests mock the org context and MistEngine to avoid external dependencies.
+"""
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services.reconciler import ActionType, diff, plan_kind
+
+
+class TestDiff:
+    """
+    Test the structural diff.
+
+    Why: A false diff rewrites an unchanged object; a missed diff leaves
+    drift in place.
+    """
+
+    def test_server_fields_do_not_cause_updates(self):
+        """
+        Test: Extra keys in Mist records (ids, timestamps) are ignored.
+
+        Why: Every Mist object carries fields the document never sets.
+        """
+        # Arrange
+        desired = {"name": "HQ", "latlng": {"lat": 1.0, "lng": 2.0}}
+        current = {"id": "s1", "name": "HQ", "latlng": {"lat": 1.0, "lng": 2.0}, "modified_time": 9}
+
+        # Act / Assert
+        assert diff(desired, current) == {}
+
+    def test_only_changed_fields_are_returned(self):
+        """
+        Test: The update payload holds just the differing fields.
+
+        Why: Full-payload PUTs are what made re-applies slow.
+        """
+        # Arrange
+        desired = {"name": "Corp", "vlan_id": 20, "lan": [{"name": "a", "subnet": "10.0.0.0/24"}]}
+        current = {"name": "Corp", "vlan_id": 10, "lan": [{"name": "a", "subnet": "10.0.0.0/24", "id": "x"}]}
+
+        # Act / Assert
+        assert diff(desired, current) == {"vlan_id": 20}
+
+    def test_plan_kind_creates_updates_and_prunes(self):
+        """
+        Test: Missing names are created, drifted ones updated, extra ones
+        deleted only when pruning.
+
+        Why: These are the only three writes the reconciler may issue.
+        """
+        # Arrange
+        desired = [{"name": "A", "vlan_id": 1}, {"name": "B", "vlan_id": 2}, {"name": "C"}]
+        current = [{"id": "1", "name": "A", "vlan_id": 1}, {"id": "2", "name": "B", "vlan_id": 3},
+                   {"id": "9", "name": "Z"}]
+
+        # Act
+        actions, unchanged = plan_kind("networks", desired, current, prune=True)
+
+        # Assert
+        assert unchanged == 1
+        assert [(a.action, a.name, a.changes) for a in actions] == [
+            (ActionType.UPDATE, "B", {"vlan_id": 2}),
+            (ActionType.CREATE, "C", {"name": "C"}),
+            (ActionType.DELETE, "Z", {}),
+        ]
+
+    def test_duplicate_desired_names_are_rejected(self):
+        """
+        Test: A document naming two objects alike is an error.
+
+        Why: Objects are matched by name; duplicates are ambiguous.
+        """
+        with pytest.raises(ValueError):
+            plan_kind("sites", [{"name": "A"}, {"name": "A"}], [], prune=False)
+
+
+class TestReconcileEndpoints:
+    """
+    Test POST /reconcile/plan and /reconcile/apply.
+
+    Why: Re-applying an unchanged org intent must issue no writes.
+    """
+
+    @pytest.fixture
+    def client(self):
+        """Create FastAPI test client."""
+        return TestClient(app)
+
+    @pytest.fixture(autouse=True)
+    def mock_mist(self):
+        """Org with one network and one site; writes are recorded in order."""
+        current = {
+            "/api/v1/orgs/org-1/networks": [{"id": "n1", "name": "Corp", "subnet": "10.0.0.0/24", "vlan_id": 10}],
+            "/api/v1/orgs/org-1/sites": [{"id": "s1", "name": "HQ", "timezone": "UTC"}],
+        }
+
+        async def paginate(self, endpoint, params=None, limit=100):
+            for obj in current.get(endpoint, []):
+                yield obj
+
+        writes = []
+
+        async def post(self, endpoint, json=None):
+            writes.append(("POST", endpoint))
+            return {"id": "new", **json}
+
+        async def put(self, endpoint, json=None):
+            writes.append(("PUT", endpoint, json))
+            return {"id": endpoint.rsplit("/", 1)[-1], **json}
+
+        with patch(
+            "src.routers.day0_design_and_topology.reconcile.get_context",
+            AsyncMock(return_value=("api.mist.com", "org-1")),
+        ), patch("src.services.reconciler.MistEngine.paginate", paginate), \
+                patch("src.services.reconciler.MistEngine.post", post), \
+                patch("src.services.reconciler.MistEngine.put", put):
+            yield writes
+
+    def test_unchanged_document_issues_no_writes(self, client, mock_mist):
+        """
+        Test: Applying the current state is a no-op.
+
+        Why: Idempotency is the point of the reconciler.
+        """
+        # Arrange
+        state = {"networks": [{"name": "Corp", "subnet": "10.0.0.0/24", "vlan_id": 10}],
+                 "sites": [{"name": "HQ", "timezone": "UTC"}]}
+
+        # Act
+        response = client.post("/reconcile/apply", json={"state": state})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["plan"]["unchanged"] == {"networks": 1, "sites": 1}
+        assert mock_mist == []
+
+    def test_apply_writes_diff_in_dependency_order(self, client, mock_mist):
+        """
+        Test: Network changes are written before sites, with only the diff.
+
+        Why: Sites and hub profiles may reference networks.
+        """
+        # Arrange
+        state = {"sites": [{"name": "HQ", "timezone": "UTC"}, {"name": "Branch"}],
+                 "networks": [{"name": "Corp", "vlan_id": 20}]}
+
+        # Act
+        response = client.post("/reconcile/apply", json={"state": state})
+
+        # Assert
+        assert mock_mist == [
+            ("PUT", "/api/v1/orgs/org-1/networks/n1", {"vlan_id": 20}),
+            ("POST", "/api/v1/orgs/org-1/sites"),
+        ]
+        assert response.json()["results"]["succeeded"] == 2
+
+    def test_plan_is_a_dry_run(self, client, mock_mist):
+        """
+        Test: /reconcile/plan lists actions without writing.
+
+        Why: Operators review the diff before applying it.
+        """
+        # Act
+        response = client.post("/reconcile/plan", json={"state": {"sites": [{"name": "New"}]}})
+
+        # Assert
+        assert [a["action"] for a in response.json()["actions"]] == ["create"]
+        assert mock_mist == []
@@ -1,14 +1,149 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
 import pytest
-from src.services.redis import get_redis_client
+import redis.asyncio as redis
+
+from src.services.redis import (
+    ContextCache,
+    close_redis_pool,
+    get_context,
+    get_redis_client,
+    run_invalidation_listener,
+    set_context,
+)
+from tests.conftest import FakePubSub
 
 
 class TestRedis:
     """Test Redis connection."""
 
-    def test_redis_ping(self):
+    @pytest.mark.anyio
+    async def test_redis_ping(self):
         """Test that Redis connection is successful."""
         client = get_redis_client()
-        result = client.ping()
+        result = await client.ping()
+        await close_redis_pool()
         if not result:
             pytest.skip("Redis not reachable - skipping test (use local Redis or Railway public URL)")
         assert result is True
+
+
+class TestContextCache:
+    """
+    Test the in-process org context cache.
+
+    Why: Every org-scoped request resolves api_host/org_id. Serving them
+    from memory removes Redis round trips from the hot path, but a stale
+    context would send provisioning calls to the wrong org.
+    """
+
+    @pytest.fixture
+    def mock_redis(self):
+        """Mock Redis client and a fresh cache per test."""
+        redis_mock = AsyncMock()
+        with (
+            patch("src.services.redis.get_redis_client", return_value=redis_mock),
+            patch("src.services.redis.get_context_cache", return_value=ContextCache(ttl=60)),
+        ):
+            yield redis_mock
+
+    @pytest.mark.anyio
+    async def test_context_is_served_from_cache(self, mock_redis):
+        """
+        Test: A second lookup does not touch Redis.
+
+        Why: This is the round trip the cache exists to remove.
+        """
+        # Arrange
+        mock_redis.mget.return_value = ["api.mist.com", "org-1"]
+
+        # Act
+        first = await get_context()
+        second = await get_context()
+
+        # Assert
+        assert first == second == ("api.mist.com", "org-1")
+        mock_redis.mget.assert_called_once()
+
+    @pytest.mark.anyio
+    async def test_incomplete_context_is_not_cached(self, mock_redis):
+        """
+        Test: A missing org_id is re-read on the next request.
+
+        Why: Handlers return 400 until POST /org/self runs; caching the
+        miss would keep returning 400 after the org is configured.
+        """
+        # Arrange
+        mock_redis.mget.return_value = ["api.mist.com", None]
+
+        # Act
+        await get_context()
+        await get_context()
+
+        # Assert
+        assert mock_redis.mget.call_count == 2
+
+    @pytest.mark.anyio
+    async def test_set_context_publishes_invalidation(self, mock_redis):
+        """
+        Test: Writing the context drops the cache and notifies other workers.
+
+        Why: Other worker processes hold their own copy; without the
+        pub/sub message they would keep the previous org until TTL expiry.
+        """
+        # Arrange
+        mock_redis.mget.return_value = ["api.mist.com", "org-1"]
+        await get_context()
+        mock_redis.mget.return_value = ["api.eu.mist.com", "org-2"]
+
+        # Act
+        await set_context("api.eu.mist.com", "org-2")
+        context = await get_context()
+
+        # Assert
+        assert context == ("api.eu.mist.com", "org-2")
+        mock_redis.publish.assert_called_once()
+
+
+class TestInvalidationListener:
+    """
+    Test run_invalidation_listener.
+
+    Why: If the listener stops, this worker's caches go stale silently.
+    """
+
+    @pytest.mark.anyio
+    async def test_survives_redis_errors_and_bad_messages(self, use_fake_redis):
+        """
+        Test: A non-connection Redis error flushes the caches and resubscribes;
+        a message its handler rejects is skipped.
+
+        Why: Only connection errors used to be retried; anything else ended
+        the task for good.
+        """
+        # Arrange
+        fake = use_fake_redis("src.services.redis")
+        fake.pubsubs = [
+            FakePubSub(error=redis.ResponseError("NOPERM")),
+            FakePubSub([
+                {"type": "message", "channel": "test:invalidate", "data": "bad"},
+                {"type": "message", "channel": "test:invalidate", "data": "key-1"},
+            ]),
+        ]
+        received = []
+
+        def handler(message: str) -> None:
+            if message == "bad":
+                raise ValueError(message)
+            received.append(message)
+
+        # Act
+        with patch.dict("src.services.redis._invalidation_handlers", {"test:invalidate": handler}, clear=True):
+            task = asyncio.create_task(run_invalidation_listener(retry_delay=0))
+            for _ in range(20):
+                await asyncio.sleep(0)
+            task.cancel()
+
+        # Assert: flushed on subscribe, on the error and on resubscribe, then the good message
+        assert received == ["", "", "", "key-1"]
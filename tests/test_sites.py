@@ -0,0 +1,220 @@
+"""
+Tests for the Site Provisioning API.
+
+These tests validate the /sites list endpoint in both its JSON and streaming
+(NDJSON) representations, and the bulk creation endpoints.
+
+All tests mock the org context and MistEngine to avoid external dependencies.
+"""
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from src.main import app
+
+
+class TestListSites:
+    """
+    Test GET /sites/.
+
+    Why: Site listings drive every downstream Day 0 workflow. Large orgs
+    need the streaming mode so sync jobs start consuming immediately.
+    """
+
+    @pytest.fixture
+    def client(self):
+        """Create FastAPI test client."""
+        return TestClient(app)
+
+    @pytest.fixture
+    def sample_sites(self):
+        """Mist site records as returned by the API."""
+        return [
+            {"id": "s1", "name": "Branch-Austin-001", "timezone": "America/Chicago"},
+            {"id": "s2", "name": "Branch-Dallas-002", "timezone": "America/Chicago"},
+        ]
+
+    @pytest.fixture
+    def mock_context(self):
+        """Stored org context (normally written by POST /org/self)."""
+        with patch(
+            "src.routers.day0_design_and_topology.sites.get_context",
+            AsyncMock(return_value=("api.mist.com", "org-1")),
+        ):
+            yield
+
+    @pytest.fixture
+    def mock_paginate(self, sample_sites):
+        """Replace Mist pagination with the sample records."""
+        async def paginate(self, endpoint, params=None, limit=100):
+            for site in sample_sites:
+                yield site
+
+        with patch("src.routers.day0_design_and_topology.sites.MistEngine.paginate", paginate):
+            yield
+
+    def test_ndjson_streams_one_record_per_line(self, client, mock_context, mock_paginate):
+        """
+        Test: Accept: application/x-ndjson streams sites line by line.
+
+        Why: CMDB sync jobs consume tens of thousands of records and must
+        not wait for the whole collection to be materialised.
+        """
+        # Act
+        response = client.get("/sites/", headers={"Accept": "application/x-ndjson"})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [s["id"] for s in lines] == ["s1", "s2"]
+
+    def test_ndjson_applies_site_name_filter(self, client, mock_context, mock_paginate):
+        """
+        Test: The site_name filter also applies to the stream.
+
+        Why: Streaming must not change which records a query returns.
+        """
+        # Act
+        response = client.get(
+            "/sites/",
+            params={"site_name": "Branch-Dallas-002"},
+            headers={"Accept": "application/x-ndjson"},
+        )
+
+        # Assert
+        lines = response.text.splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["id"] == "s2"
+
+    def test_all_pages_returns_json_list(self, client, mock_context, mock_paginate):
+        """
+        Test: all=true collects every page into the JSON response.
+
+        Why: Callers without NDJSON support still need the full collection.
+        """
+        # Act
+        response = client.get("/sites/", params={"all": "true"})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["count"] == 2
+
+
+class TestBulkCreateSites:
+    """
+    Test POST /sites/bulk and /sites/bulk/import.
+
+    Why: Bulk creation is the Day 0 throughput path. It must skip sites
+    that already exist and report partial failures item by item.
+    """
+
+    @pytest.fixture
+    def client(self):
+        """Create FastAPI test client."""
+        return TestClient(app)
+
+    @pytest.fixture
+    def mock_engine(self):
+        """Mist org with one existing site; creating "Bad-Site" fails."""
+        async def paginate(self, endpoint, params=None, limit=100):
+            yield {"id": "s0", "name": "Branch-Existing"}
+
+        async def post(self, endpoint, json=None):
+            if json["name"] == "Bad-Site":
+                raise HTTPException(status_code=400, detail="invalid timezone")
+            return {"id": f"id-{json['name']}", **json}
+
+        with (
+            patch(
+                "src.routers.day0_design_and_topology.sites.get_context",
+                AsyncMock(return_value=("api.mist.com", "org-1")),
+            ),
+            patch("src.routers.day0_design_and_topology.sites.MistEngine.paginate", paginate),
+            patch("src.routers.day0_design_and_topology.sites.MistEngine.post", post),
+        ):
+            yield
+
+    def test_bulk_create_reports_per_item_results(self, client, mock_engine):
+        """
+        Test: Existing and repeated names are skipped, failures are isolated.
+
+        Why: A 2,000-site rollout must be re-runnable after a partial
+        failure without duplicating the sites that already succeeded.
+        """
+        # Arrange
+        payload = {"sites": [
+            {"name": "Branch-New"},
+            {"name": "Branch-Existing"},
+            {"name": "Bad-Site"},
+            {"name": "Branch-New"},
+        ]}
+
+        # Act
+        response = client.post("/sites/bulk", json=payload)
+
+        # Assert
+        data = response.json()
+        assert response.status_code == 200
+        assert (data["succeeded"], data["skipped"], data["failed"]) == (1, 2, 1)
+        assert [r["status"] for r in data["results"]] == ["succeeded", "skipped", "failed", "skipped"]
+        assert data["results"][0]["id"] == "id-Branch-New"
+
+    def test_csv_import(self, client, mock_engine):
+        """
+        Test: A CSV upload creates one site per row and reports bad rows.
+
+        Why: Rollout plans usually arrive as spreadsheets exported to CSV.
+        """
+        # Arrange
+        body = "name,timezone,lat,lng\nBranch-CSV,America/Denver,39.7,-104.9\nBranch-Bad,,north,west\n"
+
+        # Act
+        response = client.post(
+            "/sites/bulk/import", content=body, headers={"Content-Type": "text/csv"}
+        )
+
+        # Assert
+        data = response.json()
+        assert (data["succeeded"], data["failed"]) == (1, 1)
+        assert data["results"][1]["key"] == "Branch-Bad"
+
+    def test_csv_blank_cells_take_defaults(self, client, mock_engine):
+        """
+        Test: An empty timezone cell creates the site with the default timezone.
+
+        Why: Spreadsheets leave optional columns blank; that is not an error.
+        """
+        # Arrange
+        body = "name,timezone\nBranch-Blank,\n"
+
+        # Act
+        response = client.post(
+            "/sites/bulk/import", content=body, headers={"Content-Type": "text/csv"}
+        )
+
+        # Assert
+        data = response.json()
+        assert data["succeeded"] == 1
+        assert data["results"][0]["id"] == "id-Branch-Blank"
+
+    def test_jsonl_line_that_is_not_an_object_is_rejected(self, client, mock_engine):
+        """
+        Test: A JSON Lines upload with an array on line 2 gets a 400 naming the line.
+
+        Why: A malformed upload is the caller's error, not a server error.
+        """
+        # Arrange
+        body = '{"name": "Branch-One"}\n["a"]\n'
+
+        # Act
+        response = client.post(
+            "/sites/bulk/import", content=body, headers={"Content-Type": "application/x-ndjson"}
+        )
+
+        # Assert
+        assert response.status_code == 400
+        assert "line 2" in response.json()["detail"]
@@ -0,0 +1,253 @@
+"""
+Tests for live Day 2 event streams.
+
+These tests validate subscriber filters and backpressure, health change
+detection, and the WebSocket stream.
+
+All tests mock the org context and Redis.
+"""
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import redis.asyncio as redis
+from fastapi import WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.routers.day2_observability_assurance_and_aiops.assurance import (
+    _health_watchers,
+    next_event,
+    publish_health_changes,
+    watch_fleet_health,
+)
+from src.routers.day2_observability_assurance_and_aiops.models import FleetHealthResponse, SiteHealthResponse
+from src.services.event_bus import EventBus, EventFilter, Subscription
+from tests.conftest import FakePubSub
+
+
+ASSURANCE = "src.routers.day2_observability_assurance_and_aiops.assurance"
+
+
+class PrimedBus(EventBus):
+    """EventBus that dispatches `events` as soon as a subscriber registers."""
+
+    def __init__(self, events: list[dict]):
+        super().__init__()
+        self.events = events
+
+    @asynccontextmanager
+    async def subscribe(self, org_id, event_filter):
+        async with super().subscribe(org_id, event_filter) as subscription:
+            for event in self.events:
+                self.dispatch(org_id, event)
+            yield subscription
+
+
+def _fleet(clients: int = 0, **scores) -> FleetHealthResponse:
+    sites = [SiteHealthResponse(site_id=site_id, site_name=site_id, overall_score=score,
+                                connected_clients=clients, timestamp="t")
+             for site_id, score in scores.items()]
+    return FleetHealthResponse(sites=sites, count=len(sites), generated_at="t")
+
+
+class TestSubscription:
+    """
+    Test Subscription and EventFilter.
+
+    Why: One slow NOC screen must not stall the others or grow without bound.
+    """
+
+    @pytest.mark.anyio
+    async def test_full_queue_drops_oldest_and_reports_lag(self):
+        """
+        Test: Delivering past the queue size drops the oldest events, and the
+        next read is a `lagged` notice with the count.
+
+        Why: The client must know to resync instead of silently missing alerts.
+        """
+        # Arrange
+        subscription = Subscription("org-1", EventFilter(), maxsize=2)
+
+        # Act
+        for n in range(3):
+            subscription.deliver({"type": "alert", "n": n})
+        received = [await subscription.get() for _ in range(3)]
+
+        # Assert
+        assert received == [{"type": "lagged", "dropped": 1}, {"type": "alert", "n": 1}, {"type": "alert", "n": 2}]
+
+    def test_filters(self):
+        """
+        Test: Site and type filters apply to every event; severity only to
+        events that carry one.
+
+        Why: A critical-only screen still wants health changes of its sites.
+        """
+        # Arrange
+        event_filter = EventFilter(site_ids=frozenset({"s1"}), severities=frozenset({"critical"}))
+
+        # Act / Assert
+        assert event_filter.matches({"type": "alert", "site_id": "s1", "severity": "critical"})
+        assert not event_filter.matches({"type": "alert", "site_id": "s1", "severity": "info"})
+        assert not event_filter.matches({"type": "alert", "site_id": "s2", "severity": "critical"})
+        assert event_filter.matches({"type": "health", "site_id": "s1"})
+        assert not EventFilter(types=frozenset({"alert"})).matches({"type": "health", "site_id": "s1"})
+
+    @pytest.mark.anyio
+    async def test_idle_subscriber_gets_keepalive(self):
+        """
+        Test: next_event returns a keepalive when nothing arrives in time.
+
+        Why: Proxies close idle streams, and closed sockets are only noticed on send.
+        """
+        # Act
+        event = await next_event(Subscription("org-1", EventFilter()), heartbeat=0.01)
+
+        # Assert
+        assert event == {"type": "keepalive"}
+
+
+class TestEventListener:
+    """
+    Test EventBus.run_listener.
+
+    Why: When the listener stops, no subscriber on the worker gets events.
+    """
+
+    @pytest.mark.anyio
+    async def test_survives_redis_errors_and_bad_messages(self, use_fake_redis):
+        """
+        Test: After a non-connection Redis error the listener resubscribes and
+        marks subscribers lagged; messages that are not JSON objects are skipped.
+
+        Why: Only connection errors used to be retried; anything else stopped
+        event delivery on the worker for good.
+        """
+        # Arrange
+        fake = use_fake_redis("src.services.event_bus")
+        fake.pubsubs = [
+            FakePubSub(error=redis.ResponseError("NOPERM")),
+            FakePubSub([
+                {"type": "pmessage", "channel": "events:org-1", "data": "[]"},
+                {"type": "pmessage", "channel": "events:org-1", "data": json.dumps({"type": "alert", "n": 1})},
+            ]),
+        ]
+        bus = EventBus()
+
+        # Act
+        async with bus.subscribe("org-1", EventFilter()) as subscription:
+            task = asyncio.create_task(bus.run_listener(retry_delay=0))
+            received = [await asyncio.wait_for(subscription.get(), 1) for _ in range(2)]
+            task.cancel()
+
+        # Assert
+        assert received == [{"type": "lagged", "dropped": 1}, {"type": "alert", "n": 1}]
+
+
+class TestHealthChanges:
+    """
+    Test publish_health_changes.
+
+    Why: Subscribers receive deltas, not the whole fleet every snapshot.
+    """
+
+    @pytest.mark.anyio
+    async def test_only_changed_sites_are_published(self, use_fake_redis):
+        """
+        Test: The first snapshot publishes every site; the next one only the
+        site whose score changed, although every site's client count moved.
+
+        Why: Unchanged sites would flood 200 screens every minute.
+        """
+        # Arrange
+        redis = use_fake_redis(ASSURANCE, "src.services.event_bus")
+        with patch(f"{ASSURANCE}.get_event_bus", return_value=EventBus()):
+
+            # Act
+            first = await publish_health_changes("org-1", _fleet(s1=100, s2=90))
+            second = await publish_health_changes("org-1", _fleet(clients=7, s1=100, s2=50))
+
+        # Assert
+        assert (first, second) == (2, 1)
+        published = [json.loads(message) for _, message in redis.published]
+        assert [(e["site_id"], e["overall_score"]) for e in published] == [
+            ("s1", 100), ("s2", 90), ("s2", 50),
+        ]
+
+    @pytest.mark.anyio
+    async def test_subscribers_keep_health_fresh_without_polling(self):
+        """
+        Test: While subscribers are connected, one refresh task per org
+        rebuilds the fleet snapshot; it stops when the last one leaves.
+
+        Why: Health events must flow even when no dashboard polls fleet health.
+        """
+        # Arrange
+        fleet_health = AsyncMock()
+        with patch(f"{ASSURANCE}.fleet_health", fleet_health):
+
+            # Act
+            async with watch_fleet_health("api.mist.com", "org-1"), watch_fleet_health("api.mist.com", "org-1"):
+                await asyncio.sleep(0)
+                watchers = dict(_health_watchers)
+
+        # Assert
+        fleet_health.assert_awaited_once_with("api.mist.com", "org-1")
+        assert watchers["org-1"][0] == 2
+        assert _health_watchers == {}
+        await asyncio.sleep(0)
+        assert watchers["org-1"][1].cancelled()
+
+
+class TestWebSocketStream:
+    """
+    Test the /assurance/ws stream.
+
+    Why: Subscribers receive only the events their filters select.
+    """
+
+    def test_site_filter_and_cleanup(self):
+        """
+        Test: A subscriber filtered to one site receives its alert and health
+        events only, and is unregistered when it disconnects.
+
+        Why: Disconnected screens must not keep receiving fan-out.
+        """
+        # Arrange
+        bus = PrimedBus([
+            {"type": "alert", "alert_id": "a1", "site_id": "s1", "severity": "critical"},
+            {"type": "alert", "alert_id": "a2", "site_id": "s2", "severity": "critical"},
+            {"type": "health", "site_id": "s1", "overall_score": 80},
+        ])
+        with patch(f"{ASSURANCE}.get_context", AsyncMock(return_value=("api.mist.com", "org-1"))), \
+                patch(f"{ASSURANCE}.get_event_bus", return_value=bus), \
+                patch(f"{ASSURANCE}.fleet_health", AsyncMock()):
+            client = TestClient(app)
+
+            # Act
+            with client.websocket_connect("/assurance/ws?site_id=s1") as websocket:
+                received = [websocket.receive_json(), websocket.receive_json()]
+
+        # Assert
+        assert [e["type"] for e in received] == ["alert", "health"]
+        assert received[0]["alert_id"] == "a1"
+        assert bus._subscriptions == {}
+
+    def test_missing_context_closes_socket(self):
+        """
+        Test: Without an org context the socket is closed with a policy error.
+
+        Why: Streams are scoped to the configured org.
+        """
+        # Arrange
+        with patch(f"{ASSURANCE}.get_context", AsyncMock(return_value=(None, None))):
+            client = TestClient(app)
+
+            # Act / Assert
+            with pytest.raises(WebSocketDisconnect) as exc_info, client.websocket_connect("/assurance/ws"):
+                pass
+        assert exc_info.value.code == 1008
+
@@ -0,0 +1,125 @@
+"""
+Tests for the Day 1 template engine.
+
+These tests validate placeholder substitution, the compile cache, and batch
+rendering with variables merged from the NMS profile, IPAM and each site.
+
+Redis is mocked; no Mist calls are made.
+"""
+import pickle
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services.templates import TemplateError, compile_template, render_many
+
+
+class TestTemplateEngine:
+    """
+    Test compilation and rendering.
+
+    Why: Day 1 templates must stay abstract and render identically for every site.
+    """
+
+    def test_whole_placeholder_keeps_type(self):
+        """
+        Test: "{{vlan}}" renders to the variable itself; embedded placeholders
+        are interpolated as text.
+
+        Why: Mist expects integers for VLAN IDs.
+        """
+        # Arrange
+        template = compile_template({"vlan_id": "{{vlan}}", "name": "corp-{{ vlan }}", "ports": ["ge-0/0/1"]})
+
+        # Act
+        result = template.render({"vlan": 20})
+
+        # Assert
+        assert result == {"vlan_id": 20, "name": "corp-20", "ports": ["ge-0/0/1"]}
+        assert template.variables == {"vlan"}
+
+    def test_identical_content_is_compiled_once(self):
+        """
+        Test: Templates with the same content share one compilation.
+
+        Why: Compilation is the cost paid once per template, not per site.
+        """
+        # Act / Assert
+        assert compile_template({"a": "{{x}}", "b": 1}) is compile_template({"b": 1, "a": "{{x}}"})
+
+    def test_missing_variables_are_reported_per_site(self):
+        """
+        Test: A site missing variables yields a TemplateError naming them;
+        other sites still render.
+
+        Why: One incomplete site must not fail the batch.
+        """
+        # Act
+        results = render_many({"v": "{{a}}-{{b}}"}, [{"a": 1, "b": 2}, {"a": 1}])
+
+        # Assert
+        assert results[0] == {"v": "1-2"}
+        assert isinstance(results[1], TemplateError)
+        assert results[1].missing == ["b"]
+
+    def test_template_error_survives_pickling(self):
+        """
+        Test: TemplateError round-trips through pickle.
+
+        Why: Process-pool workers return their results pickled.
+        """
+        # Act
+        error = pickle.loads(pickle.dumps(TemplateError(["b", "a"])))
+
+        # Assert
+        assert error.missing == ["a", "b"]
+
+
+class TestRenderEndpoint:
+    """
+    Test POST /templates/render.
+
+    Why: Operators render one template for every site in a single call.
+    """
+
+    def test_variables_are_merged_by_precedence(self):
+        """
+        Test: NMS values, IPAM subnets and site vars are merged, site vars winning.
+
+        Why: Sites override org defaults; subnets come from the calculator.
+        """
+        # Arrange
+        client = TestClient(app)
+        redis_client = MagicMock(get=AsyncMock(return_value='{"vlan_1": 3666, "mgmt_vlan": 3623}'))
+        template = {"vlan": "{{vlan_1}}", "mgmt": "{{mgmt_vlan}}", "subnet": "{{data_subnet}}", "site": "{{site_name}}"}
+        sites = [{"name": "HQ", "zone_id": 1, "site_id": 55, "vars": {"mgmt_vlan": 10}}, {"name": "Lab"}]
+
+        # Act
+        with patch("src.routers.day1_intent_and_policy.templates.get_redis_client", return_value=redis_client):
+            response = client.post("/templates/render", json={"template": template, "sites": sites})
+
+        # Assert
+        body = response.json()
+        assert response.status_code == 200
+        assert body["sites"][0]["config"] == {"vlan": 3666, "mgmt": 10, "subnet": "10.101.55.0/24", "site": "HQ"}
+        assert body["sites"][1]["missing"] == ["data_subnet"]
+        assert (body["rendered"], body["failed"]) == (1, 1)
+
+    @pytest.mark.parametrize("zone_id", [200])
+    def test_unplannable_zone_is_rejected(self, zone_id):
+        """
+        Test: A zone beyond the bulk-planning range is a 400.
+
+        Why: Its IoT subnet would not fit in one octet.
+        """
+        # Act
+        response = TestClient(app).post("/templates/render", json={
+            "template": {"a": "{{iot_subnet}}"},
+            "sites": [{"name": "X", "zone_id": zone_id, "site_id": 1}],
+            "use_nms_profile": False,
+        })
+
+        # Assert
+        assert response.status_code == 400
@@ -0,0 +1,225 @@
+"""
+Tests for the time-series store and the SLE endpoints it backs.
+
+These tests validate rollups at every resolution, range queries, retention
+trimming, and that /assurance/sle answers from recorded samples.
+
+All tests use a dict-backed Redis and mock the org context.
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.routers.day2_observability_assurance_and_aiops.assurance import health_samples, sample_fleet_health
+from src.routers.day2_observability_assurance_and_aiops.models import FleetHealthResponse, SiteHealthResponse
+from src.services.timeseries import RESOLUTIONS, Sample, TimeSeriesStore, average
+
+
+ASSURANCE = "src.routers.day2_observability_assurance_and_aiops.assurance"
+
+
+@pytest.fixture
+def fake_redis(use_fake_redis):
+    """Route the time-series store to a dict-backed Redis."""
+    return use_fake_redis("src.services.timeseries")
+
+
+# 2026-01-01T00:00:00Z, aligned to every resolution
+T0 = 1767225600
+
+
+class TestTimeSeriesStore:
+    """
+    Test TimeSeriesStore.
+
+    Why: Long-range trends must come from a handful of pre-aggregated buckets.
+    """
+
+    @pytest.mark.anyio
+    async def test_samples_roll_up_into_every_resolution(self, fake_redis):
+        """
+        Test: Samples in one minute share a 1m bucket; samples across an hour
+        land in separate 1m buckets but one 1h bucket.
+
+        Why: Each range query reads the resolution sized for it.
+        """
+        # Arrange
+        store = TimeSeriesStore()
+        samples = [Sample("o:s1", "wireless", T0 + offset, value)
+                   for offset, value in [(0, 80), (30, 100), (600, 60)]]
+
+        # Act
+        await store.add(samples)
+        minutes = await store.query("o:s1", "wireless", T0, T0 + 3599, "1m")
+        hours = await store.query("o:s1", "wireless", T0, T0 + 3599, "1h")
+
+        # Assert
+        assert [(p.timestamp, p.average, p.count) for p in minutes] == [(T0, 90.0, 2), (T0 + 600, 60.0, 1)]
+        assert [(p.timestamp, p.count) for p in hours] == [(T0, 3)]
+        assert average(minutes) == pytest.approx(80.0)
+
+    @pytest.mark.anyio
+    async def test_query_range_uses_the_matching_resolution(self, fake_redis):
+        """
+        Test: A 30d query reads daily buckets covering 30 days.
+
+        Why: A 30-day trend must not read 43,200 minute buckets.
+        """
+        # Arrange
+        store = TimeSeriesStore()
+        day = RESOLUTIONS["1d"].bucket
+        await store.add(Sample("o:s1", "wan", T0 + i * day, 100 - i) for i in range(40))
+
+        # Act
+        points = await store.query_range("o:s1", "wan", "30d", now=T0 + 39 * day)
+
+        # Assert
+        assert len(points) == 31
+        assert points[-1].timestamp == T0 + 39 * day
+
+    @pytest.mark.anyio
+    async def test_trim_drops_buckets_past_retention(self, fake_redis):
+        """
+        Test: Buckets older than a resolution's retention are removed from the
+        index and both hashes; newer ones are kept.
+
+        Why: Minute buckets must not grow without bound.
+        """
+        # Arrange
+        store = TimeSeriesStore()
+        await store.add([Sample("o:s1", "wired", T0, 50), Sample("o:s1", "wired", T0 + 2 * 86400, 70)])
+
+        # Act
+        removed = await store.trim(now=T0 + 2 * 86400)
+        minutes = await store.query("o:s1", "wired", 0, T0 + 3 * 86400, "1m")
+        hours = await store.query("o:s1", "wired", 0, T0 + 3 * 86400, "1h")
+
+        # Assert
+        assert removed == 1  # only the 1m bucket is past its 24h retention
+        assert [p.timestamp for p in minutes] == [T0 + 2 * 86400]
+        assert len(hours) == 2
+        assert "1767225600" not in fake_redis.hashes["ts:o:s1:wired:1m:sum"]
+
+
+class TestHealthSamples:
+    """
+    Test health_samples.
+
+    Why: Only scored domains may be recorded; a missing score is not a zero.
+    """
+
+    def test_unscored_domains_are_skipped(self):
+        """
+        Test: A site without gateways records no WAN sample.
+
+        Why: Averaging in zeros would fake outages in SLE trends.
+        """
+        # Arrange
+        fleet = FleetHealthResponse(
+            sites=[SiteHealthResponse(site_id="s1", site_name="HQ", overall_score=90, wireless_health=90,
+                                      timestamp="2026-01-01T00:00:00+00:00")],
+            count=1,
+            generated_at="2026-01-01T00:00:00+00:00",
+        )
+
+        # Act
+        samples = health_samples("o", fleet)
+
+        # Assert
+        assert {(s.series, s.metric, s.timestamp, s.value) for s in samples} == {
+            ("o:s1", "overall", T0, 90.0), ("o:s1", "wireless", T0, 90.0),
+        }
+
+    @pytest.mark.anyio
+    async def test_sampling_yields_to_jobs_when_budget_is_low(self):
+        """
+        Test: With fewer Mist API tokens left than the reserve, no snapshot
+        is built and nothing is sampled.
+
+        Why: A background sampler must not starve provisioning jobs of quota.
+        """
+        # Arrange
+        fleet_health = AsyncMock()
+        with patch(f"{ASSURANCE}.get_context", AsyncMock(return_value=("api.mist.com", "o"))), \
+                patch(f"{ASSURANCE}.get_rate_limiter",
+                      return_value=MagicMock(bucket=MagicMock(return_value=MagicMock(remaining=3)))), \
+                patch(f"{ASSURANCE}.fleet_health", fleet_health):
+
+            # Act
+            samples = await sample_fleet_health()
+
+        # Assert
+        assert samples == []
+        fleet_health.assert_not_called()
+
+
+class TestSLEEndpoints:
+    """
+    Test GET /assurance/sle/*.
+
+    Why: SLE reports must be answered from recorded samples, not placeholders.
+    """
+
+    @pytest.fixture
+    def client(self, fake_redis):
+        with patch(f"{ASSURANCE}.get_context", AsyncMock(return_value=("api.mist.com", "org-1"))), \
+                patch("src.services.timeseries.time.time", return_value=T0 + 3000):
+            yield TestClient(app)
+
+    def _record(self, samples):
+        asyncio.run(TimeSeriesStore().add(samples))
+
+    def test_report_averages_recorded_domains(self, client):
+        """
+        Test: The report lists one metric per recorded domain and the overall
+        score is the overall domain's average.
+
+        Why: Dashboards read SLE history locally, in one request.
+        """
+        # Arrange
+        self._record([Sample("org-1:s1", "overall", T0 + 60, 80), Sample("org-1:s1", "overall", T0 + 120, 100),
+                      Sample("org-1:s1", "wireless", T0 + 60, 70)])
+
+        # Act
+        response = client.get("/assurance/sle/s1?time_range=1h")
+
+        # Assert
+        assert response.status_code == 200
+        body = response.json()
+        assert body["overall_sle_score"] == 90.0
+        assert {m["name"]: m["score"] for m in body["metrics"]} == {"overall": 90.0, "wireless": 70.0}
+
+    def test_domain_trend(self, client):
+        """
+        Test: The wireless endpoint returns one point per bucket and the average.
+
+        Why: Trend charts plot the rollup buckets directly.
+        """
+        # Arrange
+        self._record([Sample("org-1:s1", "wireless", T0 + 60, 60), Sample("org-1:s1", "wireless", T0 + 120, 80)])
+
+        # Act
+        response = client.get("/assurance/sle/wireless/s1?time_range=1h")
+
+        # Assert
+        body = response.json()
+        assert [p["score"] for p in body["wireless_sles"]] == [60.0, 80.0]
+        assert body["score"] == 70.0
+
+    def test_no_samples_is_404_and_bad_range_is_400(self, client):
+        """
+        Test: A site without samples gets 404; an unknown time range gets 400.
+
+        Why: An empty report must not look like a score of zero.
+        """
+        # Act
+        missing = client.get("/assurance/sle/s9")
+        invalid = client.get("/assurance/sle/s1?time_range=2w")
+
+        # Assert
+        assert missing.status_code == 404
+        assert invalid.status_code == 400
+
@@ -0,0 +1,96 @@
+"""
+Tests for the Day 1 WAN gateway template endpoints.
+
+These tests validate that templates are created through Mist and that bulk
+late binding only updates sites that need it.
+
+All tests mock the org context and MistEngine to avoid external dependencies.
+"""
+import importlib
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+
+wan = importlib.import_module("src.routers.day1_intent_and_policy.0_routing_wan.wan")
+
+
+@pytest.fixture
+def client():
+    """Create FastAPI test client."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def mock_mist():
+    """Org with three sites, one already bound to template t1; writes are recorded."""
+    sites = [
+        {"id": "s1", "name": "A", "gatewaytemplate_id": None},
+        {"id": "s2", "name": "B", "gatewaytemplate_id": "t1"},
+        {"id": "s3", "name": "C"},
+    ]
+
+    async def get(self, endpoint, params=None, cache=False):
+        return {"id": "t1", "name": "Spoke"}
+
+    async def paginate(self, endpoint, params=None, limit=100):
+        for site in sites:
+            yield site
+
+    writes = []
+
+    async def put(self, endpoint, json=None):
+        writes.append(("PUT", endpoint, json))
+        return {"id": endpoint.rsplit("/", 1)[-1], **json}
+
+    async def post(self, endpoint, json=None):
+        writes.append(("POST", endpoint, json))
+        return {"id": "t9", "org_id": "org-1", **json}
+
+    with patch.object(wan, "get_context", AsyncMock(return_value=("api.mist.com", "org-1"))), \
+            patch("src.services.mist_engine.MistEngine.get", get), \
+            patch("src.services.mist_engine.MistEngine.paginate", paginate), \
+            patch("src.services.mist_engine.MistEngine.put", put), \
+            patch("src.services.mist_engine.MistEngine.post", post):
+        yield writes
+
+
+class TestGatewayTemplates:
+    """
+    Test gateway template creation and late binding.
+
+    Why: Binding templates to the site fleet is the most frequent Day 1 operation.
+    """
+
+    def test_create_posts_to_mist(self, client, mock_mist):
+        """
+        Test: POST /wan/gateway-templates creates the template in the org.
+
+        Why: The endpoint used to return a synthetic ID.
+        """
+        # Act
+        response = client.post("/wan/gateway-templates", json={"name": "Spoke"})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["id"] == "t9"
+        assert mock_mist[0][:2] == ("POST", "/api/v1/orgs/org-1/gatewaytemplates")
+
+    def test_bind_updates_only_unbound_sites(self, client, mock_mist):
+        """
+        Test: Bound and repeated sites are skipped, unknown sites fail, the
+        rest are updated.
+
+        Why: Re-submitting a partially failed rollout must not rewrite sites.
+        """
+        # Act
+        response = client.post("/wan/gateway-templates/t1/sites",
+                               json={"site_ids": ["s1", "s2", "s3", "s1", "nope"]})
+
+        # Assert
+        body = response.json()
+        assert [r["status"] for r in body["results"]] == ["succeeded", "skipped", "succeeded", "skipped", "failed"]
+        assert sorted(w[1] for w in mock_mist) == ["/api/v1/sites/s1", "/api/v1/sites/s3"]
+        assert all(w[2] == {"gatewaytemplate_id": "t1"} for w in mock_mist)
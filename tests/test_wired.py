@@ -0,0 +1,125 @@
+"""
+Tests for the Day 1 wired switching endpoints.
+
+These tests validate the port-profile compiler and the bulk push to switches
+pulled from org inventory.
+
+All tests mock the org context and MistEngine to avoid external dependencies.
+"""
+import importlib
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+
+from src.main import app
+
+wired = importlib.import_module("src.routers.day1_intent_and_policy.1_wired_switching.wired")
+models = importlib.import_module("src.routers.day1_intent_and_policy.1_wired_switching.models")
+
+PORT_USAGES = {
+    "corp": {"mode": "access", "port_network": "corp"},
+    "uplink": {"mode": "trunk", "all_networks": True},
+    "unused": {"mode": "access", "port_network": "parking"},
+}
+
+
+class TestCompilePortConfig:
+    """
+    Test compile_port_config.
+
+    Why: Each switch model gets exactly the profiles its ports use.
+    """
+
+    def test_model_specific_assignments(self):
+        """
+        Test: Assignments limited to other models are left out, along with
+        the profiles nothing references.
+
+        Why: A 24-port switch must not receive a 48-port layout.
+        """
+        # Arrange
+        assignments = [
+            models.PortAssignment(ports="ge-0/0/0-47", usage="corp", models=["EX2300-48P"]),
+            models.PortAssignment(ports="ge-0/0/0-23", usage="corp", models=["EX2300-24P"]),
+            models.PortAssignment(ports="ge-0/1/0-3", usage="uplink"),
+        ]
+
+        # Act
+        config = wired.compile_port_config(PORT_USAGES, assignments, "EX2300-24P")
+
+        # Assert
+        assert config == {
+            "port_usages": {"corp": PORT_USAGES["corp"], "uplink": PORT_USAGES["uplink"]},
+            "port_config": {"ge-0/0/0-23": {"usage": "corp"}, "ge-0/1/0-3": {"usage": "uplink"}},
+        }
+
+
+class TestPushPortProfiles:
+    """
+    Test POST /wired/port-profiles/push.
+
+    Why: Hand-applying port profiles across hundreds of switches does not scale.
+    """
+
+    def test_push_updates_assigned_matching_switches(self):
+        """
+        Test: Switches assigned to a site with a matching model are updated;
+        the others are skipped. Ports and profiles already on the switch are kept.
+
+        Why: Unassigned switches have no site-level device endpoint, and a
+        push must not wipe uplinks it does not assign.
+        """
+        # Arrange
+        inventory = [
+            {"id": "d1", "serial": "A", "model": "EX2300-24P", "site_id": "s1"},
+            {"id": "d2", "serial": "B", "model": "EX2300-24P"},
+            {"id": "d3", "serial": "C", "model": "EX4400-48P", "site_id": "s1"},
+        ]
+        writes = []
+
+        async def paginate(self, endpoint, params=None, limit=100):
+            assert params == {"type": "switch"}
+            for device in inventory:
+                yield device
+
+        async def get(self, endpoint, params=None, cache=False):
+            return {"port_usages": {"uplink": {"mode": "trunk"}},
+                    "port_config": {"xe-0/1/0": {"usage": "uplink"}, "ge-0/0/0-23": {"usage": "default"}}}
+
+        async def put(self, endpoint, json=None):
+            writes.append((endpoint, json))
+            return {}
+
+        body = {
+            "template": {"name": "Access", "port_usages": PORT_USAGES},
+            "assignments": [{"ports": "ge-0/0/0-23", "usage": "corp", "models": ["EX2300-24P"]}],
+        }
+
+        # Act
+        with patch.object(wired, "get_context", AsyncMock(return_value=("api.mist.com", "org-1"))), \
+                patch("src.services.mist_engine.MistEngine.paginate", paginate), \
+                patch("src.services.mist_engine.MistEngine.get", get), \
+                patch("src.services.mist_engine.MistEngine.put", put):
+            response = TestClient(app).post("/wired/port-profiles/push", json=body)
+
+        # Assert
+        assert [r["status"] for r in response.json()["results"]] == ["succeeded", "skipped", "skipped"]
+        assert writes == [("/api/v1/sites/s1/devices/d1", {
+            "port_usages": {"uplink": {"mode": "trunk"}, "corp": PORT_USAGES["corp"]},
+            "port_config": {"xe-0/1/0": {"usage": "uplink"}, "ge-0/0/0-23": {"usage": "corp"}},
+        })]
+
+    def test_undefined_profile_is_rejected(self):
+        """
+        Test: An assignment naming a profile missing from port_usages is a 422.
+
+        Why: Mist would reject every switch; fail before any call.
+        """
+        # Act
+        response = TestClient(app).post("/wired/port-profiles/push", json={
+            "template": {"name": "Access", "port_usages": PORT_USAGES},
+            "assignments": [{"ports": "ge-0/0/0", "usage": "voice"}],
+        })
+
+        # Assert
+        assert response.status_code == 422
@@ -0,0 +1,137 @@
+"""
+Tests for the Day 1 wireless endpoints.
+
+These tests validate the Mist payloads and that a wireless bundle creates
+its objects in dependency order, reusing what already exists.
+
+All tests mock the org context, MistEngine and the checkpoint store.
+"""
+import importlib
+from typing import ClassVar
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services.pipeline import CheckpointStore, StepResult
+
+wireless = importlib.import_module("src.routers.day1_intent_and_policy.2_wireless_mobility.wireless")
+
+
+class MemoryCheckpoints(CheckpointStore):
+    """CheckpointStore kept in class-level dicts instead of Redis."""
+    inputs: ClassVar[dict[str, dict]] = {}
+    steps: ClassVar[dict[str, dict[str, StepResult]]] = {}
+
+    async def save_input(self, data: dict) -> None:
+        self.inputs[self.run_id] = data
+
+    async def load_input(self) -> dict | None:
+        return self.inputs.get(self.run_id)
+
+    async def load(self) -> dict[str, StepResult]:
+        return dict(self.steps.get(self.run_id, {}))
+
+    async def save(self, result: StepResult) -> None:
+        self.steps.setdefault(self.run_id, {})[f"{result.target}/{result.step}"] = result
+
+
+@pytest.fixture
+def mist():
+    """In-memory org collections; POSTs are recorded in order."""
+    collections: dict[str, list[dict]] = {}
+    posts: list[tuple[str, dict]] = []
+
+    async def get(self, endpoint, params=None, cache=False):
+        return list(collections.get(endpoint, []))
+
+    async def post(self, endpoint, json=None):
+        posts.append((endpoint.rsplit("/", 1)[-1], json))
+        record = {"id": f"id-{len(posts)}", **json}
+        collections.setdefault(endpoint, []).append(record)
+        return record
+
+    with patch.object(wireless, "get_context", AsyncMock(return_value=("api.mist.com", "org-1"))), \
+            patch.object(wireless, "CheckpointStore", MemoryCheckpoints), \
+            patch("src.services.mist_engine.MistEngine.get", get), \
+            patch("src.services.mist_engine.MistEngine.post", post):
+        yield posts
+
+
+BUNDLE = {
+    "template": {"name": "Corp"},
+    "wlans": [{"ssid": "corp", "vlan_id": 20}, {"ssid": "guest", "auth_type": "open", "band": "5"}],
+    "labels": [{"name": "guests", "values": ["guest"]}],
+    "wxrules": [{"name": "isolate", "order": 1, "action": "deny", "src_labels": ["guests"]}],
+}
+
+
+class TestWirelessBundle:
+    """
+    Test POST /wireless/bundles.
+
+    Why: A WLAN rollout used to take dozens of sequential calls.
+    """
+
+    def test_objects_are_created_after_their_dependencies(self, mist):
+        """
+        Test: WLANs reference the new template and wxrules the new label IDs.
+
+        Why: Mist rejects references to objects that do not exist yet.
+        """
+        # Act
+        response = TestClient(app).post("/wireless/bundles", json=BUNDLE)
+
+        # Assert
+        assert response.json()["status"] == "succeeded"
+        order = [kind for kind, _ in mist]
+        assert order.index("wlans") > order.index("templates")
+        assert order.index("wxrules") > max(order.index("templates"), order.index("wxtags"))
+        template_id = next(f"id-{i + 1}" for i, (kind, _) in enumerate(mist) if kind == "templates")
+        label_id = next(f"id-{i + 1}" for i, (kind, _) in enumerate(mist) if kind == "wxtags")
+        rule = next(payload for kind, payload in mist if kind == "wxrules")
+        assert rule["template_id"] == template_id
+        assert rule["src_wxtags"] == [label_id]
+        assert rule["action"] == "block"
+        guest = next(payload for kind, payload in mist if payload.get("ssid") == "guest")
+        assert guest["bands"] == ["5"] and guest["template_id"] == template_id
+
+    def test_resubmitting_a_bundle_creates_nothing(self, mist):
+        """
+        Test: A second identical bundle reuses every existing object.
+
+        Why: Re-running a rollout must be safe.
+        """
+        # Arrange
+        client = TestClient(app)
+        client.post("/wireless/bundles", json=BUNDLE)
+        created = len(mist)
+
+        # Act
+        response = client.post("/wireless/bundles", json=BUNDLE)
+
+        # Assert
+        assert response.json()["status"] == "succeeded"
+        assert len(mist) == created
+
+
+class TestPayloads:
+    """
+    Test the Mist payload mapping.
+
+    Why: The request models use friendlier names than the Mist API.
+    """
+
+    def test_psk_wlan_uses_org_psks(self):
+        """
+        Test: A PSK WLAN is created for multi-PSK only, with its VLAN enabled.
+
+        Why: Passphrases come from Org PSKs, not the WLAN.
+        """
+        # Act
+        payload = wireless._wlan_payload(wireless.WLANCreate(ssid="corp", vlan_id=20), "t1")
+
+        # Assert
+        assert payload["auth"] == {"type": "psk", "multi_psk_only": True}
+        assert (payload["vlan_enabled"], payload["vlan_id"], payload["template_id"]) == (True, 20, "t1")